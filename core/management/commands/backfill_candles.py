@@ -0,0 +1,125 @@
+"""
+Management command to backfill historical candles from the brokers.
+
+Pages through the broker's history API in windows of one request each,
+fetches the windows concurrently under the broker rate limiter and writes
+the deduplicated candles to the history keys of the Redis candle store.
+
+Example (a month of 1m candles):
+    python manage.py backfill_candles --asset BTC --days 30
+"""
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.broker import BrokerError
+from core.services.broker.config import get_broker_service_for_asset
+from core.services.market_data import HistoryBackfill, get_candle_store
+from core.services.market_data.history_backfill import DEFAULT_BACKFILL_WORKERS
+from trading.models import TradingAsset
+
+
+class Command(BaseCommand):
+    help = 'Backfill historical candles from the broker into the Redis candle store'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--asset',
+            nargs='+',
+            help='Asset symbols to backfill (default: all active assets)'
+        )
+        parser.add_argument(
+            '--timeframe',
+            default='1m',
+            help='Candle timeframe (default: 1m)'
+        )
+        parser.add_argument(
+            '--days',
+            type=float,
+            default=30,
+            help='Days of history to load (default: 30)'
+        )
+        parser.add_argument(
+            '--end',
+            help='End of the range as ISO datetime in UTC (default: now)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_BACKFILL_WORKERS,
+            help=f'Request windows fetched concurrently (default: {DEFAULT_BACKFILL_WORKERS})'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete the existing history of each asset before backfilling'
+        )
+
+    def handle(self, *args, **options):
+        timeframe = options['timeframe']
+
+        if options['end']:
+            try:
+                end = datetime.fromisoformat(options['end'])
+            except ValueError:
+                raise CommandError(f"Invalid --end datetime: {options['end']}")
+            if end.tzinfo is None:
+                end = end.replace(tzinfo=timezone.utc)
+        else:
+            end = datetime.now(timezone.utc)
+        end = end.replace(second=0, microsecond=0)
+        start = end - timedelta(days=options['days'])
+
+        assets = TradingAsset.objects.filter(is_active=True)
+        if options['asset']:
+            assets = TradingAsset.objects.filter(symbol__in=options['asset'])
+            missing = set(options['asset']) - set(assets.values_list('symbol', flat=True))
+            if missing:
+                raise CommandError(f"Unknown assets: {', '.join(sorted(missing))}")
+
+        store = get_candle_store()
+        total_written = 0
+        failures = 0
+
+        for asset in assets:
+            if asset.broker == TradingAsset.BrokerKind.MEXC:
+                symbol = asset.effective_broker_symbol
+            else:
+                symbol = asset.epic
+
+            self.stdout.write(f"{asset.symbol}: backfilling {timeframe} from {start:%Y-%m-%d %H:%M} to {end:%Y-%m-%d %H:%M} UTC")
+
+            try:
+                broker = get_broker_service_for_asset(asset)
+                broker.connect()
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"  ✗ {asset.symbol}: cannot connect to {asset.broker}: {e}"))
+                failures += 1
+                continue
+
+            try:
+                if options['clear']:
+                    store.clear_history(asset.symbol, timeframe)
+                backfill = HistoryBackfill(broker, store=store, max_workers=options['workers'])
+                result = backfill.run(asset.symbol, symbol, timeframe, start, end)
+            except (ValueError, BrokerError) as e:
+                self.stdout.write(self.style.ERROR(f"  ✗ {asset.symbol}: {e}"))
+                failures += 1
+                continue
+            finally:
+                broker.disconnect()
+
+            total_written += result.written
+            self.stdout.write(
+                f"  {result.written} candles written ({result.fetched} fetched in {result.windows} windows)"
+            )
+            for window_start, window_end, error in result.failed_windows:
+                self.stdout.write(self.style.WARNING(f"  ! {window_start:%Y-%m-%d %H:%M} - {window_end:%Y-%m-%d %H:%M}: {error}"))
+            if not result.success:
+                failures += 1
+
+        summary = f"Summary: {total_written} {timeframe} candles written, {failures} assets with errors"
+        if failures:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
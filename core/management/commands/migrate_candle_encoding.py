@@ -0,0 +1,61 @@
+"""
+Management command to re-encode stored market candles.
+
+Converts legacy "{timestamp}:{json}" sorted-set members in Redis to the
+compact binary encoding (or back to JSON). Safe to run while the worker
+is writing: each stream key is converted in a single transaction.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.market_data import (
+    get_candle_store,
+    MEMBER_ENCODING_BINARY,
+    MEMBER_ENCODING_JSON,
+)
+
+
+class Command(BaseCommand):
+    help = 'Re-encode market candles stored in Redis (JSON -> binary by default)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--encoding',
+            choices=[MEMBER_ENCODING_BINARY, MEMBER_ENCODING_JSON],
+            default=MEMBER_ENCODING_BINARY,
+            help='Target member encoding (default: binary)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many candles would be converted'
+        )
+
+    def handle(self, *args, **options):
+        encoding = options['encoding']
+        dry_run = options['dry_run']
+
+        store = get_candle_store()
+        if not store.is_connected:
+            raise CommandError("Redis is not available - nothing to migrate")
+
+        total_keys = 0
+        total_converted = 0
+
+        for key in store.iter_stream_keys():
+            total_keys += 1
+            try:
+                converted = store.migrate_member_encoding(key, encoding=encoding, dry_run=dry_run)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"  ✗ {key}: {e}"))
+                continue
+
+            total_converted += converted
+            if converted:
+                self.stdout.write(f"  {key}: {converted} candles")
+
+        action = "would be converted" if dry_run else "converted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Summary: {total_converted} candles in {total_keys} streams {action} to {encoding}"
+            )
+        )
@@ -11,16 +11,22 @@ Usage:
     python manage.py run_fiona_worker
     python manage.py run_fiona_worker --interval 60 --shadow-only
     python manage.py run_fiona_worker --epic CC.D.CL.UNC.IP --verbose
+    python manage.py run_fiona_worker --multi-asset --stream-prices
+    python manage.py run_fiona_worker --multi-asset --concurrency 8
+    python manage.py run_fiona_worker --multi-asset --broker MEXC --shard 0/2
+    python manage.py run_fiona_worker --multi-asset --stream-prices --schedule aligned
 """
 import logging
 import signal
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import Optional, Any
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 
 from core.services.broker import (
     BrokerService,
@@ -28,10 +34,19 @@ from core.services.broker import (
     BrokerError,
     AuthenticationError,
     BrokerRegistry,
-    SessionTimesConfig,
+    get_rate_limit_stats,
+    get_broker_metrics,
+    summarize_broker_metrics,
+    get_cached_symbol_price,
 )
 from core.services.broker.models import SymbolPrice
-from trading.models import WorkerStatus, AssetDiagnostics, AssetPriceStatus, PriceSnapshot, BreakoutRange
+from trading.models import (
+    WorkerStatus,
+    AssetDiagnostics,
+    PriceSnapshot,
+    BreakoutRange,
+    TradingAsset,
+)
 from core.services.strategy import (
     StrategyEngine,
     StrategyConfig,
@@ -42,6 +57,10 @@ from core.services.risk.models import RiskConfig
 from core.services.execution import ExecutionService
 from core.services.execution.models import ExecutionConfig
 from core.services.weaviate import WeaviateService
+from core.services.worker_coordination import WorkerShard, WorkerCoordinator, MIN_LEASE_SECONDS
+from core.services.worker_scheduler import CycleScheduler, CycleTrigger, DEFAULT_SETTLE_SECONDS
+from core.services.worker_context import AssetContextCache, AssetCycleContext
+from core.services.worker_writes import CycleWriteBuffer
 from dataclasses import dataclass
 
 
@@ -93,7 +112,21 @@ class Command(BaseCommand):
         self.risk_engine: Optional[RiskEngine] = None
         self.execution_service: Optional[ExecutionService] = None
         self.weaviate_service: Optional[WeaviateService] = None
+        self.stream_ingestor = None
+        self.kline_ingestor = None
         self.shutdown_handler: Optional[GracefulShutdown] = None
+        # Assets handled by this process (--broker, --shard) and, when only
+        # part of the assets is handled, the coordination with other workers
+        self.worker_shard = WorkerShard()
+        self.worker_coordinator: Optional[WorkerCoordinator] = None
+        # Set with --schedule aligned: cycles start on interval boundaries
+        # and, with streamed prices, on candle close events
+        self.cycle_scheduler: Optional[CycleScheduler] = None
+        # Strategy config and session phases per asset, reloaded only when
+        # the asset (or one of its configs) changes
+        self.asset_context_cache = AssetContextCache()
+        # Writes of a multi-asset cycle, flushed in one transaction per cycle
+        self.cycle_writes = CycleWriteBuffer()
         self._last_price_snapshot_cleanup: Optional[datetime] = None
         # Track intra-phase highs/lows per epic using observed mid prices.
         # Broker-provided daily low values would otherwise bleed into later phases
@@ -146,6 +179,47 @@ class Command(BaseCommand):
             default=0,
             help='Maximum number of iterations (0 = unlimited)'
         )
+        parser.add_argument(
+            '--stream-prices',
+            action='store_true',
+            help='Stream IG ticks and MEXC klines into 1m candles instead of polling each cycle (multi-asset mode)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Number of assets evaluated in parallel per cycle (multi-asset mode, default: 1)'
+        )
+        parser.add_argument(
+            '--broker',
+            type=str,
+            choices=TradingAsset.BrokerKind.values,
+            default=None,
+            help='Only process assets of this broker (multi-asset mode)'
+        )
+        parser.add_argument(
+            '--shard',
+            type=str,
+            default=None,
+            help='Only process shard i of N (0-based, e.g. 0/4); assets are assigned by id (multi-asset mode)'
+        )
+        parser.add_argument(
+            '--schedule',
+            type=str,
+            choices=['sleep', 'aligned'],
+            default='sleep',
+            help=(
+                "'sleep': wait --interval after each cycle (default). "
+                "'aligned': start cycles on interval boundaries; with --stream-prices "
+                "also evaluate an asset as soon as its 1m candle closes"
+            )
+        )
+        parser.add_argument(
+            '--settle-seconds',
+            type=float,
+            default=DEFAULT_SETTLE_SECONDS,
+            help=f'Delay after a boundary or candle close before an aligned cycle starts (default: {DEFAULT_SETTLE_SECONDS})'
+        )
 
     def handle(self, *args, **options):
         interval = options['interval']
@@ -156,6 +230,26 @@ class Command(BaseCommand):
         dry_run = options['dry_run']
         run_once = options['once']
         max_iterations = options['max_iterations']
+        stream_prices = options.get('stream_prices', False)
+        concurrency = max(1, options.get('concurrency') or 1)
+        broker = options.get('broker')
+        shard_spec = options.get('shard')
+        schedule = options.get('schedule') or 'sleep'
+        settle_seconds = options.get('settle_seconds', DEFAULT_SETTLE_SECONDS)
+        
+        if (broker or shard_spec) and not multi_asset:
+            raise CommandError("--broker and --shard require --multi-asset")
+        try:
+            self.worker_shard = WorkerShard.parse(shard_spec, broker=broker)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if self.worker_shard.is_partial:
+            self.worker_coordinator = WorkerCoordinator(
+                self.worker_shard,
+                lease_seconds=max(3 * interval, MIN_LEASE_SECONDS),
+            )
+        if schedule == 'aligned':
+            self.cycle_scheduler = CycleScheduler(interval, settle_seconds=settle_seconds)
         
         # Configure logging
         if verbose:
@@ -167,11 +261,16 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS("=" * 60))
         if multi_asset:
             self.stdout.write("Mode: Multi-Asset (from database)")
+            self.stdout.write(f"Concurrency: {concurrency}")
+            if self.worker_shard.is_partial:
+                self.stdout.write(f"Shard: {self.worker_shard.label}")
         else:
             self.stdout.write(f"Epic: {epic}")
         self.stdout.write(f"Interval: {interval}s")
+        self.stdout.write(f"Schedule: {schedule}")
         self.stdout.write(f"Shadow Only: {shadow_only}")
         self.stdout.write(f"Dry Run: {dry_run}")
+        self.stdout.write(f"Price Streaming: {stream_prices}")
         self.stdout.write("")
         
         # Set up graceful shutdown
@@ -180,9 +279,12 @@ class Command(BaseCommand):
         try:
             # Initialize all services
             self._initialize_services(epic, shadow_only)
+            if stream_prices:
+                self._start_price_streaming()
             
             # Main loop
             iteration = 0
+            trigger: Optional[CycleTrigger] = None
             while not self.shutdown_handler.should_stop:
                 iteration += 1
                 
@@ -190,9 +292,13 @@ class Command(BaseCommand):
                     self.stdout.write(f"Reached max iterations ({max_iterations}), stopping.")
                     break
                 
+                if self.worker_coordinator:
+                    self.worker_coordinator.renew_lease()
+                
                 try:
                     if multi_asset:
-                        self._run_multi_asset_cycle(shadow_only, dry_run, interval)
+                        with self.cycle_writes.batch():
+                            self._run_multi_asset_cycle(shadow_only, dry_run, interval, concurrency, trigger)
                     else:
                         self._run_cycle(epic, shadow_only, dry_run, interval)
                 except BrokerError as e:
@@ -208,7 +314,12 @@ class Command(BaseCommand):
                     self.stdout.write("Single run completed, exiting.")
                     break
                 
-                if not self.shutdown_handler.should_stop:
+                if self.shutdown_handler.should_stop:
+                    break
+                
+                if self.cycle_scheduler:
+                    trigger = self.cycle_scheduler.wait(lambda: self.shutdown_handler.should_stop)
+                else:
                     self.stdout.write(f"Sleeping for {interval}s...")
                     time.sleep(interval)
             
@@ -237,18 +348,20 @@ class Command(BaseCommand):
         
         # 2. Initialize default IG Broker for backward compatibility
         # (will be replaced by per-asset broker selection in multi-asset mode)
-        self.stdout.write("  → Connecting to default broker (IG)...")
-        try:
-            default_broker = self.broker_registry.get_ig_broker()
-            self.stdout.write(self.style.SUCCESS("    ✓ Connected to IG"))
-        except AuthenticationError as e:
-            logger.warning(f"IG authentication failed: {e}")
-            self.stdout.write(self.style.WARNING(f"    ⚠ IG authentication failed: {e}"))
-            default_broker = None
-        except Exception as e:
-            logger.warning(f"Failed to connect to IG: {e}")
-            self.stdout.write(self.style.WARNING(f"    ⚠ Failed to connect to IG: {e}"))
-            default_broker = None
+        default_broker = None
+        if not self._handles_broker(TradingAsset.BrokerKind.IG):
+            self.stdout.write(f"  → Skipping IG connection (only {self.worker_shard.broker} assets)")
+        else:
+            self.stdout.write("  → Connecting to default broker (IG)...")
+            try:
+                default_broker = self.broker_registry.get_ig_broker()
+                self.stdout.write(self.style.SUCCESS("    ✓ Connected to IG"))
+            except AuthenticationError as e:
+                logger.warning(f"IG authentication failed: {e}")
+                self.stdout.write(self.style.WARNING(f"    ⚠ IG authentication failed: {e}"))
+            except Exception as e:
+                logger.warning(f"Failed to connect to IG: {e}")
+                self.stdout.write(self.style.WARNING(f"    ⚠ Failed to connect to IG: {e}"))
         
         # 3. Get account state to verify connection (if broker available)
         if default_broker:
@@ -267,6 +380,7 @@ class Command(BaseCommand):
             broker_service=default_broker,
             eia_timestamp=None,  # Can be set later if needed
             broker_registry=self.broker_registry,
+            write_buffer=self.cycle_writes,
         )
         self.stdout.write(self.style.SUCCESS("    ✓ Market State Provider created"))
         
@@ -330,6 +444,43 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS("\n✓ All services initialized successfully!"))
         self.stdout.write("")
 
+    def _handles_broker(self, broker: str) -> bool:
+        """Check whether this worker processes assets of a broker (see --broker)."""
+        return self.worker_shard.broker in (None, broker)
+
+    def _start_price_streaming(self) -> None:
+        """
+        Start streaming IG ticks and MEXC klines into the market data layer.
+        
+        Falls back to per-cycle REST polling if a stream cannot be set up.
+        """
+        from core.services.market_data import IgStreamIngestor, MexcKlineIngestor
+        
+        if self._handles_broker(TradingAsset.BrokerKind.IG):
+            self.stdout.write("  → Starting IG price streaming...")
+            try:
+                ig_broker = self.broker_registry.get_ig_broker()
+                self.stream_ingestor = IgStreamIngestor.from_api_client(ig_broker.api_client)
+                self.stream_ingestor.start()
+                self.market_state_provider.set_stream_ingestor(self.stream_ingestor)
+                self.stdout.write(self.style.SUCCESS("    ✓ IG price streaming started"))
+            except Exception as e:
+                logger.warning(f"Failed to start IG price streaming: {e}")
+                self.stdout.write(self.style.WARNING(f"    ⚠ IG price streaming unavailable, polling prices: {e}"))
+                self.stream_ingestor = None
+        
+        if self._handles_broker(TradingAsset.BrokerKind.MEXC):
+            self.stdout.write("  → Starting MEXC kline streaming...")
+            try:
+                self.kline_ingestor = MexcKlineIngestor.from_settings()
+                self.kline_ingestor.start()
+                self.market_state_provider.set_mexc_kline_stream(self.kline_ingestor)
+                self.stdout.write(self.style.SUCCESS("    ✓ MEXC kline streaming started"))
+            except Exception as e:
+                logger.warning(f"Failed to start MEXC kline streaming: {e}")
+                self.stdout.write(self.style.WARNING(f"    ⚠ MEXC kline streaming unavailable, polling klines: {e}"))
+                self.kline_ingestor = None
+
     def _run_cycle(self, epic: str, shadow_only: bool, dry_run: bool, worker_interval: int = 60) -> None:
         """Run one cycle of the worker loop (legacy single-asset mode)."""
         now = datetime.now(timezone.utc)
@@ -356,7 +507,7 @@ class Command(BaseCommand):
         price = None
         try:
             default_broker = self.broker_registry.get_ig_broker()
-            price = default_broker.get_symbol_price(epic)
+            price = get_cached_symbol_price(default_broker, epic)
             bid_price = price.bid
             ask_price = price.ask
             spread = price.spread
@@ -422,24 +573,35 @@ class Command(BaseCommand):
             # Legacy mode doesn't use AssetDiagnostics, pass None
             self._process_setup(setup, shadow_only, dry_run, now, diagnostics=None)
     
-    def _run_multi_asset_cycle(self, shadow_only: bool, dry_run: bool, worker_interval: int = 60) -> None:
+    def _run_multi_asset_cycle(
+        self,
+        shadow_only: bool,
+        dry_run: bool,
+        worker_interval: int = 60,
+        concurrency: int = 1,
+        trigger: Optional[CycleTrigger] = None,
+    ) -> None:
         """
         Run one cycle processing all active assets from the database.
         
         This method iterates over all TradingAssets marked as active and
         runs the strategy evaluation for each one using asset-specific configurations.
-        """
-        from trading.models import TradingAsset
+        With concurrency > 1, up to that many assets are evaluated in parallel
+        threads, so a slow broker call only delays its own asset.
         
+        With a trigger from the cycle scheduler, only the assets it includes
+        are evaluated (e.g. the assets whose 1m candle just closed).
+        """
         now = datetime.now(timezone.utc)
         
-        # Load all active assets
-        active_assets = TradingAsset.objects.filter(is_active=True).prefetch_related(
-            'breakout_config', 'event_configs'
-        )
+        # Load all active assets of this worker's broker/shard
+        # (configs are loaded from the database only for new or changed assets)
+        active_assets = list(self.worker_shard.filter_assets(
+            TradingAsset.objects.filter(is_active=True)
+        ))
+        self.asset_context_cache.retain(asset.pk for asset in active_assets)
         
-        asset_count = active_assets.count()
-        if asset_count == 0:
+        if not active_assets:
             self.stdout.write(self.style.WARNING(
                 f"\n[{now.strftime('%H:%M:%S')} UTC] No active assets found in database"
             ))
@@ -461,52 +623,66 @@ class Command(BaseCommand):
             )
             return
         
+        # Stream ticks/klines of the assets (no-op for markets already streamed)
+        for asset in active_assets:
+            streamed = False
+            if self.stream_ingestor and asset.broker == TradingAsset.BrokerKind.IG:
+                self.stream_ingestor.add_market(asset.symbol, asset.effective_broker_symbol)
+                streamed = True
+            elif self.kline_ingestor and asset.broker == TradingAsset.BrokerKind.MEXC:
+                self.kline_ingestor.add_symbol(asset.symbol, asset.effective_broker_symbol)
+                streamed = True
+            if streamed and self.cycle_scheduler:
+                self._watch_candle_closes(asset)
+        
+        if trigger is not None:
+            active_assets = [asset for asset in active_assets if trigger.includes(asset.symbol)]
+            if not active_assets:
+                logger.debug("All assets were evaluated on candle close, skipping boundary cycle")
+                return
+        
+        asset_count = len(active_assets)
         self.stdout.write(f"\n[{now.strftime('%H:%M:%S')} UTC] Processing {asset_count} active asset(s)")
         
         total_setups = 0
         processed_epics = []
+        # Fetch all asset prices with one batch request per broker; the
+        # per-asset price lookups below are then served from the price cache
+        self.broker_registry.prefetch_prices(active_assets)
+        
         # Track price from first asset with valid prices for WorkerStatus
         last_bid_price = None
         last_ask_price = None
         last_spread = None
         
         # Process each active asset
-        for asset in active_assets:
-            self.stdout.write(f"\n  📈 Asset: {asset.name} ({asset.symbol})")
-            self.stdout.write(f"     EPIC: {asset.epic}")
+        if concurrency > 1 and asset_count > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(concurrency, asset_count),
+                thread_name_prefix='fiona-asset',
+            ) as pool:
+                cycle_results = list(pool.map(
+                    lambda asset: self._process_asset_in_thread(asset, shadow_only, dry_run, now),
+                    active_assets,
+                ))
+        else:
+            cycle_results = [
+                self._process_asset(asset, shadow_only, dry_run, now)
+                for asset in active_assets
+            ]
+        
+        for asset, cycle_result in zip(active_assets, cycle_results):
+            if cycle_result is None:
+                continue
             
-            try:
-                # Get asset-specific strategy config
-                strategy_config = asset.get_strategy_config()
-                
-                # Create a new strategy engine with this asset's config
-                asset_strategy_engine = StrategyEngine(
-                    market_state=self.market_state_provider,
-                    config=strategy_config,
-                    trading_asset=asset,
-                )
-                
-                # Run cycle for this asset
-                cycle_result = self._run_asset_cycle(
-                    asset=asset,
-                    strategy_engine=asset_strategy_engine,
-                    shadow_only=shadow_only,
-                    dry_run=dry_run,
-                    now=now,
-                )
-                
-                total_setups += cycle_result.setups_found
-                processed_epics.append(asset.epic)
-                
-                # Use price from first asset with valid prices
-                if last_bid_price is None and cycle_result.bid_price is not None:
-                    last_bid_price = cycle_result.bid_price
-                    last_ask_price = cycle_result.ask_price
-                    last_spread = cycle_result.spread
-                
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"     ✗ Error processing asset: {e}"))
-                logger.exception(f"Error processing asset {asset.epic}")
+            total_setups += cycle_result.setups_found
+            processed_epics.append(asset.epic)
+            
+            # Use price from first asset with valid prices
+            if last_bid_price is None and cycle_result.bid_price is not None:
+                last_bid_price = cycle_result.bid_price
+                last_ask_price = cycle_result.ask_price
+                last_spread = cycle_result.spread
         
         # Update worker status with summary including price from first asset
         phase = self.market_state_provider.get_phase(now)
@@ -527,10 +703,71 @@ class Command(BaseCommand):
             worker_interval=worker_interval,
         )
         
+        logger.debug(f"Price cache: {self.broker_registry.price_cache.get_stats()}")
+        for limiter_stats in get_rate_limit_stats():
+            logger.debug(f"Broker rate limit: {limiter_stats}")
+        for broker_summary in summarize_broker_metrics(get_broker_metrics().snapshot()):
+            logger.debug(f"Broker calls: {broker_summary}")
+        
         # Clean up old price snapshots periodically (once per hour) to keep database lean
         # Retain 2 hours of data (enough for the 60-minute chart display)
         self._maybe_cleanup_old_price_snapshots(now)
     
+    def _watch_candle_closes(self, asset) -> None:
+        """Let the cycle scheduler start a cycle when the asset's 1m candle closes."""
+        from core.services.market_data import get_stream_manager, BASE_TIMEFRAME
+        
+        stream = get_stream_manager().get_or_create_stream(asset.symbol, BASE_TIMEFRAME, broker=asset.broker)
+        self.cycle_scheduler.watch_stream(stream)
+    
+    def _process_asset(self, asset, shadow_only: bool, dry_run: bool, now: datetime) -> Optional[AssetCycleResult]:
+        """
+        Evaluate one asset with its own market state provider and strategy engine.
+        
+        Returns:
+            AssetCycleResult, or None if processing the asset failed
+        """
+        self.stdout.write(f"\n  📈 Asset: {asset.name} ({asset.symbol})")
+        self.stdout.write(f"     EPIC: {asset.epic}")
+        
+        try:
+            asset_context = self.asset_context_cache.get(asset)
+            
+            # Provider bound to this asset (no shared current-asset state)
+            market_state = self.market_state_provider.for_asset(
+                asset,
+                session_times=asset_context.session_times,
+                phase_configs=asset_context.phase_configs,
+            )
+            
+            # Create a new strategy engine with this asset's config
+            asset_strategy_engine = StrategyEngine(
+                market_state=market_state,
+                config=asset_context.strategy_config,
+                trading_asset=asset,
+            )
+            
+            return self._run_asset_cycle(
+                asset=asset,
+                strategy_engine=asset_strategy_engine,
+                shadow_only=shadow_only,
+                dry_run=dry_run,
+                now=now,
+                market_state=market_state,
+                asset_context=asset_context,
+            )
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"     ✗ Error processing asset {asset.epic}: {e}"))
+            logger.exception(f"Error processing asset {asset.epic}")
+            return None
+    
+    def _process_asset_in_thread(self, asset, shadow_only: bool, dry_run: bool, now: datetime) -> Optional[AssetCycleResult]:
+        """Run _process_asset() in a pool thread and close its database connections afterwards."""
+        try:
+            return self._process_asset(asset, shadow_only, dry_run, now)
+        finally:
+            connections.close_all()
+    
     def _maybe_cleanup_old_price_snapshots(self, now: datetime) -> None:
         """
         Clean up old price snapshots if an hour has passed since last cleanup.
@@ -555,7 +792,9 @@ class Command(BaseCommand):
         strategy_engine: StrategyEngine,
         shadow_only: bool,
         dry_run: bool,
-        now: datetime
+        now: datetime,
+        market_state: Optional[IGMarketStateProvider] = None,
+        asset_context: Optional[AssetCycleContext] = None,
     ) -> AssetCycleResult:
         """
         Run strategy evaluation for a single asset.
@@ -570,12 +809,14 @@ class Command(BaseCommand):
             shadow_only: Whether to only create shadow trades
             dry_run: Whether to skip trade execution
             now: Current timestamp
+            market_state: Market state provider bound to this asset
+                (default: a new view of the shared provider via for_asset())
+            asset_context: Cached configuration of the asset
+                (default: from the asset context cache)
             
         Returns:
             AssetCycleResult with setups found and price information
         """
-        from trading.models import AssetSessionPhaseConfig
-        
         epic = asset.epic
         broker_symbol = asset.effective_broker_symbol
         result = AssetCycleResult()
@@ -589,69 +830,28 @@ class Command(BaseCommand):
             logger.exception(f"Failed to get broker for asset {epic}")
             return result
         
-        # Set current asset for range persistence (Acceptance Criteria #2)
-        self.market_state_provider.set_current_asset(asset)
+        # Cached configuration; no queries unless the asset or its configs changed
+        if asset_context is None:
+            asset_context = self.asset_context_cache.get(asset)
+        
+        # Asset-bound provider for range persistence (Acceptance Criteria #2)
+        if market_state is None:
+            market_state = self.market_state_provider.for_asset(asset, phase_configs=asset_context.phase_configs)
         
         try:
             # 1. Configure session times from asset's Sessions & Phases configuration
-            # Pre-fetch all phase configs for this asset to avoid N+1 queries
-            phase_configs_by_phase = {}
-            try:
-                phase_configs = list(AssetSessionPhaseConfig.get_enabled_phases_for_asset(asset))
-                phase_configs_by_phase = {pc.phase: pc for pc in phase_configs}
-                
-                # Build session times from phase configs
-                session_times_kwargs = {}
-                for pc in phase_configs:
-                    if pc.phase == 'ASIA_RANGE':
-                        session_times_kwargs['asia_start'] = pc.start_time_utc
-                        session_times_kwargs['asia_end'] = pc.end_time_utc
-                    elif pc.phase == 'LONDON_CORE':
-                        session_times_kwargs['london_core_start'] = pc.start_time_utc
-                        session_times_kwargs['london_core_end'] = pc.end_time_utc
-                    elif pc.phase == 'PRE_US_RANGE':
-                        session_times_kwargs['pre_us_start'] = pc.start_time_utc
-                        session_times_kwargs['pre_us_end'] = pc.end_time_utc
-                    elif pc.phase == 'US_CORE_TRADING':
-                        session_times_kwargs['us_core_trading_start'] = pc.start_time_utc
-                        session_times_kwargs['us_core_trading_end'] = pc.end_time_utc
-                        session_times_kwargs['us_core_trading_enabled'] = pc.enabled
-                
-                if session_times_kwargs:
-                    session_times = SessionTimesConfig.from_time_strings(**session_times_kwargs)
-                    self.market_state_provider.set_session_times(session_times)
-                else:
-                    # Fallback to breakout config if no session phase configs exist
-                    logger.debug(f"No AssetSessionPhaseConfig found for {epic}, falling back to AssetBreakoutConfig")
-                    try:
-                        breakout_cfg = asset.breakout_config
-                        session_times = SessionTimesConfig.from_time_strings(
-                            asia_start=getattr(breakout_cfg, 'asia_range_start', '00:00'),
-                            asia_end=getattr(breakout_cfg, 'asia_range_end', '08:00'),
-                            pre_us_start=getattr(breakout_cfg, 'pre_us_start', '13:00'),
-                            pre_us_end=getattr(breakout_cfg, 'pre_us_end', '15:00'),
-                            us_core_trading_start=getattr(breakout_cfg, 'us_core_trading_start', '15:00'),
-                            us_core_trading_end=getattr(breakout_cfg, 'us_core_trading_end', '22:00'),
-                            us_core_trading_enabled=getattr(breakout_cfg, 'us_core_trading_enabled', True),
-                        )
-                        self.market_state_provider.set_session_times(session_times)
-                    except Exception:
-                        logger.debug(f"No AssetBreakoutConfig found for {epic}, using default session times")
-                        self.market_state_provider.set_session_times(SessionTimesConfig())
-            except Exception as e:
-                logger.debug(f"Using default session times for {epic}: {e}")
-                # Use default session times if no configuration exists
-                self.market_state_provider.set_session_times(SessionTimesConfig())
+            phase_configs_by_phase = asset_context.phase_configs
+            market_state.set_session_times(asset_context.session_times)
             
             # 2. Determine session phase (now using asset-specific times)
-            phase = self.market_state_provider.get_phase(now)
+            phase = market_state.get_phase(now)
             self.stdout.write(f"     Phase: {phase.value}")
             
             # 3. Update candle cache with current price
-            # The provider automatically uses the correct broker via BrokerRegistry
-            # when current_asset is set (done above via set_current_asset)
+            # The asset-bound provider automatically uses the correct broker
+            # via BrokerRegistry
             try:
-                self.market_state_provider.update_candle_from_price()
+                market_state.update_candle_from_price()
             except Exception as e:
                 logger.warning(f"Failed to update candle for {broker_symbol}: {e}")
             
@@ -659,7 +859,7 @@ class Command(BaseCommand):
             # Use asset-specific broker and broker_symbol
             current_price = None
             try:
-                price = asset_broker.get_symbol_price(broker_symbol)
+                price = get_cached_symbol_price(asset_broker, broker_symbol)
                 current_price = price
                 # Store price in result for WorkerStatus update
                 result.bid_price = Decimal(str(price.bid)) if price.bid is not None else None
@@ -672,7 +872,7 @@ class Command(BaseCommand):
                 if price.bid is not None and price.ask is not None:
                     try:
                         price_mid = (price.bid + price.ask) / 2
-                        PriceSnapshot.record_snapshot(
+                        self.cycle_writes.record_price_snapshot(
                             asset=asset,
                             price_mid=price_mid,
                             price_bid=price.bid,
@@ -686,7 +886,9 @@ class Command(BaseCommand):
                 result.status_message = f"Could not get price: {e}"
             
             range_built_phase = None         
-            range_built_phase = self._build_range_for_phase(asset, epic, phase, phase_configs_by_phase, current_price, now)
+            range_built_phase = self._build_range_for_phase(
+                asset, epic, phase, phase_configs_by_phase, current_price, now, market_state=market_state
+            )
          
             
             # 5. Check and update breakout state based on current price position
@@ -761,12 +963,15 @@ class Command(BaseCommand):
 
             # 8. Process each setup
             for setup in setups:
-                self._process_setup(setup, shadow_only, dry_run, now, trading_asset=asset, diagnostics=diagnostics)
+                self._process_setup(
+                    setup, shadow_only, dry_run, now,
+                    trading_asset=asset, diagnostics=diagnostics, market_state=market_state,
+                )
             
             # Save diagnostics after processing all setups to persist risk engine counters
             if diagnostics:
                 try:
-                    diagnostics.save()
+                    self.cycle_writes.save_diagnostics(diagnostics)
                 except Exception as e:
                     logger.warning(f"Failed to save diagnostics after setup processing: {e}")
 
@@ -776,7 +981,7 @@ class Command(BaseCommand):
         finally:
             status_message = result.status_message or "No status available"
             try:
-                AssetPriceStatus.update_price(
+                self.cycle_writes.update_price_status(
                     asset=asset,
                     bid_price=result.bid_price,
                     ask_price=result.ask_price,
@@ -785,8 +990,6 @@ class Command(BaseCommand):
                 )
             except Exception as price_status_error:
                 logger.warning(f"Failed to persist price status for {epic}: {price_status_error}")
-            # Clear current asset after processing
-            self.market_state_provider.clear_current_asset()
 
     def _build_range_for_phase(
         self,
@@ -795,7 +998,8 @@ class Command(BaseCommand):
         phase: SessionPhase,
         phase_configs: dict,
         current_price,
-        now: datetime
+        now: datetime,
+        market_state: Optional[IGMarketStateProvider] = None,
     ) -> str:
         """
         Build and persist range data for the current phase.
@@ -820,10 +1024,13 @@ class Command(BaseCommand):
             phase_configs: Dict of phase configs by phase name
             current_price: Current SymbolPrice (or None)
             now: Current timestamp
+            market_state: Market state provider bound to the asset (default: shared provider)
             
         Returns:
             str: Phase name for which range was built ('asia', 'london', 'pre_us'), or None if no range built
         """
+        market_state = market_state or self.market_state_provider
+        
         if current_price is None:
             try:
                 from trading.models import AssetPriceStatus
@@ -921,16 +1128,16 @@ class Command(BaseCommand):
         start_time = tracker.get("start_time", now)
         
         # Get ATR for context
-        atr = self.market_state_provider.get_atr(epic, '1h', 14)
+        atr = market_state.get_atr(epic, '1h', 14)
         
         # Get candle count
-        candle_count = self.market_state_provider.get_candle_count_for_epic(epic)
+        candle_count = market_state.get_candle_count_for_epic(epic)
         
         # Set the range based on current phase
         # Note: The set_*_range methods will persist to database using update_or_create
         # to ensure only one record per (asset, phase, date) combination
         if phase == SessionPhase.ASIA_RANGE:
-            self.market_state_provider.set_asia_range(
+            market_state.set_asia_range(
                 epic=epic,
                 high=high,
                 low=low,
@@ -941,7 +1148,7 @@ class Command(BaseCommand):
             )
             return 'asia'
         elif phase == SessionPhase.LONDON_CORE:
-            self.market_state_provider.set_london_core_range(
+            market_state.set_london_core_range(
                 epic=epic,
                 high=high,
                 low=low,
@@ -952,7 +1159,7 @@ class Command(BaseCommand):
             )
             return 'london'
         elif phase == SessionPhase.PRE_US_RANGE:
-            self.market_state_provider.set_pre_us_range(
+            market_state.set_pre_us_range(
                 epic=epic,
                 high=high,
                 low=low,
@@ -978,7 +1185,25 @@ class Command(BaseCommand):
         diagnostic_criteria: list = None,
         worker_interval: int = 60
     ) -> None:
-        """Update the worker status in the database."""
+        """
+        Update the worker status in the database.
+        
+        With --broker/--shard, every shard publishes its summary and only the
+        leader writes WorkerStatus, adding the summaries of the other shards.
+        """
+        if self.worker_coordinator:
+            self.worker_coordinator.publish_summary({
+                'epic': epic,
+                'setup_count': setup_count,
+                'message': diagnostic_message,
+                'updated_at': now.isoformat(),
+            })
+            if not self.worker_coordinator.is_leader:
+                return
+            setup_count, diagnostic_criteria = self._merge_shard_summaries(
+                setup_count, diagnostic_criteria or []
+            )
+        
         try:
             from decimal import Decimal
             WorkerStatus.update_status(
@@ -992,10 +1217,30 @@ class Command(BaseCommand):
                 diagnostic_message=diagnostic_message,
                 diagnostic_criteria=diagnostic_criteria or [],
                 worker_interval=worker_interval,
+                broker_metrics=get_broker_metrics().snapshot(),
             )
         except Exception as e:
             logger.warning(f"Failed to update worker status: {e}")
 
+    def _merge_shard_summaries(self, setup_count: int, diagnostic_criteria: list) -> tuple[int, list]:
+        """
+        Add the cycle summaries of the other worker shards to the leader's status.
+        
+        Returns:
+            Tuple of (total setup count, criteria with one entry per shard)
+        """
+        own_label = self.worker_shard.label
+        criteria = list(diagnostic_criteria)
+        for label, summary in self.worker_coordinator.get_summaries().items():
+            if label != own_label:
+                setup_count += int(summary.get('setup_count') or 0)
+            criteria.append({
+                'name': f"Worker shard {label}",
+                'passed': True,
+                'detail': f"{summary.get('message', '')} (at {summary.get('updated_at', '?')})",
+            })
+        return setup_count, criteria
+
     def _update_asset_diagnostics(
         self,
         asset,
@@ -1059,14 +1304,23 @@ class Command(BaseCommand):
                 field_name = range_field_map[range_built_phase]
                 setattr(diagnostics, field_name, getattr(diagnostics, field_name) + 1)
             
-            diagnostics.save()
+            self.cycle_writes.save_diagnostics(diagnostics)
             return diagnostics
             
         except Exception as e:
             logger.warning(f"Failed to update asset diagnostics for {asset.symbol}: {e}")
             return None
 
-    def _process_setup(self, setup, shadow_only: bool, dry_run: bool, now: datetime, trading_asset=None, diagnostics=None) -> None:
+    def _process_setup(
+        self,
+        setup,
+        shadow_only: bool,
+        dry_run: bool,
+        now: datetime,
+        trading_asset=None,
+        diagnostics=None,
+        market_state: Optional[IGMarketStateProvider] = None,
+    ) -> None:
         """Process a single setup through risk and execution.
         
         Args:
@@ -1076,6 +1330,7 @@ class Command(BaseCommand):
             now: Current timestamp
             trading_asset: Optional TradingAsset model instance for linking signals
             diagnostics: Optional AssetDiagnostics instance for tracking metrics
+            market_state: Optional market state provider bound to the asset (default: shared provider)
         """
         self.stdout.write(
             f"\n  Setup: {setup.setup_kind.value} {setup.direction} @ {setup.reference_price}"
@@ -1150,7 +1405,7 @@ class Command(BaseCommand):
             tp_distance = sl_distance * rr
         else:
             # Fallback: ATR (für spätere Setups, EIA etc.)
-            atr = self.market_state_provider.get_atr(setup.epic, "1h", 14)
+            atr = (market_state or self.market_state_provider).get_atr(setup.epic, "1h", 14)
             if atr is None:
                 atr = Decimal("0.50")  # Notfall-Default, besser später pro Asset
             atr = Decimal(str(atr))
@@ -1460,7 +1715,7 @@ class Command(BaseCommand):
             if asset.breakout_state != new_state:
                 old_state = asset.breakout_state
                 asset.breakout_state = new_state
-                asset.save()
+                self.cycle_writes.save_breakout_state(asset)
                 
                 logger.info(
                     "Breakout state updated from %s to %s",
@@ -1507,8 +1762,9 @@ class Command(BaseCommand):
             # Wait a bit before reconnecting
             time.sleep(5)
             
-            # Reconnect to default IG broker
-            self.broker_registry.get_ig_broker()
+            # Reconnect to default IG broker (unless this worker skips IG assets)
+            if self._handles_broker(TradingAsset.BrokerKind.IG):
+                self.broker_registry.get_ig_broker()
             self.stdout.write(self.style.SUCCESS("Reconnected successfully!"))
             
         except Exception as e:
@@ -1519,6 +1775,18 @@ class Command(BaseCommand):
         """Clean up resources on shutdown."""
         self.stdout.write("\nCleaning up...")
         
+        for ingestor in (self.stream_ingestor, self.kline_ingestor):
+            if ingestor:
+                try:
+                    ingestor.stop()
+                except Exception as e:
+                    logger.warning(f"Error stopping price streaming: {e}")
+        if self.stream_ingestor or self.kline_ingestor:
+            self.stdout.write("  ✓ Stopped price streaming")
+        
+        if self.worker_coordinator:
+            self.worker_coordinator.release()
+        
         if self.broker_registry:
             try:
                 self.broker_registry.disconnect_all()
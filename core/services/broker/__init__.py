@@ -27,6 +27,10 @@ from .ig_broker_service import IgBrokerService
 from .mexc_broker_service import MexcBrokerService
 from .mexc_market_data import MexcMarketDataFetcher, MexcMarketDataError
 
+from .async_broker_service import AsyncBrokerService, SyncBrokerAdapter
+from .async_ig_broker_service import AsyncIgBrokerService
+from .async_mexc_broker_service import AsyncMexcBrokerService
+
 from .config import (
     get_active_ig_broker_config,
     create_ig_broker_service,
@@ -36,6 +40,19 @@ from .config import (
     BrokerRegistry,
 )
 
+from .price_cache import PriceQuoteCache, get_cached_symbol_price, get_cached_symbol_prices
+from .metrics import BrokerMetrics, get_broker_metrics, summarize_broker_metrics
+from .session_cache import IgSessionCache
+from .rate_limiter import (
+    BrokerRateLimiter,
+    RateLimitExceeded,
+    RequestPriority,
+    get_rate_limiter,
+    get_rate_limit_stats,
+)
+from .streaming_client import SubscriptionClient, WebSocketSubscriptionClient, LightstreamerClient
+from .mexc_websocket_client import MexcWebSocketClient
+
 from .ig_market_state_provider import IGMarketStateProvider, SessionTimesConfig
 
 __all__ = [
@@ -62,6 +79,11 @@ __all__ = [
     'MexcBrokerService',
     'MexcMarketDataFetcher',
     'MexcMarketDataError',
+    # Async implementations
+    'AsyncBrokerService',
+    'SyncBrokerAdapter',
+    'AsyncIgBrokerService',
+    'AsyncMexcBrokerService',
     # Config utilities
     'get_active_ig_broker_config',
     'create_ig_broker_service',
@@ -69,6 +91,25 @@ __all__ = [
     'create_mexc_broker_service',
     'get_broker_service_for_asset',
     'BrokerRegistry',
+    'PriceQuoteCache',
+    'get_cached_symbol_price',
+    'get_cached_symbol_prices',
+    'IgSessionCache',
+    # Rate limiting
+    'BrokerRateLimiter',
+    'RateLimitExceeded',
+    'RequestPriority',
+    'get_rate_limiter',
+    'get_rate_limit_stats',
+    # Instrumentation
+    'BrokerMetrics',
+    'get_broker_metrics',
+    'summarize_broker_metrics',
+    # Streaming
+    'SubscriptionClient',
+    'WebSocketSubscriptionClient',
+    'LightstreamerClient',
+    'MexcWebSocketClient',
     # Market State Provider
     'IGMarketStateProvider',
     'SessionTimesConfig',
@@ -0,0 +1,286 @@
+"""
+Async Broker Service interface.
+
+Asyncio counterpart of BrokerService for the read-only market and account
+calls, so many symbols can be polled concurrently over pooled HTTP
+connections instead of one blocking request at a time.
+
+SyncBrokerAdapter exposes an async service through the regular
+BrokerService interface for callers that are not async (worker, views).
+"""
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import httpx
+
+from .broker_service import BrokerService, BrokerError
+from .models import (
+    AccountState,
+    Position,
+    OrderRequest,
+    OrderResult,
+    SymbolPrice,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Keep-alive connections per async client
+ASYNC_POOL_MAXSIZE = 20
+
+
+class AsyncBrokerService(ABC):
+    """
+    Abstract base class for async broker service implementations.
+    
+    Covers the market data and account calls. Order placement stays on
+    the synchronous BrokerService implementations.
+    """
+    
+    def __init__(self, timeout: int = 30, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize the shared HTTP client settings.
+        
+        Args:
+            timeout: Request timeout in seconds.
+            transport: Custom httpx transport (optional, e.g. for tests).
+        """
+        self._timeout = timeout
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_http(self) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP client for the running event loop.
+        
+        An httpx.AsyncClient is bound to the loop it was first used on,
+        so a new client is created when the service is used from another loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or self._http_loop is not loop:
+            self._http = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=ASYNC_POOL_MAXSIZE,
+                    max_keepalive_connections=ASYNC_POOL_MAXSIZE,
+                ),
+                transport=self._transport,
+            )
+            self._http_loop = loop
+        return self._http
+    
+    async def _close_http(self) -> None:
+        """Close the HTTP client if it belongs to the running loop."""
+        if self._http is not None and self._http_loop is asyncio.get_running_loop():
+            await self._http.aclose()
+        self._http = None
+        self._http_loop = None
+    
+    @abstractmethod
+    async def connect(self) -> None:
+        """
+        Establish connection to the broker API.
+        
+        Raises:
+            ConnectionError: If connection cannot be established.
+            AuthenticationError: If credentials are invalid.
+        """
+        pass
+    
+    @abstractmethod
+    async def disconnect(self) -> None:
+        """Close the connection to the broker API."""
+        pass
+    
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """
+        Check if the service is currently connected.
+        
+        Returns:
+            bool: True if connected and session is valid, False otherwise.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_account_state(self) -> AccountState:
+        """
+        Get the current account state.
+        
+        Raises:
+            ConnectionError: If not connected to the broker.
+            BrokerError: If account information cannot be retrieved.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_open_positions(self) -> List[Position]:
+        """
+        Get all currently open positions.
+        
+        Raises:
+            ConnectionError: If not connected to the broker.
+            BrokerError: If positions cannot be retrieved.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_symbol_price(self, epic: str) -> SymbolPrice:
+        """
+        Get the current price for a symbol/market.
+        
+        Raises:
+            ConnectionError: If not connected to the broker.
+            BrokerError: If price cannot be retrieved.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_historical_prices(self, *args, **kwargs) -> List[dict]:
+        """
+        Get historical candles for a market.
+        
+        Takes the same arguments as the synchronous implementation of
+        the broker and returns the same candle dictionaries.
+        """
+        pass
+    
+    async def get_symbol_prices(self, epics: List[str]) -> Dict[str, SymbolPrice]:
+        """
+        Get current prices for several symbols concurrently.
+        
+        Symbols whose price cannot be retrieved are logged and left out.
+        
+        Args:
+            epics: Symbols/EPIC codes to fetch.
+        
+        Returns:
+            Dict mapping each symbol to its SymbolPrice.
+        """
+        results = await asyncio.gather(
+            *(self.get_symbol_price(epic) for epic in epics),
+            return_exceptions=True,
+        )
+        
+        prices = {}
+        for epic, result in zip(epics, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to get price for {epic}: {result}")
+                continue
+            prices[epic] = result
+        return prices
+
+
+class SyncBrokerAdapter(BrokerService):
+    """
+    Exposes an AsyncBrokerService through the BrokerService interface.
+    
+    Coroutines run on a private event loop in a daemon thread, so the
+    adapter can be called from any thread, including threads that
+    already run an event loop. Order placement is delegated to an
+    optional synchronous trading broker.
+    
+    Usage:
+        adapter = SyncBrokerAdapter(AsyncIgBrokerService.from_config(config))
+        adapter.connect()
+        price = adapter.get_symbol_price('CC.D.CL.UNC.IP')
+    """
+    
+    def __init__(
+        self,
+        broker: AsyncBrokerService,
+        trading_broker: Optional[BrokerService] = None,
+    ):
+        """
+        Initialize the adapter.
+        
+        Args:
+            broker: Async broker service to wrap.
+            trading_broker: Synchronous broker used for place_order and
+                close_position (optional).
+        """
+        self._broker = broker
+        self._trading_broker = trading_broker
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def broker(self) -> AsyncBrokerService:
+        """Get the wrapped async broker service."""
+        return self._broker
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the private event loop thread if needed."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="SyncBrokerAdapter",
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
+    
+    def _run(self, coro):
+        """Run a coroutine on the private loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        return future.result()
+    
+    def close(self) -> None:
+        """Stop the private event loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        
+        if loop is None:
+            return
+        
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+    
+    def connect(self) -> None:
+        self._run(self._broker.connect())
+    
+    def disconnect(self) -> None:
+        try:
+            self._run(self._broker.disconnect())
+        finally:
+            self.close()
+    
+    def is_connected(self) -> bool:
+        return self._broker.is_connected()
+    
+    def get_account_state(self) -> AccountState:
+        return self._run(self._broker.get_account_state())
+    
+    def get_open_positions(self) -> List[Position]:
+        return self._run(self._broker.get_open_positions())
+    
+    def get_symbol_price(self, epic: str) -> SymbolPrice:
+        return self._run(self._broker.get_symbol_price(epic))
+    
+    def get_symbol_prices(self, epics: List[str]) -> Dict[str, SymbolPrice]:
+        """Get current prices for several symbols concurrently."""
+        return self._run(self._broker.get_symbol_prices(epics))
+    
+    def get_historical_prices(self, *args, **kwargs) -> List[dict]:
+        return self._run(self._broker.get_historical_prices(*args, **kwargs))
+    
+    def place_order(self, order: OrderRequest) -> OrderResult:
+        if self._trading_broker is None:
+            raise BrokerError("Order placement is not supported by the async broker adapter")
+        return self._trading_broker.place_order(order)
+    
+    def close_position(self, position_id: str) -> OrderResult:
+        if self._trading_broker is None:
+            raise BrokerError("Closing positions is not supported by the async broker adapter")
+        return self._trading_broker.close_position(position_id)
@@ -0,0 +1,326 @@
+"""
+Async IG Broker Service implementation.
+
+Fetches prices, candles, positions and account state from the IG REST API
+with httpx. Authentication (login, OAuth refresh) is delegated to an
+IgApiClient, so the sync and async services share one session.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .async_broker_service import AsyncBrokerService
+from .broker_service import BrokerError, AuthenticationError
+from .ig_api_client import (
+    IgApiClient,
+    build_prices_params,
+    get_request_priority,
+    parse_error_response,
+    ALLOWANCE_EXCEEDED_ERRORS,
+    API_VERSION_ACCOUNTS,
+    API_VERSION_MARKETS,
+    API_VERSION_MARKETS_BATCH,
+    API_VERSION_POSITIONS,
+)
+from .ig_broker_service import (
+    parse_account_state,
+    parse_positions,
+    parse_symbol_price,
+    parse_market_prices,
+    parse_price_candles,
+)
+from .models import AccountState, Position, SymbolPrice
+from .rate_limiter import get_rate_limiter
+from .session_cache import IgSessionCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncIgBrokerService(AsyncBrokerService):
+    """
+    Async IG implementation of the AsyncBrokerService interface.
+    """
+    
+    def __init__(
+        self,
+        client: IgApiClient,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the async IG Broker Service.
+        
+        Args:
+            client: IgApiClient used for authentication.
+            transport: Custom httpx transport (optional, e.g. for tests).
+        """
+        super().__init__(timeout=client.timeout, transport=transport)
+        self._client = client
+        self._connected = False
+        logger.info(f"AsyncIgBrokerService initialized ({client.account_type})")
+    
+    @classmethod
+    def from_config(cls, config) -> 'AsyncIgBrokerService':
+        """
+        Create service from an IgBrokerConfig model instance.
+        
+        Args:
+            config: IgBrokerConfig model instance.
+        
+        Returns:
+            AsyncIgBrokerService instance.
+        """
+        client = IgApiClient(
+            api_key=config.api_key,
+            username=config.username,
+            password=config.password,
+            account_type=config.account_type,
+            account_id=config.account_id or None,
+            base_url=config.api_base_url or None,
+            timeout=config.timeout_seconds,
+            rate_limiter=get_rate_limiter('IG', config.username),
+            session_cache=IgSessionCache.from_settings(),
+        )
+        return cls(client)
+    
+    async def _request(
+        self,
+        endpoint: str,
+        version: str,
+        params: Optional[Dict] = None,
+        retry_on_token_error: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Make a GET request to the IG API.
+        
+        Args:
+            endpoint: API endpoint (without base URL).
+            version: API version for the request.
+            params: Query parameters.
+            retry_on_token_error: If True, renew the session and retry once
+                when a token-invalid error is received.
+        
+        Returns:
+            Parsed JSON response.
+        
+        Raises:
+            BrokerError: If the request fails.
+        """
+        url = f"{self._client.base_url}{endpoint}"
+        priority = get_request_priority("GET", endpoint)
+        rate_limiter = self._client.rate_limiter
+        
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async(priority)
+        
+        try:
+            response = await self._get_http().get(
+                url,
+                headers=self._client._get_auth_headers(version),
+                params=params,
+            )
+        except httpx.TimeoutException:
+            raise BrokerError(f"Request timeout after {self._timeout}s")
+        except httpx.HTTPError as e:
+            raise BrokerError(f"Request failed: {str(e)}")
+        
+        logger.debug(f"IG API GET {endpoint} -> {response.status_code}")
+        
+        if response.status_code in [200, 201]:
+            return response.json() if response.text else {}
+        
+        error_msg, error_code = parse_error_response(response)
+        
+        if error_code in ALLOWANCE_EXCEEDED_ERRORS and rate_limiter is not None:
+            rate_limiter.report_exceeded(priority)
+        
+        if response.status_code == 401:
+            if retry_on_token_error and error_code in IgApiClient.TOKEN_INVALID_ERRORS:
+                logger.info(f"Token invalid ({error_code}), attempting to re-authenticate...")
+                await asyncio.to_thread(self._client.refresh_session)
+                return await self._request(endpoint, version, params, retry_on_token_error=False)
+            raise AuthenticationError(error_msg, code=error_code)
+        
+        raise BrokerError(error_msg, code=str(response.status_code))
+    
+    async def connect(self) -> None:
+        """
+        Connect to IG and establish a session.
+        
+        Raises:
+            ConnectionError: If connection fails.
+            AuthenticationError: If credentials are invalid.
+        """
+        try:
+            logger.info("Connecting to IG (async)...")
+            if not self._client.is_authenticated:
+                await asyncio.to_thread(self._client.login)
+            self._connected = True
+            logger.info("Successfully connected to IG (async)")
+        except AuthenticationError:
+            self._connected = False
+            raise
+        except BrokerError as e:
+            self._connected = False
+            raise ConnectionError(f"Failed to connect to IG: {e}")
+    
+    async def disconnect(self) -> None:
+        """
+        Disconnect from IG and end the session.
+        """
+        try:
+            logger.info("Disconnecting from IG (async)...")
+            await asyncio.to_thread(self._client.logout)
+        finally:
+            self._connected = False
+            await self._close_http()
+            logger.info("Disconnected from IG (async)")
+    
+    def is_connected(self) -> bool:
+        """
+        Check if service is connected.
+        
+        Returns:
+            bool: True if connected, False otherwise.
+        """
+        return self._connected and self._client.is_authenticated
+    
+    def _ensure_connected(self) -> None:
+        """Ensure service is connected, raise if not."""
+        if not self.is_connected():
+            raise ConnectionError("Not connected to IG. Call connect() first.")
+    
+    async def get_account_state(self) -> AccountState:
+        """
+        Get current account state.
+        
+        Returns:
+            AccountState with current balance, equity, margin, etc.
+        """
+        self._ensure_connected()
+        
+        account_id = self._client._session.account_id
+        try:
+            response = await self._request("/accounts", API_VERSION_ACCOUNTS)
+            for account in response.get("accounts", []):
+                if account.get("accountId") == account_id:
+                    return parse_account_state(account)
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get account state: {e}")
+        
+        raise BrokerError(f"Account {account_id} not found")
+    
+    async def get_open_positions(self) -> List[Position]:
+        """
+        Get all open positions.
+        
+        Returns:
+            List of Position objects.
+        """
+        self._ensure_connected()
+        
+        try:
+            response = await self._request("/positions", API_VERSION_POSITIONS)
+            return parse_positions(response.get("positions", []))
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get positions: {e}")
+    
+    async def get_symbol_price(self, epic: str) -> SymbolPrice:
+        """
+        Get current price for a market.
+        
+        Args:
+            epic: Market EPIC code.
+        
+        Returns:
+            SymbolPrice with current bid/ask and other price data.
+        """
+        self._ensure_connected()
+        
+        if not epic:
+            raise ValueError("Epic cannot be empty")
+        
+        try:
+            response = await self._request(f"/markets/{epic}", API_VERSION_MARKETS)
+            return parse_symbol_price(epic, response)
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get price for {epic}: {e}")
+    
+    async def get_symbol_prices(self, epics: List[str]) -> Dict[str, SymbolPrice]:
+        """
+        Get current prices for several markets via /markets?epics=.
+        
+        Chunks of up to IgApiClient.MAX_EPICS_PER_REQUEST epics are
+        requested concurrently.
+        
+        Args:
+            epics: Market EPIC codes.
+        
+        Returns:
+            Dict mapping each EPIC code to its SymbolPrice.
+        """
+        self._ensure_connected()
+        
+        epics = [epic for epic in dict.fromkeys(epics) if epic]
+        chunk_size = IgApiClient.MAX_EPICS_PER_REQUEST
+        responses = await asyncio.gather(*(
+            self._request(
+                "/markets",
+                API_VERSION_MARKETS_BATCH,
+                params={"epics": ",".join(epics[start:start + chunk_size])},
+            )
+            for start in range(0, len(epics), chunk_size)
+        ))
+        
+        prices = {}
+        for response in responses:
+            prices.update(parse_market_prices(response.get("marketDetails", [])))
+        return prices
+    
+    async def get_historical_prices(
+        self,
+        epic: str,
+        resolution: str = "MINUTE",
+        num_points: int = 720,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[dict]:
+        """
+        Get historical price data (candles) for a market.
+        
+        Args:
+            epic: Market EPIC code (e.g., 'CC.D.CL.UNC.IP').
+            resolution: Price resolution (default: 'MINUTE' for 1m candles).
+            num_points: Number of data points to retrieve (default: 720).
+            start_time: Optional start of the window (inclusive).
+            end_time: Optional end of the window (inclusive).
+        
+        Returns:
+            List of candle dictionaries (time, open, high, low, close).
+        """
+        self._ensure_connected()
+        
+        try:
+            response = await self._request(
+                f"/prices/{epic}",
+                API_VERSION_MARKETS,
+                params=build_prices_params(resolution, num_points, start_time, end_time),
+            )
+            candles = parse_price_candles(response)
+            
+            logger.debug(f"Retrieved {len(candles)} candles for {epic}")
+            return candles
+        
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get historical prices for {epic}: {e}")
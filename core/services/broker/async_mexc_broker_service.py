@@ -0,0 +1,400 @@
+"""
+Async MEXC Broker Service implementation.
+
+Fetches prices, klines, positions and account state from the MEXC Spot
+and Futures APIs with httpx. Request signing and response parsing are
+shared with MexcBrokerService.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import httpx
+
+from .async_broker_service import AsyncBrokerService
+from .broker_service import BrokerError, AuthenticationError
+from .mexc_broker_service import (
+    MexcBrokerService,
+    MexcSigningMixin,
+    check_spot_response,
+    get_request_priority,
+    unwrap_futures_response,
+    parse_spot_account_state,
+    parse_futures_account_state,
+    parse_spot_holdings,
+    build_spot_position,
+    parse_open_futures_positions,
+    build_futures_position,
+    parse_symbol_price,
+    parse_symbol_prices,
+    build_klines_params,
+    parse_klines,
+)
+from .models import AccountState, Position, SymbolPrice
+from .rate_limiter import BrokerRateLimiter, get_rate_limiter
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMexcBrokerService(MexcSigningMixin, AsyncBrokerService):
+    """
+    Async MEXC implementation of the AsyncBrokerService interface.
+    
+    Supports Spot and Futures accounts (legacy "MARGIN" is treated as FUTURES).
+    """
+    
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        account_type: str = "SPOT",
+        base_url: Optional[str] = None,
+        futures_base_url: Optional[str] = None,
+        timeout: int = 30,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[BrokerRateLimiter] = None,
+    ):
+        """
+        Initialize the async MEXC Broker Service.
+        
+        Args:
+            api_key: MEXC API key.
+            api_secret: MEXC API secret.
+            account_type: "SPOT" or "FUTURES" (legacy "MARGIN" is treated as "FUTURES").
+            base_url: Override the base URL for Spot (optional).
+            futures_base_url: Override the base URL for Futures (optional).
+            timeout: Request timeout in seconds.
+            transport: Custom httpx transport (optional, e.g. for tests).
+            rate_limiter: Request budget of the account (optional).
+        """
+        super().__init__(timeout=timeout, transport=transport)
+        self._api_key = api_key
+        self._api_secret = api_secret
+        self._account_type = "FUTURES" if account_type == "MARGIN" else account_type
+        self._base_url = base_url or MexcBrokerService.DEFAULT_BASE_URL
+        self._futures_base_url = futures_base_url or MexcBrokerService.DEFAULT_FUTURES_BASE_URL
+        self._rate_limiter = rate_limiter
+        self._connected = False
+        logger.info(f"AsyncMexcBrokerService initialized ({self._account_type})")
+    
+    @classmethod
+    def from_config(cls, config) -> 'AsyncMexcBrokerService':
+        """
+        Create service from a MexcBrokerConfig model instance.
+        
+        Args:
+            config: MexcBrokerConfig model instance.
+        
+        Returns:
+            AsyncMexcBrokerService instance.
+        """
+        return cls(
+            api_key=config.api_key,
+            api_secret=config.api_secret,
+            account_type=config.account_type,
+            base_url=config.api_base_url or None,
+            timeout=config.timeout_seconds,
+            rate_limiter=get_rate_limiter('MEXC', config.api_key),
+        )
+    
+    async def _request(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        signed: bool = False,
+    ) -> dict:
+        """
+        Make a GET request to the MEXC Spot API.
+        
+        Args:
+            endpoint: API endpoint.
+            params: Request parameters.
+            signed: Whether to sign the request.
+        
+        Returns:
+            dict: Response JSON.
+        
+        Raises:
+            BrokerError: If request fails.
+        """
+        params = dict(params or {})
+        
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async(get_request_priority(endpoint))
+        
+        if signed:
+            params['timestamp'] = self._get_timestamp()
+            params['signature'] = self._sign_request(params)
+        
+        try:
+            response = await self._get_http().get(
+                f"{self._base_url}{endpoint}",
+                params=params,
+                headers=self._get_headers(include_api_key=signed),
+            )
+        except httpx.HTTPError as e:
+            raise BrokerError(f"Request failed: {e}")
+        
+        return check_spot_response(response)
+    
+    async def _futures_request(self, endpoint: str, params: Optional[dict] = None):
+        """
+        Make a GET request to the MEXC Futures API.
+        
+        Args:
+            endpoint: API endpoint.
+            params: Request parameters.
+        
+        Returns:
+            Response payload ('data' field if present).
+        
+        Raises:
+            BrokerError: If request fails.
+        """
+        request_params = params if params else None
+        
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async(get_request_priority(endpoint))
+        
+        timestamp = self._get_timestamp()
+        signature = self._sign_futures_request(timestamp, request_params)
+        
+        try:
+            response = await self._get_http().get(
+                f"{self._futures_base_url}{endpoint}",
+                params=request_params,
+                headers=self._get_futures_headers(timestamp, signature),
+            )
+        except httpx.HTTPError as e:
+            raise BrokerError(f"Futures request failed: {e}")
+        
+        return unwrap_futures_response(response)
+    
+    async def connect(self) -> None:
+        """
+        Connect to MEXC and verify API credentials.
+        
+        Raises:
+            ConnectionError: If connection fails.
+            AuthenticationError: If credentials are invalid.
+        """
+        try:
+            logger.info(f"Connecting to MEXC ({self._account_type}, async)...")
+            
+            if self._is_futures_account():
+                await self._futures_request("/api/v1/private/account/assets")
+            else:
+                await self._request("/api/v3/account", signed=True)
+            
+            self._connected = True
+            logger.info(f"Successfully connected to MEXC ({self._account_type}, async)")
+        
+        except AuthenticationError:
+            self._connected = False
+            raise
+        except BrokerError as e:
+            self._connected = False
+            raise ConnectionError(f"Failed to connect to MEXC: {e}")
+    
+    async def disconnect(self) -> None:
+        """
+        Disconnect from MEXC.
+        
+        Note: MEXC API doesn't require explicit logout.
+        """
+        self._connected = False
+        await self._close_http()
+        logger.info("Disconnected from MEXC (async)")
+    
+    def is_connected(self) -> bool:
+        """
+        Check if service is connected.
+        
+        Returns:
+            bool: True if connected, False otherwise.
+        """
+        return self._connected
+    
+    def _ensure_connected(self) -> None:
+        """Ensure service is connected, raise if not."""
+        if not self.is_connected():
+            raise ConnectionError("Not connected to MEXC. Call connect() first.")
+    
+    async def get_account_state(self) -> AccountState:
+        """
+        Get current account state.
+        
+        Returns:
+            AccountState with current balances.
+        """
+        self._ensure_connected()
+        
+        try:
+            if self._is_futures_account():
+                assets_data = await self._futures_request("/api/v1/private/account/assets")
+                return parse_futures_account_state(assets_data, self._account_type)
+            
+            account_data = await self._request("/api/v3/account", signed=True)
+            return parse_spot_account_state(account_data, self._account_type)
+        
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get account state: {e}")
+    
+    async def _get_mid_price(self, symbol: str) -> Decimal:
+        """Get the mid price of a symbol, or 0 if it is unavailable."""
+        try:
+            price = await self.get_symbol_price(symbol)
+            return price.mid_price
+        except Exception:
+            return Decimal('0')
+    
+    async def get_open_positions(self) -> List[Position]:
+        """
+        Get all currently open positions.
+        
+        For spot trading, this returns non-zero balances.
+        For futures trading, this returns actual futures positions.
+        Current prices of all positions are fetched concurrently.
+        
+        Returns:
+            List[Position]: List of all open positions.
+        """
+        self._ensure_connected()
+        
+        try:
+            if self._is_futures_account():
+                return await self._get_futures_positions()
+            
+            account_data = await self._request("/api/v3/account", signed=True)
+            holdings = parse_spot_holdings(account_data)
+            prices = await asyncio.gather(
+                *(self._get_mid_price(f"{asset}USDT") for asset, _ in holdings)
+            )
+            return [
+                build_spot_position(asset, total, price)
+                for (asset, total), price in zip(holdings, prices)
+            ]
+        
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get positions: {e}")
+    
+    async def _get_futures_positions(self) -> List[Position]:
+        """Get open positions from the Futures account."""
+        try:
+            positions_data = await self._futures_request(
+                "/api/v1/private/position/open_positions"
+            )
+        except BrokerError as e:
+            logger.warning(f"Failed to get futures positions: {e}")
+            return []
+        
+        open_positions = parse_open_futures_positions(positions_data)
+        # MEXC Futures uses symbols like "BTC_USDT"
+        prices = await asyncio.gather(
+            *(self._get_mid_price(pos.get('symbol', '').replace('_', '')) for pos in open_positions)
+        )
+        return [
+            build_futures_position(pos, price)
+            for pos, price in zip(open_positions, prices)
+        ]
+    
+    async def get_symbol_price(self, symbol: str) -> SymbolPrice:
+        """
+        Get current price for a market/symbol.
+        
+        The book ticker and 24h stats are requested concurrently.
+        
+        Args:
+            symbol: Market symbol (e.g., 'BTCUSDT').
+        
+        Returns:
+            SymbolPrice with current bid/ask and other price data.
+        """
+        self._ensure_connected()
+        
+        if not symbol:
+            raise ValueError("Symbol cannot be empty")
+        
+        try:
+            ticker_data, stats_data = await asyncio.gather(
+                self._request("/api/v3/ticker/bookTicker", params={"symbol": symbol}),
+                self._request("/api/v3/ticker/24hr", params={"symbol": symbol}),
+            )
+            return parse_symbol_price(symbol, ticker_data, stats_data)
+        
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get price for {symbol}: {e}")
+    
+    async def get_symbol_prices(self, symbols: List[str]) -> Dict[str, SymbolPrice]:
+        """
+        Get current prices for several symbols from the all-symbol tickers.
+        
+        Args:
+            symbols: Market symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+        
+        Returns:
+            Dict mapping each symbol to its SymbolPrice.
+        """
+        self._ensure_connected()
+        
+        symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol]
+        if not symbols:
+            return {}
+        
+        tickers, stats = await asyncio.gather(
+            self._request("/api/v3/ticker/bookTicker"),
+            self._request("/api/v3/ticker/24hr"),
+        )
+        return parse_symbol_prices(symbols, tickers, stats)
+    
+    async def get_historical_prices(
+        self,
+        symbol: Optional[str] = None,
+        interval: str = "1m",
+        limit: int = 720,
+        epic: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        **_: object,
+    ) -> List[dict]:
+        """
+        Get historical price data (klines/candlesticks) for a market.
+        
+        Args:
+            symbol: Market symbol (e.g., 'BTCUSDT').
+            interval: Kline interval (default: '1m').
+            limit: Number of klines to retrieve (default: 720, max 1000).
+            epic: Optional alias for symbol for compatibility with other broker interfaces.
+            start_time: Optional start of the window (inclusive).
+            end_time: Optional end of the window (inclusive).
+        
+        Returns:
+            List of kline data dictionaries.
+        """
+        self._ensure_connected()
+        
+        symbol = symbol or epic
+        
+        if not symbol:
+            raise BrokerError("Symbol is required to fetch historical prices")
+        
+        try:
+            response = await self._request(
+                "/api/v3/klines",
+                params=build_klines_params(symbol, interval, limit, start_time, end_time),
+            )
+            return parse_klines(response)
+        
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get historical prices for {symbol}: {e}")
@@ -5,7 +5,7 @@ Defines the contract that all broker implementations must follow.
 This ensures Finoa is independent of specific broker implementations.
 """
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
 
 from .models import (
     AccountState,
@@ -24,6 +24,11 @@ class BrokerService(ABC):
     to ensure consistent behavior across different brokers.
     """
 
+    # PriceQuoteCache shared by get_cached_symbol_price() lookups (set by
+    # PriceQuoteCache.attach); get_symbol_price() itself is never cached.
+    price_cache = None
+    price_cache_key = None
+
     @abstractmethod
     def connect(self) -> None:
         """
@@ -103,6 +108,31 @@ class BrokerService(ABC):
         """
         pass
 
+    def get_symbol_prices(self, epics: List[str]) -> Dict[str, SymbolPrice]:
+        """
+        Get current price information for several markets/symbols.
+        
+        The default implementation calls get_symbol_price per symbol.
+        Brokers with a batch endpoint override this to use one request.
+        Symbols whose price cannot be retrieved are left out.
+        
+        Args:
+            epics: Market identifiers.
+        
+        Returns:
+            Dict mapping each market identifier to its SymbolPrice.
+        
+        Raises:
+            ConnectionError: If not connected to the broker.
+        """
+        prices = {}
+        for epic in epics:
+            try:
+                prices[epic] = self.get_symbol_price(epic)
+            except (BrokerError, ValueError):
+                continue
+        return prices
+
     @abstractmethod
     def place_order(self, order: OrderRequest) -> OrderResult:
         """
@@ -6,13 +6,15 @@ Also provides a BrokerRegistry for caching and managing broker service instances
 """
 import logging
 import threading
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 from django.core.exceptions import ImproperlyConfigured
 
 from .broker_service import BrokerService
 from .ig_broker_service import IgBrokerService
 from .mexc_broker_service import MexcBrokerService
+from .models import SymbolPrice
+from .price_cache import PriceQuoteCache, get_cached_symbol_prices
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,10 @@ class BrokerRegistry:
     
     Thread-safe implementation using a lock for synchronized access.
     
+    Registered brokers get a short-lived PriceQuoteCache, so repeated
+    get_cached_symbol_price calls for the same symbol within one cycle
+    share a single broker request.
+    
     Usage:
         >>> registry = BrokerRegistry()
         >>> broker = registry.get_broker_for_asset(asset)
@@ -41,6 +47,7 @@ class BrokerRegistry:
         self._brokers: Dict[str, BrokerService] = {}
         self._connected: Dict[str, bool] = {}
         self._lock: threading.Lock = threading.Lock()
+        self._price_cache = PriceQuoteCache.from_settings()
     
     @classmethod
     def get_instance(cls) -> 'BrokerRegistry':
@@ -52,6 +59,41 @@ class BrokerRegistry:
                     cls._instance = cls()
         return cls._instance
     
+    @property
+    def price_cache(self) -> PriceQuoteCache:
+        """Get the price quote cache shared by all registered brokers."""
+        return self._price_cache
+    
+    def _register_broker(self, broker_type: str, broker: BrokerService) -> None:
+        """
+        Cache a connected broker and attach the price cache to it.
+        
+        Must be called with the lock held.
+        """
+        self._price_cache.invalidate(broker_type)
+        self._brokers[broker_type] = self._price_cache.attach(broker_type, broker)
+        self._connected[broker_type] = True
+    
+    def _get_connected_broker(self, broker_type: str) -> Optional[BrokerService]:
+        """
+        Get a cached broker whose session is still alive.
+        
+        Brokers stay connected for the lifetime of the registry so callers
+        share one authenticated session. A broker that lost its session
+        (e.g. after a failed re-login) is dropped so the caller reconnects.
+        Must be called with the lock held.
+        """
+        broker = self._brokers.get(broker_type)
+        if broker is None or not self._connected.get(broker_type, False):
+            return None
+        
+        if not broker.is_connected():
+            logger.info(f"{broker_type} broker session lost, reconnecting")
+            self._connected[broker_type] = False
+            return None
+        
+        return broker
+    
     def get_broker_for_asset(self, asset) -> BrokerService:
         """
         Get the appropriate broker service for a trading asset.
@@ -75,8 +117,9 @@ class BrokerRegistry:
         
         with self._lock:
             # Return cached broker if available and connected
-            if broker_type in self._brokers and self._connected.get(broker_type, False):
-                return self._brokers[broker_type]
+            cached = self._get_connected_broker(broker_type)
+            if cached is not None:
+                return cached
             
             # Create new broker service
             if broker_type == TradingAsset.BrokerKind.IG:
@@ -90,8 +133,7 @@ class BrokerRegistry:
             broker.connect()
             
             # Cache the broker
-            self._brokers[broker_type] = broker
-            self._connected[broker_type] = True
+            self._register_broker(broker_type, broker)
             
             logger.info(f"Created and connected {broker_type} broker service")
             
@@ -109,14 +151,14 @@ class BrokerRegistry:
         broker_type = TradingAsset.BrokerKind.IG
         
         with self._lock:
-            if broker_type in self._brokers and self._connected.get(broker_type, False):
-                return self._brokers[broker_type]
+            cached = self._get_connected_broker(broker_type)
+            if cached is not None:
+                return cached
             
             broker = create_ig_broker_service()
             broker.connect()
             
-            self._brokers[broker_type] = broker
-            self._connected[broker_type] = True
+            self._register_broker(broker_type, broker)
             
             logger.info("Created and connected IG broker service")
             
@@ -134,14 +176,14 @@ class BrokerRegistry:
         broker_type = TradingAsset.BrokerKind.MEXC
         
         with self._lock:
-            if broker_type in self._brokers and self._connected.get(broker_type, False):
-                return self._brokers[broker_type]
+            cached = self._get_connected_broker(broker_type)
+            if cached is not None:
+                return cached
             
             broker = create_mexc_broker_service()
             broker.connect()
             
-            self._brokers[broker_type] = broker
-            self._connected[broker_type] = True
+            self._register_broker(broker_type, broker)
             
             logger.info("Created and connected MEXC broker service")
             
@@ -149,6 +191,35 @@ class BrokerRegistry:
     
    
     
+    def prefetch_prices(self, assets: Iterable) -> Dict[str, SymbolPrice]:
+        """
+        Warm the price cache for several assets with one batch request per broker.
+        
+        Brokers that cannot be connected or fail the batch request are
+        skipped; their assets are fetched individually later.
+        
+        Args:
+            assets: TradingAsset instances.
+        
+        Returns:
+            Dict mapping broker symbol to SymbolPrice for all fetched quotes.
+        """
+        symbols_by_broker: Dict[str, list] = {}
+        asset_by_broker = {}
+        for asset in assets:
+            symbols_by_broker.setdefault(asset.broker, []).append(asset.effective_broker_symbol)
+            asset_by_broker.setdefault(asset.broker, asset)
+        
+        prices = {}
+        for broker_type, symbols in symbols_by_broker.items():
+            try:
+                broker = self.get_broker_for_asset(asset_by_broker[broker_type])
+                prices.update(get_cached_symbol_prices(broker, symbols))
+            except Exception as e:
+                logger.warning(f"Failed to prefetch {broker_type} prices: {e}")
+        
+        return prices
+    
     def disconnect_all(self) -> None:
         """Disconnect all broker services."""
         with self._lock:
@@ -167,6 +238,7 @@ class BrokerRegistry:
         with self._lock:
             self._brokers.clear()
             self._connected.clear()
+        self._price_cache.invalidate()
     
     @classmethod
     def reset_instance(cls) -> None:
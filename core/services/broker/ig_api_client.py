@@ -5,15 +5,26 @@ Handles low-level communication with IG Web API including:
 - Session management (login/logout)
 - Authentication header management
 - REST API calls for accounts, positions, and markets
+- Pooled keep-alive HTTP connections shared by all clients in a process
 """
+import hashlib
 import logging
+import os
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 
 from .broker_service import BrokerError, AuthenticationError
+from .metrics import get_broker_metrics
+from .rate_limiter import BrokerRateLimiter, RequestPriority
+
+if TYPE_CHECKING:
+    from .session_cache import IgSessionCache
 
 
 logger = logging.getLogger(__name__)
@@ -24,8 +35,134 @@ API_VERSION_SESSION = "3"
 API_VERSION_ACCOUNTS = "1"
 API_VERSION_POSITIONS = "2"
 API_VERSION_MARKETS = "3"
+API_VERSION_MARKETS_BATCH = "2"
 API_VERSION_ORDERS = "2"
 
+# CST/X-SECURITY-TOKEN are valid for 6 hours (IG extends them while in use)
+SESSION_TOKEN_LIFETIME_SECONDS = 6 * 3600
+
+# Cached sessions expiring within this margin are refreshed instead of reused
+SESSION_EXPIRY_MARGIN_SECONDS = 10
+
+# Shared HTTP connection pool sizing
+HTTP_POOL_CONNECTIONS = 4  # Hosts kept in the pool (demo, live, ...)
+HTTP_POOL_MAXSIZE = 20  # Keep-alive connections per host
+
+# Process-wide HTTP sessions: {pid: requests.Session}
+_http_sessions: Dict[int, requests.Session] = {}
+_http_sessions_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get the process-wide keep-alive session for IG REST calls.
+    
+    Sessions are created per process ID, so forked workers never share
+    sockets with their parent.
+    """
+    pid = os.getpid()
+    with _http_sessions_lock:
+        session = _http_sessions.get(pid)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_sessions[pid] = session
+        return session
+
+
+def reset_http_sessions() -> None:
+    """Close and drop all shared HTTP sessions (useful for testing)."""
+    with _http_sessions_lock:
+        for session in _http_sessions.values():
+            try:
+                session.close()
+            except Exception:
+                pass
+        _http_sessions.clear()
+
+
+def parse_error_response(response) -> Tuple[str, Optional[str]]:
+    """
+    Extract the error message and IG error code from a failed response.
+    
+    Works with requests and httpx responses.
+    
+    Returns:
+        Tuple of (error message, errorCode or None)
+    """
+    error_msg = f"IG API error: {response.status_code}"
+    error_code = None
+    try:
+        error_data = response.json()
+        error_code = error_data.get('errorCode', 'UNKNOWN')
+        error_msg = f"IG API error [{error_code}]: {response.text}"
+    except (ValueError, TypeError):
+        pass
+    return error_msg, error_code
+
+
+# Error codes IG returns when an allowance has been used up
+ALLOWANCE_EXCEEDED_ERRORS = frozenset([
+    "error.public-api.exceeded-api-key-allowance",
+    "error.public-api.exceeded-account-allowance",
+    "error.public-api.exceeded-account-trading-allowance",
+    "error.public-api.exceeded-account-historical-data-allowance",
+])
+
+
+def get_request_priority(method: str, endpoint: str) -> RequestPriority:
+    """
+    Classify an IG request into its rate limiter lane.
+    
+    Args:
+        method: HTTP method.
+        endpoint: API endpoint (without base URL).
+    
+    Returns:
+        ORDER for deal confirmations and requests that open, amend or
+        close positions and working orders, HISTORY for /prices, PRICE
+        otherwise (including reading positions and working orders).
+    """
+    if endpoint.startswith("/prices"):
+        return RequestPriority.HISTORY
+    if endpoint.startswith("/confirms"):
+        return RequestPriority.ORDER
+    if endpoint.startswith(("/positions/otc", "/workingorders")) and method.upper() != "GET":
+        return RequestPriority.ORDER
+    return RequestPriority.PRICE
+
+
+def build_prices_params(
+    resolution: str,
+    num_points: int,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Build the /prices/{epic} (v3) query parameters.
+    
+    Without a window the newest num_points candles are requested. With a
+    window, IG returns all candles between from and to (UTC) and ignores max.
+    
+    Returns:
+        Dictionary of query parameters.
+    """
+    params: Dict[str, Any] = {
+        "resolution": resolution,
+        "max": num_points,
+        "pageSize": 0,  # Return all in one response
+    }
+    if start_time is not None:
+        params["from"] = start_time.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    if end_time is not None:
+        params["to"] = end_time.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    return params
+
 
 @dataclass
 class IgSession:
@@ -37,11 +174,56 @@ class IgSession:
     timezone_offset: int = 0
     created_at: datetime = None
     is_oauth: bool = False  # Track if session was authenticated via OAuth
+    lightstreamer_endpoint: str = ""
+    expires_at: Optional[datetime] = None  # Access token (OAuth) or CST expiry
 
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now(timezone.utc)
 
+    def is_expired(self, margin_seconds: float = 0) -> bool:
+        """Check whether the tokens expire within margin_seconds (False if unknown)."""
+        if self.expires_at is None:
+            return False
+        return datetime.now(timezone.utc) + timedelta(seconds=margin_seconds) >= self.expires_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the session to a JSON-serializable dictionary."""
+        return {
+            "cst": self.cst,
+            "security_token": self.security_token,
+            "account_id": self.account_id,
+            "client_id": self.client_id,
+            "timezone_offset": self.timezone_offset,
+            "created_at": self.created_at.isoformat(),
+            "is_oauth": self.is_oauth,
+            "lightstreamer_endpoint": self.lightstreamer_endpoint,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IgSession':
+        """Create a session from a dictionary created by to_dict()."""
+        return cls(
+            cst=data["cst"],
+            security_token=data["security_token"],
+            account_id=data["account_id"],
+            client_id=data["client_id"],
+            timezone_offset=data.get("timezone_offset", 0),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            is_oauth=data.get("is_oauth", False),
+            lightstreamer_endpoint=data.get("lightstreamer_endpoint", ""),
+            expires_at=datetime.fromisoformat(data["expires_at"]) if data.get("expires_at") else None,
+        )
+
+
+def get_oauth_expiry(oauth_token: Dict[str, Any]) -> Optional[datetime]:
+    """Get the access token expiry of an IG oauthToken / refresh response."""
+    try:
+        return datetime.now(timezone.utc) + timedelta(seconds=int(oauth_token["expires_in"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
 
 class IgApiClient:
     """
@@ -64,7 +246,10 @@ class IgApiClient:
         account_type: str = "DEMO",
         account_id: Optional[str] = None,
         base_url: Optional[str] = None,
-        timeout: int = 30
+        timeout: int = 30,
+        http_session: Optional[requests.Session] = None,
+        rate_limiter: Optional[BrokerRateLimiter] = None,
+        session_cache: Optional['IgSessionCache'] = None,
     ):
         """
         Initialize the IG API client.
@@ -77,6 +262,12 @@ class IgApiClient:
             account_id: Specific account ID to use (if multiple accounts).
             base_url: Override the base URL (optional).
             timeout: Request timeout in seconds.
+            http_session: HTTP session to use (defaults to the shared
+                keep-alive session of the process).
+            rate_limiter: Request budget of the account (optional, no
+                client-side limiting if omitted).
+            session_cache: Shared session cache (optional); login() reuses
+                a valid session of another process instead of logging in.
         """
         self.api_key = api_key
         self.username = username
@@ -94,6 +285,9 @@ class IgApiClient:
             self.base_url = self.DEMO_BASE_URL
         
         self._session: Optional[IgSession] = None
+        self._http = http_session or get_http_session()
+        self.rate_limiter = rate_limiter
+        self.session_cache = session_cache
         logger.info(f"IgApiClient initialized for {self.account_type} account")
 
     @property
@@ -101,6 +295,12 @@ class IgApiClient:
         """Check if client has a valid session."""
         return self._session is not None
 
+    @property
+    def session_cache_scope(self) -> str:
+        """Key of this account in the shared session cache (credentials are hashed)."""
+        raw = "|".join([self.base_url, self.api_key, self.username, self.account_id or ""])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
     def _get_auth_headers(self, version: str = "1") -> Dict[str, str]:
         """
         Get headers for authenticated requests.
@@ -180,9 +380,15 @@ class IgApiClient:
             BrokerError: If the request fails.
         """
         url = f"{self.base_url}{endpoint}"
+        priority = get_request_priority(method, endpoint)
+        metrics = get_broker_metrics()
+        
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(priority)
         
+        start = time.perf_counter()
         try:
-            response = requests.request(
+            response = self._http.request(
                 method=method,
                 url=url,
                 headers=headers,
@@ -190,23 +396,22 @@ class IgApiClient:
                 params=params,
                 timeout=self.timeout
             )
+            latency = time.perf_counter() - start
             
             # Log request (without sensitive data)
-            logger.debug(f"IG API {method} {endpoint} -> {response.status_code}")
+            logger.debug(f"IG API {method} {endpoint} -> {response.status_code} ({latency * 1000:.0f}ms)")
             
             # Handle responses
             if response.status_code in [200, 201]:
+                metrics.observe("IG", endpoint, latency)
                 return response.json() if response.text else {}
             
             # Handle errors
-            error_msg = f"IG API error: {response.status_code}"
-            error_code = None
-            try:
-                error_data = response.json()
-                error_code = error_data.get('errorCode', 'UNKNOWN')
-                error_msg = f"IG API error [{error_code}]: {response.text}"
-            except (ValueError, TypeError):
-                pass
+            error_msg, error_code = parse_error_response(response)
+            metrics.observe("IG", endpoint, latency, error_code=error_code or str(response.status_code))
+            
+            if error_code in ALLOWANCE_EXCEEDED_ERRORS and self.rate_limiter is not None:
+                self.rate_limiter.report_exceeded(priority)
             
             if response.status_code == 401:
                 # Check if this is a token-invalid error that we can retry
@@ -220,8 +425,10 @@ class IgApiClient:
             raise BrokerError(error_msg, code=str(response.status_code))
             
         except requests.Timeout:
+            metrics.observe("IG", endpoint, time.perf_counter() - start, error_code="TIMEOUT")
             raise BrokerError(f"Request timeout after {self.timeout}s")
         except requests.RequestException as e:
+            metrics.observe("IG", endpoint, time.perf_counter() - start, error_code="REQUEST_FAILED")
             raise BrokerError(f"Request failed: {str(e)}")
 
     def _retry_with_fresh_session(
@@ -256,30 +463,10 @@ class IgApiClient:
             BrokerError: If the retried request fails.
         """
         try:
-            # For OAuth sessions, try to refresh the token first
-            if self._session and self._session.is_oauth and self._session.security_token:
-                try:
-                    self._refresh_oauth_token()
-                except AuthenticationError:
-                    # If refresh fails, fall back to full re-login
-                    logger.info("OAuth token refresh failed, falling back to full login")
-                    self.login()
-            else:
-                # For traditional sessions, just re-login
-                self.login()
-            
-            # Verify session was established with valid tokens
-            # Note: For both OAuth and traditional sessions, the access/auth token is stored in `cst`
-            # For OAuth: cst = access_token, security_token = refresh_token
-            # For traditional: cst = CST header value, security_token = X-SECURITY-TOKEN header value
-            if not self._session or not self._session.cst:
-                raise AuthenticationError("Re-authentication did not establish a valid session")
-            
-            # For non-OAuth sessions, also verify security_token
-            if not self._session.is_oauth and not self._session.security_token:
-                raise AuthenticationError("Re-authentication did not establish a valid session")
+            self.refresh_session()
             
             logger.info("Re-authentication successful, retrying request...")
+            get_broker_metrics().record_retry("IG")
             
             # Get fresh auth headers for the retry
             version = headers.get("VERSION", "1")
@@ -294,6 +481,114 @@ class IgApiClient:
             logger.error("Re-authentication failed")
             raise
 
+    def refresh_session(self) -> IgSession:
+        """
+        Renew the session after the server rejected its tokens.
+        
+        For OAuth sessions, tries to refresh the token first. If that fails,
+        or for traditional sessions, performs a full login.
+        
+        Returns:
+            The renewed IgSession.
+        
+        Raises:
+            AuthenticationError: If no valid session could be established.
+        """
+        get_broker_metrics().record_token_refresh("IG")
+        
+        if self.session_cache is not None and self._session is not None:
+            rejected = self._session
+            self.session_cache.discard(self.session_cache_scope, rejected.cst)
+            # Another process may already have renewed the session
+            cached = self.session_cache.get(self.session_cache_scope)
+            if cached is not None and cached.cst != rejected.cst and not cached.is_expired(SESSION_EXPIRY_MARGIN_SECONDS):
+                logger.info("Using IG session renewed by another process")
+                self._session = cached
+                return self._session
+        
+        # For OAuth sessions, try to refresh the token first
+        if self._session and self._session.is_oauth and self._session.security_token:
+            try:
+                self._refresh_oauth_token()
+            except AuthenticationError:
+                # If refresh fails, fall back to full re-login
+                logger.info("OAuth token refresh failed, falling back to full login")
+                self.login()
+        else:
+            # For traditional sessions, just re-login
+            self.login()
+        
+        # Verify session was established with valid tokens
+        # Note: For both OAuth and traditional sessions, the access/auth token is stored in `cst`
+        # For OAuth: cst = access_token, security_token = refresh_token
+        # For traditional: cst = CST header value, security_token = X-SECURITY-TOKEN header value
+        if not self._session or not self._session.cst:
+            raise AuthenticationError("Re-authentication did not establish a valid session")
+        
+        # For non-OAuth sessions, also verify security_token
+        if not self._session.is_oauth and not self._session.security_token:
+            raise AuthenticationError("Re-authentication did not establish a valid session")
+        
+        return self._session
+
+    def get_streaming_credentials(self) -> Tuple[str, str, str]:
+        """
+        Get the Lightstreamer endpoint and login for the current session.
+        
+        Lightstreamer authenticates with the account ID as user and
+        'CST-<cst>|XST-<security token>' as password. OAuth sessions carry
+        no CST, so those tokens are fetched via GET /session?fetchSessionTokens=true.
+        
+        Returns:
+            Tuple of (endpoint, user, password).
+        
+        Raises:
+            AuthenticationError: If not authenticated or no streaming tokens are available.
+        """
+        if not self._session:
+            raise AuthenticationError("Not authenticated - call login() first")
+        
+        if not self._session.lightstreamer_endpoint:
+            raise AuthenticationError("Login response did not include a lightstreamerEndpoint")
+        
+        if self._session.is_oauth:
+            cst, security_token = self._fetch_session_tokens()
+        else:
+            cst, security_token = self._session.cst, self._session.security_token
+        
+        return (
+            self._session.lightstreamer_endpoint,
+            self._session.account_id,
+            f"CST-{cst}|XST-{security_token}",
+        )
+
+    def _fetch_session_tokens(self) -> Tuple[str, str]:
+        """
+        Get CST/X-SECURITY-TOKEN for an OAuth session.
+        
+        Returns:
+            Tuple of (cst, security_token).
+        
+        Raises:
+            AuthenticationError: If the tokens could not be fetched.
+        """
+        try:
+            response = self._http.get(
+                f"{self.base_url}/session",
+                headers=self._get_auth_headers("1"),
+                params={"fetchSessionTokens": "true"},
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            raise AuthenticationError(f"Session token request failed: {str(e)}")
+        
+        cst = response.headers.get("CST")
+        security_token = response.headers.get("X-SECURITY-TOKEN")
+        if response.status_code != 200 or not cst or not security_token:
+            raise AuthenticationError(f"Failed to fetch session tokens: {response.status_code}")
+        
+        return cst, security_token
+
     def _refresh_oauth_token(self) -> None:
         """
         Refresh OAuth access token using the refresh token.
@@ -313,17 +608,18 @@ class IgApiClient:
         }
         
         try:
-            response = requests.post(
-                f"{self.base_url}/session/refresh-token",
-                headers={
-                    "X-IG-API-KEY": self.api_key,
-                    "Content-Type": "application/json; charset=UTF-8",
-                    "Accept": "application/json; charset=UTF-8",
-                    "VERSION": API_VERSION_SESSION,
-                },
-                json=data,
-                timeout=self.timeout
-            )
+            with get_broker_metrics().timed("IG", "/session/refresh-token"):
+                response = self._http.post(
+                    f"{self.base_url}/session/refresh-token",
+                    headers={
+                        "X-IG-API-KEY": self.api_key,
+                        "Content-Type": "application/json; charset=UTF-8",
+                        "Accept": "application/json; charset=UTF-8",
+                        "VERSION": API_VERSION_SESSION,
+                    },
+                    json=data,
+                    timeout=self.timeout
+                )
             
             if response.status_code != 200:
                 error_msg = f"Token refresh failed: {response.status_code}"
@@ -353,7 +649,10 @@ class IgApiClient:
                 client_id=self._session.client_id,
                 timezone_offset=self._session.timezone_offset,
                 is_oauth=True,
+                lightstreamer_endpoint=self._session.lightstreamer_endpoint,
+                expires_at=get_oauth_expiry(body),
             )
+            self._publish_session()
             
             logger.info("OAuth token refreshed successfully")
             
@@ -364,12 +663,73 @@ class IgApiClient:
         """
         Authenticate with IG and create a session.
         
+        With a session cache, a valid cached session of the account is
+        reused, and logins of several processes are serialized so only
+        one of them logs in. An expired OAuth session is only refreshed
+        under the login lock, as its refresh token is single-use.
+        
         Returns:
             IgSession with authentication tokens.
         
         Raises:
             AuthenticationError: If login fails.
         """
+        if self.session_cache is None:
+            return self._login()
+        
+        session = self._adopt_cached_session(refresh=False)
+        if session is not None:
+            return session
+        
+        with self.session_cache.login_lock(self.session_cache_scope):
+            # Another process may have logged in while we waited for the lock
+            session = self._adopt_cached_session(refresh=True)
+            if session is not None:
+                return session
+            
+            session = self._login()
+            self._publish_session()
+            return session
+
+    def _adopt_cached_session(self, refresh: bool) -> Optional[IgSession]:
+        """
+        Take over the cached session of the account if it is still usable.
+        
+        Args:
+            refresh: Refresh an expired cached OAuth session. Only pass
+                True while holding the login lock.
+        
+        Returns:
+            The adopted IgSession, or None if a login is needed.
+        """
+        cached = self.session_cache.get(self.session_cache_scope)
+        if cached is None:
+            return None
+        
+        if not cached.is_expired(SESSION_EXPIRY_MARGIN_SECONDS):
+            logger.info(f"Reusing cached IG session. Account: {cached.account_id}")
+            self._session = cached
+            return cached
+        
+        if refresh and cached.is_oauth and cached.security_token:
+            self._session = cached
+            get_broker_metrics().record_token_refresh("IG")
+            try:
+                self._refresh_oauth_token()
+                return self._session
+            except AuthenticationError:
+                logger.info("Cached OAuth session could not be refreshed")
+                self._session = None
+        
+        return None
+
+    def _publish_session(self) -> None:
+        """Share the current session with other processes."""
+        if self.session_cache is not None and self._session is not None:
+            self.session_cache.set(self.session_cache_scope, self._session)
+
+    def _login(self) -> IgSession:
+        """Log in with username and password (POST /session)."""
         logger.info("Logging in to IG API...")
         
         data = {
@@ -378,12 +738,13 @@ class IgApiClient:
         }
         
         try:
-            response = requests.post(
-                f"{self.base_url}/session",
-                headers=self._get_login_headers(API_VERSION_SESSION),
-                json=data,
-                timeout=self.timeout
-            )
+            with get_broker_metrics().timed("IG", "/session"):
+                response = self._http.post(
+                    f"{self.base_url}/session",
+                    headers=self._get_login_headers(API_VERSION_SESSION),
+                    json=data,
+                    timeout=self.timeout
+                )
             
             if response.status_code != 200:
                 error_msg = f"Login failed: {response.status_code}"
@@ -405,12 +766,16 @@ class IgApiClient:
             # IG API V3 can return oauthToken in body for OAuth flow
             # Note: If headers have partial tokens (one present, one missing), we don't fallback to OAuth
             is_oauth = False
+            expires_at = None
             if not cst and not security_token:
                 oauth_token = body.get("oauthToken", {})
                 if oauth_token:
                     cst = oauth_token.get("access_token")
                     security_token = oauth_token.get("refresh_token")
+                    expires_at = get_oauth_expiry(oauth_token)
                     is_oauth = True
+            else:
+                expires_at = datetime.now(timezone.utc) + timedelta(seconds=SESSION_TOKEN_LIFETIME_SECONDS)
             
             if not cst or not security_token:
                 raise AuthenticationError("Login response missing session tokens")
@@ -426,6 +791,8 @@ class IgApiClient:
                 client_id=client_id,
                 timezone_offset=timezone_offset,
                 is_oauth=is_oauth,
+                lightstreamer_endpoint=body.get("lightstreamerEndpoint", ""),
+                expires_at=expires_at,
             )
             
             auth_method = "OAuth" if is_oauth else "traditional"
@@ -454,6 +821,9 @@ class IgApiClient:
                 # For OAuth sessions, just discard the tokens
                 # OAuth tokens expire on their own and don't need server-side logout
                 logger.info("OAuth session - discarding tokens")
+            elif self.session_cache is not None:
+                # Shared sessions stay open for the other processes using them
+                logger.info("Shared session - discarding local tokens")
             else:
                 # For traditional sessions, make a logout request
                 self._make_request(
@@ -551,6 +921,34 @@ class IgApiClient:
         )
         return response
 
+    # Maximum number of epics per /markets?epics= request
+    MAX_EPICS_PER_REQUEST = 50
+
+    def get_markets(self, epics: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get market details and current prices for several markets.
+        
+        Uses the multi-epic /markets?epics= endpoint, so one request
+        covers up to MAX_EPICS_PER_REQUEST markets.
+        
+        Args:
+            epics: Market EPIC codes.
+        
+        Returns:
+            List of market details dictionaries (instrument, snapshot, ...).
+        """
+        markets = []
+        for start in range(0, len(epics), self.MAX_EPICS_PER_REQUEST):
+            chunk = epics[start:start + self.MAX_EPICS_PER_REQUEST]
+            response = self._make_request(
+                "GET",
+                "/markets",
+                self._get_auth_headers(API_VERSION_MARKETS_BATCH),
+                params={"epics": ",".join(chunk)}
+            )
+            markets.extend(response.get("marketDetails", []))
+        return markets
+
     def search_markets(self, search_term: str) -> List[Dict[str, Any]]:
         """
         Search for markets.
@@ -699,6 +1097,8 @@ class IgApiClient:
         epic: str,
         resolution: str = "MINUTE",
         num_points: int = 720,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """
         Get historical price data (candles) for a market.
@@ -716,6 +1116,8 @@ class IgApiClient:
                 - 'DAY', 'WEEK', 'MONTH'
             num_points: Number of data points to retrieve (default: 720 = 12 hours of 1m candles).
                 Max varies by resolution. For MINUTE: max ~10000 points.
+            start_time: Optional start of the window (inclusive) for paging through history.
+            end_time: Optional end of the window (inclusive) for paging through history.
         
         Returns:
             Dictionary containing:
@@ -737,10 +1139,6 @@ class IgApiClient:
             "GET",
             f"/prices/{epic}",
             self._get_auth_headers(API_VERSION_MARKETS),
-            params={
-                "resolution": resolution,
-                "max": num_points,
-                "pageSize": 0,  # Return all in one response
-            }
+            params=build_prices_params(resolution, num_points, start_time, end_time),
         )
         return response
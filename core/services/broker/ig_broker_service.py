@@ -7,12 +7,14 @@ abstracted interface for trading operations via IG.
 import logging
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from dateutil import parser as dateutil_parser
 
 from .broker_service import BrokerService, BrokerError, AuthenticationError
 from .ig_api_client import IgApiClient, IgSession
+from .rate_limiter import BrokerRateLimiter, get_rate_limiter
+from .session_cache import IgSessionCache
 from .models import (
     AccountState,
     Position,
@@ -28,6 +30,185 @@ from .models import (
 logger = logging.getLogger(__name__)
 
 
+def parse_account_state(account_data: dict) -> AccountState:
+    """
+    Build an AccountState from an IG /accounts entry.
+    
+    Args:
+        account_data: Account dictionary from the IG API.
+    
+    Returns:
+        AccountState with balance, equity, margin and P&L.
+    """
+    balance_data = account_data.get("balance", {})
+    
+    return AccountState(
+        account_id=account_data.get("accountId", ""),
+        account_name=account_data.get("accountName", ""),
+        balance=Decimal(str(balance_data.get("balance", 0))),
+        available=Decimal(str(balance_data.get("available", 0))),
+        equity=Decimal(str(balance_data.get("balance", 0))),
+        margin_used=Decimal(str(balance_data.get("deposit", 0))),
+        margin_available=Decimal(str(balance_data.get("available", 0))),
+        unrealized_pnl=Decimal(str(balance_data.get("profitLoss", 0))),
+        currency=account_data.get("currency", "EUR"),
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+def parse_positions(positions_data: List[dict]) -> List[Position]:
+    """
+    Build Position objects from the IG /positions response.
+    
+    Args:
+        positions_data: List of position entries from the IG API.
+    
+    Returns:
+        List of Position objects.
+    """
+    positions = []
+    
+    for pos in positions_data:
+        position_data = pos.get("position", {})
+        market_data = pos.get("market", {})
+        
+        direction_str = position_data.get("direction", "BUY")
+        direction = OrderDirection.BUY if direction_str == "BUY" else OrderDirection.SELL
+        
+        # Calculate current price based on direction
+        bid = Decimal(str(market_data.get("bid", 0)))
+        offer = Decimal(str(market_data.get("offer", 0)))
+        current_price = bid if direction == OrderDirection.BUY else offer
+        
+        position = Position(
+            position_id=position_data.get("dealId", ""),
+            deal_id=position_data.get("dealId", ""),
+            epic=market_data.get("epic", ""),
+            market_name=market_data.get("instrumentName", ""),
+            direction=direction,
+            size=Decimal(str(position_data.get("size", 0))),
+            open_price=Decimal(str(position_data.get("level", 0))),
+            current_price=current_price,
+            stop_loss=Decimal(str(position_data.get("stopLevel"))) if position_data.get("stopLevel") else None,
+            take_profit=Decimal(str(position_data.get("limitLevel"))) if position_data.get("limitLevel") else None,
+            unrealized_pnl=Decimal(str(position_data.get("profit", 0))),
+            currency=position_data.get("currency", "EUR"),
+            created_at=dateutil_parser.parse(position_data["createdDateUTC"]) if position_data.get("createdDateUTC") else None,
+        )
+        positions.append(position)
+    
+    return positions
+
+
+def parse_symbol_price(epic: str, market_data: dict) -> SymbolPrice:
+    """
+    Build a SymbolPrice from the IG /markets/{epic} response.
+    
+    Args:
+        epic: Market EPIC code.
+        market_data: Market details from the IG API.
+    
+    Returns:
+        SymbolPrice with current bid/ask and other price data.
+    """
+    snapshot = market_data.get("snapshot", {})
+    instrument = market_data.get("instrument", {})
+    
+    bid = Decimal(str(snapshot.get("bid", 0)))
+    offer = Decimal(str(snapshot.get("offer", 0)))
+    
+    return SymbolPrice(
+        epic=epic,
+        market_name=instrument.get("name", ""),
+        bid=bid,
+        ask=offer,
+        spread=offer - bid,
+        high=Decimal(str(snapshot.get("high"))) if snapshot.get("high") else None,
+        low=Decimal(str(snapshot.get("low"))) if snapshot.get("low") else None,
+        change=Decimal(str(snapshot.get("netChange"))) if snapshot.get("netChange") else None,
+        change_percent=Decimal(str(snapshot.get("percentageChange"))) if snapshot.get("percentageChange") else None,
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+def parse_market_prices(market_details: List[dict]) -> Dict[str, SymbolPrice]:
+    """
+    Build SymbolPrices from the IG /markets?epics= response.
+    
+    Args:
+        market_details: 'marketDetails' entries from the IG API.
+    
+    Returns:
+        Dict mapping each EPIC code to its SymbolPrice.
+    """
+    prices = {}
+    for market_data in market_details:
+        epic = market_data.get("instrument", {}).get("epic")
+        if epic:
+            prices[epic] = parse_symbol_price(epic, market_data)
+    return prices
+
+
+def parse_price_candles(response: dict) -> List[dict]:
+    """
+    Convert the IG /prices response to mid-price candle dictionaries.
+    
+    Args:
+        response: Response from the IG /prices/{epic} endpoint.
+    
+    Returns:
+        List of dictionaries with time (Unix seconds), open, high, low, close.
+        Entries without a timestamp or prices are skipped.
+    """
+    prices = response.get("prices", [])
+    candles = []
+    
+    for price_data in prices:
+        # Parse timestamp
+        snapshot_time = price_data.get("snapshotTimeUTC")
+        if snapshot_time:
+            try:
+                dt = dateutil_parser.parse(snapshot_time)
+                timestamp = int(dt.timestamp())
+            except (ValueError, TypeError):
+                continue
+        else:
+            continue
+        
+        # Extract mid prices (average of bid and ask)
+        open_price = price_data.get("openPrice", {})
+        close_price = price_data.get("closePrice", {})
+        high_price = price_data.get("highPrice", {})
+        low_price = price_data.get("lowPrice", {})
+        
+        # Calculate mid prices
+        def get_mid(price_obj):
+            bid = price_obj.get("bid")
+            ask = price_obj.get("ask")
+            if bid is not None and ask is not None:
+                return (float(bid) + float(ask)) / 2
+            elif bid is not None:
+                return float(bid)
+            elif ask is not None:
+                return float(ask)
+            last_traded = price_obj.get("lastTraded")
+            return float(last_traded) if last_traded is not None else None
+        
+        candle = {
+            "time": timestamp,
+            "open": get_mid(open_price),
+            "high": get_mid(high_price),
+            "low": get_mid(low_price),
+            "close": get_mid(close_price),
+        }
+        
+        # Only add if we have valid data
+        if all(v is not None for v in [candle["open"], candle["high"], candle["low"], candle["close"]]):
+            candles.append(candle)
+    
+    return candles
+
+
 class IgBrokerService(BrokerService):
     """
     IG implementation of the BrokerService interface.
@@ -44,6 +225,8 @@ class IgBrokerService(BrokerService):
         account_id: Optional[str] = None,
         base_url: Optional[str] = None,
         timeout: int = 30,
+        rate_limiter: Optional[BrokerRateLimiter] = None,
+        session_cache: Optional[IgSessionCache] = None,
     ):
         """
         Initialize the IG Broker Service.
@@ -56,6 +239,8 @@ class IgBrokerService(BrokerService):
             account_id: Specific account ID to use (if multiple accounts).
             base_url: Override the base URL (optional).
             timeout: Request timeout in seconds.
+            rate_limiter: Request budget of the account (optional).
+            session_cache: Session cache shared with other processes (optional).
         """
         self._client = IgApiClient(
             api_key=api_key,
@@ -65,6 +250,8 @@ class IgBrokerService(BrokerService):
             account_id=account_id,
             base_url=base_url,
             timeout=timeout,
+            rate_limiter=rate_limiter,
+            session_cache=session_cache,
         )
         self._connected = False
         logger.info(f"IgBrokerService initialized ({account_type})")
@@ -88,6 +275,8 @@ class IgBrokerService(BrokerService):
             account_id=config.account_id or None,
             base_url=config.api_base_url or None,
             timeout=config.timeout_seconds,
+            rate_limiter=get_rate_limiter('IG', config.username),
+            session_cache=IgSessionCache.from_settings(),
         )
 
     def connect(self) -> None:
@@ -130,6 +319,11 @@ class IgBrokerService(BrokerService):
         """
         return self._connected and self._client.is_authenticated
 
+    @property
+    def api_client(self) -> IgApiClient:
+        """The underlying IgApiClient (shares the session, e.g. for streaming)."""
+        return self._client
+
     def _ensure_connected(self) -> None:
         """Ensure service is connected, raise if not."""
         if not self.is_connected():
@@ -145,21 +339,7 @@ class IgBrokerService(BrokerService):
         self._ensure_connected()
         
         try:
-            account_data = self._client.get_account_details()
-            balance_data = account_data.get("balance", {})
-            
-            return AccountState(
-                account_id=account_data.get("accountId", ""),
-                account_name=account_data.get("accountName", ""),
-                balance=Decimal(str(balance_data.get("balance", 0))),
-                available=Decimal(str(balance_data.get("available", 0))),
-                equity=Decimal(str(balance_data.get("balance", 0))),
-                margin_used=Decimal(str(balance_data.get("deposit", 0))),
-                margin_available=Decimal(str(balance_data.get("available", 0))),
-                unrealized_pnl=Decimal(str(balance_data.get("profitLoss", 0))),
-                currency=account_data.get("currency", "EUR"),
-                timestamp=datetime.now(timezone.utc),
-            )
+            return parse_account_state(self._client.get_account_details())
         except BrokerError:
             raise
         except Exception as e:
@@ -175,39 +355,7 @@ class IgBrokerService(BrokerService):
         self._ensure_connected()
         
         try:
-            positions_data = self._client.get_positions()
-            positions = []
-            
-            for pos in positions_data:
-                position_data = pos.get("position", {})
-                market_data = pos.get("market", {})
-                
-                direction_str = position_data.get("direction", "BUY")
-                direction = OrderDirection.BUY if direction_str == "BUY" else OrderDirection.SELL
-                
-                # Calculate current price based on direction
-                bid = Decimal(str(market_data.get("bid", 0)))
-                offer = Decimal(str(market_data.get("offer", 0)))
-                current_price = bid if direction == OrderDirection.BUY else offer
-                
-                position = Position(
-                    position_id=position_data.get("dealId", ""),
-                    deal_id=position_data.get("dealId", ""),
-                    epic=market_data.get("epic", ""),
-                    market_name=market_data.get("instrumentName", ""),
-                    direction=direction,
-                    size=Decimal(str(position_data.get("size", 0))),
-                    open_price=Decimal(str(position_data.get("level", 0))),
-                    current_price=current_price,
-                    stop_loss=Decimal(str(position_data.get("stopLevel"))) if position_data.get("stopLevel") else None,
-                    take_profit=Decimal(str(position_data.get("limitLevel"))) if position_data.get("limitLevel") else None,
-                    unrealized_pnl=Decimal(str(position_data.get("profit", 0))),
-                    currency=position_data.get("currency", "EUR"),
-                    created_at=dateutil_parser.parse(position_data["createdDateUTC"]) if position_data.get("createdDateUTC") else None,
-                )
-                positions.append(position)
-            
-            return positions
+            return parse_positions(self._client.get_positions())
         except BrokerError:
             raise
         except Exception as e:
@@ -229,30 +377,36 @@ class IgBrokerService(BrokerService):
             raise ValueError("Epic cannot be empty")
         
         try:
-            market_data = self._client.get_market(epic)
-            snapshot = market_data.get("snapshot", {})
-            instrument = market_data.get("instrument", {})
-            
-            bid = Decimal(str(snapshot.get("bid", 0)))
-            offer = Decimal(str(snapshot.get("offer", 0)))
-            
-            return SymbolPrice(
-                epic=epic,
-                market_name=instrument.get("name", ""),
-                bid=bid,
-                ask=offer,
-                spread=offer - bid,
-                high=Decimal(str(snapshot.get("high"))) if snapshot.get("high") else None,
-                low=Decimal(str(snapshot.get("low"))) if snapshot.get("low") else None,
-                change=Decimal(str(snapshot.get("netChange"))) if snapshot.get("netChange") else None,
-                change_percent=Decimal(str(snapshot.get("percentageChange"))) if snapshot.get("percentageChange") else None,
-                timestamp=datetime.now(timezone.utc),
-            )
+            return parse_symbol_price(epic, self._client.get_market(epic))
         except BrokerError:
             raise
         except Exception as e:
             raise BrokerError(f"Failed to get price for {epic}: {e}")
 
+    def get_symbol_prices(self, epics: List[str]) -> Dict[str, SymbolPrice]:
+        """
+        Get current prices for several markets in one request.
+        
+        Args:
+            epics: Market EPIC codes.
+        
+        Returns:
+            Dict mapping each EPIC code to its SymbolPrice. Markets IG
+            did not return are left out.
+        """
+        self._ensure_connected()
+        
+        epics = [epic for epic in dict.fromkeys(epics) if epic]
+        if not epics:
+            return {}
+        
+        try:
+            return parse_market_prices(self._client.get_markets(epics))
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get prices for {', '.join(epics)}: {e}")
+
     def place_order(self, order: OrderRequest) -> OrderResult:
         """
         Place a new order.
@@ -417,6 +571,8 @@ class IgBrokerService(BrokerService):
         epic: str,
         resolution: str = "MINUTE",
         num_points: int = 720,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
     ) -> List[dict]:
         """
         Get historical price data (candles) for a market.
@@ -432,6 +588,9 @@ class IgBrokerService(BrokerService):
                 - 'HOUR', 'HOUR_2', 'HOUR_3', 'HOUR_4'
                 - 'DAY', 'WEEK', 'MONTH'
             num_points: Number of data points to retrieve (default: 720 = 12 hours of 1m candles).
+            start_time: Optional start of the window (inclusive); with a window
+                all candles between start_time and end_time are returned.
+            end_time: Optional end of the window (inclusive).
         
         Returns:
             List of price data dictionaries, each containing:
@@ -452,53 +611,11 @@ class IgBrokerService(BrokerService):
                 epic=epic,
                 resolution=resolution,
                 num_points=num_points,
+                start_time=start_time,
+                end_time=end_time,
             )
             
-            prices = response.get("prices", [])
-            candles = []
-            
-            for price_data in prices:
-                # Parse timestamp
-                snapshot_time = price_data.get("snapshotTimeUTC")
-                if snapshot_time:
-                    try:
-                        dt = dateutil_parser.parse(snapshot_time)
-                        timestamp = int(dt.timestamp())
-                    except (ValueError, TypeError):
-                        continue
-                else:
-                    continue
-                
-                # Extract mid prices (average of bid and ask)
-                open_price = price_data.get("openPrice", {})
-                close_price = price_data.get("closePrice", {})
-                high_price = price_data.get("highPrice", {})
-                low_price = price_data.get("lowPrice", {})
-                
-                # Calculate mid prices
-                def get_mid(price_obj):
-                    bid = price_obj.get("bid")
-                    ask = price_obj.get("ask")
-                    if bid is not None and ask is not None:
-                        return (float(bid) + float(ask)) / 2
-                    elif bid is not None:
-                        return float(bid)
-                    elif ask is not None:
-                        return float(ask)
-                    last_traded = price_obj.get("lastTraded")
-                    return float(last_traded) if last_traded is not None else None
-                
-                candle = {
-                    "time": timestamp,
-                    "open": get_mid(open_price),
-                    "high": get_mid(high_price),
-                    "low": get_mid(low_price),
-                    "close": get_mid(close_price),
-                }
-                
-                # Only add if we have valid data
-                if all(v is not None for v in [candle["open"], candle["high"], candle["low"], candle["close"]]):
-                    candles.append(candle)
+            candles = parse_price_candles(response)
             
             logger.debug(f"Retrieved {len(candles)} candles for {epic}")
             return candles
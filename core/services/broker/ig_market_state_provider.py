@@ -8,21 +8,25 @@ Logging Guidelines (Acceptance Criteria #1):
 - Log each candle fetch with EPIC, time window, candle count, first/last timestamps
 - Log each range build with Asset, Phase, Range High/Low, Ticks, Tick Size
 """
+import copy
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
 
 from core.services.strategy.models import Candle, SessionPhase
 from core.services.strategy.providers import BaseMarketStateProvider
 from .ig_broker_service import IgBrokerService
 from .mexc_broker_service import MexcBrokerService
 from .mexc_market_data import MexcMarketDataFetcher, MexcMarketDataError
+from .price_cache import get_cached_symbol_price
 
 if TYPE_CHECKING:
     from trading.models import TradingAsset
+    from core.services.market_data import IgStreamIngestor
     from .config import BrokerRegistry
+    from core.services.worker_writes import CycleWriteBuffer
 
 
 logger = logging.getLogger(__name__)
@@ -187,6 +191,10 @@ class IGMarketStateProvider(BaseMarketStateProvider):
     Range Persistence:
     When an asset is associated via set_current_asset(), ranges will be
     persisted to the database using BreakoutRange.save_range_snapshot().
+    
+    Concurrent use:
+    set_current_asset()/set_session_times() mutate the provider, so assets
+    evaluated in parallel each use their own view from for_asset().
     """
 
     def __init__(
@@ -196,6 +204,8 @@ class IGMarketStateProvider(BaseMarketStateProvider):
         session_times: Optional[SessionTimesConfig] = None,
         broker_registry: Optional['BrokerRegistry'] = None,
         mexc_market_data: Optional[MexcMarketDataFetcher] = None,
+        stream_ingestor: Optional['IgStreamIngestor'] = None,
+        write_buffer: Optional['CycleWriteBuffer'] = None,
     ):
         """
         Initialize the IG Market State Provider.
@@ -209,12 +219,18 @@ class IGMarketStateProvider(BaseMarketStateProvider):
                             When provided and a current_asset is set, the registry
                             will be used to get the correct broker for the asset.
             mexc_market_data: Optional MEXC market data fetcher for real klines.
+            stream_ingestor: Optional IG tick stream. Epics it streams are read
+                            from the market data layer instead of polled via REST.
+            write_buffer: Optional worker write buffer. Range snapshots are
+                            written through it (batched per worker cycle).
         """
         self._broker = broker_service
         self._eia_timestamp = eia_timestamp
         self._session_times = session_times or SessionTimesConfig()
         self._broker_registry = broker_registry
         self._mexc_market_data = mexc_market_data or MexcMarketDataFetcher()
+        self._stream_ingestor = stream_ingestor
+        self._write_buffer = write_buffer
         
         # Cache for session ranges
         self._asia_range_cache: dict[str, tuple[float, float]] = {}
@@ -226,6 +242,9 @@ class IGMarketStateProvider(BaseMarketStateProvider):
         
         # Current asset for range persistence (optional)
         self._current_asset: Optional['TradingAsset'] = None
+        # Enabled AssetSessionPhaseConfig of the current asset by phase,
+        # if preloaded by the caller (otherwise queried per phase)
+        self._phase_configs: Optional[dict[str, Any]] = None
         
         # Track candle counts per epic (for sanity checks)
         self._candle_counts: dict[str, int] = {}
@@ -301,24 +320,75 @@ class IGMarketStateProvider(BaseMarketStateProvider):
             asset: TradingAsset instance to associate with ranges.
         """
         self._current_asset = asset
+        self._phase_configs = None
         logger.debug(f"Current asset set to: {asset.symbol} ({asset.epic})")
     
     def clear_current_asset(self) -> None:
         """Clear the current asset association."""
         self._current_asset = None
+        self._phase_configs = None
+
+    def for_asset(
+        self,
+        asset: 'TradingAsset',
+        session_times: Optional[SessionTimesConfig] = None,
+        phase_configs: Optional[dict[str, Any]] = None,
+    ) -> 'IGMarketStateProvider':
+        """
+        Get a provider bound to one asset.
+        
+        The returned provider shares brokers, streams and the range/candle
+        caches (keyed by EPIC) with this one, but has its own current asset
+        and session times. Use one per asset to evaluate assets concurrently.
+        
+        Args:
+            asset: TradingAsset the provider is bound to.
+            session_times: Session times of the asset (default: this provider's).
+            phase_configs: Enabled AssetSessionPhaseConfig of the asset by phase
+                (default: queried when needed).
+            
+        Returns:
+            IGMarketStateProvider bound to the asset.
+        """
+        provider = copy.copy(self)
+        provider._current_asset = asset
+        provider._phase_configs = phase_configs
+        if session_times is not None:
+            provider._session_times = session_times
+        return provider
+
+    def set_stream_ingestor(self, stream_ingestor: Optional['IgStreamIngestor']) -> None:
+        """Set (or remove) the IG tick stream used instead of REST polling."""
+        self._stream_ingestor = stream_ingestor
+
+    def set_mexc_kline_stream(self, kline_stream) -> None:
+        """Set (or remove) the MEXC kline stream used instead of REST kline polling."""
+        self._mexc_market_data.set_kline_stream(kline_stream)
+
+    def _is_streamed(self, symbol: Optional[str]) -> bool:
+        """Check whether live ticks for the current asset's symbol are being streamed."""
+        return bool(
+            symbol
+            and self._current_asset
+            and self._stream_ingestor
+            and self._stream_ingestor.is_streaming(symbol)
+        )
 
     def is_phase_tradeable(self, phase: SessionPhase) -> bool:
         """Return whether the current phase is tradeable for the active asset."""
         # If an asset is set, prefer its per-phase configuration
         if self._current_asset:
             try:
-                from trading.models import AssetSessionPhaseConfig
+                if self._phase_configs is not None:
+                    phase_config = self._phase_configs.get(phase.value)
+                else:
+                    from trading.models import AssetSessionPhaseConfig
 
-                phase_config = (
-                    AssetSessionPhaseConfig.objects
-                    .filter(asset=self._current_asset, phase=phase.value, enabled=True)
-                    .first()
-                )
+                    phase_config = (
+                        AssetSessionPhaseConfig.objects
+                        .filter(asset=self._current_asset, phase=phase.value, enabled=True)
+                        .first()
+                    )
                 if phase_config:
                     return phase_config.is_trading_phase
             except Exception as exc:  # pragma: no cover - defensive logging
@@ -545,6 +615,10 @@ class IGMarketStateProvider(BaseMarketStateProvider):
             cache_key = f"{symbol}_{timeframe}"
             candles: list[Candle] = []
 
+            # Streamed candles (built from IG ticks, no broker call)
+            if self._is_streamed(symbol):
+                candles = self._get_stream_candles(timeframe, limit, closed_only=closed_only)
+
             # MEXC candles from market data API
             if not candles and isinstance(broker_service, MexcBrokerService) and timeframe == "1m":
                 fetch_limit = max(1, min(limit, 2))
@@ -596,7 +670,7 @@ class IGMarketStateProvider(BaseMarketStateProvider):
 
             if not candles:
                 # Get current market data
-                price = broker_service.get_symbol_price(symbol)
+                price = get_cached_symbol_price(broker_service, symbol)
 
                 # Create a candle from current price data
                 now = datetime.now(timezone.utc)
@@ -669,7 +743,12 @@ class IGMarketStateProvider(BaseMarketStateProvider):
                 return
             # else: epic is provided but no asset/registry - use default broker with provided epic
             
-            price = broker_service.get_symbol_price(symbol)
+            # Streamed markets build their candles from ticks
+            if self._is_streamed(symbol):
+                logger.debug(f"Skipping REST candle update for {symbol}, ticks are streamed")
+                return
+            
+            price = get_cached_symbol_price(broker_service, symbol)
             now = datetime.now(timezone.utc)
 
             mid_price = float(price.mid_price)
@@ -731,7 +810,7 @@ class IGMarketStateProvider(BaseMarketStateProvider):
                 broker_service = self._broker_registry.get_broker_for_asset(self._current_asset)
                 symbol = self._current_asset.effective_broker_symbol
             
-            price = broker_service.get_symbol_price(symbol)
+            price = get_cached_symbol_price(broker_service, symbol)
             if price.high is not None and price.low is not None:
                 return (float(price.high), float(price.low))
             return None
@@ -1029,7 +1108,11 @@ class IGMarketStateProvider(BaseMarketStateProvider):
             
             now = datetime.now(timezone.utc)
             
-            BreakoutRange.save_range_snapshot(
+            save_range_snapshot = (
+                self._write_buffer.save_range_snapshot if self._write_buffer
+                else BreakoutRange.save_range_snapshot
+            )
+            save_range_snapshot(
                 asset=self._current_asset,
                 phase=phase,
                 start_time=start_time or now,
@@ -1130,6 +1213,12 @@ class IGMarketStateProvider(BaseMarketStateProvider):
         cache_key = f"{symbol}_{timeframe}"
         candles = self._candle_cache.get(cache_key, [])
         
+        if len(candles) < period:
+            # Prefer real bars from the market data streams
+            stream_candles = self._get_stream_candles(timeframe, period + 1)
+            if len(stream_candles) > len(candles):
+                candles = stream_candles
+        
         if len(candles) < period:
             # Not enough data, estimate from daily range
             daily = self.get_daily_high_low(epic)
@@ -1154,6 +1243,43 @@ class IGMarketStateProvider(BaseMarketStateProvider):
             return sum(tr_values) / len(tr_values)
         return None
 
+    def _get_stream_candles(self, timeframe: str, limit: int, closed_only: bool = True) -> list[Candle]:
+        """
+        Get candles for the current asset from the market data layer.
+        
+        Derived timeframes are aggregated from the 1m stream, others (e.g.
+        4h) come from their own stream, so this makes no broker call.
+        Returns an empty list if no asset is set. The forming candle is
+        only included if closed_only is False.
+        """
+        if not self._current_asset:
+            return []
+        
+        try:
+            from core.services.market_data import get_stream_manager
+            
+            stream_candles = get_stream_manager().get_cached_candles(
+                self._current_asset.symbol,
+                timeframe,
+                count=limit + 1,
+            )
+        except Exception as e:
+            logger.debug(f"Market data stream unavailable for {self._current_asset.symbol}: {e}")
+            return []
+        
+        return [
+            Candle(
+                timestamp=datetime.fromtimestamp(c.timestamp, tz=timezone.utc),
+                open=c.open,
+                high=c.high,
+                low=c.low,
+                close=c.close,
+                volume=c.volume,
+            )
+            for c in stream_candles
+            if c.complete or not closed_only
+        ][-limit:]
+
     def get_eia_timestamp(self) -> Optional[datetime]:
         """
         Get the expected/actual EIA release timestamp.
@@ -0,0 +1,225 @@
+"""
+Broker call instrumentation.
+
+BrokerMetrics records, per broker, a latency histogram for every
+endpoint, error counts by broker error code, retries and session/token
+refreshes. The worker publishes a snapshot with its status; the web
+process serves its own and the worker's snapshot on the metrics endpoint.
+"""
+import bisect
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .broker_service import BrokerError
+
+
+# Upper bounds of the latency histogram buckets in milliseconds (plus +Inf)
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Path segments kept verbatim; others (epics, deal IDs, symbols) become {id}
+_STATIC_SEGMENT = re.compile(r'^[a-z][a-z0-9_-]*$')
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """
+    Collapse identifiers in an endpoint path so calls group per endpoint.
+
+    Example:
+        '/prices/CC.D.CL.UNC.IP' -> '/prices/{id}'
+    """
+    path = endpoint.split('?', 1)[0]
+    segments = [
+        segment if _STATIC_SEGMENT.match(segment) else '{id}'
+        for segment in path.strip('/').split('/')
+        if segment
+    ]
+    return '/' + '/'.join(segments)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (not thread-safe, guarded by BrokerMetrics)."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, latency_ms: float, error: bool = False) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        if error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-quantile (max latency for the +Inf bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'avg_ms': round(self.total_ms / self.count, 1) if self.count else None,
+            'max_ms': round(self.max_ms, 1),
+            'p50_ms': self.quantile(0.5),
+            'p95_ms': self.quantile(0.95),
+            'buckets': {
+                **{f'le_{bound}': count for bound, count in zip(LATENCY_BUCKETS_MS, self.counts)},
+                'le_inf': self.counts[-1],
+            },
+        }
+
+
+class BrokerMetrics:
+    """
+    Thread-safe counters and latency histograms of broker calls.
+
+    Usage:
+        metrics = get_broker_metrics()
+        with metrics.timed('IG', '/prices/CC.D.CL.UNC.IP'):
+            response = http.get(...)
+        metrics.snapshot()
+    """
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self._lock = threading.Lock()
+        self._latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._retries: Dict[str, int] = {}
+        self._token_refreshes: Dict[str, int] = {}
+
+    def observe(
+        self,
+        broker: str,
+        endpoint: str,
+        latency_seconds: float,
+        error_code: Optional[str] = None,
+    ) -> None:
+        """
+        Record one broker call.
+
+        Args:
+            broker: Broker identifier ('IG', 'MEXC').
+            endpoint: Endpoint path (identifiers are collapsed).
+            latency_seconds: Duration of the call.
+            error_code: Broker error code if the call failed.
+        """
+        key = (broker, normalize_endpoint(endpoint))
+        with self._lock:
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = LatencyHistogram()
+            histogram.observe(latency_seconds * 1000, error=error_code is not None)
+            if error_code is not None:
+                error_key = (broker, str(error_code))
+                self._errors[error_key] = self._errors.get(error_key, 0) + 1
+
+    @contextmanager
+    def timed(self, broker: str, endpoint: str) -> Iterator[None]:
+        """
+        Time a broker call; exceptions are counted by their broker error code.
+
+        BrokerErrors without a code count as 'UNKNOWN', other exceptions by
+        their class name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BrokerError as e:
+            self.observe(broker, endpoint, time.perf_counter() - start, error_code=e.code or 'UNKNOWN')
+            raise
+        except Exception as e:
+            self.observe(broker, endpoint, time.perf_counter() - start, error_code=type(e).__name__)
+            raise
+        self.observe(broker, endpoint, time.perf_counter() - start)
+
+    def record_retry(self, broker: str) -> None:
+        """Count a retried broker call."""
+        with self._lock:
+            self._retries[broker] = self._retries.get(broker, 0) + 1
+
+    def record_token_refresh(self, broker: str) -> None:
+        """Count a session/token renewal."""
+        with self._lock:
+            self._token_refreshes[broker] = self._token_refreshes.get(broker, 0) + 1
+
+    def snapshot(self) -> dict:
+        """
+        Get all metrics as a JSON-serializable dictionary.
+
+        Returns:
+            {broker: {'endpoints': {endpoint: histogram}, 'errors': {code: count},
+            'retries': int, 'token_refreshes': int}}
+        """
+        with self._lock:
+            brokers = (
+                {broker for broker, _ in self._latency}
+                | {broker for broker, _ in self._errors}
+                | set(self._retries)
+                | set(self._token_refreshes)
+            )
+            result = {
+                broker: {
+                    'endpoints': {},
+                    'errors': {},
+                    'retries': self._retries.get(broker, 0),
+                    'token_refreshes': self._token_refreshes.get(broker, 0),
+                }
+                for broker in sorted(brokers)
+            }
+            for (broker, endpoint), histogram in sorted(self._latency.items()):
+                result[broker]['endpoints'][endpoint] = histogram.to_dict()
+            for (broker, code), count in sorted(self._errors.items()):
+                result[broker]['errors'][code] = count
+        return result
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+        with self._lock:
+            self._latency.clear()
+            self._errors.clear()
+            self._retries.clear()
+            self._token_refreshes.clear()
+
+
+_metrics = BrokerMetrics()
+
+
+def get_broker_metrics() -> BrokerMetrics:
+    """Get the broker metrics of this process."""
+    return _metrics
+
+
+def summarize_broker_metrics(snapshot: dict) -> List[str]:
+    """
+    Condense a snapshot to one line per broker (for logs and status texts).
+
+    Example:
+        'IG: 120 calls, p95 250ms, 2 errors, 1 retries, 1 token refreshes'
+    """
+    lines = []
+    for broker, metrics in snapshot.items():
+        endpoints = metrics['endpoints'].values()
+        calls = sum(endpoint['count'] for endpoint in endpoints)
+        p95 = max((endpoint['p95_ms'] or 0 for endpoint in endpoints), default=0)
+        errors = sum(metrics['errors'].values())
+        lines.append(
+            f"{broker}: {calls} calls, p95 {p95:.0f}ms, {errors} errors, "
+            f"{metrics['retries']} retries, {metrics['token_refreshes']} token refreshes"
+        )
+    return lines
@@ -13,12 +13,14 @@ import logging
 import time
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlencode
 
 import requests
 
 from .broker_service import BrokerService, BrokerError, AuthenticationError
+from .metrics import get_broker_metrics
+from .rate_limiter import BrokerRateLimiter, RequestPriority, get_rate_limiter
 from .models import (
     AccountState,
     Position,
@@ -34,7 +36,173 @@ from .models import (
 logger = logging.getLogger(__name__)
 
 
-class MexcBrokerService(BrokerService):
+class MexcSigningMixin:
+    """
+    Request signing shared by the sync and async MEXC services.
+    
+    Expects ``_api_key``, ``_api_secret`` and ``_account_type`` attributes.
+    """
+    
+    def _is_futures_account(self) -> bool:
+        """Check if this is a Futures account."""
+        return self._account_type == "FUTURES"
+    
+    def _sign_request(self, params: dict) -> str:
+        """
+        Generate HMAC SHA256 signature for request.
+        
+        Args:
+            params: Request parameters to sign.
+            
+        Returns:
+            str: Hex-encoded signature.
+        """
+        query_string = urlencode(params)
+        signature = hmac.new(
+            self._api_secret.encode('utf-8'),
+            query_string.encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+        return signature
+    
+    def _get_timestamp(self) -> int:
+        """Get current timestamp in milliseconds."""
+        return int(time.time() * 1000)
+    
+    def _get_headers(self, include_api_key: bool = True) -> dict:
+        """Get headers for API requests."""
+        headers = {
+            "Content-Type": "application/json",
+        }
+
+        if include_api_key:
+            headers["X-MEXC-APIKEY"] = self._api_key
+
+        return headers
+    
+    def _get_futures_headers(self, timestamp: int, signature: str) -> dict:
+        """Get headers for Futures API requests."""
+        return {
+            "ApiKey": self._api_key,
+            "Request-Time": str(timestamp),
+            "Signature": signature,
+            "Content-Type": "application/json",
+        }
+    
+    def _sign_futures_request(self, timestamp: int, params: Optional[dict] = None) -> str:
+        """
+        Generate HMAC SHA256 signature for Futures API request.
+        
+        The Futures API requires signing: api_key + timestamp + query_string
+        
+        Args:
+            timestamp: Request timestamp in milliseconds.
+            params: Request parameters to sign (optional).
+            
+        Returns:
+            str: Hex-encoded signature.
+        """
+        query_string = urlencode(params) if params else ""
+        sign_string = f"{self._api_key}{timestamp}{query_string}"
+        signature = hmac.new(
+            self._api_secret.encode('utf-8'),
+            sign_string.encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+        return signature
+
+
+def get_request_priority(endpoint: str) -> RequestPriority:
+    """
+    Classify a MEXC request into its rate limiter lane.
+    
+    Args:
+        endpoint: Spot or Futures API endpoint.
+    
+    Returns:
+        ORDER for order endpoints, HISTORY for klines, PRICE otherwise.
+    """
+    if endpoint.startswith("/api/v3/klines"):
+        return RequestPriority.HISTORY
+    if endpoint.startswith(("/api/v3/order", "/api/v1/private/order")):
+        return RequestPriority.ORDER
+    return RequestPriority.PRICE
+
+
+def check_spot_response(response) -> dict:
+    """
+    Validate a Spot API response and return its JSON body.
+    
+    Works with requests and httpx responses.
+    
+    Raises:
+        AuthenticationError: If the credentials were rejected.
+        BrokerError: If the API returned an error.
+    """
+    if response.status_code == 401:
+        raise AuthenticationError("Invalid API credentials", code="401")
+    
+    if response.status_code != 200:
+        error_msg = f"API error: {response.status_code}"
+        error_code = str(response.status_code)
+        try:
+            error_data = response.json()
+            if 'msg' in error_data:
+                error_msg = f"{error_msg} - {error_data['msg']}"
+            if 'code' in error_data:
+                error_msg = f"{error_msg} (code: {error_data['code']})"
+                error_code = str(error_data['code'])
+        except Exception:
+            error_msg = f"{error_msg} - {response.text}"
+        raise BrokerError(error_msg, code=error_code)
+    
+    return response.json()
+
+
+def unwrap_futures_response(response):
+    """
+    Validate a Futures API response and return its payload.
+    
+    The Futures API wraps responses with a success/code/data structure;
+    the 'data' field is returned when present. Works with requests and
+    httpx responses.
+    
+    Raises:
+        AuthenticationError: If the credentials were rejected.
+        BrokerError: If the API returned an error.
+    """
+    if response.status_code == 401:
+        raise AuthenticationError("Invalid API credentials for Futures", code="401")
+    
+    if response.status_code != 200:
+        error_msg = f"Futures API error: {response.status_code}"
+        error_code = str(response.status_code)
+        try:
+            error_data = response.json()
+            if 'message' in error_data:
+                error_msg = f"{error_msg} - {error_data['message']}"
+            if 'code' in error_data:
+                error_msg = f"{error_msg} (code: {error_data['code']})"
+                error_code = str(error_data['code'])
+        except Exception:
+            error_msg = f"{error_msg} - {response.text}"
+        raise BrokerError(error_msg, code=error_code)
+    
+    response_data = response.json()
+    
+    if isinstance(response_data, dict):
+        if response_data.get('success') is False:
+            error_msg = response_data.get('message', 'Unknown Futures API error')
+            error_code = response_data.get('code', 'UNKNOWN')
+            raise BrokerError(f"Futures API error: {error_msg} (code: {error_code})", code=str(error_code))
+        # Return the 'data' field if present, otherwise return the full response
+        if 'data' in response_data:
+            return response_data['data']
+    
+    return response_data
+
+
+class MexcBrokerService(MexcSigningMixin, BrokerService):
     """
     MEXC implementation of the BrokerService interface.
     
@@ -72,6 +240,7 @@ class MexcBrokerService(BrokerService):
         base_url: Optional[str] = None,
         futures_base_url: Optional[str] = None,
         timeout: int = 30,
+        rate_limiter: Optional[BrokerRateLimiter] = None,
     ):
         """
         Initialize the MEXC Broker Service.
@@ -83,6 +252,7 @@ class MexcBrokerService(BrokerService):
             base_url: Override the base URL for Spot (optional).
             futures_base_url: Override the base URL for Futures (optional).
             timeout: Request timeout in seconds.
+            rate_limiter: Request budget of the account (optional).
         """
         self._api_key = api_key
         self._api_secret = api_secret
@@ -92,13 +262,10 @@ class MexcBrokerService(BrokerService):
         self._futures_base_url = futures_base_url or self.DEFAULT_FUTURES_BASE_URL
         self._timeout = timeout
         self._session = requests.Session()
+        self._rate_limiter = rate_limiter
         self._connected = False
         logger.info(f"MexcBrokerService initialized ({self._account_type})")
     
-    def _is_futures_account(self) -> bool:
-        """Check if this is a Futures account."""
-        return self._account_type == "FUTURES"
-    
     @classmethod
     def from_config(cls, config) -> 'MexcBrokerService':
         """
@@ -116,41 +283,9 @@ class MexcBrokerService(BrokerService):
             account_type=config.account_type,
             base_url=config.api_base_url or None,
             timeout=config.timeout_seconds,
+            rate_limiter=get_rate_limiter('MEXC', config.api_key),
         )
     
-    def _sign_request(self, params: dict) -> str:
-        """
-        Generate HMAC SHA256 signature for request.
-        
-        Args:
-            params: Request parameters to sign.
-            
-        Returns:
-            str: Hex-encoded signature.
-        """
-        query_string = urlencode(params)
-        signature = hmac.new(
-            self._api_secret.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
-    
-    def _get_timestamp(self) -> int:
-        """Get current timestamp in milliseconds."""
-        return int(time.time() * 1000)
-    
-    def _get_headers(self, include_api_key: bool = True) -> dict:
-        """Get headers for API requests."""
-        headers = {
-            "Content-Type": "application/json",
-        }
-
-        if include_api_key:
-            headers["X-MEXC-APIKEY"] = self._api_key
-
-        return headers
-    
     def _request(
         self,
         method: str,
@@ -176,89 +311,46 @@ class MexcBrokerService(BrokerService):
         url = f"{self._base_url}{endpoint}"
         params = params or {}
         
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(get_request_priority(endpoint))
+        
         if signed:
             params['timestamp'] = self._get_timestamp()
             params['signature'] = self._sign_request(params)
         
         try:
-            headers = self._get_headers(include_api_key=signed)
+            with get_broker_metrics().timed("MEXC", endpoint):
+                headers = self._get_headers(include_api_key=signed)
 
-            if method == "GET":
-                response = self._session.get(
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=self._timeout,
-                )
-            elif method == "POST":
-                response = self._session.post(
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=self._timeout,
-                )
-            elif method == "DELETE":
-                response = self._session.delete(
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=self._timeout,
-                )
-            else:
-                raise BrokerError(f"Unsupported HTTP method: {method}")
-            
-            # Check for errors
-            if response.status_code == 401:
-                raise AuthenticationError("Invalid API credentials")
-            
-            if response.status_code != 200:
-                error_msg = f"API error: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    if 'msg' in error_data:
-                        error_msg = f"{error_msg} - {error_data['msg']}"
-                    if 'code' in error_data:
-                        error_msg = f"{error_msg} (code: {error_data['code']})"
-                except Exception:
-                    error_msg = f"{error_msg} - {response.text}"
-                raise BrokerError(error_msg)
+                if method == "GET":
+                    response = self._session.get(
+                        url,
+                        params=params,
+                        headers=headers,
+                        timeout=self._timeout,
+                    )
+                elif method == "POST":
+                    response = self._session.post(
+                        url,
+                        params=params,
+                        headers=headers,
+                        timeout=self._timeout,
+                    )
+                elif method == "DELETE":
+                    response = self._session.delete(
+                        url,
+                        params=params,
+                        headers=headers,
+                        timeout=self._timeout,
+                    )
+                else:
+                    raise BrokerError(f"Unsupported HTTP method: {method}")
             
-            return response.json()
+                return check_spot_response(response)
             
         except requests.RequestException as e:
             raise BrokerError(f"Request failed: {e}")
     
-    def _get_futures_headers(self, timestamp: int, signature: str) -> dict:
-        """Get headers for Futures API requests."""
-        return {
-            "ApiKey": self._api_key,
-            "Request-Time": str(timestamp),
-            "Signature": signature,
-            "Content-Type": "application/json",
-        }
-    
-    def _sign_futures_request(self, timestamp: int, params: Optional[dict] = None) -> str:
-        """
-        Generate HMAC SHA256 signature for Futures API request.
-        
-        The Futures API requires signing: api_key + timestamp + query_string
-        
-        Args:
-            timestamp: Request timestamp in milliseconds.
-            params: Request parameters to sign (optional).
-            
-        Returns:
-            str: Hex-encoded signature.
-        """
-        query_string = urlencode(params) if params else ""
-        sign_string = f"{self._api_key}{timestamp}{query_string}"
-        signature = hmac.new(
-            self._api_secret.encode('utf-8'),
-            sign_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
-    
     def _futures_request(
         self,
         method: str,
@@ -283,64 +375,41 @@ class MexcBrokerService(BrokerService):
         """
         url = f"{self._futures_base_url}{endpoint}"
         request_params = params if params else None
+        
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(get_request_priority(endpoint))
+        
         timestamp = self._get_timestamp()
         signature = self._sign_futures_request(timestamp, request_params)
         headers = self._get_futures_headers(timestamp, signature)
         
         try:
-            if method == "GET":
-                response = self._session.get(
-                    url,
-                    params=request_params,
-                    headers=headers,
-                    timeout=self._timeout,
-                )
-            elif method == "POST":
-                response = self._session.post(
-                    url,
-                    params=request_params,
-                    headers=headers,
-                    timeout=self._timeout,
-                )
-            elif method == "DELETE":
-                response = self._session.delete(
-                    url,
-                    params=request_params,
-                    headers=headers,
-                    timeout=self._timeout,
-                )
-            else:
-                raise BrokerError(f"Unsupported HTTP method: {method}")
-            
-            # Check for errors
-            if response.status_code == 401:
-                raise AuthenticationError("Invalid API credentials for Futures")
-            
-            if response.status_code != 200:
-                error_msg = f"Futures API error: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    if 'message' in error_data:
-                        error_msg = f"{error_msg} - {error_data['message']}"
-                    if 'code' in error_data:
-                        error_msg = f"{error_msg} (code: {error_data['code']})"
-                except Exception:
-                    error_msg = f"{error_msg} - {response.text}"
-                raise BrokerError(error_msg)
-            
-            response_data = response.json()
-            
-            # Futures API wraps responses with success/code/data structure
-            if isinstance(response_data, dict):
-                if response_data.get('success') is False:
-                    error_msg = response_data.get('message', 'Unknown Futures API error')
-                    error_code = response_data.get('code', 'UNKNOWN')
-                    raise BrokerError(f"Futures API error: {error_msg} (code: {error_code})")
-                # Return the 'data' field if present, otherwise return the full response
-                if 'data' in response_data:
-                    return response_data['data']
+            with get_broker_metrics().timed("MEXC", endpoint):
+                if method == "GET":
+                    response = self._session.get(
+                        url,
+                        params=request_params,
+                        headers=headers,
+                        timeout=self._timeout,
+                    )
+                elif method == "POST":
+                    response = self._session.post(
+                        url,
+                        params=request_params,
+                        headers=headers,
+                        timeout=self._timeout,
+                    )
+                elif method == "DELETE":
+                    response = self._session.delete(
+                        url,
+                        params=request_params,
+                        headers=headers,
+                        timeout=self._timeout,
+                    )
+                else:
+                    raise BrokerError(f"Unsupported HTTP method: {method}")
             
-            return response_data
+                return unwrap_futures_response(response)
             
         except requests.RequestException as e:
             raise BrokerError(f"Futures request failed: {e}")
@@ -427,128 +496,12 @@ class MexcBrokerService(BrokerService):
     def _get_spot_account_state(self) -> AccountState:
         """Get account state from Spot API."""
         account_data = self._request("GET", "/api/v3/account", signed=True)
-        
-        # Get USDT balance for account state
-        # Note: For proper multi-asset accounting, you'd need to convert all
-        # assets to a common base currency using current market prices.
-        # This implementation focuses on USDT as the primary quote currency.
-        usdt_balance = Decimal('0')
-        usdt_available = Decimal('0')
-        
-        for balance in account_data.get('balances', []):
-            if balance.get('asset') == 'USDT':
-                usdt_balance = Decimal(str(balance.get('free', '0'))) + Decimal(str(balance.get('locked', '0')))
-                usdt_available = Decimal(str(balance.get('free', '0')))
-                break
-        
-        return AccountState(
-            account_id=str(account_data.get('accountType', 'SPOT')),
-            account_name=f"MEXC {self._account_type}",
-            balance=usdt_balance,
-            available=usdt_available,
-            equity=usdt_balance,
-            margin_used=Decimal('0'),
-            margin_available=usdt_available,
-            unrealized_pnl=Decimal('0'),
-            currency='USDT',
-            timestamp=datetime.now(timezone.utc),
-        )
+        return parse_spot_account_state(account_data, self._account_type)
     
     def _get_futures_account_state(self) -> AccountState:
-        """
-        Get account state from Futures API.
-        
-        The Futures API returns account assets including:
-        - equity: Total equity (balance + unrealized P&L)
-        - availableBalance: Available for trading
-        - frozenBalance: Frozen/used margin
-        - unrealisedPnl: Unrealized profit/loss
-        """
-        # Get account assets from Futures API
+        """Get account state from Futures API."""
         assets_data = self._futures_request("GET", "/api/v1/private/account/assets")
-        
-        # Log raw response for debugging
-        logger.debug(
-            "Futures account assets response",
-            extra={
-                "broker_data": {
-                    "endpoint": "/api/v1/private/account/assets",
-                    "response_type": type(assets_data).__name__,
-                    "asset_count": len(assets_data) if isinstance(assets_data, list) else 0,
-                }
-            }
-        )
-        
-        # Find USDT asset in the response
-        # The response is a list of assets
-        usdt_equity = Decimal('0')
-        usdt_available = Decimal('0')
-        usdt_frozen = Decimal('0')
-        usdt_unrealized_pnl = Decimal('0')
-        usdt_found = False
-        
-        if isinstance(assets_data, list):
-            for asset in assets_data:
-                if asset.get('currency') == 'USDT':
-                    usdt_equity = Decimal(str(asset.get('equity', '0')))
-                    usdt_available = Decimal(str(asset.get('availableBalance', '0')))
-                    usdt_frozen = Decimal(str(asset.get('frozenBalance', '0')))
-                    usdt_unrealized_pnl = Decimal(str(asset.get('unrealisedPnl', '0')))
-                    usdt_found = True
-                    
-                    # Log the USDT asset values for debugging
-                    logger.debug(
-                        "Futures USDT asset found",
-                        extra={
-                            "broker_data": {
-                                "currency": "USDT",
-                                "equity": float(usdt_equity),
-                                "available_balance": float(usdt_available),
-                                "frozen_balance": float(usdt_frozen),
-                                "unrealised_pnl": float(usdt_unrealized_pnl),
-                            }
-                        }
-                    )
-                    break
-        
-        # Warn if USDT asset was not found or has zero equity
-        if not usdt_found:
-            logger.warning(
-                "Futures USDT asset not found in account assets response",
-                extra={
-                    "broker_data": {
-                        "endpoint": "/api/v1/private/account/assets",
-                        "assets_received": [a.get('currency') for a in assets_data] if isinstance(assets_data, list) else [],
-                    }
-                }
-            )
-        elif usdt_equity <= Decimal('0'):
-            logger.warning(
-                "Futures USDT equity is zero or negative",
-                extra={
-                    "broker_data": {
-                        "equity": float(usdt_equity),
-                        "available_balance": float(usdt_available),
-                        "frozen_balance": float(usdt_frozen),
-                    }
-                }
-            )
-        
-        # Calculate balance (equity - unrealized P&L)
-        usdt_balance = usdt_equity - usdt_unrealized_pnl
-        
-        return AccountState(
-            account_id='FUTURES',
-            account_name=f"MEXC {self._account_type}",
-            balance=usdt_balance,
-            available=usdt_available,
-            equity=usdt_equity,
-            margin_used=usdt_frozen,
-            margin_available=usdt_available,
-            unrealized_pnl=usdt_unrealized_pnl,
-            currency='USDT',
-            timestamp=datetime.now(timezone.utc),
-        )
+        return parse_futures_account_state(assets_data, self._account_type)
     
     def get_open_positions(self) -> List[Position]:
         """
@@ -578,36 +531,15 @@ class MexcBrokerService(BrokerService):
         positions = []
         account_data = self._request("GET", "/api/v3/account", signed=True)
         
-        for balance in account_data.get('balances', []):
-            free = Decimal(str(balance.get('free', '0')))
-            locked = Decimal(str(balance.get('locked', '0')))
-            total = free + locked
+        for asset, total in parse_spot_holdings(account_data):
+            # Get current price for this asset
+            try:
+                price_data = self.get_symbol_price(f"{asset}USDT")
+                current_price = price_data.mid_price
+            except Exception:
+                current_price = Decimal('0')
             
-            if total > 0 and balance.get('asset') != 'USDT':
-                # Create a position-like entry for non-zero balances
-                asset = balance.get('asset', '')
-                symbol = f"{asset}USDT"
-                
-                # Get current price for this asset
-                try:
-                    price_data = self.get_symbol_price(symbol)
-                    current_price = price_data.mid_price
-                except Exception:
-                    current_price = Decimal('0')
-                
-                position = Position(
-                    position_id=f"spot_{asset}",
-                    deal_id=f"spot_{asset}",
-                    epic=symbol,
-                    market_name=f"{asset}/USDT",
-                    direction=OrderDirection.BUY,
-                    size=total,
-                    open_price=Decimal('0'),  # Not tracked for spot
-                    current_price=current_price,
-                    unrealized_pnl=Decimal('0'),
-                    currency='USDT',
-                )
-                positions.append(position)
+            positions.append(build_spot_position(asset, total, current_price))
         
         return positions
     
@@ -626,40 +558,16 @@ class MexcBrokerService(BrokerService):
                 "/api/v1/private/position/open_positions"
             )
             
-            if isinstance(positions_data, list):
-                for pos in positions_data:
-                    symbol = pos.get('symbol', '')
-                    pos_type = pos.get('positionType', self.POSITION_LONG)
-                    hold_vol = Decimal(str(pos.get('holdVol', '0')))
-                    open_avg_price = Decimal(str(pos.get('openAvgPrice', '0')))
-                    unrealised_pnl = Decimal(str(pos.get('unrealisedPnl', '0')))
-                    
-                    if hold_vol > 0:
-                        # Get current price
-                        try:
-                            # For futures, convert symbol format if needed
-                            # MEXC Futures uses symbols like "BTC_USDT"
-                            spot_symbol = symbol.replace('_', '')
-                            price_data = self.get_symbol_price(spot_symbol)
-                            current_price = price_data.mid_price
-                        except Exception:
-                            current_price = Decimal('0')
-                        
-                        direction = OrderDirection.BUY if pos_type == self.POSITION_LONG else OrderDirection.SELL
-                        
-                        position = Position(
-                            position_id=f"futures_{symbol}_{pos_type}",
-                            deal_id=f"futures_{symbol}_{pos_type}",
-                            epic=symbol,
-                            market_name=symbol,
-                            direction=direction,
-                            size=hold_vol,
-                            open_price=open_avg_price,
-                            current_price=current_price,
-                            unrealized_pnl=unrealised_pnl,
-                            currency='USDT',
-                        )
-                        positions.append(position)
+            for pos in parse_open_futures_positions(positions_data):
+                # Get current price
+                try:
+                    # MEXC Futures uses symbols like "BTC_USDT"
+                    price_data = self.get_symbol_price(pos.get('symbol', '').replace('_', ''))
+                    current_price = price_data.mid_price
+                except Exception:
+                    current_price = Decimal('0')
+                
+                positions.append(build_futures_position(pos, current_price))
                         
         except BrokerError as e:
             logger.warning(f"Failed to get futures positions: {e}")
@@ -689,9 +597,6 @@ class MexcBrokerService(BrokerService):
                 params={"symbol": symbol}
             )
             
-            bid = Decimal(str(ticker_data.get('bidPrice', '0')))
-            ask = Decimal(str(ticker_data.get('askPrice', '0')))
-            
             # Get 24h stats for high/low
             stats_data = self._request(
                 "GET",
@@ -699,24 +604,43 @@ class MexcBrokerService(BrokerService):
                 params={"symbol": symbol}
             )
             
-            return SymbolPrice(
-                epic=symbol,
-                market_name=symbol,
-                bid=bid,
-                ask=ask,
-                spread=ask - bid,
-                high=Decimal(str(stats_data.get('highPrice'))) if stats_data.get('highPrice') else None,
-                low=Decimal(str(stats_data.get('lowPrice'))) if stats_data.get('lowPrice') else None,
-                change=Decimal(str(stats_data.get('priceChange'))) if stats_data.get('priceChange') else None,
-                change_percent=Decimal(str(stats_data.get('priceChangePercent'))) if stats_data.get('priceChangePercent') else None,
-                timestamp=datetime.now(timezone.utc),
-            )
+            return parse_symbol_price(symbol, ticker_data, stats_data)
             
         except BrokerError:
             raise
         except Exception as e:
             raise BrokerError(f"Failed to get price for {symbol}: {e}")
     
+    def get_symbol_prices(self, symbols: List[str]) -> Dict[str, SymbolPrice]:
+        """
+        Get current prices for several symbols.
+        
+        Uses the bookTicker and 24hr ticker endpoints without a symbol
+        filter, which return all symbols in one response each.
+        
+        Args:
+            symbols: Market symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+        
+        Returns:
+            Dict mapping each symbol to its SymbolPrice. Unknown symbols
+            are left out.
+        """
+        self._ensure_connected()
+        
+        symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol]
+        if not symbols:
+            return {}
+        
+        try:
+            tickers = self._request("GET", "/api/v3/ticker/bookTicker")
+            stats = self._request("GET", "/api/v3/ticker/24hr")
+            return parse_symbol_prices(symbols, tickers, stats)
+            
+        except BrokerError:
+            raise
+        except Exception as e:
+            raise BrokerError(f"Failed to get prices for {', '.join(symbols)}: {e}")
+    
     def place_order(self, order: OrderRequest) -> OrderResult:
         """
         Place a new order.
@@ -1006,6 +930,8 @@ class MexcBrokerService(BrokerService):
         interval: str = "1m",
         limit: int = 720,
         epic: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
         **_: object,
     ) -> List[dict]:
         """
@@ -1016,6 +942,8 @@ class MexcBrokerService(BrokerService):
             interval: Kline interval (default: '1m' for 1-minute candles). Options: 1m, 5m, 15m, 30m, 1h, 4h, 1d, etc.
             limit: Number of klines to retrieve (default: 720 = 12 hours of 1m candles, max 1000).
             epic: Optional alias for symbol for compatibility with other broker interfaces.
+            start_time: Optional start of the window (inclusive) for paging through history.
+            end_time: Optional end of the window (inclusive) for paging through history.
 
         Returns:
             List of kline data dictionaries.
@@ -1032,30 +960,313 @@ class MexcBrokerService(BrokerService):
             response = self._request(
                 "GET",
                 "/api/v3/klines",
-                params={
-                    "symbol": symbol,
-                    "interval": interval,
-                    "limit": limit,
-                }
+                params=build_klines_params(symbol, interval, limit, start_time, end_time),
             )
             
-            candles = []
-            for kline in response:
-                # MEXC kline format:
-                # [open_time, open, high, low, close, volume, close_time, ...]
-                candle = {
-                    "time": int(kline[0] / 1000),  # Convert ms to seconds
-                    "open": float(kline[1]),
-                    "high": float(kline[2]),
-                    "low": float(kline[3]),
-                    "close": float(kline[4]),
-                    "volume": float(kline[5]),
-                }
-                candles.append(candle)
-            
-            return candles
+            return parse_klines(response)
             
         except BrokerError:
             raise
         except Exception as e:
             raise BrokerError(f"Failed to get historical prices for {symbol}: {e}")
+
+
+def parse_spot_account_state(account_data: dict, account_type: str) -> AccountState:
+    """
+    Build an AccountState from the Spot /api/v3/account response.
+    
+    Args:
+        account_data: Account response from the Spot API.
+        account_type: Account type for the display name.
+    
+    Returns:
+        AccountState with the USDT balance.
+    """
+    # Get USDT balance for account state
+    # Note: For proper multi-asset accounting, you'd need to convert all
+    # assets to a common base currency using current market prices.
+    # This implementation focuses on USDT as the primary quote currency.
+    usdt_balance = Decimal('0')
+    usdt_available = Decimal('0')
+    
+    for balance in account_data.get('balances', []):
+        if balance.get('asset') == 'USDT':
+            usdt_balance = Decimal(str(balance.get('free', '0'))) + Decimal(str(balance.get('locked', '0')))
+            usdt_available = Decimal(str(balance.get('free', '0')))
+            break
+    
+    return AccountState(
+        account_id=str(account_data.get('accountType', 'SPOT')),
+        account_name=f"MEXC {account_type}",
+        balance=usdt_balance,
+        available=usdt_available,
+        equity=usdt_balance,
+        margin_used=Decimal('0'),
+        margin_available=usdt_available,
+        unrealized_pnl=Decimal('0'),
+        currency='USDT',
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+def parse_futures_account_state(assets_data, account_type: str) -> AccountState:
+    """
+    Build an AccountState from the Futures account assets response.
+    
+    The Futures API returns account assets including:
+    - equity: Total equity (balance + unrealized P&L)
+    - availableBalance: Available for trading
+    - frozenBalance: Frozen/used margin
+    - unrealisedPnl: Unrealized profit/loss
+    
+    Args:
+        assets_data: Payload of /api/v1/private/account/assets.
+        account_type: Account type for the display name.
+    
+    Returns:
+        AccountState with the USDT balance.
+    """
+    # Log raw response for debugging
+    logger.debug(
+        "Futures account assets response",
+        extra={
+            "broker_data": {
+                "endpoint": "/api/v1/private/account/assets",
+                "response_type": type(assets_data).__name__,
+                "asset_count": len(assets_data) if isinstance(assets_data, list) else 0,
+            }
+        }
+    )
+    
+    # Find USDT asset in the response
+    # The response is a list of assets
+    usdt_equity = Decimal('0')
+    usdt_available = Decimal('0')
+    usdt_frozen = Decimal('0')
+    usdt_unrealized_pnl = Decimal('0')
+    usdt_found = False
+    
+    if isinstance(assets_data, list):
+        for asset in assets_data:
+            if asset.get('currency') == 'USDT':
+                usdt_equity = Decimal(str(asset.get('equity', '0')))
+                usdt_available = Decimal(str(asset.get('availableBalance', '0')))
+                usdt_frozen = Decimal(str(asset.get('frozenBalance', '0')))
+                usdt_unrealized_pnl = Decimal(str(asset.get('unrealisedPnl', '0')))
+                usdt_found = True
+    
+                # Log the USDT asset values for debugging
+                logger.debug(
+                    "Futures USDT asset found",
+                    extra={
+                        "broker_data": {
+                            "currency": "USDT",
+                            "equity": float(usdt_equity),
+                            "available_balance": float(usdt_available),
+                            "frozen_balance": float(usdt_frozen),
+                            "unrealised_pnl": float(usdt_unrealized_pnl),
+                        }
+                    }
+                )
+                break
+    
+    # Warn if USDT asset was not found or has zero equity
+    if not usdt_found:
+        logger.warning(
+            "Futures USDT asset not found in account assets response",
+            extra={
+                "broker_data": {
+                    "endpoint": "/api/v1/private/account/assets",
+                    "assets_received": [a.get('currency') for a in assets_data] if isinstance(assets_data, list) else [],
+                }
+            }
+        )
+    elif usdt_equity <= Decimal('0'):
+        logger.warning(
+            "Futures USDT equity is zero or negative",
+            extra={
+                "broker_data": {
+                    "equity": float(usdt_equity),
+                    "available_balance": float(usdt_available),
+                    "frozen_balance": float(usdt_frozen),
+                }
+            }
+        )
+    
+    # Calculate balance (equity - unrealized P&L)
+    usdt_balance = usdt_equity - usdt_unrealized_pnl
+    
+    return AccountState(
+        account_id='FUTURES',
+        account_name=f"MEXC {account_type}",
+        balance=usdt_balance,
+        available=usdt_available,
+        equity=usdt_equity,
+        margin_used=usdt_frozen,
+        margin_available=usdt_available,
+        unrealized_pnl=usdt_unrealized_pnl,
+        currency='USDT',
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+def parse_spot_holdings(account_data: dict) -> List[Tuple[str, Decimal]]:
+    """
+    List non-zero, non-USDT balances of a Spot account.
+    
+    Returns:
+        List of (asset, total balance) tuples.
+    """
+    holdings = []
+    for balance in account_data.get('balances', []):
+        free = Decimal(str(balance.get('free', '0')))
+        locked = Decimal(str(balance.get('locked', '0')))
+        total = free + locked
+        
+        if total > 0 and balance.get('asset') != 'USDT':
+            holdings.append((balance.get('asset', ''), total))
+    return holdings
+
+
+def build_spot_position(asset: str, total: Decimal, current_price: Decimal) -> Position:
+    """Create a position-like entry for a Spot balance."""
+    symbol = f"{asset}USDT"
+    return Position(
+        position_id=f"spot_{asset}",
+        deal_id=f"spot_{asset}",
+        epic=symbol,
+        market_name=f"{asset}/USDT",
+        direction=OrderDirection.BUY,
+        size=total,
+        open_price=Decimal('0'),  # Not tracked for spot
+        current_price=current_price,
+        unrealized_pnl=Decimal('0'),
+        currency='USDT',
+    )
+
+
+def parse_open_futures_positions(positions_data) -> List[dict]:
+    """Filter the Futures open_positions payload to positions with volume."""
+    if not isinstance(positions_data, list):
+        return []
+    return [pos for pos in positions_data if Decimal(str(pos.get('holdVol', '0'))) > 0]
+
+
+def build_futures_position(pos: dict, current_price: Decimal) -> Position:
+    """Create a Position from a Futures open_positions entry."""
+    symbol = pos.get('symbol', '')
+    pos_type = pos.get('positionType', MexcBrokerService.POSITION_LONG)
+    direction = OrderDirection.BUY if pos_type == MexcBrokerService.POSITION_LONG else OrderDirection.SELL
+    
+    return Position(
+        position_id=f"futures_{symbol}_{pos_type}",
+        deal_id=f"futures_{symbol}_{pos_type}",
+        epic=symbol,
+        market_name=symbol,
+        direction=direction,
+        size=Decimal(str(pos.get('holdVol', '0'))),
+        open_price=Decimal(str(pos.get('openAvgPrice', '0'))),
+        current_price=current_price,
+        unrealized_pnl=Decimal(str(pos.get('unrealisedPnl', '0'))),
+        currency='USDT',
+    )
+
+
+def parse_symbol_price(symbol: str, ticker_data: dict, stats_data: dict) -> SymbolPrice:
+    """
+    Build a SymbolPrice from the bookTicker and 24hr ticker responses.
+    
+    Args:
+        symbol: Market symbol (e.g., 'BTCUSDT').
+        ticker_data: Response of /api/v3/ticker/bookTicker.
+        stats_data: Response of /api/v3/ticker/24hr.
+    
+    Returns:
+        SymbolPrice with current bid/ask and 24h stats.
+    """
+    bid = Decimal(str(ticker_data.get('bidPrice', '0')))
+    ask = Decimal(str(ticker_data.get('askPrice', '0')))
+    
+    return SymbolPrice(
+        epic=symbol,
+        market_name=symbol,
+        bid=bid,
+        ask=ask,
+        spread=ask - bid,
+        high=Decimal(str(stats_data.get('highPrice'))) if stats_data.get('highPrice') else None,
+        low=Decimal(str(stats_data.get('lowPrice'))) if stats_data.get('lowPrice') else None,
+        change=Decimal(str(stats_data.get('priceChange'))) if stats_data.get('priceChange') else None,
+        change_percent=Decimal(str(stats_data.get('priceChangePercent'))) if stats_data.get('priceChangePercent') else None,
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+def parse_symbol_prices(symbols: List[str], tickers: list, stats: list) -> Dict[str, SymbolPrice]:
+    """
+    Build SymbolPrices from the all-symbol bookTicker and 24hr ticker responses.
+    
+    Args:
+        symbols: Symbols to keep.
+        tickers: Response of /api/v3/ticker/bookTicker without a symbol.
+        stats: Response of /api/v3/ticker/24hr without a symbol.
+    
+    Returns:
+        Dict mapping each symbol found in the book tickers to its SymbolPrice.
+    """
+    wanted = set(symbols)
+    stats_by_symbol = {s.get('symbol'): s for s in stats if s.get('symbol') in wanted}
+    
+    return {
+        ticker['symbol']: parse_symbol_price(ticker['symbol'], ticker, stats_by_symbol.get(ticker['symbol'], {}))
+        for ticker in tickers
+        if ticker.get('symbol') in wanted
+    }
+
+
+def build_klines_params(
+    symbol: str,
+    interval: str,
+    limit: int,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> dict:
+    """
+    Build the /api/v3/klines query parameters.
+    
+    The optional window is sent as startTime/endTime in milliseconds.
+    
+    Returns:
+        Dictionary of query parameters.
+    """
+    params = {
+        "symbol": symbol,
+        "interval": interval,
+        "limit": limit,
+    }
+    if start_time is not None:
+        params["startTime"] = int(start_time.timestamp() * 1000)
+    if end_time is not None:
+        params["endTime"] = int(end_time.timestamp() * 1000)
+    return params
+
+
+def parse_klines(response: list) -> List[dict]:
+    """
+    Convert /api/v3/klines rows to candle dictionaries.
+    
+    MEXC kline format: [open_time, open, high, low, close, volume, close_time, ...]
+    
+    Returns:
+        List of dictionaries with time (Unix seconds), open, high, low, close, volume.
+    """
+    return [
+        {
+            "time": int(kline[0] / 1000),  # Convert ms to seconds
+            "open": float(kline[1]),
+            "high": float(kline[2]),
+            "low": float(kline[3]),
+            "close": float(kline[4]),
+            "volume": float(kline[5]),
+        }
+        for kline in response
+    ]
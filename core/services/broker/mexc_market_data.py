@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import datetime, timezone
 from typing import List, Optional
 
@@ -6,6 +7,7 @@ import requests
 
 from core.services.strategy.models import Candle
 
+from .metrics import get_broker_metrics
 from .mexc_broker_service import MexcBrokerService
 
 
@@ -24,10 +26,20 @@ class MexcMarketDataFetcher:
         base_url: str = MexcBrokerService.DEFAULT_BASE_URL,
         timeout: int = 10,
         session: Optional[requests.Session] = None,
+        kline_stream=None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
         self._session = session or requests.Session()
+        self._kline_stream = kline_stream
+
+    def set_kline_stream(self, kline_stream) -> None:
+        """
+        Serve recent 1m klines from a stream (e.g. MexcKlineIngestor) instead of REST.
+
+        The stream must provide is_streaming(symbol) and get_klines(symbol).
+        """
+        self._kline_stream = kline_stream
 
     def get_klines(
         self,
@@ -36,15 +48,29 @@ class MexcMarketDataFetcher:
         limit: int = 2,
     ) -> List[Candle]:
         """Return recent klines as Candle objects ordered oldest to newest."""
+        streamed = self._get_streamed_klines(symbol, interval, limit)
+        if streamed:
+            return streamed
+
         params = {"symbol": symbol, "interval": interval, "limit": limit}
         url = f"{self._base_url}/api/v3/klines"
 
+        metrics = get_broker_metrics()
+        start = time.perf_counter()
         try:
             response = self._session.get(url, params=params, timeout=self._timeout)
             response.raise_for_status()
         except Exception as exc:  # noqa: BLE001
+            status_code = getattr(getattr(exc, "response", None), "status_code", None)
+            metrics.observe(
+                "MEXC",
+                "/api/v3/klines",
+                time.perf_counter() - start,
+                error_code=str(status_code) if status_code else type(exc).__name__,
+            )
             logger.warning("Failed to fetch klines from MEXC: %s", exc)
             raise MexcMarketDataError(f"Failed to fetch klines for {symbol}") from exc
+        metrics.observe("MEXC", "/api/v3/klines", time.perf_counter() - start)
 
         data = response.json()
 
@@ -63,3 +89,22 @@ class MexcMarketDataFetcher:
             )
 
         return candles
+
+    def _get_streamed_klines(self, symbol: str, interval: str, limit: int) -> List[Candle]:
+        """Return the streamed last closed/current 1m klines, or [] to fall back to REST."""
+        if self._kline_stream is None or interval != "1m" or limit > 2:
+            return []
+        if not self._kline_stream.is_streaming(symbol):
+            return []
+
+        return [
+            Candle(
+                timestamp=datetime.fromtimestamp(kline.timestamp, tz=timezone.utc),
+                open=kline.open,
+                high=kline.high,
+                low=kline.low,
+                close=kline.close,
+                volume=kline.volume,
+            )
+            for kline in self._kline_stream.get_klines(symbol)
+        ][-limit:]
@@ -0,0 +1,123 @@
+"""
+MEXC Spot WebSocket subscription client.
+
+Subscribes to MEXC public channels (e.g. 'spot@public.kline.v3.api@BTCUSDT@Min1')
+with the JSON protocol: SUBSCRIPTION/UNSUBSCRIPTION requests, PING
+keepalives and pushed messages of the form {"c": channel, "d": data, ...}.
+"""
+import json
+import logging
+from typing import Callable, Dict, List, Optional
+
+import websocket
+
+from .broker_service import BrokerError
+from .streaming_client import Subscription, UpdateListener, WebSocketSubscriptionClient
+
+
+logger = logging.getLogger(__name__)
+
+# MEXC limits each connection to 30 subscriptions
+MAX_SUBSCRIPTIONS_PER_CONNECTION = 30
+
+# The server drops connections without traffic for 60s
+PING_INTERVAL_SECONDS = 20.0
+
+
+def kline_channel(symbol: str, interval: str = "Min1") -> str:
+    """Channel name of a symbol's kline stream."""
+    return f"spot@public.kline.v3.api@{symbol}@{interval}"
+
+
+def book_ticker_channel(symbol: str) -> str:
+    """Channel name of a symbol's best bid/ask stream."""
+    return f"spot@public.bookTicker.v3.api@{symbol}"
+
+
+class MexcWebSocketClient(WebSocketSubscriptionClient):
+    """
+    Subscription client for MEXC Spot public WebSocket channels.
+
+    The item of a subscription is the channel name; listeners receive the
+    message's 'd' payload (fields are not used, MEXC pushes full messages).
+
+    Usage:
+        client = MexcWebSocketClient()
+        client.subscribe(kline_channel('BTCUSDT'), [], on_kline)
+        client.connect()
+    """
+
+    DEFAULT_WS_URL = "wss://wbs.mexc.com/ws"
+
+    keepalive_interval = PING_INTERVAL_SECONDS
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        connect_timeout: float = 10.0,
+        connection_factory: Optional[Callable[..., websocket.WebSocket]] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            url: WebSocket URL (defaults to DEFAULT_WS_URL).
+            connect_timeout: Socket timeout for connecting.
+            connection_factory: Creates the WebSocket (defaults to
+                websocket.create_connection).
+        """
+        super().__init__(
+            url=url or self.DEFAULT_WS_URL,
+            name="MexcWebSocketClient",
+            connect_timeout=connect_timeout,
+            connection_factory=connection_factory,
+        )
+
+    def subscribe(
+        self,
+        item: str,
+        fields: List[str],
+        listener: UpdateListener,
+        mode: str = "MERGE",
+    ) -> int:
+        with self._lock:
+            if len(self._subscriptions) >= MAX_SUBSCRIPTIONS_PER_CONNECTION:
+                raise BrokerError(
+                    f"MEXC allows at most {MAX_SUBSCRIPTIONS_PER_CONNECTION} subscriptions per connection",
+                    code="TOO_MANY_SUBSCRIPTIONS",
+                )
+        return super().subscribe(item, fields, listener, mode)
+
+    def _send_request(self, method: str, params: Optional[List[str]] = None) -> None:
+        request: Dict[str, object] = {"method": method}
+        if params is not None:
+            request["params"] = params
+        self._send_text(json.dumps(request))
+
+    def _send_subscribe(self, subscription: Subscription) -> None:
+        self._send_request("SUBSCRIPTION", [subscription.item])
+
+    def _send_unsubscribe(self, subscription: Subscription) -> None:
+        self._send_request("UNSUBSCRIPTION", [subscription.item])
+
+    def _send_keepalive(self) -> None:
+        self._send_request("PING")
+
+    def _handle_message(self, message: str) -> None:
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            logger.debug(f"Ignoring non-JSON MEXC message: {message[:200]}")
+            return
+
+        channel = payload.get("c")
+        if channel is None:
+            # Subscription acknowledgements and PONG: {"id": 0, "code": 0, "msg": ...}
+            if payload.get("code") not in (None, 0):
+                logger.warning(f"MEXC WebSocket request failed: {payload}")
+            return
+
+        with self._lock:
+            subscriptions = [sub for sub in self._subscriptions.values() if sub.item == channel]
+        for subscription in subscriptions:
+            self._deliver(subscription, payload.get("d") or {})
@@ -0,0 +1,271 @@
+"""
+Short-lived price quote cache for broker services.
+
+Within one worker cycle the same symbol price is requested several times
+(candle update, daily high/low, range price, ...). PriceQuoteCache keeps
+each quote for a small staleness budget so those calls share one broker
+request.
+
+Only lookups made through get_cached_symbol_price/get_cached_symbol_prices
+use the cache. broker.get_symbol_price stays uncached, so order entry and
+position monitoring always see a fresh quote.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .models import SymbolPrice
+
+
+logger = logging.getLogger(__name__)
+
+# Default staleness budget for cached quotes (seconds)
+DEFAULT_PRICE_CACHE_MAX_AGE_SECONDS = 2.0
+
+
+class PriceQuoteCache:
+    """
+    Thread-safe cache of SymbolPrice quotes keyed by (broker, symbol).
+
+    Quotes older than max_age_seconds are treated as missing. Failed
+    fetches are not cached. A max age of 0 disables the cache.
+
+    Usage:
+        cache = PriceQuoteCache(max_age_seconds=2.0)
+        cache.attach('IG', broker)
+        get_cached_symbol_price(broker, epic)  # fetched
+        get_cached_symbol_price(broker, epic)  # served from cache
+        broker.get_symbol_price(epic)  # always fetched
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float = DEFAULT_PRICE_CACHE_MAX_AGE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_age_seconds: Staleness budget for cached quotes.
+            clock: Monotonic time source (overridable for tests).
+        """
+        self._max_age = max_age_seconds
+        self._clock = clock
+        self._quotes: Dict[Tuple[str, str], Tuple[float, SymbolPrice]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_settings(cls) -> 'PriceQuoteCache':
+        """
+        Create a cache using BROKER_PRICE_CACHE_MAX_AGE_SECONDS from Django settings.
+
+        Returns:
+            PriceQuoteCache instance.
+        """
+        try:
+            from django.conf import settings
+            max_age = getattr(settings, 'BROKER_PRICE_CACHE_MAX_AGE_SECONDS', DEFAULT_PRICE_CACHE_MAX_AGE_SECONDS)
+        except Exception:
+            max_age = DEFAULT_PRICE_CACHE_MAX_AGE_SECONDS
+        return cls(max_age_seconds=float(max_age))
+
+    @property
+    def enabled(self) -> bool:
+        """Whether quotes are cached at all."""
+        return self._max_age > 0
+
+    @property
+    def max_age_seconds(self) -> float:
+        """Staleness budget for cached quotes."""
+        return self._max_age
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that needed a broker request."""
+        return self._misses
+
+    def get(self, broker_key: str, symbol: str) -> Optional[SymbolPrice]:
+        """
+        Get a fresh cached quote and count the hit or miss.
+
+        Args:
+            broker_key: Broker identifier (e.g., 'IG', 'MEXC').
+            symbol: Market symbol/EPIC.
+
+        Returns:
+            Cached SymbolPrice, or None if missing or stale.
+        """
+        with self._lock:
+            entry = self._quotes.get((broker_key, symbol))
+            if entry is not None and self._clock() - entry[0] <= self._max_age:
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            return None
+
+    def put(self, broker_key: str, symbol: str, price: SymbolPrice) -> None:
+        """Store a quote fetched just now."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._quotes[(broker_key, symbol)] = (self._clock(), price)
+
+    def get_or_fetch(
+        self,
+        broker_key: str,
+        symbol: str,
+        fetch: Callable[[str], SymbolPrice],
+    ) -> SymbolPrice:
+        """
+        Get a quote from the cache, fetching it on a miss.
+
+        Args:
+            broker_key: Broker identifier.
+            symbol: Market symbol/EPIC.
+            fetch: Uncached single-symbol fetch (e.g., broker.get_symbol_price).
+
+        Returns:
+            SymbolPrice for the symbol.
+        """
+        price = self.get(broker_key, symbol)
+        if price is None:
+            price = fetch(symbol)
+            self.put(broker_key, symbol, price)
+        return price
+
+    def get_many_or_fetch(
+        self,
+        broker_key: str,
+        symbols: List[str],
+        fetch_many: Callable[[List[str]], Dict[str, SymbolPrice]],
+    ) -> Dict[str, SymbolPrice]:
+        """
+        Get quotes for several symbols, fetching only the misses in one batch.
+
+        Args:
+            broker_key: Broker identifier.
+            symbols: Market symbols/EPICs.
+            fetch_many: Uncached batch fetch (e.g., broker.get_symbol_prices).
+
+        Returns:
+            Dict mapping each symbol to its SymbolPrice.
+        """
+        prices = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            price = self.get(broker_key, symbol)
+            if price is None:
+                missing.append(symbol)
+            else:
+                prices[symbol] = price
+
+        if missing:
+            fetched = fetch_many(missing)
+            for symbol, price in fetched.items():
+                self.put(broker_key, symbol, price)
+            prices.update(fetched)
+
+        return prices
+
+    def attach(self, broker_key: str, broker):
+        """
+        Make a broker's cached price lookups use this cache.
+
+        Sets price_cache and price_cache_key on the broker, so every
+        get_cached_symbol_price call for it shares the cache. The broker's
+        own methods are left untouched.
+
+        Args:
+            broker_key: Broker identifier.
+            broker: BrokerService instance.
+
+        Returns:
+            The same broker instance.
+        """
+        if self.enabled:
+            broker.price_cache = self
+            broker.price_cache_key = broker_key
+        return broker
+
+    def invalidate(self, broker_key: Optional[str] = None) -> None:
+        """
+        Drop cached quotes.
+
+        Args:
+            broker_key: Only drop quotes of this broker (all if None).
+        """
+        with self._lock:
+            if broker_key is None:
+                self._quotes.clear()
+            else:
+                for key in [k for k in self._quotes if k[0] == broker_key]:
+                    del self._quotes[key]
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, size and max_age_seconds.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else 0.0,
+                'size': len(self._quotes),
+                'max_age_seconds': self._max_age,
+            }
+
+    def reset_stats(self) -> None:
+        """Reset the hit/miss counters."""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+def get_cached_symbol_price(broker, epic: str) -> SymbolPrice:
+    """
+    Get a price through the broker's PriceQuoteCache.
+
+    For reads that tolerate the staleness budget (candle updates, ranges,
+    logging). Without an attached cache the broker is asked directly.
+
+    Args:
+        broker: BrokerService instance.
+        epic: Market symbol/EPIC.
+
+    Returns:
+        SymbolPrice for the symbol.
+    """
+    cache = getattr(broker, 'price_cache', None)
+    if not isinstance(cache, PriceQuoteCache):
+        return broker.get_symbol_price(epic)
+    return cache.get_or_fetch(broker.price_cache_key, epic, broker.get_symbol_price)
+
+
+def get_cached_symbol_prices(broker, epics: List[str]) -> Dict[str, SymbolPrice]:
+    """
+    Get prices for several symbols through the broker's PriceQuoteCache.
+
+    Args:
+        broker: BrokerService instance.
+        epics: Market symbols/EPICs.
+
+    Returns:
+        Dict mapping each symbol to its SymbolPrice.
+    """
+    cache = getattr(broker, 'price_cache', None)
+    if not isinstance(cache, PriceQuoteCache):
+        return broker.get_symbol_prices(epics)
+    return cache.get_many_or_fetch(broker.price_cache_key, epics, broker.get_symbol_prices)
@@ -0,0 +1,301 @@
+"""
+Client-side rate limiting for broker APIs.
+
+Brokers limit requests per account (IG allowances, MEXC request weights).
+BrokerRateLimiter keeps one token bucket for trading/price endpoints and
+one for historical data per broker account, so requests are spread out
+before the broker starts rejecting them.
+
+Priority lanes: in the shared trading bucket, each lane may only take
+tokens while more than its reserve is left. Orders can use the whole
+budget and price requests leave a reserve for orders. History requests
+have their own bucket, so a burst of backfill never delays an order and
+may use that bucket's whole budget.
+"""
+import asyncio
+import logging
+import threading
+import time
+from enum import IntEnum
+from typing import Callable, Dict, Optional
+
+from .broker_service import BrokerError
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Priority lane of a broker request (lower value = higher priority)."""
+    ORDER = 0
+    PRICE = 1
+    HISTORY = 2
+
+
+# Share of the trading bucket each lane must leave untouched for higher lanes
+LANE_RESERVE = {
+    RequestPriority.ORDER: 0.0,
+    RequestPriority.PRICE: 0.2,
+}
+
+# Maximum time a request waits for budget before failing (seconds)
+LANE_MAX_WAIT_SECONDS = {
+    RequestPriority.ORDER: 30.0,
+    RequestPriority.PRICE: 20.0,
+    RequestPriority.HISTORY: 60.0,
+}
+
+# Default budgets per broker account (requests per minute)
+DEFAULT_RATE_LIMITS = {
+    'IG': {'TRADING_PER_MINUTE': 30, 'HISTORY_PER_MINUTE': 10},
+    'MEXC': {'TRADING_PER_MINUTE': 600, 'HISTORY_PER_MINUTE': 120},
+}
+
+BUDGET_TRADING = 'trading'
+BUDGET_HISTORY = 'history'
+
+
+class RateLimitExceeded(BrokerError):
+    """Raised when no request budget became available in time."""
+
+    def __init__(self, message: str, details: dict = None):
+        super().__init__(message, code='RATE_LIMITED', details=details)
+
+
+class TokenBucket:
+    """
+    Token bucket with lane reserves.
+
+    Holds up to ``capacity`` tokens and refills at ``rate_per_second``.
+    ``reserves`` maps lanes to the share of the capacity they must leave;
+    lanes not listed may use the whole bucket. Not thread-safe on its own;
+    BrokerRateLimiter guards it with a lock.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        reserves: Optional[Dict[RequestPriority, float]] = None,
+    ):
+        if rate_per_second <= 0 or capacity <= 0:
+            raise ValueError("rate_per_second and capacity must be positive")
+
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._reserves = reserves or {}
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    @property
+    def remaining(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def reserve(self, priority: RequestPriority) -> float:
+        """
+        Take one token if the lane's reserve allows it.
+
+        Returns:
+            0.0 if a token was taken, otherwise the seconds until one
+            becomes available for this lane.
+        """
+        self._refill()
+        floor = self.capacity * self._reserves.get(priority, 0.0)
+        if self._tokens - 1 >= floor:
+            self._tokens -= 1
+            return 0.0
+        return (floor + 1 - self._tokens) / self.rate_per_second
+
+    def drain(self) -> None:
+        """Empty the bucket (e.g. after the broker reported an exceeded allowance)."""
+        self._refill()
+        self._tokens = 0.0
+
+
+class BrokerRateLimiter:
+    """
+    Request budget of one broker account.
+
+    Usage:
+        limiter = get_rate_limiter('IG', 'my-account')
+        limiter.acquire(RequestPriority.PRICE)
+        response = session.get(...)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        trading_per_minute: float,
+        history_per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Label used in logs and metrics (e.g. 'IG:demo-user').
+            trading_per_minute: Budget for order, price and account requests.
+            history_per_minute: Budget for historical data requests.
+            clock: Monotonic time source (overridable for tests).
+            sleep: Sleep function (overridable for tests).
+        """
+        self.name = name
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets = {
+            BUDGET_TRADING: TokenBucket(trading_per_minute / 60.0, trading_per_minute, clock, LANE_RESERVE),
+            BUDGET_HISTORY: TokenBucket(history_per_minute / 60.0, history_per_minute, clock),
+        }
+        self._throttled = 0
+        self._rejected = 0
+
+    @staticmethod
+    def _budget_for(priority: RequestPriority) -> str:
+        return BUDGET_HISTORY if priority == RequestPriority.HISTORY else BUDGET_TRADING
+
+    def _reserve(self, priority: RequestPriority, waited: float) -> float:
+        """Try to take a token; raise once the lane's wait limit is exceeded."""
+        budget = self._budget_for(priority)
+        with self._lock:
+            wait = self._buckets[budget].reserve(priority)
+            if wait and waited == 0:
+                self._throttled += 1
+            if wait and waited + wait > LANE_MAX_WAIT_SECONDS[priority]:
+                self._rejected += 1
+                raise RateLimitExceeded(
+                    f"{self.name} {budget} budget exhausted for {priority.name} request",
+                    details={'budget': budget, 'priority': priority.name, 'retry_after': round(wait, 2)},
+                )
+        return wait
+
+    def acquire(self, priority: RequestPriority = RequestPriority.PRICE) -> float:
+        """
+        Block until the request may be sent.
+
+        Args:
+            priority: Lane of the request.
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            RateLimitExceeded: If no budget became available within the lane's wait limit.
+        """
+        waited = 0.0
+        while True:
+            wait = self._reserve(priority, waited)
+            if not wait:
+                return waited
+            logger.debug(f"{self.name}: throttling {priority.name} request for {wait:.2f}s")
+            self._sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, priority: RequestPriority = RequestPriority.PRICE) -> float:
+        """Async variant of acquire() that does not block the event loop."""
+        waited = 0.0
+        while True:
+            wait = self._reserve(priority, waited)
+            if not wait:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def report_exceeded(self, priority: RequestPriority) -> None:
+        """
+        Back off after the broker rejected a request for exceeding its allowance.
+
+        Empties the affected budget so following requests wait for a refill.
+        """
+        budget = self._budget_for(priority)
+        with self._lock:
+            self._buckets[budget].drain()
+        logger.warning(f"{self.name}: broker reported exceeded {budget} allowance, backing off")
+
+    def get_stats(self) -> dict:
+        """
+        Get remaining budget and throttling counters.
+
+        Returns:
+            Dictionary with per-budget remaining/capacity/rate and the
+            throttled and rejected request counts.
+        """
+        with self._lock:
+            budgets = {
+                budget: {
+                    'remaining': round(bucket.remaining, 2),
+                    'capacity': bucket.capacity,
+                    'per_minute': round(bucket.rate_per_second * 60, 2),
+                }
+                for budget, bucket in self._buckets.items()
+            }
+            return {
+                'name': self.name,
+                'budgets': budgets,
+                'throttled': self._throttled,
+                'rejected': self._rejected,
+            }
+
+
+_rate_limiters: Dict[str, BrokerRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limit_settings(broker: str) -> dict:
+    limits = dict(DEFAULT_RATE_LIMITS.get(broker, DEFAULT_RATE_LIMITS['IG']))
+    try:
+        from django.conf import settings
+        limits.update(getattr(settings, 'BROKER_RATE_LIMITS', {}).get(broker, {}))
+    except Exception:
+        pass
+    return limits
+
+
+def get_rate_limiter(broker: str, account: str) -> BrokerRateLimiter:
+    """
+    Get the shared rate limiter of a broker account.
+
+    Budgets come from BROKER_RATE_LIMITS in Django settings, e.g.
+    ``{'IG': {'TRADING_PER_MINUTE': 30, 'HISTORY_PER_MINUTE': 10}}``.
+
+    Args:
+        broker: Broker identifier ('IG', 'MEXC').
+        account: Account identifier (username or API key).
+
+    Returns:
+        BrokerRateLimiter shared by all clients of the account.
+    """
+    key = f"{broker}:{account}"
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limits = _get_rate_limit_settings(broker)
+            limiter = BrokerRateLimiter(
+                name=f"{broker}:{account[-4:]}" if broker == 'MEXC' else key,
+                trading_per_minute=float(limits['TRADING_PER_MINUTE']),
+                history_per_minute=float(limits['HISTORY_PER_MINUTE']),
+            )
+            _rate_limiters[key] = limiter
+        return limiter
+
+
+def get_rate_limit_stats() -> list:
+    """Get the stats of all rate limiters created in this process."""
+    with _rate_limiters_lock:
+        limiters = list(_rate_limiters.values())
+    return [limiter.get_stats() for limiter in limiters]
+
+
+def reset_rate_limiters() -> None:
+    """Drop all shared rate limiters (useful for testing)."""
+    with _rate_limiters_lock:
+        _rate_limiters.clear()
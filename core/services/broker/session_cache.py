@@ -0,0 +1,219 @@
+"""
+Shared IG session cache.
+
+Web views, the worker and scripts each create their own IgApiClient and
+would log in to IG separately. IgSessionCache keeps the current session
+tokens in Redis (Fernet-encrypted) so other processes reuse a valid
+CST/X-SECURITY-TOKEN (or OAuth token pair) instead of logging in again.
+Logins of the same account are serialized with a Redis lock, so a cold
+start of several processes results in a single login.
+"""
+import base64
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from .ig_api_client import IgSession
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_CACHE_PREFIX = "broker:session:ig"
+
+# OAuth entries outlive their access token so other processes can still use the refresh token
+OAUTH_REFRESH_GRACE_SECONDS = 300
+
+# Upper bound for holding the login lock, and for waiting on another process' login
+LOGIN_LOCK_TIMEOUT_SECONDS = 30
+LOGIN_LOCK_WAIT_SECONDS = 15
+
+
+def derive_encryption_key(secret: str) -> bytes:
+    """Derive a Fernet key from an arbitrary secret (e.g. Django's SECRET_KEY)."""
+    digest = hashlib.sha256(f"ig-session-cache:{secret}".encode("utf-8")).digest()
+    return base64.urlsafe_b64encode(digest)
+
+
+def _default_redis_client():
+    """Redis client on the shared market data connection pool."""
+    import redis
+    from core.services.market_data.market_data_config import RedisConfig
+    from core.services.market_data.redis_candle_store import get_connection_pool
+
+    return redis.Redis(connection_pool=get_connection_pool(RedisConfig.from_django_settings()))
+
+
+class IgSessionCache:
+    """
+    Redis-backed, encrypted cache of IG sessions keyed by account scope.
+
+    Entries expire with the session (see IgSession.expires_at). Redis
+    errors are logged and treated as cache misses, so an unavailable
+    Redis only costs a regular login.
+
+    Usage:
+        cache = IgSessionCache.from_settings()
+        client = IgApiClient(..., session_cache=cache)
+        client.login()  # reuses a cached session if one is valid
+    """
+
+    def __init__(
+        self,
+        encryption_key: bytes,
+        redis_client_factory: Callable[[], Any] = _default_redis_client,
+        key_prefix: str = DEFAULT_SESSION_CACHE_PREFIX,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            encryption_key: Fernet key (urlsafe base64, 32 bytes).
+            redis_client_factory: Returns the Redis client to use.
+            key_prefix: Prefix of the Redis keys.
+        """
+        self._fernet = Fernet(encryption_key)
+        self._redis_client_factory = redis_client_factory
+        self._redis_client = None
+        self._key_prefix = key_prefix
+
+    @classmethod
+    def from_settings(cls) -> Optional['IgSessionCache']:
+        """
+        Create a cache from Django settings.
+
+        Uses BROKER_SESSION_CACHE_ENABLED and BROKER_SESSION_CACHE_KEY
+        (a key derived from SECRET_KEY when empty).
+
+        Returns:
+            IgSessionCache, or None if the cache is disabled.
+        """
+        try:
+            from django.conf import settings
+            if not getattr(settings, 'BROKER_SESSION_CACHE_ENABLED', False):
+                return None
+            key = getattr(settings, 'BROKER_SESSION_CACHE_KEY', '')
+            encryption_key = key.encode("utf-8") if key else derive_encryption_key(settings.SECRET_KEY)
+        except Exception as e:
+            logger.warning(f"IG session cache disabled: {e}")
+            return None
+        return cls(encryption_key)
+
+    def _get_redis(self):
+        if self._redis_client is None:
+            self._redis_client = self._redis_client_factory()
+        return self._redis_client
+
+    def _key(self, scope: str) -> str:
+        return f"{self._key_prefix}:{scope}"
+
+    def _encrypt(self, session: IgSession) -> bytes:
+        return self._fernet.encrypt(json.dumps(session.to_dict()).encode("utf-8"))
+
+    def _decrypt(self, token: bytes) -> Optional[IgSession]:
+        try:
+            return IgSession.from_dict(json.loads(self._fernet.decrypt(token)))
+        except (InvalidToken, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable cached IG session: {e}")
+            return None
+
+    def get(self, scope: str) -> Optional[IgSession]:
+        """
+        Get the cached session of an account.
+
+        The session may be expired (OAuth entries are kept for a refresh
+        grace period); callers check IgSession.is_expired().
+
+        Args:
+            scope: Account scope (see IgApiClient.session_cache_scope).
+
+        Returns:
+            IgSession, or None if nothing usable is cached.
+        """
+        try:
+            token = self._get_redis().get(self._key(scope))
+        except Exception as e:
+            logger.warning(f"IG session cache read failed: {e}")
+            return None
+        return self._decrypt(token) if token else None
+
+    def set(self, scope: str, session: IgSession) -> None:
+        """
+        Store a session until it expires.
+
+        Args:
+            scope: Account scope.
+            session: Session to share.
+        """
+        ttl = None
+        if session.expires_at is not None:
+            ttl = int((session.expires_at - datetime.now(timezone.utc)).total_seconds())
+            if session.is_oauth:
+                ttl += OAUTH_REFRESH_GRACE_SECONDS
+            if ttl <= 0:
+                return
+
+        try:
+            self._get_redis().set(self._key(scope), self._encrypt(session), ex=ttl)
+        except Exception as e:
+            logger.warning(f"IG session cache write failed: {e}")
+
+    def discard(self, scope: str, cst: str) -> None:
+        """
+        Remove a rejected session, unless another process already replaced it.
+
+        Args:
+            scope: Account scope.
+            cst: Token (CST or OAuth access token) of the rejected session.
+        """
+        import redis
+
+        key = self._key(scope)
+        try:
+            with self._get_redis().pipeline() as pipe:
+                pipe.watch(key)
+                token = pipe.get(key)
+                cached = self._decrypt(token) if token else None
+                if cached is not None and cached.cst != cst:
+                    return
+                pipe.multi()
+                pipe.delete(key)
+                pipe.execute()
+        except redis.WatchError:
+            pass  # Replaced concurrently by a fresh session
+        except Exception as e:
+            logger.warning(f"IG session cache delete failed: {e}")
+
+    @contextmanager
+    def login_lock(self, scope: str) -> Iterator[bool]:
+        """
+        Serialize logins of one account across processes.
+
+        Yields:
+            True if the lock was acquired, False if waiting timed out or
+            Redis is unavailable (the caller logs in anyway).
+        """
+        lock = None
+        acquired = False
+        try:
+            lock = self._get_redis().lock(
+                f"{self._key(scope)}:login",
+                timeout=LOGIN_LOCK_TIMEOUT_SECONDS,
+                blocking_timeout=LOGIN_LOCK_WAIT_SECONDS,
+            )
+            acquired = bool(lock.acquire())
+        except Exception as e:
+            logger.warning(f"IG session login lock unavailable: {e}")
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    lock.release()
+                except Exception as e:
+                    logger.debug(f"IG session login lock release failed: {e}")
@@ -0,0 +1,444 @@
+"""
+Streaming subscription clients for broker price feeds.
+
+SubscriptionClient is the broker-agnostic interface: subscribe to an item
+with a list of fields and receive field updates on a listener.
+WebSocketSubscriptionClient runs one reader thread that reconnects with
+exponential backoff and re-creates all subscriptions after every
+reconnect, so callers subscribe once for the lifetime of the client.
+LightstreamerClient implements the protocol of IG's Lightstreamer server
+(TLCP over a WebSocket).
+"""
+import itertools
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlencode
+
+import websocket
+
+from .broker_service import BrokerError
+
+
+logger = logging.getLogger(__name__)
+
+# Reconnect backoff (seconds)
+RECONNECT_INITIAL_DELAY_SECONDS = 1.0
+RECONNECT_MAX_DELAY_SECONDS = 30.0
+
+# TLCP protocol constants
+TLCP_SUBPROTOCOL = "TLCP-2.1.0.lightstreamer.com"
+TLCP_CID = "mgQkwtwdysogQz2BJ4Ji kOj2Bg"
+
+# Listener signature: (item name, {field: value})
+UpdateListener = Callable[[str, Dict[str, Any]], None]
+
+
+@dataclass
+class Subscription:
+    """A subscription kept by a SubscriptionClient across reconnects."""
+    sub_id: int
+    item: str
+    fields: List[str]
+    mode: str
+    listener: UpdateListener
+
+
+class SubscriptionClient(ABC):
+    """
+    Abstract streaming subscription client.
+
+    Implementations keep their subscriptions across reconnects and
+    deliver updates from a background thread.
+    """
+
+    @abstractmethod
+    def connect(self) -> None:
+        """Start the connection (returns immediately, connects in background)."""
+        pass
+
+    @abstractmethod
+    def disconnect(self) -> None:
+        """Close the connection and stop reconnecting."""
+        pass
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """Check whether a streaming session is currently established."""
+        pass
+
+    @abstractmethod
+    def subscribe(
+        self,
+        item: str,
+        fields: List[str],
+        listener: UpdateListener,
+        mode: str = "MERGE",
+    ) -> int:
+        """
+        Subscribe to an item.
+
+        Args:
+            item: Item name (e.g., 'CHART:CS.D.EURUSD.MINI.IP:TICK').
+            fields: Field names to receive.
+            listener: Called with (item, {field: value}) for every update.
+            mode: Subscription mode ('MERGE', 'DISTINCT', ...).
+
+        Returns:
+            Subscription ID.
+        """
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, sub_id: int) -> None:
+        """Remove a subscription."""
+        pass
+
+
+def decode_tlcp_value(raw: str, previous: Optional[str]) -> Optional[str]:
+    """
+    Decode one field of a TLCP update.
+
+    Empty means unchanged, '#' is null, '$' is the empty string,
+    everything else is percent-encoded.
+    """
+    if raw == "":
+        return previous
+    if raw == "#":
+        return None
+    if raw == "$":
+        return ""
+    return unquote(raw)
+
+
+class WebSocketSubscriptionClient(SubscriptionClient):
+    """
+    Base class for subscription clients on a single WebSocket.
+
+    Subclasses implement the protocol: opening a session, sending
+    (un)subscribe requests and handling incoming messages. Raising from
+    _handle_message() drops the connection and triggers a reconnect.
+    """
+
+    # Seconds without incoming data before _send_keepalive() is called (None = never)
+    keepalive_interval: Optional[float] = None
+
+    def __init__(
+        self,
+        url: str,
+        name: str,
+        subprotocols: Optional[List[str]] = None,
+        connect_timeout: float = 10.0,
+        connection_factory: Optional[Callable[..., websocket.WebSocket]] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            url: WebSocket URL.
+            name: Label used for the reader thread and logs.
+            subprotocols: WebSocket subprotocols to request.
+            connect_timeout: Socket timeout for connecting.
+            connection_factory: Creates the WebSocket (defaults to
+                websocket.create_connection).
+        """
+        self._url = url
+        self._name = name
+        self._subprotocols = subprotocols
+        self._connect_timeout = connect_timeout
+        self._connection_factory = connection_factory or websocket.create_connection
+
+        self._subscriptions: Dict[int, Subscription] = {}
+        self._sub_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+        self._ws: Optional[websocket.WebSocket] = None
+        self._connected = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def connect(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def disconnect(self) -> None:
+        self._stop.set()
+        self._close_socket()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def subscribe(
+        self,
+        item: str,
+        fields: List[str],
+        listener: UpdateListener,
+        mode: str = "MERGE",
+    ) -> int:
+        subscription = Subscription(
+            sub_id=next(self._sub_ids),
+            item=item,
+            fields=list(fields),
+            mode=mode,
+            listener=listener,
+        )
+        with self._lock:
+            self._subscriptions[subscription.sub_id] = subscription
+
+        if self.is_connected():
+            self._send_subscribe(subscription)
+        return subscription.sub_id
+
+    def unsubscribe(self, sub_id: int) -> None:
+        with self._lock:
+            subscription = self._subscriptions.pop(sub_id, None)
+
+        if subscription is not None and self.is_connected():
+            self._send_unsubscribe(subscription)
+
+    # Protocol hooks
+
+    def _open_session(self) -> None:
+        """Perform the protocol handshake after the WebSocket is open."""
+        pass
+
+    def _handle_message(self, message: str) -> None:
+        """Handle one incoming text message."""
+        raise NotImplementedError
+
+    def _send_subscribe(self, subscription: Subscription) -> None:
+        raise NotImplementedError
+
+    def _send_unsubscribe(self, subscription: Subscription) -> None:
+        raise NotImplementedError
+
+    def _send_keepalive(self) -> None:
+        pass
+
+    # Connection loop
+
+    def _run(self) -> None:
+        """Connect, stream and reconnect with backoff until disconnect()."""
+        delay = RECONNECT_INITIAL_DELAY_SECONDS
+        while not self._stop.is_set():
+            try:
+                self._ws = self._connection_factory(
+                    self._url,
+                    subprotocols=self._subprotocols,
+                    timeout=self._connect_timeout,
+                )
+                self._ws.settimeout(self.keepalive_interval)
+                self._open_session()
+                self._connected = True
+                self._resubscribe()
+                delay = RECONNECT_INITIAL_DELAY_SECONDS
+                self._read_loop()
+            except Exception as e:
+                if not self._stop.is_set():
+                    logger.warning(f"{self._name} connection lost: {e}")
+            finally:
+                self._connected = False
+                self._on_disconnected()
+                self._close_socket()
+
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+
+    def _on_disconnected(self) -> None:
+        """Reset per-connection protocol state."""
+        pass
+
+    def _resubscribe(self) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.values())
+        for subscription in subscriptions:
+            self._send_subscribe(subscription)
+
+    def _read_loop(self) -> None:
+        while not self._stop.is_set():
+            self._handle_message(self._recv())
+
+    def _recv(self) -> str:
+        """Receive one text message, sending keepalives while the line is idle."""
+        while True:
+            try:
+                message = self._ws.recv()
+            except websocket.WebSocketTimeoutException:
+                self._send_keepalive()
+                continue
+            if not message:
+                raise BrokerError(f"{self._name} connection closed by server")
+            if isinstance(message, bytes):
+                message = message.decode('utf-8')
+            return message
+
+    def _send_text(self, text: str) -> None:
+        with self._send_lock:
+            if self._ws is None:
+                return
+            self._ws.send(text)
+
+    def _deliver(self, subscription: Subscription, values: Dict[str, Any]) -> None:
+        """Pass an update to the subscription's listener."""
+        try:
+            subscription.listener(subscription.item, values)
+        except Exception as e:
+            logger.error(f"Error in streaming listener for {subscription.item}: {e}")
+
+    def _close_socket(self) -> None:
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+
+class LightstreamerClient(WebSocketSubscriptionClient):
+    """
+    Minimal Lightstreamer (TLCP over WebSocket) subscription client.
+
+    Usage:
+        client = LightstreamerClient(
+            endpoint='https://demo-apd.marketdatasystems.com',
+            credentials=lambda: (account_id, f'CST-{cst}|XST-{xst}'),
+        )
+        client.subscribe('CHART:CS.D.EURUSD.MINI.IP:TICK', ['BID', 'OFR', 'UTM'], on_update, mode='DISTINCT')
+        client.connect()
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        credentials: Callable[[], Tuple[str, str]],
+        adapter_set: str = "DEFAULT",
+        connect_timeout: float = 10.0,
+        connection_factory: Optional[Callable[..., websocket.WebSocket]] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            endpoint: Lightstreamer server URL (http(s) or ws(s)).
+            credentials: Returns (user, password); called on every
+                (re)connect so refreshed session tokens are picked up.
+            adapter_set: Lightstreamer adapter set.
+            connect_timeout: Socket timeout for connecting.
+            connection_factory: Creates the WebSocket (defaults to
+                websocket.create_connection).
+        """
+        url = endpoint.rstrip('/')
+        if url.startswith('http'):
+            url = 'ws' + url[len('http'):]
+        super().__init__(
+            url=f"{url}/lightstreamer",
+            name="LightstreamerClient",
+            subprotocols=[TLCP_SUBPROTOCOL],
+            connect_timeout=connect_timeout,
+            connection_factory=connection_factory,
+        )
+        self._credentials = credentials
+        self._adapter_set = adapter_set
+        self._values: Dict[int, List[Optional[str]]] = {}
+        self._req_ids = itertools.count(1)
+        self._session_id: Optional[str] = None
+
+    @property
+    def session_id(self) -> Optional[str]:
+        """Current Lightstreamer session ID (None if not connected)."""
+        return self._session_id
+
+    def unsubscribe(self, sub_id: int) -> None:
+        super().unsubscribe(sub_id)
+        with self._lock:
+            self._values.pop(sub_id, None)
+
+    def _open_session(self) -> None:
+        """Create a session and wait for CONOK (skipping WSOK/PROBE)."""
+        user, password = self._credentials()
+        self._send("create_session", {
+            "LS_cid": TLCP_CID,
+            "LS_adapter_set": self._adapter_set,
+            "LS_user": user,
+            "LS_password": password,
+        })
+
+        while True:
+            for line in self._split_lines(self._recv()):
+                fields = line.split(",")
+                if fields[0] == "CONOK":
+                    self._session_id = fields[1]
+                    with self._lock:
+                        self._values.clear()
+                    logger.info(f"Lightstreamer session {self._session_id} established")
+                    return
+                if fields[0] in ("CONERR", "END"):
+                    raise BrokerError(f"Lightstreamer session refused: {line}", code=fields[0])
+
+    def _on_disconnected(self) -> None:
+        self._session_id = None
+
+    def _handle_message(self, message: str) -> None:
+        for line in self._split_lines(message):
+            self._handle_line(line)
+
+    @staticmethod
+    def _split_lines(message: str) -> List[str]:
+        return [line for line in message.split("\r\n") if line]
+
+    def _handle_line(self, line: str) -> None:
+        fields = line.split(",", 3)
+        kind = fields[0]
+
+        if kind == "U":
+            self._handle_update(int(fields[1]), fields[3] if len(fields) > 3 else "")
+        elif kind in ("LOOP", "END", "CONERR"):
+            raise BrokerError(f"Lightstreamer session closed: {line}", code=kind)
+        elif kind in ("REQERR", "ERROR"):
+            logger.warning(f"Lightstreamer request failed: {line}")
+        # PROBE, NOOP, REQOK, SUBOK, SYNC, ... need no action
+
+    def _handle_update(self, sub_id: int, payload: str) -> None:
+        with self._lock:
+            subscription = self._subscriptions.get(sub_id)
+            if subscription is None:
+                return
+            previous = self._values.get(sub_id) or [None] * len(subscription.fields)
+            raw_values = payload.split("|")
+            values = [
+                decode_tlcp_value(raw, previous[i] if i < len(previous) else None)
+                for i, raw in enumerate(raw_values)
+            ]
+            self._values[sub_id] = values
+
+        self._deliver(subscription, dict(zip(subscription.fields, values)))
+
+    def _send(self, request: str, params: dict) -> None:
+        self._send_text(f"{request}\r\n{urlencode(params, quote_via=quote)}")
+
+    def _send_control(self, params: dict) -> None:
+        self._send("control", {"LS_reqId": next(self._req_ids), **params})
+
+    def _send_subscribe(self, subscription: Subscription) -> None:
+        self._send_control({
+            "LS_op": "add",
+            "LS_subId": subscription.sub_id,
+            "LS_mode": subscription.mode,
+            "LS_group": subscription.item,
+            "LS_schema": " ".join(subscription.fields),
+            "LS_snapshot": "false",
+        })
+
+    def _send_unsubscribe(self, subscription: Subscription) -> None:
+        self._send_control({"LS_op": "delete", "LS_subId": subscription.sub_id})
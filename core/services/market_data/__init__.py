@@ -36,22 +36,56 @@ from .market_data_config import (
     SUPPORTED_WINDOW_HOURS,
     DEFAULT_TIMEFRAME,
     DEFAULT_WINDOW_HOURS,
+    BUFFER_MODE_DEQUE,
+    BUFFER_MODE_COLUMNAR,
+    MEMBER_ENCODING_JSON,
+    MEMBER_ENCODING_BINARY,
 )
 
 from .redis_candle_store import (
     RedisCandleStore,
     get_candle_store,
     reset_candle_store,
+    get_connection_pool,
+    reset_connection_pools,
+    encode_candle_update,
+    decode_candle_update,
+)
+
+from .candle_buffer import (
+    CandleArrays,
+    DequeCandleBuffer,
+    ColumnarCandleBuffer,
 )
 
 from .candle_stream import CandleStream
 
+from .candle_pubsub import CandleUpdateSubscriber
+
+from .timeframe_aggregator import (
+    TimeframeAggregator,
+    aggregate_candles,
+    BASE_TIMEFRAME,
+)
+
 from .market_data_stream_manager import (
     MarketDataStreamManager,
     get_stream_manager,
     get_candles_for_asset,
 )
 
+from .tick_aggregator import TickCandleAggregator
+
+from .ig_stream_ingestor import IgStreamIngestor
+
+from .mexc_kline_ingestor import MexcKlineIngestor
+
+from .history_backfill import (
+    HistoryBackfill,
+    BackfillResult,
+    split_windows,
+)
+
 
 __all__ = [
     # Candle models
@@ -71,17 +105,48 @@ __all__ = [
     'SUPPORTED_WINDOW_HOURS',
     'DEFAULT_TIMEFRAME',
     'DEFAULT_WINDOW_HOURS',
+    'BUFFER_MODE_DEQUE',
+    'BUFFER_MODE_COLUMNAR',
+    'MEMBER_ENCODING_JSON',
+    'MEMBER_ENCODING_BINARY',
     
     # Redis store
     'RedisCandleStore',
     'get_candle_store',
     'reset_candle_store',
+    'get_connection_pool',
+    'reset_connection_pools',
+    'encode_candle_update',
+    'decode_candle_update',
+    
+    # Candle buffers
+    'CandleArrays',
+    'DequeCandleBuffer',
+    'ColumnarCandleBuffer',
     
     # Candle stream
     'CandleStream',
     
+    # Cross-process updates
+    'CandleUpdateSubscriber',
+    
+    # Timeframe aggregation
+    'TimeframeAggregator',
+    'aggregate_candles',
+    'BASE_TIMEFRAME',
+    
     # Stream manager
     'MarketDataStreamManager',
     'get_stream_manager',
     'get_candles_for_asset',
+    
+    # Streaming ingestion
+    'TickCandleAggregator',
+    'IgStreamIngestor',
+    'MexcKlineIngestor',
+    
+    # Historical backfill
+    'HistoryBackfill',
+    'BackfillResult',
+    'split_windows',
 ]
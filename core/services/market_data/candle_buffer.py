@@ -0,0 +1,384 @@
+"""
+Candle buffers for the Market Data Layer.
+
+Provides the in-memory storage backends used by CandleStream:
+- DequeCandleBuffer: list of Candle objects in a bounded deque
+- ColumnarCandleBuffer: preallocated NumPy columns with a ring head pointer
+
+The columnar buffer keeps timestamps sorted, so time-window queries are a
+binary search and return zero-copy views instead of copied lists.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .candle_models import Candle
+from .market_data_config import BUFFER_MODE_DEQUE, BUFFER_MODE_COLUMNAR
+
+# Sentinel for missing trade counts in the int64 column
+NO_TRADE_COUNT = -1
+
+
+@dataclass
+class CandleArrays:
+    """
+    Columnar view of a candle series.
+
+    All arrays have the same length and are ordered by timestamp ascending.
+    Missing volumes are NaN, missing trade counts are -1.
+
+    Arrays returned by ColumnarCandleBuffer are views into the live buffer
+    and change with the next write; CandleStream hands out copies.
+
+    Attributes:
+        timestamp: Unix timestamps in seconds (int64)
+        open: Opening prices (float64)
+        high: Highest prices (float64)
+        low: Lowest prices (float64)
+        close: Closing prices (float64)
+        volume: Volumes (float64, NaN if unknown)
+        trade_count: Trade counts (int64, -1 if unknown)
+        complete: Completion flags (bool)
+    """
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    trade_count: np.ndarray
+    complete: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def from_candles(cls, candles: List[Candle]) -> 'CandleArrays':
+        """Build (copied) columns from a list of Candle objects."""
+        return cls(
+            timestamp=np.array([c.timestamp for c in candles], dtype=np.int64),
+            open=np.array([c.open for c in candles], dtype=np.float64),
+            high=np.array([c.high for c in candles], dtype=np.float64),
+            low=np.array([c.low for c in candles], dtype=np.float64),
+            close=np.array([c.close for c in candles], dtype=np.float64),
+            volume=np.array(
+                [np.nan if c.volume is None else c.volume for c in candles],
+                dtype=np.float64,
+            ),
+            trade_count=np.array(
+                [NO_TRADE_COUNT if c.trade_count is None else c.trade_count for c in candles],
+                dtype=np.int64,
+            ),
+            complete=np.array([c.complete for c in candles], dtype=bool),
+        )
+
+    def copy(self) -> 'CandleArrays':
+        """Copy the columns (e.g. to detach them from a live buffer)."""
+        return CandleArrays(*(np.array(column, copy=True) for column in (
+            self.timestamp, self.open, self.high, self.low,
+            self.close, self.volume, self.trade_count, self.complete,
+        )))
+
+    def to_candles(self) -> List[Candle]:
+        """Materialize the columns as a list of Candle objects."""
+        volumes = self.volume.tolist()
+        trade_counts = self.trade_count.tolist()
+        return [
+            Candle(
+                timestamp=ts,
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=None if v != v else v,  # NaN check
+                trade_count=None if tc == NO_TRADE_COUNT else tc,
+                complete=done,
+            )
+            for ts, o, h, l, c, v, tc, done in zip(
+                self.timestamp.tolist(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                volumes,
+                trade_counts,
+                self.complete.tolist(),
+            )
+        ]
+
+
+class DequeCandleBuffer:
+    """
+    Bounded deque of Candle objects.
+
+    Keeps candles in arrival order; only a candle matching the last
+    timestamp replaces the last entry.
+    """
+
+    def __init__(self, capacity: int):
+        self._candles: deque = deque(maxlen=capacity)
+
+    def append(self, candle: Candle) -> None:
+        """Append a candle, replacing the last one if timestamps match."""
+        if self._candles and self._candles[-1].timestamp == candle.timestamp:
+            self._candles[-1] = candle
+        else:
+            self._candles.append(candle)
+
+    def extend(self, candles: List[Candle]) -> None:
+        """Append multiple candles."""
+        for candle in candles:
+            self.append(candle)
+
+    def get_recent(
+        self,
+        min_timestamp: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> List[Candle]:
+        """Get candles newer than min_timestamp, limited to the last count."""
+        candles = list(self._candles)
+
+        if min_timestamp is not None:
+            candles = [c for c in candles if c.timestamp >= min_timestamp]
+
+        if count is not None:
+            candles = candles[-count:]
+
+        return candles
+
+    def get_recent_arrays(
+        self,
+        min_timestamp: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> CandleArrays:
+        """Get recent candles as (copied) columns."""
+        return CandleArrays.from_candles(self.get_recent(min_timestamp, count))
+
+    def get_range_arrays(self, start_timestamp: int, end_timestamp: int) -> CandleArrays:
+        """Get candles with start <= timestamp < end as (copied) columns."""
+        return CandleArrays.from_candles(sorted(
+            (c for c in self._candles if start_timestamp <= c.timestamp < end_timestamp),
+            key=lambda c: c.timestamp,
+        ))
+
+    def get_latest_complete(self) -> Optional[Candle]:
+        """Get the most recent complete candle."""
+        for candle in reversed(self._candles):
+            if candle.complete:
+                return candle
+        return None
+
+    def clear(self) -> None:
+        """Remove all candles."""
+        self._candles.clear()
+
+    def __len__(self) -> int:
+        return len(self._candles)
+
+
+class ColumnarCandleBuffer:
+    """
+    Ring buffer of candles stored as parallel NumPy columns.
+
+    Every slot is written twice (at ``i`` and ``i + capacity``), so the
+    logical window oldest→newest is always one contiguous slice of the
+    backing arrays and can be handed out as a view without copying.
+
+    Timestamps are kept sorted ascending:
+    - a candle with the last timestamp replaces the last slot (O(1))
+    - a newer candle is written at the head pointer (O(1))
+    - an older candle replaces its existing slot or is inserted (O(n), rare)
+
+    Not thread-safe; CandleStream guards access with its own lock.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self._capacity = capacity
+        size = capacity * 2
+        self._timestamp = np.zeros(size, dtype=np.int64)
+        self._open = np.zeros(size, dtype=np.float64)
+        self._high = np.zeros(size, dtype=np.float64)
+        self._low = np.zeros(size, dtype=np.float64)
+        self._close = np.zeros(size, dtype=np.float64)
+        self._volume = np.full(size, np.nan, dtype=np.float64)
+        self._trade_count = np.full(size, NO_TRADE_COUNT, dtype=np.int64)
+        self._complete = np.ones(size, dtype=bool)
+
+        self._head = 0  # Next slot to write, in [0, capacity)
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of candles kept."""
+        return self._capacity
+
+    def _columns(self) -> tuple:
+        return (
+            self._timestamp,
+            self._open,
+            self._high,
+            self._low,
+            self._close,
+            self._volume,
+            self._trade_count,
+            self._complete,
+        )
+
+    def _window(self) -> slice:
+        """Slice of the backing arrays holding the logical window."""
+        end = self._head + self._capacity
+        return slice(end - self._size, end)
+
+    @staticmethod
+    def _row_values(candle: Candle) -> tuple:
+        """Column values for a candle, in _columns() order."""
+        return (
+            int(candle.timestamp),
+            candle.open,
+            candle.high,
+            candle.low,
+            candle.close,
+            np.nan if candle.volume is None else candle.volume,
+            NO_TRADE_COUNT if candle.trade_count is None else candle.trade_count,
+            candle.complete,
+        )
+
+    def _write_slot(self, slot: int, candle: Candle) -> None:
+        mirror = slot + self._capacity
+        for column, value in zip(self._columns(), self._row_values(candle)):
+            column[slot] = value
+            column[mirror] = value
+
+    def _last_slot(self) -> int:
+        return (self._head - 1) % self._capacity
+
+    def append(self, candle: Candle) -> None:
+        """Append a candle, keeping timestamps sorted and unique."""
+        timestamp = int(candle.timestamp)
+
+        if self._size == 0 or timestamp > self._timestamp[self._last_slot()]:
+            self._write_slot(self._head, candle)
+            self._head = (self._head + 1) % self._capacity
+            self._size = min(self._size + 1, self._capacity)
+            return
+
+        if timestamp == self._timestamp[self._last_slot()]:
+            self._write_slot(self._last_slot(), candle)
+            return
+
+        # Out-of-order candle (e.g. overlapping backfill)
+        window = self._window()
+        timestamps = self._timestamp[window]
+        index = int(np.searchsorted(timestamps, timestamp))
+
+        if timestamps[index] == timestamp:
+            slot = (window.start + index) % self._capacity
+            self._write_slot(slot, candle)
+        elif not (index == 0 and self._size == self._capacity):
+            # Older than everything in a full buffer would be evicted at once
+            self._insert(index, candle)
+
+    def _insert(self, index: int, candle: Candle) -> None:
+        """Insert a candle at a logical position by rewriting the window."""
+        window = self._window()
+        merged = [
+            np.insert(column[window], index, value)[-self._capacity:]
+            for column, value in zip(self._columns(), self._row_values(candle))
+        ]
+
+        size = len(merged[0])
+        for column, values in zip(self._columns(), merged):
+            column[:size] = values
+            column[self._capacity:self._capacity + size] = values
+
+        self._size = size
+        self._head = size % self._capacity
+
+    def extend(self, candles: List[Candle]) -> None:
+        """Append multiple candles."""
+        for candle in candles:
+            self.append(candle)
+
+    def get_recent_arrays(
+        self,
+        min_timestamp: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> CandleArrays:
+        """
+        Get recent candles as zero-copy column views.
+
+        Args:
+            min_timestamp: Only include candles at or after this timestamp
+            count: Maximum number of candles (from most recent)
+        """
+        window = self._window()
+        start = 0
+
+        if min_timestamp is not None:
+            start = int(np.searchsorted(self._timestamp[window], min_timestamp, side='left'))
+
+        if count is not None:
+            start = max(start, self._size - count)
+
+        view = slice(window.start + start, window.stop)
+        return CandleArrays(*(column[view] for column in self._columns()))
+
+    def get_range_arrays(self, start_timestamp: int, end_timestamp: int) -> CandleArrays:
+        """Get candles with start <= timestamp < end as zero-copy column views."""
+        window = self._window()
+        timestamps = self._timestamp[window]
+        start = int(np.searchsorted(timestamps, start_timestamp, side='left'))
+        end = int(np.searchsorted(timestamps, end_timestamp, side='left'))
+
+        view = slice(window.start + start, window.start + end)
+        return CandleArrays(*(column[view] for column in self._columns()))
+
+    def get_recent(
+        self,
+        min_timestamp: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> List[Candle]:
+        """Get recent candles as Candle objects (only the window is materialized)."""
+        return self.get_recent_arrays(min_timestamp, count).to_candles()
+
+    def get_latest_complete(self) -> Optional[Candle]:
+        """Get the most recent complete candle."""
+        window = self._window()
+        complete_indices = np.flatnonzero(self._complete[window])
+        if len(complete_indices) == 0:
+            return None
+
+        position = window.start + int(complete_indices[-1])
+        row = slice(position, position + 1)
+        return CandleArrays(*(column[row] for column in self._columns())).to_candles()[0]
+
+    def clear(self) -> None:
+        """Remove all candles."""
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def create_candle_buffer(mode: str, capacity: int):
+    """
+    Create a candle buffer for the given mode.
+
+    Args:
+        mode: BUFFER_MODE_DEQUE or BUFFER_MODE_COLUMNAR
+        capacity: Maximum number of candles to keep
+
+    Returns:
+        DequeCandleBuffer or ColumnarCandleBuffer
+    """
+    if mode == BUFFER_MODE_COLUMNAR:
+        return ColumnarCandleBuffer(capacity)
+    if mode == BUFFER_MODE_DEQUE:
+        return DequeCandleBuffer(capacity)
+    raise ValueError(f"Unsupported candle buffer mode: {mode}")
@@ -0,0 +1,140 @@
+"""
+Cross-process candle fan-out for the Market Data Layer.
+
+Whichever process writes completed candles to Redis publishes them on the
+updates channel (see RedisCandleStore). Every other process runs a
+CandleUpdateSubscriber that applies them to its in-memory streams, so web
+workers stay live without polling Redis or the broker themselves.
+"""
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from .candle_models import Candle
+from .market_data_config import RedisConfig, get_market_data_config
+from .redis_candle_store import (
+    RECONNECT_BACKOFF_INITIAL_SECONDS,
+    decode_candle_update,
+    get_connection_pool,
+    process_origin,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds to block waiting for a message before checking for shutdown
+SUBSCRIBER_POLL_TIMEOUT_SECONDS = 1.0
+
+# Handler signature: (asset_id, timeframe, candles)
+CandleUpdateHandler = Callable[[str, str, List[Candle]], None]
+
+
+class CandleUpdateSubscriber:
+    """
+    Background subscriber for published candle updates.
+    
+    Runs a daemon thread that listens on the updates channel and passes
+    decoded candles to a handler. Updates published by the own process are
+    skipped. Lost connections are retried with exponential backoff.
+    
+    Usage:
+        subscriber = CandleUpdateSubscriber(handler)
+        subscriber.start()
+        ...
+        subscriber.stop()
+    """
+    
+    def __init__(
+        self,
+        handler: CandleUpdateHandler,
+        config: Optional[RedisConfig] = None,
+    ):
+        """
+        Initialize the subscriber.
+        
+        Args:
+            handler: Called with (asset_id, timeframe, candles) per update
+            config: Redis configuration
+        """
+        self._handler = handler
+        self._config = config or get_market_data_config().redis
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def is_running(self) -> bool:
+        """Check whether the subscriber thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Start the subscriber thread (no-op if already running)."""
+        if self.is_running:
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name='candle-update-subscriber',
+            daemon=True,
+        )
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Signal the subscriber thread to stop."""
+        self._stop_event.set()
+        self._thread = None
+    
+    def _run(self) -> None:
+        """Subscribe and dispatch messages until stopped."""
+        backoff = RECONNECT_BACKOFF_INITIAL_SECONDS
+        
+        while not self._stop_event.is_set():
+            pubsub = None
+            try:
+                import redis
+                
+                client = redis.Redis(connection_pool=get_connection_pool(self._config))
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._config.updates_channel)
+                logger.info(f"Subscribed to candle updates on {self._config.updates_channel}")
+                backoff = RECONNECT_BACKOFF_INITIAL_SECONDS
+                
+                while not self._stop_event.is_set():
+                    message = pubsub.get_message(timeout=SUBSCRIBER_POLL_TIMEOUT_SECONDS)
+                    if message and message.get('type') == 'message':
+                        self.dispatch(message['data'])
+            except Exception as e:
+                logger.warning(f"Candle update subscription failed, retrying in {backoff:.0f}s: {e}")
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, self._config.reconnect_backoff_max)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+    
+    def dispatch(self, payload: bytes) -> bool:
+        """
+        Decode an update and pass it to the handler.
+        
+        Args:
+            payload: Raw message data
+            
+        Returns:
+            True if the handler was called, False if the update was skipped
+        """
+        try:
+            origin, asset_id, timeframe, candles = decode_candle_update(payload)
+        except Exception as e:
+            logger.warning(f"Ignoring malformed candle update: {e}")
+            return False
+        
+        if origin == process_origin() or not candles:
+            return False
+        
+        try:
+            self._handler(asset_id, timeframe, candles)
+        except Exception as e:
+            logger.error(f"Error applying candle update for {asset_id}/{timeframe}: {e}")
+        return True
@@ -5,14 +5,14 @@ Provides a ring buffer for recent candles with automatic persistence to Redis.
 Used by the MarketDataStreamManager for each asset/timeframe pair.
 """
 import logging
-from collections import deque
 from datetime import datetime, timedelta, timezone
 from threading import Lock
 from typing import List, Optional, Callable
 
 from .candle_models import Candle, CandleStreamStatus, DataStatus
+from .candle_buffer import CandleArrays, ColumnarCandleBuffer, create_candle_buffer
 from .redis_candle_store import RedisCandleStore, get_candle_store
-from .market_data_config import TimeframeConfig
+from .market_data_config import TimeframeConfig, BUFFER_MODE_DEQUE
 
 
 logger = logging.getLogger(__name__)
@@ -23,7 +23,7 @@ class CandleStream:
     In-memory ring buffer for candles with Redis persistence.
     
     Features:
-    - Fixed-size ring buffer for recent candles
+    - Fixed-size ring buffer for recent candles (deque or NumPy columnar)
     - Thread-safe operations
     - Automatic persistence to Redis on append
     - Lazy loading from Redis on first access
@@ -33,6 +33,11 @@ class CandleStream:
         stream = CandleStream('OIL', '1m', broker='IG')
         stream.append(candle)
         candles = stream.get_recent(hours=6)
+        
+        # Columnar mode: NumPy columns without Candle objects
+        stream = CandleStream('OIL', '1m', broker='IG', buffer_mode='columnar')
+        arrays = stream.get_recent_arrays(hours=6)
+        closes = arrays.close
     """
     
     def __init__(
@@ -43,6 +48,8 @@ class CandleStream:
         max_candles: int = 1440,
         store: Optional[RedisCandleStore] = None,
         on_new_candle: Optional[Callable[[Candle], None]] = None,
+        buffer_mode: str = BUFFER_MODE_DEQUE,
+        persistent: bool = True,
     ):
         """
         Initialize the candle stream.
@@ -54,6 +61,9 @@ class CandleStream:
             max_candles: Maximum number of candles to keep in memory
             store: Redis store instance (uses singleton if not provided)
             on_new_candle: Optional callback for new candles
+            buffer_mode: In-memory buffer type ('deque' or 'columnar')
+            persistent: Whether the stream loads from and writes to Redis
+                       (False for streams derived from another stream)
         """
         self._asset_id = asset_id
         self._timeframe = timeframe
@@ -61,8 +71,10 @@ class CandleStream:
         self._max_candles = max_candles
         self._store = store or get_candle_store()
         self._on_new_candle = on_new_candle
+        self._persistent = persistent
+        self._listeners: List[Callable[[List[Candle]], None]] = []
         
-        self._buffer: deque = deque(maxlen=max_candles)
+        self._buffer = create_candle_buffer(buffer_mode, max_candles)
         self._lock = Lock()
         self._status: DataStatus = 'OFFLINE'
         self._last_update: Optional[datetime] = None
@@ -85,6 +97,16 @@ class CandleStream:
         """Get the broker providing data."""
         return self._broker
     
+    @property
+    def max_candles(self) -> int:
+        """Get the buffer capacity."""
+        return self._max_candles
+    
+    @property
+    def persistent(self) -> bool:
+        """Whether the stream is backed by Redis."""
+        return self._persistent
+    
     @property
     def status(self) -> DataStatus:
         """Get the current data status."""
@@ -114,6 +136,28 @@ class CandleStream:
             if value:
                 self._status = 'OFFLINE'
     
+    def add_listener(self, callback: Callable[[List[Candle]], None]) -> None:
+        """
+        Register a callback for buffer updates.
+        
+        Unlike on_new_candle, listeners receive every appended batch
+        (including partial candles and append_many batches). Callbacks run
+        outside the stream lock.
+        
+        Args:
+            callback: Called with the list of candles just appended
+        """
+        with self._lock:
+            self._listeners.append(callback)
+    
+    def _notify_listeners(self, candles: List[Candle]) -> None:
+        """Call registered listeners with appended candles."""
+        for listener in list(self._listeners):
+            try:
+                listener(candles)
+            except Exception as e:
+                logger.error(f"Error in candle stream listener: {e}")
+    
     def _ensure_loaded(self) -> None:
         """Ensure candles are loaded from Redis on first access."""
         if self._loaded:
@@ -123,6 +167,10 @@ class CandleStream:
             if self._loaded:
                 return
             
+            if not self._persistent:
+                self._loaded = True
+                return
+            
             try:
                 # Load from Redis
                 candles = self._store.load_candles(
@@ -157,13 +205,8 @@ class CandleStream:
         self._ensure_loaded()
         
         with self._lock:
-            # Check if this is an update to an existing candle
-            if self._buffer and self._buffer[-1].timestamp == candle.timestamp:
-                # Update the last candle
-                self._buffer[-1] = candle
-            else:
-                # Append new candle
-                self._buffer.append(candle)
+            # Replaces the last candle if the timestamp matches
+            self._buffer.append(candle)
             
             self._last_update = datetime.now(timezone.utc)
             
@@ -174,12 +217,14 @@ class CandleStream:
                 self._partial_candle = None
         
         # Persist to Redis (outside lock)
-        if persist:
+        if persist and self._persistent:
             try:
                 self._store.append_candle(self._asset_id, self._timeframe, candle)
             except Exception as e:
                 logger.error(f"Failed to persist candle to Redis: {e}")
         
+        self._notify_listeners([candle])
+        
         # Notify callback
         if self._on_new_candle and candle.complete:
             try:
@@ -205,20 +250,18 @@ class CandleStream:
         self._ensure_loaded()
         
         with self._lock:
-            for candle in candles:
-                if self._buffer and self._buffer[-1].timestamp == candle.timestamp:
-                    self._buffer[-1] = candle
-                else:
-                    self._buffer.append(candle)
+            self._buffer.extend(candles)
             
             self._last_update = datetime.now(timezone.utc)
         
         # Persist to Redis
-        if persist:
+        if persist and self._persistent:
             try:
                 self._store.append_candles(self._asset_id, self._timeframe, candles)
             except Exception as e:
                 logger.error(f"Failed to persist candles to Redis: {e}")
+        
+        self._notify_listeners(candles)
     
     def get_recent(
         self,
@@ -236,33 +279,70 @@ class CandleStream:
             List of candles, ordered by timestamp ascending
         """
         self._ensure_loaded()
+        min_ts = self._hours_to_min_timestamp(hours)
         
         with self._lock:
-            candles = list(self._buffer)
+            return self._buffer.get_recent(min_ts, count)
+    
+    def get_recent_arrays(
+        self,
+        hours: Optional[float] = None,
+        count: Optional[int] = None,
+    ) -> CandleArrays:
+        """
+        Get recent candles as NumPy columns.
         
-        if hours is not None:
-            min_ts = int((datetime.now(timezone.utc) - timedelta(hours=hours)).timestamp())
-            candles = [c for c in candles if c.timestamp >= min_ts]
+        The arrays are copies taken under the stream lock, so they stay
+        consistent while other threads append to the stream.
         
-        if count is not None:
-            candles = candles[-count:]
+        Args:
+            hours: Time window in hours
+            count: Maximum number of candles
+            
+        Returns:
+            CandleArrays, ordered by timestamp ascending
+        """
+        self._ensure_loaded()
+        min_ts = self._hours_to_min_timestamp(hours)
+        
+        with self._lock:
+            return self._detach(self._buffer.get_recent_arrays(min_ts, count))
+    
+    def get_range_arrays(self, start_timestamp: int, end_timestamp: int) -> CandleArrays:
+        """
+        Get candles with start_timestamp <= timestamp < end_timestamp.
+        
+        Args:
+            start_timestamp: Inclusive lower bound (Unix seconds)
+            end_timestamp: Exclusive upper bound (Unix seconds)
+            
+        Returns:
+            CandleArrays, ordered by timestamp ascending
+        """
+        self._ensure_loaded()
         
-        return candles
+        with self._lock:
+            return self._detach(self._buffer.get_range_arrays(start_timestamp, end_timestamp))
+    
+    def _detach(self, arrays: CandleArrays) -> CandleArrays:
+        """Copy views into the columnar buffer (deque mode already builds copies)."""
+        if isinstance(self._buffer, ColumnarCandleBuffer):
+            return arrays.copy()
+        return arrays
+    
+    @staticmethod
+    def _hours_to_min_timestamp(hours: Optional[float]) -> Optional[int]:
+        """Convert a window in hours to the oldest timestamp to include."""
+        if hours is None:
+            return None
+        return int((datetime.now(timezone.utc) - timedelta(hours=hours)).timestamp())
     
     def get_latest(self) -> Optional[Candle]:
         """Get the most recent complete candle."""
         self._ensure_loaded()
         
         with self._lock:
-            if not self._buffer:
-                return None
-            
-            # Find the most recent complete candle
-            for candle in reversed(self._buffer):
-                if candle.complete:
-                    return candle
-            
-            return None
+            return self._buffer.get_latest_complete()
     
     def get_partial(self) -> Optional[Candle]:
         """Get the current partial candle (if any)."""
@@ -298,6 +378,9 @@ class CandleStream:
             self._last_update = None
             self._partial_candle = None
         
+        if not self._persistent:
+            return
+        
         try:
             self._store.clear(self._asset_id, self._timeframe)
         except Exception as e:
@@ -0,0 +1,252 @@
+"""
+Historical candle backfill for the Market Data Layer.
+
+Loads long candle histories (e.g. a month of 1m data) that a single
+broker history request cannot return: the requested range is split into
+windows of at most one request each, the windows are fetched concurrently
+(the broker clients' rate limiters throttle them on the HISTORY lane),
+the candles are deduplicated by timestamp and written to the history
+keys of the RedisCandleStore.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from core.services.broker import IgBrokerService, MexcBrokerService
+
+from .candle_models import Candle
+from .market_data_config import TimeframeConfig
+from .redis_candle_store import RedisCandleStore, get_candle_store
+
+
+logger = logging.getLogger(__name__)
+
+# MEXC returns at most 1000 klines per /api/v3/klines request
+MEXC_MAX_KLINES_PER_REQUEST = 1000
+
+# Candles per IG /prices window (IG has no hard cap, smaller windows parallelize better)
+IG_MAX_POINTS_PER_REQUEST = 1000
+
+# Windows fetched concurrently by default
+DEFAULT_BACKFILL_WORKERS = 4
+
+# Native broker resolutions; timeframes without one cannot be backfilled
+IG_RESOLUTIONS = {
+    '1m': 'MINUTE',
+    '2m': 'MINUTE_2',
+    '3m': 'MINUTE_3',
+    '5m': 'MINUTE_5',
+    '10m': 'MINUTE_10',
+    '15m': 'MINUTE_15',
+    '30m': 'MINUTE_30',
+    '1h': 'HOUR',
+    '2h': 'HOUR_2',
+    '3h': 'HOUR_3',
+    '4h': 'HOUR_4',
+    '1d': 'DAY',
+}
+MEXC_INTERVALS = {
+    '1m': '1m',
+    '5m': '5m',
+    '15m': '15m',
+    '30m': '30m',
+    '1h': '60m',
+    '4h': '4h',
+    '1d': '1d',
+}
+
+
+@dataclass
+class BackfillResult:
+    """
+    Outcome of a backfill run.
+
+    Attributes:
+        asset_id: Asset identifier of the history key
+        timeframe: Candle timeframe
+        windows: Number of request windows
+        fetched: Candles returned by the broker (before deduplication)
+        written: Unique candles written to the store
+        failed_windows: (start, end, error) of windows that could not be fetched
+    """
+    asset_id: str
+    timeframe: str
+    windows: int = 0
+    fetched: int = 0
+    written: int = 0
+    failed_windows: List[Tuple[datetime, datetime, str]] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        """True if every window was fetched."""
+        return not self.failed_windows
+
+
+def split_windows(
+    start: datetime,
+    end: datetime,
+    timeframe: str,
+    max_candles: int,
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Split a time range into request windows of at most max_candles candles.
+
+    Windows are inclusive and do not overlap: each starts one candle after
+    the previous window's end.
+
+    Args:
+        start: Start of the range (inclusive)
+        end: End of the range (inclusive)
+        timeframe: Candle timeframe
+        max_candles: Maximum candles per window
+
+    Returns:
+        List of (window_start, window_end) ordered oldest to newest
+    """
+    step = timedelta(minutes=TimeframeConfig.to_minutes(timeframe))
+    span = step * max_candles
+
+    windows = []
+    window_start = start
+    while window_start <= end:
+        window_end = min(window_start + span - step, end)
+        windows.append((window_start, window_end))
+        window_start = window_end + step
+    return windows
+
+
+class HistoryBackfill:
+    """
+    Pages a broker's history API into the candle store.
+
+    Usage:
+        backfill = HistoryBackfill(broker)
+        result = backfill.run('BTC', 'BTCUSDT', '1m', start, end)
+    """
+
+    def __init__(
+        self,
+        broker,
+        store: Optional[RedisCandleStore] = None,
+        max_workers: int = DEFAULT_BACKFILL_WORKERS,
+    ):
+        """
+        Initialize the backfill.
+
+        Args:
+            broker: Connected IgBrokerService or MexcBrokerService
+            store: Candle store receiving the history
+            max_workers: Windows fetched concurrently
+        """
+        self._broker = broker
+        self._store = store or get_candle_store()
+        self._max_workers = max(1, max_workers)
+
+    def run(
+        self,
+        asset_id: str,
+        symbol: str,
+        timeframe: str,
+        start: datetime,
+        end: datetime,
+    ) -> BackfillResult:
+        """
+        Backfill the candles of one market between start and end.
+
+        Windows that fail are reported in the result; the candles of all
+        other windows are still written.
+
+        Args:
+            asset_id: Asset identifier of the history key
+            symbol: Broker symbol (MEXC) or EPIC (IG)
+            timeframe: Candle timeframe
+            start: Start of the range (inclusive)
+            end: End of the range (inclusive)
+
+        Returns:
+            BackfillResult
+
+        Raises:
+            ValueError: If the broker or timeframe is not supported
+        """
+        max_candles = self._get_max_candles_per_request()
+        self._check_timeframe(timeframe)
+
+        windows = split_windows(start, end, timeframe, max_candles)
+        result = BackfillResult(asset_id=asset_id, timeframe=timeframe, windows=len(windows))
+        candles: Dict[int, Candle] = {}
+
+        start_ts = int(start.timestamp())
+        end_ts = int(end.timestamp())
+
+        with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='HistoryBackfill') as executor:
+            futures = {
+                executor.submit(self._fetch_window, symbol, timeframe, window_start, window_end): (window_start, window_end)
+                for window_start, window_end in windows
+            }
+            for future in as_completed(futures):
+                window_start, window_end = futures[future]
+                try:
+                    window_candles = [Candle.from_dict(data) for data in future.result()]
+                except Exception as e:
+                    # Any failure (broker, network, unexpected payload) only loses this window
+                    logger.warning(f"Backfill window {window_start} - {window_end} failed for {symbol}: {e}")
+                    result.failed_windows.append((window_start, window_end, str(e)))
+                    continue
+
+                result.fetched += len(window_candles)
+                for candle in window_candles:
+                    if start_ts <= candle.timestamp <= end_ts:
+                        candles[int(candle.timestamp)] = candle
+
+        result.failed_windows.sort(key=lambda failed: failed[0])
+        ordered = [candles[ts] for ts in sorted(candles)]
+        result.written = self._store.append_history(asset_id, timeframe, ordered)
+
+        logger.info(
+            f"Backfilled {result.written} {timeframe} candles for {asset_id} "
+            f"({result.windows} windows, {len(result.failed_windows)} failed)"
+        )
+        return result
+
+    def _get_max_candles_per_request(self) -> int:
+        """Window size of the broker's history API."""
+        if isinstance(self._broker, MexcBrokerService):
+            return MEXC_MAX_KLINES_PER_REQUEST
+        if isinstance(self._broker, IgBrokerService):
+            return IG_MAX_POINTS_PER_REQUEST
+        raise ValueError(f"Backfill is not supported for {type(self._broker).__name__}")
+
+    def _check_timeframe(self, timeframe: str) -> None:
+        resolutions = MEXC_INTERVALS if isinstance(self._broker, MexcBrokerService) else IG_RESOLUTIONS
+        if timeframe not in resolutions:
+            raise ValueError(
+                f"Timeframe {timeframe} cannot be backfilled from {type(self._broker).__name__} "
+                f"(supported: {', '.join(resolutions)})"
+            )
+
+    def _fetch_window(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: datetime,
+        end: datetime,
+    ) -> List[dict]:
+        """Fetch one window with the broker-specific history parameters."""
+        if isinstance(self._broker, MexcBrokerService):
+            return self._broker.get_historical_prices(
+                symbol=symbol,
+                interval=MEXC_INTERVALS[timeframe],
+                limit=MEXC_MAX_KLINES_PER_REQUEST,
+                start_time=start,
+                end_time=end,
+            )
+        return self._broker.get_historical_prices(
+            epic=symbol,
+            resolution=IG_RESOLUTIONS[timeframe],
+            num_points=IG_MAX_POINTS_PER_REQUEST,
+            start_time=start,
+            end_time=end,
+        )
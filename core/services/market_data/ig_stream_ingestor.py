@@ -0,0 +1,234 @@
+"""
+IG streaming ingestion for the Market Data Layer.
+
+Subscribes to IG tick updates (CHART:<epic>:TICK) through a
+SubscriptionClient and folds them into 1m candles on the asset's
+CandleStream, replacing per-minute REST price polling.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from core.services.broker import IgApiClient, LightstreamerClient, SubscriptionClient
+
+from .market_data_stream_manager import MarketDataStreamManager, get_stream_manager
+from .tick_aggregator import TickCandleAggregator
+from .timeframe_aggregator import BASE_TIMEFRAME
+
+
+logger = logging.getLogger(__name__)
+
+# Fields of IG CHART:<epic>:TICK items
+TICK_FIELDS = ['BID', 'OFR', 'UTM', 'LTV']
+
+# A market without ticks for this long is no longer considered streaming
+STREAM_STALE_SECONDS = 120.0
+
+
+@dataclass
+class _StreamedMarket:
+    """Subscription and aggregation state of one epic."""
+    asset_id: str
+    epic: str
+    aggregator: TickCandleAggregator
+    sub_id: Optional[int] = None
+    last_tick_at: Optional[float] = None
+
+
+class IgStreamIngestor:
+    """
+    Streams IG ticks into 1m candles.
+
+    Each epic's ticks are converted to mid prices, aggregated by a
+    TickCandleAggregator and appended to the asset's 1m CandleStream, so
+    derived timeframes and Redis persistence work as for fetched candles.
+
+    Usage:
+        ingestor = IgStreamIngestor.from_api_client(ig_api_client)
+        ingestor.add_market('WTI', 'CC.D.CL.UNC.IP')
+        ingestor.start()
+    """
+
+    def __init__(
+        self,
+        client: SubscriptionClient,
+        manager: Optional[MarketDataStreamManager] = None,
+        flush_interval: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the ingestor.
+
+        Args:
+            client: Subscription client delivering IG tick updates
+            manager: Stream manager owning the candle streams
+            flush_interval: Seconds between checks for closed minutes
+            clock: Wall clock (overridable for tests)
+        """
+        self._client = client
+        self._manager = manager or get_stream_manager()
+        self._flush_interval = flush_interval
+        self._clock = clock
+        self._markets: Dict[str, _StreamedMarket] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_api_client(
+        cls,
+        api_client: IgApiClient,
+        manager: Optional[MarketDataStreamManager] = None,
+    ) -> 'IgStreamIngestor':
+        """
+        Create an ingestor streaming from the Lightstreamer server of an IG session.
+
+        Credentials are read from the client on every (re)connect, so a
+        session renewed by REST calls is picked up automatically.
+
+        Args:
+            api_client: Authenticated IgApiClient
+            manager: Stream manager owning the candle streams
+
+        Returns:
+            IgStreamIngestor instance
+        """
+        endpoint, _, _ = api_client.get_streaming_credentials()
+
+        def credentials():
+            _, user, password = api_client.get_streaming_credentials()
+            return user, password
+
+        return cls(LightstreamerClient(endpoint, credentials), manager=manager)
+
+    def add_market(self, asset_id: str, epic: str) -> None:
+        """
+        Start streaming an epic into the 1m stream of an asset.
+
+        Adding an epic that is already streamed has no effect.
+
+        Args:
+            asset_id: Asset identifier of the candle stream
+            epic: IG market EPIC
+        """
+        with self._lock:
+            if epic in self._markets:
+                return
+            stream = self._manager.get_or_create_stream(asset_id, BASE_TIMEFRAME, broker='IG')
+            market = _StreamedMarket(
+                asset_id=asset_id,
+                epic=epic,
+                aggregator=TickCandleAggregator(stream, BASE_TIMEFRAME),
+            )
+            self._markets[epic] = market
+
+        market.sub_id = self._client.subscribe(
+            f"CHART:{epic}:TICK",
+            TICK_FIELDS,
+            lambda item, values: self._on_tick(market, values),
+            mode="DISTINCT",
+        )
+        logger.info(f"Streaming IG ticks for {epic} into {asset_id}/{BASE_TIMEFRAME}")
+
+    def remove_market(self, epic: str) -> None:
+        """Stop streaming an epic."""
+        with self._lock:
+            market = self._markets.pop(epic, None)
+        if market is not None and market.sub_id is not None:
+            self._client.unsubscribe(market.sub_id)
+
+    def start(self) -> None:
+        """Connect the subscription client and start closing finished minutes."""
+        self._client.connect()
+
+        if self._flush_thread is None or not self._flush_thread.is_alive():
+            self._stop.clear()
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop,
+                name="IgStreamIngestorFlush",
+                daemon=True,
+            )
+            self._flush_thread.start()
+
+    def stop(self) -> None:
+        """Disconnect and stop the flush thread."""
+        self._stop.set()
+        self._client.disconnect()
+        if self._flush_thread is not None:
+            self._flush_thread.join(timeout=5)
+            self._flush_thread = None
+
+    def is_streaming(self, epic: str) -> bool:
+        """
+        Check whether live ticks are arriving for an epic.
+
+        Args:
+            epic: IG market EPIC
+
+        Returns:
+            True if connected and the epic ticked within STREAM_STALE_SECONDS
+        """
+        market = self._markets.get(epic)
+        if market is None or market.last_tick_at is None or not self._client.is_connected():
+            return False
+        return self._clock() - market.last_tick_at <= STREAM_STALE_SECONDS
+
+    def flush(self) -> None:
+        """Close the candles of all markets whose minute has passed."""
+        now = self._clock()
+        with self._lock:
+            markets = list(self._markets.values())
+        for market in markets:
+            market.aggregator.flush(now)
+
+    def get_stats(self) -> dict:
+        """
+        Get streaming statistics.
+
+        Returns:
+            Dictionary with connection state and per-epic tick counts.
+        """
+        with self._lock:
+            markets = list(self._markets.values())
+        return {
+            'connected': self._client.is_connected(),
+            'markets': {
+                market.epic: {
+                    'asset_id': market.asset_id,
+                    'ticks': market.aggregator.tick_count,
+                    'streaming': self.is_streaming(market.epic),
+                }
+                for market in markets
+            },
+        }
+
+    def _on_tick(self, market: _StreamedMarket, values: Dict[str, Optional[str]]) -> None:
+        """Convert a tick update to a mid price and aggregate it."""
+        try:
+            bid = float(values['BID']) if values.get('BID') else None
+            offer = float(values['OFR']) if values.get('OFR') else None
+            volume = float(values['LTV']) if values.get('LTV') else None
+            timestamp = float(values['UTM']) / 1000.0 if values.get('UTM') else self._clock()
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Ignoring malformed tick for {market.epic}: {values} ({e})")
+            return
+
+        if bid is not None and offer is not None:
+            price = (bid + offer) / 2
+        else:
+            price = bid if bid is not None else offer
+        if price is None:
+            return
+
+        market.aggregator.add_tick(timestamp, price, volume)
+        market.last_tick_at = self._clock()
+        market.aggregator.stream.status = 'LIVE'
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error closing streamed candles: {e}")
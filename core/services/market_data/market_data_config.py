@@ -26,6 +26,31 @@ DEFAULT_MAX_CANDLES = 1440  # 24 hours of 1-minute candles
 # Redis key prefix for candle storage
 REDIS_KEY_PREFIX = 'market:candles'
 
+# Pub/sub channel (under the key prefix) for completed candles
+UPDATES_CHANNEL_SUFFIX = 'updates'
+
+# In-memory candle buffer modes
+BUFFER_MODE_DEQUE = 'deque'  # List of Candle objects
+BUFFER_MODE_COLUMNAR = 'columnar'  # NumPy columns, binary-searchable
+
+# Default buffer mode for streams created by the stream manager
+DEFAULT_BUFFER_MODE = BUFFER_MODE_COLUMNAR
+
+# Timeframes built from the 1m stream instead of fetched from the broker.
+# 4h stays on native fetches: a 1440-candle 1m buffer spans only six 4h
+# bars, too few for indicators such as ATR(14).
+DEFAULT_DERIVED_TIMEFRAMES = ['5m', '15m', '1h']
+
+# Largest window served purely from the 1m stream (IG history is capped at 720 points)
+DEFAULT_DERIVED_MAX_WINDOW_HOURS = 12
+
+# Redis sorted-set member encodings (both are always readable)
+MEMBER_ENCODING_JSON = 'json'  # "{timestamp}:{json}" (legacy)
+MEMBER_ENCODING_BINARY = 'binary'  # Versioned fixed-width struct
+
+# Encoding used for new writes
+DEFAULT_MEMBER_ENCODING = MEMBER_ENCODING_BINARY
+
 
 @dataclass
 class WindowConfig:
@@ -138,6 +163,13 @@ class RedisConfig:
         key_prefix: Prefix for all market data keys
         max_candles_per_stream: Maximum candles to store per stream
         ttl_hours: Time-to-live for stored candles in hours
+        member_encoding: Encoding for new sorted-set members ('json' or 'binary')
+        max_connections: Size of the shared connection pool
+        socket_timeout: Timeout for Redis commands in seconds
+        socket_connect_timeout: Timeout for establishing a connection in seconds
+        health_check_interval: Seconds a successful health check stays valid
+        reconnect_backoff_max: Upper bound for the reconnect backoff in seconds
+        pubsub_enabled: Publish completed candles and subscribe to other processes' updates
     """
     host: str = 'localhost'
     port: int = 6379
@@ -146,6 +178,18 @@ class RedisConfig:
     key_prefix: str = REDIS_KEY_PREFIX
     max_candles_per_stream: int = DEFAULT_MAX_CANDLES
     ttl_hours: int = 72  # 3 days retention
+    member_encoding: str = DEFAULT_MEMBER_ENCODING
+    max_connections: int = 50
+    socket_timeout: float = 2.0
+    socket_connect_timeout: float = 2.0
+    health_check_interval: int = 30
+    reconnect_backoff_max: float = 60.0
+    pubsub_enabled: bool = True
+    
+    @property
+    def updates_channel(self) -> str:
+        """Pub/sub channel for completed candle updates."""
+        return f"{self.key_prefix}:{UPDATES_CHANNEL_SUFFIX}"
     
     @classmethod
     def from_django_settings(cls) -> 'RedisConfig':
@@ -166,6 +210,13 @@ class RedisConfig:
                 key_prefix=redis_settings.get('KEY_PREFIX', REDIS_KEY_PREFIX),
                 max_candles_per_stream=redis_settings.get('MAX_CANDLES', DEFAULT_MAX_CANDLES),
                 ttl_hours=redis_settings.get('TTL_HOURS', 72),
+                member_encoding=redis_settings.get('MEMBER_ENCODING', DEFAULT_MEMBER_ENCODING),
+                max_connections=redis_settings.get('MAX_CONNECTIONS', 50),
+                socket_timeout=redis_settings.get('SOCKET_TIMEOUT', 2.0),
+                socket_connect_timeout=redis_settings.get('SOCKET_CONNECT_TIMEOUT', 2.0),
+                health_check_interval=redis_settings.get('HEALTH_CHECK_INTERVAL', 30),
+                reconnect_backoff_max=redis_settings.get('RECONNECT_BACKOFF_MAX', 60.0),
+                pubsub_enabled=redis_settings.get('PUBSUB_ENABLED', True),
             )
         except Exception:
             return cls()
@@ -182,6 +233,14 @@ class MarketDataConfig:
     timeframe: TimeframeConfig = field(default_factory=TimeframeConfig)
     redis: RedisConfig = field(default_factory=RedisConfig)
     
+    # In-memory buffer type for candle streams ('deque' or 'columnar')
+    buffer_mode: str = DEFAULT_BUFFER_MODE
+    
+    # Timeframes aggregated from the 1m stream, and the largest window for which
+    # the 1m stream alone is used (larger windows also fetch older bars natively)
+    derived_timeframes: List[str] = field(default_factory=lambda: DEFAULT_DERIVED_TIMEFRAMES.copy())
+    derived_max_window_hours: float = DEFAULT_DERIVED_MAX_WINDOW_HOURS
+    
     # Per-asset-class overrides (e.g., Crypto may have different defaults)
     asset_class_overrides: Dict[str, Dict] = field(default_factory=dict)
     
@@ -192,6 +251,7 @@ class MarketDataConfig:
             window=WindowConfig(),
             timeframe=TimeframeConfig(),
             redis=RedisConfig.from_django_settings(),
+            buffer_mode=cls._buffer_mode_from_django_settings(),
             asset_class_overrides={
                 'crypto': {
                     'window_default': 12,  # Crypto 24/7, longer windows useful
@@ -209,6 +269,15 @@ class MarketDataConfig:
             }
         )
     
+    @staticmethod
+    def _buffer_mode_from_django_settings() -> str:
+        """Read MARKET_DATA_BUFFER_MODE from Django settings."""
+        try:
+            from django.conf import settings
+            return getattr(settings, 'MARKET_DATA_BUFFER_MODE', DEFAULT_BUFFER_MODE)
+        except Exception:
+            return DEFAULT_BUFFER_MODE
+    
     def get_window_config_for_category(self, category: str) -> WindowConfig:
         """
         Get window configuration for an asset category.
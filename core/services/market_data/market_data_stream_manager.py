@@ -7,22 +7,28 @@ and brokers. Handles:
 - Broker-agnostic data fetching
 - Fallback to REST polling when streaming unavailable
 - Caching and persistence coordination
+- Higher timeframes derived from the 1m stream
+- Completed candles from other processes via Redis pub/sub
 """
 import logging
 from datetime import datetime, timezone, timedelta
-from threading import Lock
+from dataclasses import dataclass, field
+from threading import Event, Lock
 from typing import Dict, List, Optional, Tuple, Callable
 
 from core.services.broker import BrokerError
 
 from .candle_models import Candle, CandleStreamStatus, CandleDataResponse, DataStatus
+from .candle_pubsub import CandleUpdateSubscriber
 from .candle_stream import CandleStream
 from .redis_candle_store import RedisCandleStore, get_candle_store
+from .timeframe_aggregator import TimeframeAggregator, BASE_TIMEFRAME
 from .market_data_config import (
     MarketDataConfig, 
     TimeframeConfig, 
     WindowConfig,
     get_market_data_config,
+    BUFFER_MODE_COLUMNAR,
 )
 
 
@@ -35,6 +41,23 @@ BROKER_KRAKEN = 'KRAKEN'
 KRAKEN_FRESH_DATA_THRESHOLD_SECONDS = 180  # 3 minutes
 CACHED_DATA_REFETCH_INTERVAL_SECONDS = 30  # Refetch cached data every 30 seconds
 
+# Minimum share of the requested window the buffer must cover before
+# broker fetches switch from a full reload to gap-only fetches
+MIN_WINDOW_COVERAGE = 0.8
+
+# Smallest incremental fetch (newest buffered candle + current candle)
+MIN_INCREMENTAL_FETCH_POINTS = 2
+
+# How long concurrent callers wait for an in-flight broker fetch
+FETCH_WAIT_TIMEOUT_SECONDS = 15
+
+
+@dataclass
+class _InFlightFetch:
+    """Broker fetch in progress for one stream, shared by concurrent callers."""
+    window_hours: float
+    done: Event = field(default_factory=Event)
+
 
 class MarketDataStreamManager:
     """
@@ -46,6 +69,8 @@ class MarketDataStreamManager:
     - Automatic stream creation and management
     - Fallback to REST polling when streaming unavailable
     - Status tracking for UI indicators
+    - Derived timeframes (5m, 15m, 1h, ...) folded from the 1m stream,
+      so they need no broker fetch or Redis key of their own
     
     Usage:
         manager = MarketDataStreamManager()
@@ -82,7 +107,14 @@ class MarketDataStreamManager:
         # Status tracking
         self._last_fetch_time: Dict[Tuple[str, str], datetime] = {}
         self._fetch_errors: Dict[Tuple[str, str], str] = {}
-        self._fetch_locks: Dict[Tuple[str, str], Lock] = {}
+        self._in_flight: Dict[Tuple[str, str], _InFlightFetch] = {}
+        
+        # Derived timeframe aggregators: {(asset_id, timeframe): TimeframeAggregator}
+        self._aggregators: Dict[Tuple[str, str], TimeframeAggregator] = {}
+        
+        # Cross-process candle updates (enabled for the singleton)
+        self._subscribe_updates = False
+        self._subscriber: Optional[CandleUpdateSubscriber] = None
     
     @classmethod
     def get_instance(cls) -> 'MarketDataStreamManager':
@@ -90,7 +122,10 @@ class MarketDataStreamManager:
         if cls._instance is None:
             with cls._instance_lock:
                 if cls._instance is None:
-                    cls._instance = cls()
+                    instance = cls()
+                    instance._subscribe_updates = True
+                    instance.start_update_subscriber()
+                    cls._instance = instance
         return cls._instance
     
     @classmethod
@@ -105,12 +140,9 @@ class MarketDataStreamManager:
         """Get the stream registry key."""
         return (asset_id, timeframe)
 
-    def _get_fetch_lock(self, key: Tuple[str, str]) -> Lock:
-        """Get or create a fetch lock for a stream key."""
-        with self._lock:
-            if key not in self._fetch_locks:
-                self._fetch_locks[key] = Lock()
-            return self._fetch_locks[key]
+    def is_derived_timeframe(self, timeframe: str) -> bool:
+        """Check whether a timeframe is built from the 1m stream."""
+        return timeframe in self._config.derived_timeframes
     
     def get_or_create_stream(
         self,
@@ -122,6 +154,9 @@ class MarketDataStreamManager:
         """
         Get or create a candle stream for an asset/timeframe pair.
         
+        Streams for derived timeframes are non-persistent and kept up to
+        date from the asset's 1m stream (which is created if needed).
+        
         Args:
             asset_id: Asset identifier
             timeframe: Candle timeframe
@@ -131,6 +166,9 @@ class MarketDataStreamManager:
         Returns:
             CandleStream instance
         """
+        if self.is_derived_timeframe(timeframe):
+            return self._get_or_create_derived_stream(asset_id, timeframe, broker, on_new_candle)
+        
         key = self._get_stream_key(asset_id, timeframe)
         
         with self._lock:
@@ -142,9 +180,60 @@ class MarketDataStreamManager:
                     max_candles=self._config.redis.max_candles_per_stream,
                     store=self._store,
                     on_new_candle=on_new_candle,
+                    buffer_mode=self._config.buffer_mode,
                 )
             return self._streams[key]
     
+    def _get_or_create_derived_stream(
+        self,
+        asset_id: str,
+        timeframe: str,
+        broker: Optional[str] = None,
+        on_new_candle: Optional[Callable[[Candle], None]] = None,
+    ) -> CandleStream:
+        """Get or create a stream aggregated from the 1m base stream."""
+        key = self._get_stream_key(asset_id, timeframe)
+        
+        with self._lock:
+            if key in self._streams:
+                return self._streams[key]
+        
+        base = self.get_or_create_stream(asset_id, BASE_TIMEFRAME, broker)
+        
+        with self._lock:
+            if key in self._streams:
+                return self._streams[key]
+            
+            derived = CandleStream(
+                asset_id=asset_id,
+                timeframe=timeframe,
+                broker=broker,
+                max_candles=self._config.redis.max_candles_per_stream,
+                store=self._store,
+                on_new_candle=on_new_candle,
+                # Out-of-order bucket updates need keyed replacement
+                buffer_mode=BUFFER_MODE_COLUMNAR,
+                persistent=False,
+            )
+            aggregator = TimeframeAggregator(base, derived)
+            self._streams[key] = derived
+            self._aggregators[key] = aggregator
+        
+        base.add_listener(aggregator.on_base_update)
+        aggregator.seed()
+        return derived
+    
+    def _reseed_derived_streams(self, asset_id: Optional[str] = None) -> None:
+        """Merge re-aggregated buckets into derived streams after a base reload."""
+        with self._lock:
+            aggregators = [
+                aggregator for (stream_asset_id, _), aggregator in self._aggregators.items()
+                if asset_id is None or stream_asset_id == asset_id
+            ]
+        
+        for aggregator in aggregators:
+            aggregator.seed()
+    
     def get_stream(
         self,
         asset_id: str,
@@ -190,6 +279,9 @@ class MarketDataStreamManager:
         Returns:
             CandleDataResponse with candles and status
         """
+        if self._subscribe_updates:
+            self.start_update_subscriber()
+        
         # Validate timeframe
         timeframe = self._config.timeframe.validate_timeframe(timeframe)
         
@@ -205,25 +297,22 @@ class MarketDataStreamManager:
             timeframe=timeframe,
             broker=getattr(asset, 'broker', None),
         )
-
-        fetch_key = self._get_stream_key(stream.asset_id, timeframe)
-
-        # Check if we need to fetch from broker
-        should_fetch = force_refresh or self._should_fetch_from_broker(
-            stream, timeframe, window_hours
-        )
-
-        if should_fetch:
-            fetch_lock = self._get_fetch_lock(fetch_key)
-            if fetch_lock.acquire(blocking=False):
-                try:
-                    self._fetch_candles_from_broker(asset, stream, timeframe, window_hours)
-                finally:
-                    fetch_lock.release()
-            else:
-                logger.debug(
-                    f"Fetch already in progress for {stream.asset_id}/{timeframe}, returning cached data"
-                )
+        
+        if self.is_derived_timeframe(timeframe):
+            # Refresh the 1m base stream; the derived stream follows it
+            base = self.get_or_create_stream(asset.symbol, BASE_TIMEFRAME)
+            base_window = min(window_hours, self._config.derived_max_window_hours)
+            self._refresh_stream(asset, base, BASE_TIMEFRAME, base_window, force_refresh)
+            
+            # Older bars than the 1m stream covers are fetched natively once
+            if window_hours > self._config.derived_max_window_hours:
+                self._refresh_stream(asset, stream, timeframe, window_hours, force_refresh)
+            
+            # Error setter forces OFFLINE, so set status afterwards
+            stream.error = base.error
+            stream.status = base.status
+        else:
+            self._refresh_stream(asset, stream, timeframe, window_hours, force_refresh)
         
         # Get candles from stream
         candles = stream.get_recent(hours=window_hours)
@@ -237,6 +326,107 @@ class MarketDataStreamManager:
             error=stream.error,
         )
     
+    def _refresh_stream(
+        self,
+        asset,
+        stream: CandleStream,
+        timeframe: str,
+        window_hours: float,
+        force_refresh: bool = False,
+    ) -> None:
+        """
+        Fetch candles from the broker into a stream if its data is stale.
+        
+        Fetches are single-flight per stream: if a fetch is already running,
+        the caller waits for it (up to FETCH_WAIT_TIMEOUT_SECONDS) and reads
+        its result from the stream instead of starting a second broker call.
+        
+        Args:
+            asset: TradingAsset instance
+            stream: CandleStream to refresh
+            timeframe: Candle timeframe
+            window_hours: Time window in hours
+            force_refresh: Force fetch from broker
+        """
+        fetch_key = self._get_stream_key(stream.asset_id, timeframe)
+
+        # Check if we need to fetch from broker
+        should_fetch = force_refresh or self._should_fetch_from_broker(
+            stream, timeframe, window_hours
+        )
+
+        if not should_fetch:
+            return
+
+        with self._lock:
+            flight = self._in_flight.get(fetch_key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _InFlightFetch(window_hours=window_hours)
+                self._in_flight[fetch_key] = flight
+
+        if not is_leader:
+            logger.debug(
+                f"Fetch already in progress for {stream.asset_id}/{timeframe}, waiting for result"
+            )
+            if not flight.done.wait(FETCH_WAIT_TIMEOUT_SECONDS):
+                logger.warning(
+                    f"Timed out waiting for fetch of {stream.asset_id}/{timeframe}, "
+                    f"returning cached data"
+                )
+            elif flight.window_hours < window_hours:
+                # The shared fetch covered a shorter window than requested
+                self._refresh_stream(asset, stream, timeframe, window_hours)
+            return
+
+        try:
+            self._fetch_candles_from_broker(asset, stream, timeframe, window_hours)
+        finally:
+            with self._lock:
+                self._in_flight.pop(fetch_key, None)
+            flight.done.set()
+    
+    def get_cached_candles(
+        self,
+        asset_id: str,
+        timeframe: str,
+        count: Optional[int] = None,
+        hours: Optional[float] = None,
+        max_age_seconds: float = 60,
+    ) -> List[Candle]:
+        """
+        Get candles from memory/Redis without any broker call.
+        
+        Derived timeframes are aggregated from the 1m stream. The underlying
+        persistent stream is reloaded from Redis when it hasn't been updated
+        for max_age_seconds (e.g. when another process writes the candles).
+        
+        Args:
+            asset_id: Asset identifier
+            timeframe: Candle timeframe
+            count: Maximum number of candles
+            hours: Time window in hours
+            max_age_seconds: Reload threshold for the persistent stream
+            
+        Returns:
+            List of candles, ordered by timestamp ascending
+        """
+        if self._subscribe_updates:
+            self.start_update_subscriber()
+        
+        source_timeframe = BASE_TIMEFRAME if self.is_derived_timeframe(timeframe) else timeframe
+        source = self.get_or_create_stream(asset_id, source_timeframe)
+        
+        last_update = source.last_update
+        if last_update is None or (
+            datetime.now(timezone.utc) - last_update
+        ).total_seconds() > max_age_seconds:
+            source.reload()
+            self._reseed_derived_streams(asset_id)
+        
+        stream = self.get_or_create_stream(asset_id, timeframe)
+        return stream.get_recent(hours=hours, count=count)
+    
     def _should_fetch_from_broker(
         self,
         stream: CandleStream,
@@ -293,7 +483,7 @@ class MarketDataStreamManager:
         
         # Check if we have enough data for the requested window
         expected_candles = int(window_hours * 60 / tf_minutes)
-        if stream.get_count() < expected_candles * 0.8:  # 80% threshold
+        if stream.get_count() < expected_candles * MIN_WINDOW_COVERAGE:
             return True
         
         return False
@@ -383,57 +573,53 @@ class MarketDataStreamManager:
             # For non-Kraken assets, use broker API
             from core.services.broker import BrokerRegistry
 
-            registry = BrokerRegistry()
-            broker = registry.get_broker_for_asset(asset)
-
-            try:
-                # Calculate number of candles needed
-                tf_minutes = TimeframeConfig.to_minutes(timeframe)
-                num_points = int(window_hours * 60 / tf_minutes)
-
-                # Get broker symbols/identifiers
-                epic = getattr(asset, 'epic', asset.symbol)
-                symbol = getattr(asset, 'effective_broker_symbol', epic)
-
-                # Fetch historical prices
-                if hasattr(broker, 'get_historical_prices'):
-                    price_data = self._fetch_historical_prices(
-                        broker,
-                        symbol=symbol,
-                        epic=epic,
-                        timeframe=timeframe,
-                        num_points=num_points,
-                    )
+            # Process-wide registry keeps authenticated sessions alive across
+            # fetches; expired IG tokens are refreshed by the API client
+            broker = BrokerRegistry.get_instance().get_broker_for_asset(asset)
 
-                    # Convert to Candle objects
-                    candles = []
-                    for data in price_data:
-                        candle = Candle(
-                            timestamp=data.get('time', 0),
-                            open=float(data.get('open', 0)),
-                            high=float(data.get('high', 0)),
-                            low=float(data.get('low', 0)),
-                            close=float(data.get('close', 0)),
-                            volume=float(data.get('volume')) if data.get('volume') else None,
-                            complete=True,
-                        )
-                        candles.append(candle)
-
-                    if candles:
-                        stream.append_many(candles)
-                        stream.status = 'LIVE'
-                        stream.error = None
-                        logger.debug(f"Fetched {len(candles)} candles for {asset.symbol}")
-                else:
-                    # Broker doesn't support historical prices
-                    stream.status = 'POLL'
-                    logger.warning(f"Broker {type(broker).__name__} doesn't support historical prices")
+            # Only fetch the gap since the newest buffered candle
+            num_points = self._get_fetch_points(stream, timeframe, window_hours)
 
-                self._last_fetch_time[fetch_key] = datetime.now(timezone.utc)
-                self._fetch_errors.pop(fetch_key, None)
+            # Get broker symbols/identifiers
+            epic = getattr(asset, 'epic', asset.symbol)
+            symbol = getattr(asset, 'effective_broker_symbol', epic)
+
+            # Fetch historical prices
+            if hasattr(broker, 'get_historical_prices'):
+                price_data = self._fetch_historical_prices(
+                    broker,
+                    symbol=symbol,
+                    epic=epic,
+                    timeframe=timeframe,
+                    num_points=num_points,
+                )
 
-            finally:
-                registry.disconnect_all()
+                # Convert to Candle objects
+                candles = []
+                for data in price_data:
+                    candle = Candle(
+                        timestamp=data.get('time', 0),
+                        open=float(data.get('open', 0)),
+                        high=float(data.get('high', 0)),
+                        low=float(data.get('low', 0)),
+                        close=float(data.get('close', 0)),
+                        volume=float(data.get('volume')) if data.get('volume') else None,
+                        complete=True,
+                    )
+                    candles.append(candle)
+
+                if candles:
+                    stream.append_many(candles)
+                    stream.status = 'LIVE'
+                    stream.error = None
+                    logger.debug(f"Fetched {len(candles)} candles for {asset.symbol}")
+            else:
+                # Broker doesn't support historical prices
+                stream.status = 'POLL'
+                logger.warning(f"Broker {type(broker).__name__} doesn't support historical prices")
+
+            self._last_fetch_time[fetch_key] = datetime.now(timezone.utc)
+            self._fetch_errors.pop(fetch_key, None)
 
         except BrokerError as e:
             error_msg = self._format_broker_error(e)
@@ -456,6 +642,48 @@ class MarketDataStreamManager:
                 # For Kraken, preserve the status and error that was already set
                 logger.debug(f"Exception caught for Kraken asset but preserving status {stream.status}: {e}")
     
+    def _get_fetch_points(
+        self,
+        stream: CandleStream,
+        timeframe: str,
+        window_hours: float,
+    ) -> int:
+        """
+        Calculate how many candles to request from the broker.
+        
+        If the buffer already covers the window, only the gap between the
+        newest buffered candle and now is requested (the newest candle is
+        re-fetched because it may have been incomplete). A full reload of
+        the window is requested when the buffer is empty or sparse, or when
+        the gap is as large as the window or the buffer.
+        
+        Args:
+            stream: CandleStream to populate
+            timeframe: Candle timeframe
+            window_hours: Time window in hours
+            
+        Returns:
+            Number of candles to request
+        """
+        tf_seconds = TimeframeConfig.to_minutes(timeframe) * 60
+        full_points = int(window_hours * 3600 / tf_seconds)
+        
+        latest = stream.get_recent(count=1)
+        if not latest or stream.get_count() < full_points * MIN_WINDOW_COVERAGE:
+            return full_points
+        
+        now_ts = int(datetime.now(timezone.utc).timestamp())
+        missing = max(0, now_ts - latest[-1].timestamp) // tf_seconds + 1
+        
+        if missing >= min(full_points, stream.max_candles):
+            return full_points
+        
+        logger.debug(
+            f"Incremental fetch for {stream.asset_id}/{timeframe}: "
+            f"{missing} of {full_points} candles missing"
+        )
+        return max(missing, MIN_INCREMENTAL_FETCH_POINTS)
+    
     def _timeframe_to_ig_resolution(self, timeframe: str) -> str:
         """Convert timeframe to IG API resolution format."""
         timeframe = timeframe.lower().strip()
@@ -592,10 +820,50 @@ class MarketDataStreamManager:
         stream.append(candle)
         stream.status = 'LIVE'
     
+    def start_update_subscriber(self) -> None:
+        """
+        Subscribe to completed candles published by other processes.
+        
+        Updates are appended to streams that already exist in this process
+        (without persisting, the publisher already wrote them to Redis).
+        Only starts while Redis is reachable; the singleton retries on
+        later candle requests.
+        """
+        if not self._config.redis.pubsub_enabled or self._subscriber is not None:
+            return
+        
+        if not self._store.is_connected:
+            return
+        
+        self._subscriber = CandleUpdateSubscriber(self._apply_published_candles, self._config.redis)
+        self._subscriber.start()
+    
+    def _apply_published_candles(
+        self,
+        asset_id: str,
+        timeframe: str,
+        candles: List[Candle],
+    ) -> None:
+        """Append candles published by another process to the local stream."""
+        with self._lock:
+            stream = self._streams.get(self._get_stream_key(asset_id, timeframe))
+        
+        if stream is None:
+            return
+        
+        stream.append_many(candles, persist=False)
+        stream.error = None
+        stream.status = 'LIVE'
+    
     def close(self) -> None:
         """Close all streams and connections."""
+        if self._subscriber is not None:
+            self._subscriber.stop()
+            self._subscriber = None
+        
         with self._lock:
             self._streams.clear()
+            self._aggregators.clear()
         
         if self._store:
             self._store.close()
@@ -605,6 +873,8 @@ class MarketDataStreamManager:
         with self._lock:
             for stream in self._streams.values():
                 stream.reload()
+        
+        self._reseed_derived_streams()
 
     def _format_broker_error(self, error: Exception) -> str:
         """Return a user-friendly broker error message for known cases."""
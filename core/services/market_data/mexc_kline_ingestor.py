@@ -0,0 +1,237 @@
+"""
+MEXC kline streaming for the Market Data Layer.
+
+Subscribes to the 1m kline channel of each MEXC symbol and keeps the
+current and the last closed kline in memory. A kline closes when the
+first update of the next minute arrives; closed klines are appended to
+the asset's 1m CandleStream (and persisted to Redis).
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from core.services.broker import MexcWebSocketClient, SubscriptionClient
+from core.services.broker.mexc_websocket_client import kline_channel
+
+from .candle_models import Candle
+from .market_data_stream_manager import MarketDataStreamManager, get_stream_manager
+from .timeframe_aggregator import BASE_TIMEFRAME
+
+
+logger = logging.getLogger(__name__)
+
+# A symbol without kline updates for this long is no longer considered streaming
+STREAM_STALE_SECONDS = 90.0
+
+
+@dataclass
+class _StreamedSymbol:
+    """Subscription and kline state of one symbol."""
+    asset_id: str
+    symbol: str
+    sub_id: Optional[int] = None
+    current: Optional[Candle] = None
+    last_closed: Optional[Candle] = None
+    last_update_at: Optional[float] = None
+    updates: int = 0
+
+
+def parse_kline_update(data: dict) -> Optional[Candle]:
+    """
+    Convert a MEXC kline push ({"k": {"t", "o", "h", "l", "c", "v", ...}}) to a forming candle.
+
+    Returns:
+        Candle, or None if the payload is incomplete
+    """
+    kline = data.get('k') or {}
+    try:
+        return Candle(
+            timestamp=int(kline['t']),
+            open=float(kline['o']),
+            high=float(kline['h']),
+            low=float(kline['l']),
+            close=float(kline['c']),
+            volume=float(kline['v']) if kline.get('v') is not None else None,
+            complete=False,
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class MexcKlineIngestor:
+    """
+    Streams MEXC 1m klines into the market data layer.
+
+    Also serves as kline source for MexcMarketDataFetcher, which returns
+    the streamed klines instead of polling /api/v3/klines while a symbol
+    is streaming.
+
+    Usage:
+        ingestor = MexcKlineIngestor.from_settings()
+        ingestor.add_symbol('BTC', 'BTCUSDT')
+        ingestor.start()
+    """
+
+    def __init__(
+        self,
+        client: SubscriptionClient,
+        manager: Optional[MarketDataStreamManager] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the ingestor.
+
+        Args:
+            client: Subscription client for MEXC public channels
+            manager: Stream manager owning the candle streams
+            clock: Wall clock (overridable for tests)
+        """
+        self._client = client
+        self._manager = manager or get_stream_manager()
+        self._clock = clock
+        self._symbols: Dict[str, _StreamedSymbol] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, manager: Optional[MarketDataStreamManager] = None) -> 'MexcKlineIngestor':
+        """
+        Create an ingestor using MEXC_WS_URL from Django settings.
+
+        Args:
+            manager: Stream manager owning the candle streams
+
+        Returns:
+            MexcKlineIngestor instance
+        """
+        from django.conf import settings
+
+        url = getattr(settings, 'MEXC_WS_URL', None) or None
+        return cls(MexcWebSocketClient(url=url), manager=manager)
+
+    def add_symbol(self, asset_id: str, symbol: str) -> None:
+        """
+        Start streaming a symbol's 1m klines into the 1m stream of an asset.
+
+        Adding a symbol that is already streamed has no effect.
+
+        Args:
+            asset_id: Asset identifier of the candle stream
+            symbol: MEXC symbol (e.g., 'BTCUSDT')
+        """
+        with self._lock:
+            if symbol in self._symbols:
+                return
+            self._manager.get_or_create_stream(asset_id, BASE_TIMEFRAME, broker='MEXC')
+            state = _StreamedSymbol(asset_id=asset_id, symbol=symbol)
+            self._symbols[symbol] = state
+
+        try:
+            state.sub_id = self._client.subscribe(
+                kline_channel(symbol),
+                [],
+                lambda item, data: self._on_kline(state, data),
+            )
+        except Exception:
+            with self._lock:
+                self._symbols.pop(symbol, None)
+            raise
+        logger.info(f"Streaming MEXC klines for {symbol} into {asset_id}/{BASE_TIMEFRAME}")
+
+    def remove_symbol(self, symbol: str) -> None:
+        """Stop streaming a symbol."""
+        with self._lock:
+            state = self._symbols.pop(symbol, None)
+        if state is not None and state.sub_id is not None:
+            self._client.unsubscribe(state.sub_id)
+
+    def start(self) -> None:
+        """Connect the subscription client."""
+        self._client.connect()
+
+    def stop(self) -> None:
+        """Disconnect the subscription client."""
+        self._client.disconnect()
+
+    def is_streaming(self, symbol: str) -> bool:
+        """
+        Check whether live klines are arriving for a symbol.
+
+        Args:
+            symbol: MEXC symbol
+
+        Returns:
+            True if connected and the symbol updated within STREAM_STALE_SECONDS
+        """
+        state = self._symbols.get(symbol)
+        if state is None or state.last_update_at is None or not self._client.is_connected():
+            return False
+        return self._clock() - state.last_update_at <= STREAM_STALE_SECONDS
+
+    def get_klines(self, symbol: str) -> List[Candle]:
+        """
+        Get the last closed and the current kline of a symbol.
+
+        Args:
+            symbol: MEXC symbol
+
+        Returns:
+            Up to two candles ordered oldest to newest
+        """
+        state = self._symbols.get(symbol)
+        if state is None:
+            return []
+        with self._lock:
+            return [candle for candle in (state.last_closed, state.current) if candle is not None]
+
+    def get_stats(self) -> dict:
+        """
+        Get streaming statistics.
+
+        Returns:
+            Dictionary with connection state and per-symbol update counts.
+        """
+        with self._lock:
+            symbols = list(self._symbols.values())
+        return {
+            'connected': self._client.is_connected(),
+            'symbols': {
+                state.symbol: {
+                    'asset_id': state.asset_id,
+                    'updates': state.updates,
+                    'streaming': self.is_streaming(state.symbol),
+                }
+                for state in symbols
+            },
+        }
+
+    def _on_kline(self, state: _StreamedSymbol, data: dict) -> None:
+        """Track the forming kline and push the previous one once it has closed."""
+        candle = parse_kline_update(data)
+        if candle is None:
+            logger.debug(f"Ignoring malformed kline for {state.symbol}: {data}")
+            return
+
+        closed = None
+        with self._lock:
+            current = state.current
+            if current is not None and candle.timestamp < current.timestamp:
+                return
+            if current is not None and candle.timestamp > current.timestamp:
+                closed = Candle(
+                    timestamp=current.timestamp,
+                    open=current.open,
+                    high=current.high,
+                    low=current.low,
+                    close=current.close,
+                    volume=current.volume,
+                    complete=True,
+                )
+                state.last_closed = closed
+            state.current = candle
+            state.last_update_at = self._clock()
+            state.updates += 1
+
+        if closed is not None:
+            self._manager.append_candle(state.asset_id, BASE_TIMEFRAME, closed)
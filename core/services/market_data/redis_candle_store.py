@@ -6,19 +6,202 @@ Provides a Redis-backed storage layer for market candles with:
 - Efficient range queries by timestamp
 - Automatic expiration (TTL)
 - Recovery on restart
+- Compact binary member encoding (legacy JSON members stay readable)
+- Shared connection pool with cached health state and reconnect backoff
+- Pub/sub notification of completed candles to other processes
 """
 import json
 import logging
+import os
+import socket
+import struct
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Tuple
-from collections import deque
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
 
 from .candle_models import Candle
-from .market_data_config import RedisConfig, get_market_data_config
+from .candle_buffer import CandleArrays, ColumnarCandleBuffer, NO_TRADE_COUNT
+from .market_data_config import (
+    RedisConfig,
+    get_market_data_config,
+    MEMBER_ENCODING_BINARY,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Binary member format v1: format byte + timestamp + OHLCV + trade_count + complete.
+# Volume is NaN and trade_count is -1 when unknown. 58 bytes per candle.
+BINARY_FORMAT_V1 = 0x01
+BINARY_V1_STRUCT = struct.Struct('<BqdddddqB')
+BINARY_V1_DTYPE = np.dtype([
+    ('format', 'u1'),
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+    ('trade_count', '<i8'),
+    ('complete', 'u1'),
+])
+
+Member = Union[str, bytes]
+
+# First reconnect delay after a failed connect; doubles up to reconnect_backoff_max
+RECONNECT_BACKOFF_INITIAL_SECONDS = 1.0
+
+# Atomic append: replace-by-score, add, TTL refresh and trim in one round trip.
+# KEYS[1] = stream key
+# ARGV[1] = TTL in seconds, ARGV[2] = max candles, ARGV[3..] = score/member pairs
+# A TTL or max candles of 0 disables expiry or trimming (history keys).
+APPEND_CANDLES_LUA = """
+local key = KEYS[1]
+for i = 3, #ARGV, 2 do
+    redis.call('ZREMRANGEBYSCORE', key, ARGV[i], ARGV[i])
+    redis.call('ZADD', key, ARGV[i], ARGV[i + 1])
+end
+if tonumber(ARGV[1]) > 0 and redis.call('TTL', key) < 0 then
+    redis.call('EXPIRE', key, ARGV[1])
+end
+local max_candles = tonumber(ARGV[2])
+if max_candles > 0 then
+    local excess = redis.call('ZCARD', key) - max_candles
+    if excess > 0 then
+        redis.call('ZREMRANGEBYRANK', key, 0, excess - 1)
+    end
+end
+return (#ARGV - 2) / 2
+"""
+
+# Key segment of backfilled history (untrimmed, no TTL)
+HISTORY_KEY_SEGMENT = 'history'
+
+# Candles per append script call when writing history
+HISTORY_WRITE_BATCH_SIZE = 5000
+
+# Attempts to re-encode a key that is written concurrently
+MIGRATE_MAX_ATTEMPTS = 5
+
+
+def encode_candle_binary(candle: Candle) -> bytes:
+    """Encode a candle as a binary v1 member."""
+    return BINARY_V1_STRUCT.pack(
+        BINARY_FORMAT_V1,
+        int(candle.timestamp),
+        candle.open,
+        candle.high,
+        candle.low,
+        candle.close,
+        float('nan') if candle.volume is None else candle.volume,
+        NO_TRADE_COUNT if candle.trade_count is None else candle.trade_count,
+        1 if candle.complete else 0,
+    )
+
+
+def decode_binary_members(members: List[bytes]) -> CandleArrays:
+    """Decode binary v1 members with a single frombuffer call."""
+    records = np.frombuffer(b''.join(members), dtype=BINARY_V1_DTYPE)
+    return CandleArrays(
+        timestamp=records['timestamp'],
+        open=records['open'],
+        high=records['high'],
+        low=records['low'],
+        close=records['close'],
+        volume=records['volume'],
+        trade_count=records['trade_count'],
+        complete=records['complete'].astype(bool),
+    )
+
+
+def process_origin() -> str:
+    """Identify the current process in published updates (differs per forked worker)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def encode_candle_update(
+    asset_id: str,
+    timeframe: str,
+    candles: List[Candle],
+    origin: Optional[str] = None,
+) -> bytes:
+    """
+    Encode a pub/sub candle update.
+    
+    Format: one JSON header line (origin, asset_id, timeframe) followed by
+    the candles as concatenated binary v1 records.
+    """
+    header = json.dumps({
+        'origin': origin or process_origin(),
+        'asset_id': asset_id,
+        'timeframe': timeframe,
+    }).encode()
+    return header + b'\n' + b''.join(encode_candle_binary(c) for c in candles)
+
+
+def decode_candle_update(payload: bytes) -> Tuple[str, str, str, List[Candle]]:
+    """
+    Decode a pub/sub candle update.
+    
+    Returns:
+        Tuple of (origin, asset_id, timeframe, candles)
+    """
+    header, _, body = payload.partition(b'\n')
+    meta = json.loads(header)
+    candles = decode_binary_members([body]).to_candles() if body else []
+    return meta['origin'], meta['asset_id'], meta['timeframe'], candles
+
+
+def is_binary_member(member: Member) -> bool:
+    """Check whether a sorted-set member uses the binary encoding."""
+    return isinstance(member, bytes) and len(member) > 0 and member[0] == BINARY_FORMAT_V1
+
+
+# Shared connection pools: {(host, port, db, password): ConnectionPool}
+_connection_pools: Dict[tuple, object] = {}
+_connection_pools_lock = Lock()
+
+
+def get_connection_pool(config: RedisConfig):
+    """
+    Get the process-wide connection pool for a Redis configuration.
+    
+    Pools are decode-free (raw bytes) so binary members round-trip intact.
+    """
+    import redis
+    
+    pool_key = (config.host, config.port, config.db, config.password)
+    with _connection_pools_lock:
+        pool = _connection_pools.get(pool_key)
+        if pool is None:
+            pool = redis.ConnectionPool(
+                host=config.host,
+                port=config.port,
+                db=config.db,
+                password=config.password,
+                max_connections=config.max_connections,
+                socket_timeout=config.socket_timeout,
+                socket_connect_timeout=config.socket_connect_timeout,
+                health_check_interval=config.health_check_interval,
+                decode_responses=False,
+            )
+            _connection_pools[pool_key] = pool
+        return pool
+
+
+def reset_connection_pools() -> None:
+    """Disconnect and drop all shared connection pools (useful for testing)."""
+    with _connection_pools_lock:
+        for pool in _connection_pools.values():
+            try:
+                pool.disconnect()
+            except Exception:
+                pass
+        _connection_pools.clear()
+
 
 class RedisCandleStore:
     """
@@ -26,10 +209,11 @@ class RedisCandleStore:
     
     Uses Redis Sorted Sets for efficient time-range queries:
     - Score = timestamp (allows O(log n) range queries)
-    - Value = JSON-serialized candle data
+    - Value = binary-packed candle (or legacy "{timestamp}:{json}")
     
     Key structure:
         market:candles:{asset_id}:{timeframe}
+        market:candles:history:{asset_id}:{timeframe}  (backfilled history)
     """
     
     def __init__(self, config: Optional[RedisConfig] = None):
@@ -42,62 +226,226 @@ class RedisCandleStore:
         self._config = config or get_market_data_config().redis
         self._redis_client = None
         self._connected = False
-        self._fallback_store: dict = {}  # In-memory fallback when Redis unavailable
+        self._append_script = None  # Registered APPEND_CANDLES_LUA (EVALSHA)
+        # In-memory fallback when Redis is unavailable: {key: ColumnarCandleBuffer}
+        self._fallback_store: Dict[str, ColumnarCandleBuffer] = {}
+        # History fallback is unbounded, so it is keyed by timestamp: {key: {ts: Candle}}
+        self._history_fallback: Dict[str, Dict[int, Candle]] = {}
+        self._fallback_lock = Lock()
+        
+        # Health state (time.monotonic() based)
+        self._last_health_check = 0.0
+        self._reconnect_backoff = 0.0
+        self._next_connect_attempt = 0.0
     
     def _get_redis_client(self):
-        """Get or create Redis client."""
-        if self._redis_client is None:
-            try:
-                import redis
-                self._redis_client = redis.Redis(
-                    host=self._config.host,
-                    port=self._config.port,
-                    db=self._config.db,
-                    password=self._config.password,
-                    decode_responses=True,
-                )
-                # Test connection
-                self._redis_client.ping()
-                self._connected = True
-                logger.info(f"Connected to Redis at {self._config.host}:{self._config.port}")
-            except Exception as e:
-                logger.warning(f"Failed to connect to Redis: {e}. Using in-memory fallback.")
-                self._redis_client = None
-                self._connected = False
+        """
+        Get or create Redis client.
+        
+        Clients share a process-wide connection pool. After a failed connect,
+        further attempts are skipped until the backoff delay has passed.
+        """
+        if self._redis_client is not None:
+            return self._redis_client
+        
+        if time.monotonic() < self._next_connect_attempt:
+            return None
+        
+        try:
+            import redis
+            client = redis.Redis(connection_pool=get_connection_pool(self._config))
+            # Test connection
+            client.ping()
+            self._redis_client = client
+            self._connected = True
+            self._reconnect_backoff = 0.0
+            self._last_health_check = time.monotonic()
+            logger.info(f"Connected to Redis at {self._config.host}:{self._config.port}")
+        except Exception as e:
+            self._mark_unavailable(e)
         return self._redis_client
     
+    def _mark_unavailable(self, error: Exception) -> None:
+        """Drop the client and schedule the next connect attempt with backoff."""
+        self._reconnect_backoff = min(
+            max(self._reconnect_backoff * 2, RECONNECT_BACKOFF_INITIAL_SECONDS),
+            self._config.reconnect_backoff_max,
+        )
+        self._next_connect_attempt = time.monotonic() + self._reconnect_backoff
+        self._redis_client = None
+        self._connected = False
+        self._append_script = None
+        logger.warning(
+            f"Failed to connect to Redis: {error}. Using in-memory fallback, "
+            f"retrying in {self._reconnect_backoff:.0f}s."
+        )
+    
+    def _handle_redis_error(self, error: Exception) -> None:
+        """Start the reconnect backoff if an operation failed on the connection."""
+        try:
+            from redis.exceptions import ConnectionError, TimeoutError
+        except ImportError:
+            return
+        
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            self._mark_unavailable(error)
+    
     @property
     def is_connected(self) -> bool:
-        """Check if Redis is connected."""
-        if self._redis_client is None:
+        """
+        Check if Redis is connected.
+        
+        A successful PING is cached for health_check_interval seconds, so
+        frequent callers (e.g. per-asset status widgets) don't hit Redis.
+        """
+        redis_client = self._get_redis_client()
+        if redis_client is None:
             return False
+        
+        now = time.monotonic()
+        if now - self._last_health_check < self._config.health_check_interval:
+            return self._connected
+        
         try:
-            self._redis_client.ping()
-            return True
-        except Exception:
-            self._connected = False
-            return False
+            redis_client.ping()
+            self._connected = True
+            self._last_health_check = now
+        except Exception as e:
+            self._mark_unavailable(e)
+        return self._connected
     
     def _get_key(self, asset_id: str, timeframe: str) -> str:
         """Generate Redis key for an asset/timeframe pair."""
         return f"{self._config.key_prefix}:{asset_id}:{timeframe}"
     
-    def _candle_to_member_key(self, candle: Candle) -> str:
+    def _get_history_key(self, asset_id: str, timeframe: str) -> str:
+        """Generate Redis key for the backfilled history of an asset/timeframe pair."""
+        return f"{self._config.key_prefix}:{HISTORY_KEY_SEGMENT}:{asset_id}:{timeframe}"
+    
+    def _candle_to_member_key(
+        self,
+        candle: Candle,
+        encoding: Optional[str] = None,
+    ) -> Member:
         """
         Create a deterministic member key for the candle.
         
-        Uses timestamp as prefix to ensure only one candle per timestamp.
-        When ZADD is called with the same member key, Redis updates the score
-        and value automatically, preventing duplicates without needing ZREM.
+        Binary members start with a format byte followed by the timestamp;
+        JSON members use the timestamp as prefix. Either way a candle with
+        the same timestamp and values maps to the same member.
+        
+        Args:
+            candle: Candle to encode
+            encoding: 'binary' or 'json' (defaults to the configured encoding)
         """
+        encoding = encoding or self._config.member_encoding
+        if encoding == MEMBER_ENCODING_BINARY:
+            return encode_candle_binary(candle)
         return f"{candle.timestamp}:{json.dumps(candle.to_dict())}"
     
-    def _member_key_to_candle(self, member_key: str) -> Candle:
-        """Extract candle from member key."""
+    def _member_key_to_candle(self, member_key: Member) -> Candle:
+        """Extract candle from member key (binary or JSON)."""
+        if is_binary_member(member_key):
+            return decode_binary_members([member_key]).to_candles()[0]
+        
+        if isinstance(member_key, bytes):
+            member_key = member_key.decode('utf-8')
+        
         # Split on first colon to separate timestamp from JSON
         _, json_part = member_key.split(':', 1)
         return Candle.from_dict(json.loads(json_part))
     
+    def _members_to_candles(self, members: List[Member]) -> List[Candle]:
+        """
+        Decode a batch of sorted-set members.
+        
+        Binary members are decoded together with one frombuffer call; legacy
+        JSON members are parsed individually.
+        
+        Returns:
+            List of candles, ordered by timestamp ascending
+        """
+        binary_members = []
+        candles = []
+        for member in members:
+            if is_binary_member(member):
+                binary_members.append(member)
+            else:
+                candles.append(self._member_key_to_candle(member))
+        
+        if binary_members:
+            binary_candles = decode_binary_members(binary_members).to_candles()
+            if not candles:
+                return binary_candles  # ZRANGE order is already by score
+            candles.extend(binary_candles)
+        
+        return sorted(candles, key=lambda c: c.timestamp)
+    
+    def _get_append_script(self, redis_client):
+        """Get the registered append script for the current client."""
+        if self._append_script is None or self._append_script.registered_client is not redis_client:
+            self._append_script = redis_client.register_script(APPEND_CANDLES_LUA)
+        return self._append_script
+    
+    def _append_to_redis(
+        self,
+        redis_client,
+        key: str,
+        candles: List[Candle],
+        ttl_seconds: Optional[int] = None,
+        max_candles: Optional[int] = None,
+    ) -> int:
+        """
+        Write candles with a single round trip.
+        
+        Replace-by-score, ZADD, TTL refresh and trimming run atomically
+        inside one Lua script (EVALSHA), independent of batch size.
+        
+        Args:
+            redis_client: Redis client
+            key: Sorted set key
+            candles: Candles to write
+            ttl_seconds: Key TTL (defaults to ttl_hours; 0 keeps the key)
+            max_candles: Trim limit (defaults to max_candles_per_stream; 0 disables trimming)
+        
+        Returns:
+            Number of candles written
+        """
+        if ttl_seconds is None:
+            ttl_seconds = self._config.ttl_hours * 3600
+        if max_candles is None:
+            max_candles = self._config.max_candles_per_stream
+        args = [ttl_seconds, max_candles]
+        for candle in candles:
+            args.append(int(candle.timestamp))
+            args.append(self._candle_to_member_key(candle))
+        
+        script = self._get_append_script(redis_client)
+        return int(script(keys=[key], args=args))
+    
+    def _publish_completed(
+        self,
+        redis_client,
+        asset_id: str,
+        timeframe: str,
+        candles: List[Candle],
+    ) -> None:
+        """Publish completed candles so other processes can update their streams."""
+        if not self._config.pubsub_enabled:
+            return
+        
+        completed = [c for c in candles if c.complete]
+        if not completed:
+            return
+        
+        try:
+            redis_client.publish(
+                self._config.updates_channel,
+                encode_candle_update(asset_id, timeframe, completed),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish candle update: {e}")
+    
     def append_candle(
         self,
         asset_id: str,
@@ -108,8 +456,9 @@ class RedisCandleStore:
         Append a candle to the store.
         
         Candles are aggregated in-memory and written only once per completed minute.
-        Uses timestamp-prefixed member keys to prevent duplicates. Since the broker
-        service only calls this once per completed candle, no ZREM is needed.
+        Any existing member with the same timestamp is replaced, the TTL is set
+        if missing and the stream is trimmed, all in one atomic round trip.
+        A completed candle is then published on the updates channel.
         
         Args:
             asset_id: Asset identifier
@@ -124,31 +473,15 @@ class RedisCandleStore:
         redis_client = self._get_redis_client()
         if redis_client:
             try:
-                # Create member key with timestamp prefix
-                # Format: "{timestamp}:{json_data}"
-                member_key = self._candle_to_member_key(candle)
-                
-                # Clean up any old entries with same timestamp (edge case for restarts)
-                # This is a single operation per completed candle, not per trade
-                redis_client.zremrangebyscore(key, candle.timestamp, candle.timestamp)
-                
-                # Add the new candle
-                redis_client.zadd(key, {member_key: candle.timestamp})
-                
-                # Set TTL if not already set
-                ttl = redis_client.ttl(key)
-                if ttl < 0:
-                    redis_client.expire(key, self._config.ttl_hours * 3600)
-                
-                # Trim old candles if necessary
-                self._trim_old_candles(redis_client, key)
-                
+                self._append_to_redis(redis_client, key, [candle])
+                self._publish_completed(redis_client, asset_id, timeframe, [candle])
                 return True
             except Exception as e:
                 logger.error(f"Failed to append candle to Redis: {e}")
+                self._handle_redis_error(e)
         
         # Fallback to in-memory store
-        return self._append_to_fallback(key, candle)
+        return self._append_to_fallback(key, [candle]) > 0
     
     def append_candles(
         self,
@@ -159,7 +492,9 @@ class RedisCandleStore:
         """
         Append multiple candles to the store.
         
-        Each candle is written with a timestamp-prefixed key to prevent duplicates.
+        The whole batch is written in one atomic round trip; candles with
+        timestamps already in the store replace the stored ones.
+        Completed candles are then published on the updates channel.
         
         Args:
             asset_id: Asset identifier
@@ -177,61 +512,30 @@ class RedisCandleStore:
         redis_client = self._get_redis_client()
         if redis_client:
             try:
-                # Remove any existing candles with the same timestamps (edge case for restarts)
-                for candle in candles:
-                    redis_client.zremrangebyscore(key, candle.timestamp, candle.timestamp)
-                
-                # Batch ZADD with timestamp-prefixed member keys
-                mapping = {self._candle_to_member_key(c): c.timestamp for c in candles}
-                added = redis_client.zadd(key, mapping)
-                
-                # Set TTL if not already set
-                ttl = redis_client.ttl(key)
-                if ttl < 0:
-                    redis_client.expire(key, self._config.ttl_hours * 3600)
-                
-                # Trim old candles if necessary
-                self._trim_old_candles(redis_client, key)
-                
-                return len(candles) if added else 0
+                written = self._append_to_redis(redis_client, key, candles)
+                self._publish_completed(redis_client, asset_id, timeframe, candles)
+                return written
             except Exception as e:
                 logger.error(f"Failed to append candles to Redis: {e}")
+                self._handle_redis_error(e)
         
         # Fallback
-        count = 0
-        for candle in candles:
-            if self._append_to_fallback(key, candle):
-                count += 1
-        return count
-    
-    def _trim_old_candles(self, redis_client, key: str) -> None:
-        """Remove old candles to enforce max size."""
-        try:
-            count = redis_client.zcard(key)
-            if count > self._config.max_candles_per_stream:
-                # Remove oldest entries
-                excess = count - self._config.max_candles_per_stream
-                redis_client.zpopmin(key, excess)
-        except Exception as e:
-            logger.warning(f"Failed to trim old candles: {e}")
+        return self._append_to_fallback(key, candles)
     
-    def _append_to_fallback(self, key: str, candle: Candle) -> bool:
-        """Append candle to in-memory fallback store.
+    def _append_to_fallback(self, key: str, candles: List[Candle]) -> int:
+        """Append candles to the in-memory fallback store.
         
-        Removes any existing candle with the same timestamp to prevent duplicates.
+        Each stream is a timestamp-sorted ColumnarCandleBuffer capped at
+        max_candles_per_stream: a candle with an existing timestamp replaces
+        it (O(1) for the newest one), and the oldest candles are evicted.
         """
-        if key not in self._fallback_store:
-            self._fallback_store[key] = deque(maxlen=self._config.max_candles_per_stream)
-        
-        # Remove any existing candle with the same timestamp
-        store = self._fallback_store[key]
-        self._fallback_store[key] = deque(
-            (c for c in store if c.timestamp != candle.timestamp),
-            maxlen=self._config.max_candles_per_stream
-        )
-        
-        self._fallback_store[key].append(candle)
-        return True
+        with self._fallback_lock:
+            buffer = self._fallback_store.get(key)
+            if buffer is None:
+                buffer = ColumnarCandleBuffer(self._config.max_candles_per_stream)
+                self._fallback_store[key] = buffer
+            buffer.extend(candles)
+        return len(candles)
     
     def load_candles(
         self,
@@ -270,10 +574,10 @@ class RedisCandleStore:
                     # Load all
                     results = redis_client.zrange(key, 0, -1)
                 
-                candles = [self._member_key_to_candle(r) for r in results]
-                return sorted(candles, key=lambda c: c.timestamp)
+                return self._members_to_candles(results)
             except Exception as e:
                 logger.error(f"Failed to load candles from Redis: {e}")
+                self._handle_redis_error(e)
         
         # Fallback to in-memory store
         return self._load_from_fallback(key, window_hours, count)
@@ -285,19 +589,15 @@ class RedisCandleStore:
         count: Optional[int],
     ) -> List[Candle]:
         """Load candles from in-memory fallback store."""
-        if key not in self._fallback_store:
-            return []
-        
-        candles = list(self._fallback_store[key])
-        
+        min_ts = None
         if window_hours is not None:
             min_ts = int((datetime.now(timezone.utc) - timedelta(hours=window_hours)).timestamp())
-            candles = [c for c in candles if c.timestamp >= min_ts]
-
-        if count is not None:
-            candles = candles[-count:]
-
-        return sorted(candles, key=lambda c: c.timestamp)
+        
+        with self._fallback_lock:
+            buffer = self._fallback_store.get(key)
+            if buffer is None:
+                return []
+            return buffer.get_recent(min_timestamp=min_ts, count=count)
 
     def get_range(
         self,
@@ -315,21 +615,133 @@ class RedisCandleStore:
         if redis_client:
             try:
                 results = redis_client.zrangebyscore(key, start_ts, end_ts)
-                candles = [self._member_key_to_candle(r) for r in results]
-                return sorted(candles, key=lambda c: c.timestamp)
+                return self._members_to_candles(results)
             except Exception as e:
                 logger.error(f"Failed to load candle range from Redis: {e}")
+                self._handle_redis_error(e)
 
-        # Fallback to in-memory store
-        if key not in self._fallback_store:
-            return []
-
-        candles = [
-            c
-            for c in self._fallback_store[key]
-            if start_ts <= c.timestamp <= end_ts
-        ]
-        return sorted(candles, key=lambda c: c.timestamp)
+        # Fallback to in-memory store (binary search on the sorted buffer)
+        with self._fallback_lock:
+            buffer = self._fallback_store.get(key)
+            if buffer is None:
+                return []
+            return buffer.get_range_arrays(start_ts, end_ts + 1).to_candles()
+    
+    def append_history(
+        self,
+        asset_id: str,
+        timeframe: str,
+        candles: List[Candle],
+    ) -> int:
+        """
+        Write backfilled candles to the history key of an asset/timeframe pair.
+        
+        History keys are neither trimmed nor expired and are not published
+        on the updates channel, so live appends to the stream key cannot
+        evict them. Candles with timestamps already stored replace the
+        stored ones; large batches are written in chunks of
+        HISTORY_WRITE_BATCH_SIZE.
+        
+        Args:
+            asset_id: Asset identifier
+            timeframe: Candle timeframe
+            candles: Candles to store
+            
+        Returns:
+            Number of candles successfully stored
+        """
+        if not candles:
+            return 0
+        
+        key = self._get_history_key(asset_id, timeframe)
+        
+        redis_client = self._get_redis_client()
+        if redis_client:
+            try:
+                written = 0
+                for i in range(0, len(candles), HISTORY_WRITE_BATCH_SIZE):
+                    written += self._append_to_redis(
+                        redis_client,
+                        key,
+                        candles[i:i + HISTORY_WRITE_BATCH_SIZE],
+                        ttl_seconds=0,
+                        max_candles=0,
+                    )
+                return written
+            except Exception as e:
+                logger.error(f"Failed to append history to Redis: {e}")
+                self._handle_redis_error(e)
+        
+        with self._fallback_lock:
+            history = self._history_fallback.setdefault(key, {})
+            for candle in candles:
+                history[int(candle.timestamp)] = candle
+        return len(candles)
+    
+    def get_history_range(
+        self,
+        asset_id: str,
+        timeframe: str,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> List[Candle]:
+        """Load backfilled candles within a timestamp range (inclusive)."""
+        key = self._get_history_key(asset_id, timeframe)
+        start_ts = int(start_time.timestamp())
+        end_ts = int(end_time.timestamp())
+        
+        redis_client = self._get_redis_client()
+        if redis_client:
+            try:
+                results = redis_client.zrangebyscore(key, start_ts, end_ts)
+                return self._members_to_candles(results)
+            except Exception as e:
+                logger.error(f"Failed to load history range from Redis: {e}")
+                self._handle_redis_error(e)
+        
+        with self._fallback_lock:
+            history = self._history_fallback.get(key, {})
+            return [history[ts] for ts in sorted(history) if start_ts <= ts <= end_ts]
+    
+    def get_history_count(
+        self,
+        asset_id: str,
+        timeframe: str,
+    ) -> int:
+        """Get the number of backfilled candles of an asset/timeframe pair."""
+        key = self._get_history_key(asset_id, timeframe)
+        
+        redis_client = self._get_redis_client()
+        if redis_client:
+            try:
+                return redis_client.zcard(key)
+            except Exception as e:
+                logger.error(f"Failed to get history count from Redis: {e}")
+                self._handle_redis_error(e)
+        
+        with self._fallback_lock:
+            return len(self._history_fallback.get(key, {}))
+    
+    def clear_history(
+        self,
+        asset_id: str,
+        timeframe: str,
+    ) -> bool:
+        """Delete the backfilled history of an asset/timeframe pair."""
+        key = self._get_history_key(asset_id, timeframe)
+        
+        redis_client = self._get_redis_client()
+        if redis_client:
+            try:
+                redis_client.delete(key)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to clear history from Redis: {e}")
+                self._handle_redis_error(e)
+        
+        with self._fallback_lock:
+            self._history_fallback.pop(key, None)
+        return True
     
     def get_latest_candle(
         self,
@@ -372,10 +784,11 @@ class RedisCandleStore:
                 return redis_client.zcard(key)
             except Exception as e:
                 logger.error(f"Failed to get candle count from Redis: {e}")
+                self._handle_redis_error(e)
         
-        if key in self._fallback_store:
-            return len(self._fallback_store[key])
-        return 0
+        with self._fallback_lock:
+            buffer = self._fallback_store.get(key)
+            return len(buffer) if buffer is not None else 0
     
     def clear(
         self,
@@ -401,11 +814,79 @@ class RedisCandleStore:
                 return True
             except Exception as e:
                 logger.error(f"Failed to clear candles from Redis: {e}")
+                self._handle_redis_error(e)
         
-        if key in self._fallback_store:
-            del self._fallback_store[key]
+        with self._fallback_lock:
+            self._fallback_store.pop(key, None)
         return True
     
+    def iter_stream_keys(self) -> Iterator[str]:
+        """Iterate over all candle stream keys in Redis."""
+        redis_client = self._get_redis_client()
+        if not redis_client:
+            return
+        
+        for key in redis_client.scan_iter(match=f"{self._config.key_prefix}:*"):
+            yield key.decode('utf-8') if isinstance(key, bytes) else key
+    
+    def migrate_member_encoding(
+        self,
+        key: str,
+        encoding: str = MEMBER_ENCODING_BINARY,
+        dry_run: bool = False,
+    ) -> int:
+        """
+        Re-encode all members of a stream key to the given encoding.
+        
+        Members are swapped (ZREM + ZADD with the same score) in one
+        MULTI/EXEC transaction, so readers never see a missing candle and
+        the key's TTL is preserved. The key is WATCHed while the members
+        are read; if it is written concurrently, the migration is retried
+        so no appended candle is lost.
+        
+        Args:
+            key: Full Redis key of the stream
+            encoding: Target encoding ('binary' or 'json')
+            dry_run: Only count members that would be converted
+            
+        Returns:
+            Number of members converted (or to convert when dry_run)
+            
+        Raises:
+            ConnectionError: If Redis is not available or the key kept
+                changing for MIGRATE_MAX_ATTEMPTS attempts
+        """
+        import redis
+        
+        redis_client = self._get_redis_client()
+        if not redis_client:
+            raise ConnectionError("Redis is not available")
+        
+        to_binary = encoding == MEMBER_ENCODING_BINARY
+        for _ in range(MIGRATE_MAX_ATTEMPTS):
+            try:
+                with redis_client.pipeline() as pipe:
+                    pipe.watch(key)
+                    members = pipe.zrange(key, 0, -1, withscores=True)
+                    conversions = [
+                        (member, score) for member, score in members
+                        if is_binary_member(member) != to_binary
+                    ]
+                    if not conversions or dry_run:
+                        return len(conversions)
+                    
+                    pipe.multi()
+                    for member, score in conversions:
+                        candle = self._member_key_to_candle(member)
+                        pipe.zrem(key, member)
+                        pipe.zadd(key, {self._candle_to_member_key(candle, encoding): score})
+                    pipe.execute()
+                    return len(conversions)
+            except redis.WatchError:
+                logger.debug(f"{key} changed during migration, retrying")
+        
+        raise ConnectionError(f"{key} kept changing during migration")
+    
     def close(self) -> None:
         """Close the Redis connection."""
         if self._redis_client:
@@ -415,6 +896,7 @@ class RedisCandleStore:
                 pass
             self._redis_client = None
             self._connected = False
+            self._append_script = None
 
 
 # Singleton instance
@@ -0,0 +1,174 @@
+"""
+Tick aggregation for the Market Data Layer.
+
+Folds streamed price ticks into 1m OHLC candles. The forming candle is
+pushed to the CandleStream on every tick (not persisted) and written to
+Redis once its minute has closed.
+"""
+import logging
+import threading
+from typing import Callable, Optional
+
+from .candle_models import Candle
+from .candle_stream import CandleStream
+from .market_data_config import TimeframeConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class TickCandleAggregator:
+    """
+    Builds candles of one timeframe from ticks and appends them to a stream.
+
+    A minute closes when the first tick of a later minute arrives, or when
+    flush() is called after the minute has passed (quiet markets).
+
+    Usage:
+        aggregator = TickCandleAggregator(stream)
+        aggregator.add_tick(timestamp=1700000012.5, price=1.0851)
+    """
+
+    def __init__(
+        self,
+        stream: CandleStream,
+        timeframe: str = '1m',
+        on_candle_closed: Optional[Callable[[Candle], None]] = None,
+    ):
+        """
+        Initialize the aggregator.
+
+        Args:
+            stream: Stream receiving the candles
+            timeframe: Candle timeframe to build
+            on_candle_closed: Optional callback for every closed candle
+        """
+        self._stream = stream
+        self._bucket_seconds = TimeframeConfig.to_minutes(timeframe) * 60
+        self._on_candle_closed = on_candle_closed
+        self._candle: Optional[Candle] = None
+        self._last_closed: Optional[int] = None  # Timestamp of the last closed candle
+        self._tick_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stream(self) -> CandleStream:
+        """Stream receiving the candles."""
+        return self._stream
+
+    @property
+    def current_candle(self) -> Optional[Candle]:
+        """The candle currently being formed."""
+        return self._candle
+
+    @property
+    def tick_count(self) -> int:
+        """Number of ticks aggregated so far."""
+        return self._tick_count
+
+    def add_tick(
+        self,
+        timestamp: float,
+        price: float,
+        volume: Optional[float] = None,
+    ) -> None:
+        """
+        Add a price tick.
+
+        Ticks older than the forming candle or of an already closed
+        period (e.g. late after flush()) are ignored.
+
+        Args:
+            timestamp: Unix timestamp of the tick (seconds)
+            price: Traded or mid price
+            volume: Tick volume (optional)
+        """
+        bucket_start = int(timestamp) - int(timestamp) % self._bucket_seconds
+
+        with self._lock:
+            candle = self._candle
+            if candle is not None and bucket_start < candle.timestamp:
+                return
+            if self._last_closed is not None and bucket_start <= self._last_closed:
+                return
+
+            closed = None
+            if candle is not None and bucket_start > candle.timestamp:
+                closed = self._close(candle)
+                candle = None
+
+            if candle is None:
+                candle = Candle(
+                    timestamp=bucket_start,
+                    open=price,
+                    high=price,
+                    low=price,
+                    close=price,
+                    volume=volume,
+                    trade_count=1,
+                    complete=False,
+                )
+            else:
+                candle = Candle(
+                    timestamp=candle.timestamp,
+                    open=candle.open,
+                    high=max(candle.high, price),
+                    low=min(candle.low, price),
+                    close=price,
+                    volume=(candle.volume or 0.0) + volume if volume is not None else candle.volume,
+                    trade_count=(candle.trade_count or 0) + 1,
+                    complete=False,
+                )
+
+            self._candle = candle
+            self._tick_count += 1
+            # Appended under the lock, so a concurrent flush() is neither
+            # overwritten by a stale forming candle nor appended out of order
+            if closed is not None:
+                self._stream.append(closed)
+            self._stream.append(candle, persist=False)
+
+        if closed is not None:
+            self._notify_closed(closed)
+
+    def flush(self, now: float) -> Optional[Candle]:
+        """
+        Close the forming candle if its period has ended.
+
+        Args:
+            now: Current Unix timestamp (seconds)
+
+        Returns:
+            The closed candle, or None if nothing was closed
+        """
+        with self._lock:
+            candle = self._candle
+            if candle is None or now < candle.timestamp + self._bucket_seconds:
+                return None
+            closed = self._close(candle)
+            self._stream.append(closed)
+
+        self._notify_closed(closed)
+        return closed
+
+    def _close(self, candle: Candle) -> Candle:
+        """Mark a candle complete and clear the forming candle (lock held)."""
+        self._candle = None
+        self._last_closed = candle.timestamp
+        return Candle(
+            timestamp=candle.timestamp,
+            open=candle.open,
+            high=candle.high,
+            low=candle.low,
+            close=candle.close,
+            volume=candle.volume,
+            trade_count=candle.trade_count,
+            complete=True,
+        )
+
+    def _notify_closed(self, candle: Candle) -> None:
+        if self._on_candle_closed:
+            try:
+                self._on_candle_closed(candle)
+            except Exception as e:
+                logger.error(f"Error in candle closed callback: {e}")
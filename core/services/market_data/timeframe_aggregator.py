@@ -0,0 +1,230 @@
+"""
+Timeframe aggregation for the Market Data Layer.
+
+Builds higher-timeframe candles (5m, 15m, 1h, ...) from a 1m base stream,
+so charts and indicators on those timeframes need no broker fetch or
+Redis key of their own.
+"""
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+from .candle_buffer import CandleArrays, NO_TRADE_COUNT
+from .candle_models import Candle
+from .candle_stream import CandleStream
+from .market_data_config import TimeframeConfig
+
+
+logger = logging.getLogger(__name__)
+
+# Timeframe all derived timeframes are built from
+BASE_TIMEFRAME = '1m'
+
+
+def fold_candles(
+    arrays: CandleArrays,
+    bucket_start: int,
+    complete: bool,
+) -> Optional[Candle]:
+    """
+    Fold base candles of one bucket into a single OHLCV candle.
+
+    Args:
+        arrays: Base candles of the bucket, ordered by timestamp
+        bucket_start: Start timestamp of the bucket
+        complete: Whether the bucket is closed
+
+    Returns:
+        Aggregated candle, or None if the bucket is empty
+    """
+    if len(arrays) == 0:
+        return None
+
+    volumes = arrays.volume[~np.isnan(arrays.volume)]
+    trade_counts = arrays.trade_count[arrays.trade_count != NO_TRADE_COUNT]
+
+    return Candle(
+        timestamp=bucket_start,
+        open=float(arrays.open[0]),
+        high=float(arrays.high.max()),
+        low=float(arrays.low.min()),
+        close=float(arrays.close[-1]),
+        volume=float(volumes.sum()) if len(volumes) else None,
+        trade_count=int(trade_counts.sum()) if len(trade_counts) else None,
+        complete=complete,
+    )
+
+
+def aggregate_candles(
+    candles: List[Candle],
+    timeframe: str,
+    base_timeframe: str = BASE_TIMEFRAME,
+) -> List[Candle]:
+    """
+    Aggregate a base candle series into a higher timeframe.
+
+    Buckets are aligned to multiples of the timeframe in Unix time. The
+    last bucket is marked incomplete unless its final base candle is
+    present and complete. The first bucket is marked incomplete if the
+    base series starts after its start (its OHLC would be cut short).
+
+    Args:
+        candles: Base candles, ordered by timestamp ascending
+        timeframe: Target timeframe (e.g., '5m', '1h')
+        base_timeframe: Timeframe of the input candles
+
+    Returns:
+        Aggregated candles, ordered by timestamp ascending
+    """
+    if not candles:
+        return []
+
+    bucket_seconds = TimeframeConfig.to_minutes(timeframe) * 60
+    base_seconds = TimeframeConfig.to_minutes(base_timeframe) * 60
+
+    arrays = CandleArrays.from_candles(sorted(candles, key=lambda c: c.timestamp))
+    bucket_starts = arrays.timestamp - arrays.timestamp % bucket_seconds
+    boundaries = np.flatnonzero(np.diff(bucket_starts)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(candles)]))
+
+    result = []
+    for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        bucket = CandleArrays(*(
+            column[start:end] for column in (
+                arrays.timestamp, arrays.open, arrays.high, arrays.low,
+                arrays.close, arrays.volume, arrays.trade_count, arrays.complete,
+            )
+        ))
+        bucket_start = int(bucket_starts[start])
+        is_last = i == len(starts) - 1
+        complete = not is_last or _is_bucket_closed(bucket, bucket_start, bucket_seconds, base_seconds)
+        if i == 0 and int(bucket.timestamp[0]) > bucket_start:
+            # Base history starts partway into the bucket
+            complete = False
+        result.append(fold_candles(bucket, bucket_start, complete))
+
+    return result
+
+
+def _is_bucket_closed(
+    bucket: CandleArrays,
+    bucket_start: int,
+    bucket_seconds: int,
+    base_seconds: int,
+) -> bool:
+    """Check whether the last base candle of a bucket has closed."""
+    last_slot = bucket_start + bucket_seconds - base_seconds
+    return int(bucket.timestamp[-1]) >= last_slot and bool(bucket.complete[-1])
+
+
+class TimeframeAggregator:
+    """
+    Keeps a derived-timeframe stream in sync with a 1m base stream.
+
+    Registered as a listener on the base stream. For every update, the
+    affected buckets are re-folded from the base buffer (a binary-searched
+    slice of at most one bucket of base candles), so replaced or
+    out-of-order base candles are handled without extra bookkeeping. The
+    previous bucket is closed as soon as a base candle of a later bucket
+    arrives.
+
+    Usage:
+        aggregator = TimeframeAggregator(base_stream, derived_stream)
+        aggregator.seed()
+        base_stream.add_listener(aggregator.on_base_update)
+    """
+
+    def __init__(self, base: CandleStream, derived: CandleStream):
+        """
+        Initialize the aggregator.
+
+        Args:
+            base: 1m base stream
+            derived: Non-persistent stream for the higher timeframe
+        """
+        self._base = base
+        self._derived = derived
+        self._bucket_seconds = TimeframeConfig.to_minutes(derived.timeframe) * 60
+        self._base_seconds = TimeframeConfig.to_minutes(base.timeframe) * 60
+
+    @property
+    def timeframe(self) -> str:
+        """Get the derived timeframe."""
+        return self._derived.timeframe
+
+    def seed(self) -> int:
+        """
+        Build the derived stream from the current base buffer.
+
+        The buckets are merged into the derived stream, so older bars
+        (e.g. fetched natively for windows wider than the base buffer)
+        are kept. A partial first bucket does not replace a complete bar.
+
+        Returns:
+            Number of derived candles built
+        """
+        candles = aggregate_candles(
+            self._base.get_recent(),
+            self._derived.timeframe,
+            self._base.timeframe,
+        )
+        if candles and not candles[0].complete and self._has_complete_bar(candles[0].timestamp):
+            candles = candles[1:]
+        if candles:
+            self._derived.append_many(candles, persist=False)
+        return len(candles)
+
+    def _has_complete_bar(self, bucket_start: int) -> bool:
+        """Check whether the derived stream holds a complete bar for a bucket."""
+        existing = self._derived.get_range_arrays(bucket_start, bucket_start + 1)
+        return len(existing) > 0 and bool(existing.complete[0])
+
+    def on_base_update(self, candles: List[Candle]) -> None:
+        """Re-fold every bucket touched by appended base candles."""
+        if not candles:
+            return
+
+        buckets = sorted({int(c.timestamp) - int(c.timestamp) % self._bucket_seconds for c in candles})
+
+        # Close the forming derived candle once a later bucket starts
+        last = self._derived.get_recent(count=1)
+        if last and not last[-1].complete and last[-1].timestamp < buckets[0]:
+            buckets.insert(0, int(last[-1].timestamp))
+
+        latest = self._base.get_recent(count=1)
+        latest_ts = int(latest[-1].timestamp) if latest else 0
+
+        derived = []
+        for bucket_start in buckets:
+            candle = self._fold_bucket(bucket_start, latest_ts)
+            if candle is None:
+                continue
+            if not candle.complete and self._has_complete_bar(bucket_start):
+                # Partial bucket at the start of the base buffer
+                continue
+            derived.append(candle)
+
+        if derived:
+            self._derived.append_many(derived, persist=False)
+
+    def _fold_bucket(self, bucket_start: int, latest_ts: int) -> Optional[Candle]:
+        """Fold one bucket from the base buffer."""
+        bucket_end = bucket_start + self._bucket_seconds
+        arrays = self._base.get_range_arrays(bucket_start, bucket_end)
+        if len(arrays) == 0:
+            return None
+
+        complete = latest_ts >= bucket_end or _is_bucket_closed(
+            arrays, bucket_start, self._bucket_seconds, self._base_seconds
+        )
+        if complete and int(arrays.timestamp[0]) > bucket_start and self._starts_base(bucket_start):
+            # Base buffer starts partway into the bucket; its OHLC is cut short
+            complete = False
+        return fold_candles(arrays, bucket_start, complete)
+
+    def _starts_base(self, bucket_start: int) -> bool:
+        """Check whether the base buffer has no candles in the previous bucket."""
+        previous = self._base.get_range_arrays(bucket_start - self._bucket_seconds, bucket_start)
+        return len(previous) == 0
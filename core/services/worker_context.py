@@ -0,0 +1,178 @@
+"""
+Cached per-asset configuration of the Fiona worker.
+
+Each cycle needs the strategy config, the enabled session phase configs
+and the session times of every asset. They change rarely, so the worker
+builds them once per asset and reuses them until the asset's updated_at
+changes. Saving or deleting a breakout, event or session phase config
+touches updated_at of its asset (see trading.signals), so a cycle that
+has loaded the active assets can tell whether a cached context is stale
+without further queries.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from core.services.broker import SessionTimesConfig
+from core.services.strategy import StrategyConfig
+
+
+logger = logging.getLogger(__name__)
+
+# AssetSessionPhaseConfig.phase -> SessionTimesConfig.from_time_strings() arguments
+_PHASE_TIME_ARGUMENTS = {
+    'ASIA_RANGE': ('asia_start', 'asia_end'),
+    'LONDON_CORE': ('london_core_start', 'london_core_end'),
+    'PRE_US_RANGE': ('pre_us_start', 'pre_us_end'),
+    'US_CORE_TRADING': ('us_core_trading_start', 'us_core_trading_end'),
+}
+
+
+@dataclass(frozen=True)
+class AssetCycleContext:
+    """
+    Configuration of one asset used by a worker cycle.
+
+    Attributes:
+        version: updated_at of the asset the context was built from.
+        strategy_config: StrategyConfig of the asset.
+        phase_configs: Enabled AssetSessionPhaseConfig by phase.
+        session_times: Session times of the asset.
+    """
+    version: Optional[datetime]
+    strategy_config: StrategyConfig
+    phase_configs: Dict[str, Any]
+    session_times: SessionTimesConfig
+
+
+def build_session_times(asset, phase_configs) -> SessionTimesConfig:
+    """
+    Build the session times of an asset.
+
+    Uses the Sessions & Phases configuration and falls back to the
+    breakout config, then to the default session times.
+
+    Args:
+        asset: TradingAsset instance.
+        phase_configs: Enabled AssetSessionPhaseConfig instances of the asset.
+
+    Returns:
+        SessionTimesConfig for the asset.
+    """
+    session_times_kwargs = {}
+    for pc in phase_configs:
+        arguments = _PHASE_TIME_ARGUMENTS.get(pc.phase)
+        if arguments is None:
+            continue
+        session_times_kwargs[arguments[0]] = pc.start_time_utc
+        session_times_kwargs[arguments[1]] = pc.end_time_utc
+        if pc.phase == 'US_CORE_TRADING':
+            session_times_kwargs['us_core_trading_enabled'] = pc.enabled
+
+    if session_times_kwargs:
+        return SessionTimesConfig.from_time_strings(**session_times_kwargs)
+
+    # Fallback to breakout config if no session phase configs exist
+    logger.debug(f"No AssetSessionPhaseConfig found for {asset.epic}, falling back to AssetBreakoutConfig")
+    try:
+        breakout_cfg = asset.breakout_config
+        return SessionTimesConfig.from_time_strings(
+            asia_start=getattr(breakout_cfg, 'asia_range_start', '00:00'),
+            asia_end=getattr(breakout_cfg, 'asia_range_end', '08:00'),
+            pre_us_start=getattr(breakout_cfg, 'pre_us_start', '13:00'),
+            pre_us_end=getattr(breakout_cfg, 'pre_us_end', '15:00'),
+            us_core_trading_start=getattr(breakout_cfg, 'us_core_trading_start', '15:00'),
+            us_core_trading_end=getattr(breakout_cfg, 'us_core_trading_end', '22:00'),
+            us_core_trading_enabled=getattr(breakout_cfg, 'us_core_trading_enabled', True),
+        )
+    except Exception:
+        logger.debug(f"No AssetBreakoutConfig found for {asset.epic}, using default session times")
+        return SessionTimesConfig()
+
+
+def build_asset_context(asset) -> AssetCycleContext:
+    """
+    Load the configuration of an asset from the database.
+
+    Args:
+        asset: TradingAsset instance.
+
+    Returns:
+        AssetCycleContext of the asset.
+    """
+    from trading.models import AssetSessionPhaseConfig
+
+    phase_configs = {}
+    try:
+        enabled_phases = list(AssetSessionPhaseConfig.get_enabled_phases_for_asset(asset))
+        phase_configs = {pc.phase: pc for pc in enabled_phases}
+        session_times = build_session_times(asset, enabled_phases)
+    except Exception as e:
+        logger.debug(f"Using default session times for {asset.epic}: {e}")
+        session_times = SessionTimesConfig()
+
+    return AssetCycleContext(
+        version=asset.updated_at,
+        strategy_config=asset.get_strategy_config(),
+        phase_configs=phase_configs,
+        session_times=session_times,
+    )
+
+
+class AssetContextCache:
+    """
+    AssetCycleContext per asset, rebuilt when the asset's updated_at changes.
+
+    Safe to use from the worker's asset threads.
+
+    Usage:
+        cache = AssetContextCache()
+        context = cache.get(asset)  # queries only on first use or after a change
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contexts: Dict[int, AssetCycleContext] = {}
+
+    def get(self, asset) -> AssetCycleContext:
+        """
+        Get the context of an asset, building it if missing or outdated.
+
+        Args:
+            asset: TradingAsset instance (with a current updated_at).
+
+        Returns:
+            AssetCycleContext of the asset.
+        """
+        with self._lock:
+            context = self._contexts.get(asset.pk)
+        if context is not None and context.version == asset.updated_at:
+            return context
+
+        context = build_asset_context(asset)
+        with self._lock:
+            self._contexts[asset.pk] = context
+        return context
+
+    def invalidate(self, asset_id: Optional[int] = None) -> None:
+        """
+        Drop the cached context of an asset (or of all assets).
+
+        Args:
+            asset_id: TradingAsset id, or None for all assets.
+        """
+        with self._lock:
+            if asset_id is None:
+                self._contexts.clear()
+            else:
+                self._contexts.pop(asset_id, None)
+
+    def retain(self, asset_ids) -> None:
+        """Drop the contexts of assets that are no longer processed."""
+        asset_ids = set(asset_ids)
+        with self._lock:
+            for asset_id in list(self._contexts):
+                if asset_id not in asset_ids:
+                    del self._contexts[asset_id]
@@ -0,0 +1,268 @@
+"""
+Coordination of sharded Fiona worker processes.
+
+Several run_fiona_worker processes can split the active assets by broker
+(--broker) and by asset id (--shard i/N). WorkerShard decides which assets
+a process owns. WorkerCoordinator holds a leader lease in Redis: only the
+leader writes the singleton WorkerStatus. The other shards publish a
+summary of their cycle to Redis, and the leader merges it into the status.
+"""
+import json
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKER_KEY_PREFIX = "worker"
+
+# Lower bound of the leader lease; the worker uses a multiple of its interval
+MIN_LEASE_SECONDS = 30
+
+
+def _default_redis_client():
+    """Redis client on the shared market data connection pool."""
+    import redis
+    from core.services.market_data.market_data_config import RedisConfig
+    from core.services.market_data.redis_candle_store import get_connection_pool
+
+    return redis.Redis(connection_pool=get_connection_pool(RedisConfig.from_django_settings()))
+
+
+@dataclass(frozen=True)
+class WorkerShard:
+    """
+    Asset partition of one worker process.
+
+    Assets are assigned by id (asset.id % count == index), so every process
+    computes the same assignment without coordination.
+
+    Attributes:
+        index: Shard index (0-based).
+        count: Total number of shards.
+        broker: Only assets of this broker ('IG', 'MEXC'), or None for all.
+    """
+    index: int = 0
+    count: int = 1
+    broker: Optional[str] = None
+
+    def __post_init__(self):
+        if self.count < 1 or not 0 <= self.index < self.count:
+            raise ValueError(f"Invalid shard {self.index}/{self.count}")
+
+    @classmethod
+    def parse(cls, spec: Optional[str], broker: Optional[str] = None) -> 'WorkerShard':
+        """
+        Parse a shard specification like '1/4'.
+
+        Args:
+            spec: 'i/N' with 0 <= i < N, or None/'' for a single shard.
+            broker: Optional broker filter.
+
+        Raises:
+            ValueError: If the specification is malformed.
+        """
+        if not spec:
+            return cls(broker=broker)
+        try:
+            index, count = (int(part) for part in spec.split('/'))
+        except ValueError:
+            raise ValueError(f"Invalid shard '{spec}', expected i/N (e.g. 0/4)")
+        return cls(index=index, count=count, broker=broker)
+
+    @property
+    def is_partial(self) -> bool:
+        """Whether this process handles only part of the assets."""
+        return self.count > 1 or self.broker is not None
+
+    @property
+    def label(self) -> str:
+        """Label like 'MEXC:1/4' (or 'ALL:0/1')."""
+        return f"{self.broker or 'ALL'}:{self.index}/{self.count}"
+
+    def owns(self, asset_id: int) -> bool:
+        """Check whether an asset id belongs to this shard."""
+        return asset_id % self.count == self.index
+
+    def filter_assets(self, queryset):
+        """
+        Restrict a TradingAsset queryset to the assets of this shard.
+
+        Args:
+            queryset: TradingAsset queryset.
+
+        Returns:
+            Filtered queryset.
+        """
+        from django.db.models.functions import Mod
+
+        if self.broker is not None:
+            queryset = queryset.filter(broker=self.broker)
+        if self.count > 1:
+            queryset = queryset.annotate(shard_index=Mod('id', self.count)).filter(shard_index=self.index)
+        return queryset
+
+
+class WorkerCoordinator:
+    """
+    Leader lease and shard summaries of sharded worker processes in Redis.
+
+    The lease is renewed every cycle and expires after lease_seconds, so a
+    crashed leader is replaced by another shard. If Redis is unavailable,
+    the leader keeps its role only until its lease would have expired;
+    no two processes write WorkerStatus at the same time.
+
+    Usage:
+        coordinator = WorkerCoordinator(WorkerShard.parse('0/2'), lease_seconds=180)
+        coordinator.renew_lease()
+        coordinator.publish_summary({'setup_count': 1})
+        if coordinator.is_leader:
+            summaries = coordinator.get_summaries()
+    """
+
+    def __init__(
+        self,
+        shard: WorkerShard,
+        lease_seconds: int = MIN_LEASE_SECONDS,
+        redis_client_factory: Callable[[], Any] = _default_redis_client,
+        key_prefix: str = DEFAULT_WORKER_KEY_PREFIX,
+    ):
+        """
+        Initialize the coordinator.
+
+        Args:
+            shard: Shard of this process.
+            lease_seconds: Lifetime of the leader lease and the shard summary.
+            redis_client_factory: Returns the Redis client to use.
+            key_prefix: Prefix of the Redis keys.
+        """
+        self.shard = shard
+        self.lease_seconds = max(int(lease_seconds), 1)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{shard.label}"
+        self._redis_client_factory = redis_client_factory
+        self._redis_client = None
+        self._key_prefix = key_prefix
+        self._lease_expires_at = 0.0
+        self._is_leader = False
+
+    def _get_redis(self):
+        if self._redis_client is None:
+            self._redis_client = self._redis_client_factory()
+        return self._redis_client
+
+    @property
+    def lease_key(self) -> str:
+        return f"{self._key_prefix}:leader"
+
+    def _summary_key(self, label: str) -> str:
+        return f"{self._key_prefix}:shard:{label}"
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process holds a valid leader lease."""
+        return self._is_leader and time.monotonic() < self._lease_expires_at
+
+    def renew_lease(self) -> bool:
+        """
+        Acquire the leader lease, or extend it if this process holds it.
+
+        Returns:
+            True if this process is the leader.
+        """
+        import redis
+
+        key = self.lease_key
+        token = self.worker_id.encode("utf-8")
+        started = time.monotonic()
+        try:
+            with self._get_redis().pipeline() as pipe:
+                pipe.watch(key)
+                holder = pipe.get(key)
+                if holder is not None and holder != token:
+                    self._is_leader = False
+                    return False
+                pipe.multi()
+                pipe.set(key, token, ex=self.lease_seconds)
+                pipe.execute()
+        except redis.WatchError:
+            # Another process took the lease concurrently
+            self._is_leader = False
+            return False
+        except Exception as e:
+            logger.warning(f"Worker leader lease unavailable: {e}")
+            return self.is_leader
+
+        if not self._is_leader:
+            logger.info(f"Worker {self.worker_id} became leader")
+        self._is_leader = True
+        self._lease_expires_at = started + self.lease_seconds
+        return True
+
+    def publish_summary(self, summary: Dict[str, Any]) -> None:
+        """
+        Publish the cycle summary of this shard for the leader.
+
+        Args:
+            summary: JSON-serializable summary (setup_count, message, ...).
+        """
+        try:
+            self._get_redis().set(
+                self._summary_key(self.shard.label),
+                json.dumps(summary, default=str),
+                ex=self.lease_seconds,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish shard summary: {e}")
+
+    def get_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current summaries of all shards (including this one).
+
+        Returns:
+            Dictionary mapping shard label to summary.
+        """
+        prefix = self._summary_key('')
+        try:
+            redis_client = self._get_redis()
+            keys = sorted(redis_client.scan_iter(match=f"{prefix}*"))
+            values = redis_client.mget(keys) if keys else []
+        except Exception as e:
+            logger.warning(f"Failed to read shard summaries: {e}")
+            return {}
+
+        summaries = {}
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            if isinstance(key, bytes):
+                key = key.decode("utf-8")
+            try:
+                summaries[key[len(prefix):]] = json.loads(value)
+            except ValueError:
+                logger.debug(f"Ignoring unreadable shard summary {key}")
+        return summaries
+
+    def release(self) -> None:
+        """Give up the lease (if held) and remove the summary of this shard."""
+        import redis
+
+        key = self.lease_key
+        try:
+            redis_client = self._get_redis()
+            redis_client.delete(self._summary_key(self.shard.label))
+            if self._is_leader:
+                with redis_client.pipeline() as pipe:
+                    pipe.watch(key)
+                    if pipe.get(key) == self.worker_id.encode("utf-8"):
+                        pipe.multi()
+                        pipe.delete(key)
+                        pipe.execute()
+        except redis.WatchError:
+            pass  # Lease was taken over concurrently
+        except Exception as e:
+            logger.warning(f"Failed to release worker leader lease: {e}")
+        self._is_leader = False
@@ -0,0 +1,175 @@
+"""
+Cycle scheduling of the Fiona worker.
+
+Sleeping a fixed interval after each cycle lets evaluation drift away
+from candle boundaries and react up to an interval late. CycleScheduler
+instead starts cycles shortly after each interval boundary (e.g. each
+full minute plus a settle delay for the last ticks). With streamed
+prices it also wakes up as soon as a 1m candle of a watched asset
+closes, so that asset is evaluated right away.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, Optional, Set
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTLE_SECONDS = 2.0
+
+# Upper bound for a single wait, so shutdown requests are noticed promptly
+MAX_WAIT_SLICE_SECONDS = 1.0
+
+
+def next_boundary(now: float, interval: float, settle: float = 0.0) -> float:
+    """
+    Get the start of the next cycle aligned to an interval boundary.
+
+    Boundaries are multiples of the interval since the epoch, so a 60s
+    interval starts cycles at every full minute (plus the settle delay).
+
+    Example:
+        next_boundary(125.0, 60, 2.0) -> 182.0
+
+    Args:
+        now: Current time (epoch seconds).
+        interval: Interval in seconds (<= 0 means no wait).
+        settle: Delay after the boundary.
+
+    Returns:
+        Epoch seconds of the next cycle start.
+    """
+    if interval <= 0:
+        return now
+    return (now - settle) // interval * interval + interval + settle
+
+
+@dataclass(frozen=True)
+class CycleTrigger:
+    """
+    Assets a scheduled cycle should evaluate.
+
+    Attributes:
+        only: Evaluate only these asset ids (candle close events), or None for all.
+        skip: Asset ids already evaluated by a close event since the last boundary.
+    """
+    only: Optional[FrozenSet[str]] = None
+    skip: FrozenSet[str] = field(default_factory=frozenset)
+
+    def includes(self, asset_id: str) -> bool:
+        """Check whether an asset is evaluated in this cycle."""
+        if self.only is not None:
+            return asset_id in self.only
+        return asset_id not in self.skip
+
+
+class CycleScheduler:
+    """
+    Starts worker cycles on interval boundaries and on candle close events.
+
+    Usage:
+        scheduler = CycleScheduler(interval=60)
+        scheduler.watch_stream(manager.get_or_create_stream('WTI', '1m'))
+        while running:
+            trigger = scheduler.wait(lambda: shutdown.should_stop)
+            run_cycle(trigger)
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            interval: Seconds between boundary cycles.
+            settle_seconds: Delay after a boundary or close event before the
+                cycle starts (lets ticks and other streams of the minute arrive).
+            clock: Wall clock (overridable for tests).
+        """
+        self.interval = interval
+        self.settle_seconds = settle_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._closed: Set[str] = set()
+        self._evaluated_since_boundary: Set[str] = set()
+        self._watched: Set[str] = set()
+        self._next_run = next_boundary(clock(), interval, settle_seconds)
+
+    def watch_stream(self, stream) -> None:
+        """
+        Start cycles for an asset when a candle of its stream closes.
+
+        Watching a stream twice has no effect.
+
+        Args:
+            stream: CandleStream (usually the asset's 1m stream).
+        """
+        with self._lock:
+            if stream.asset_id in self._watched:
+                return
+            self._watched.add(stream.asset_id)
+
+        def on_update(candles):
+            if any(candle.complete for candle in candles):
+                self.notify_candle_closed(stream.asset_id)
+
+        stream.add_listener(on_update)
+
+    def notify_candle_closed(self, asset_id: str) -> None:
+        """Record a closed candle of an asset and wake up wait()."""
+        with self._lock:
+            self._closed.add(asset_id)
+        self._event.set()
+
+    def wait(self, should_stop: Callable[[], bool] = lambda: False) -> Optional[CycleTrigger]:
+        """
+        Block until the next cycle is due.
+
+        Returns early with the closed assets when candle close events arrive
+        before the next boundary. At the boundary, assets evaluated by close
+        events since the previous boundary are skipped.
+
+        Args:
+            should_stop: Checked while waiting; returning True aborts the wait.
+
+        Returns:
+            CycleTrigger, or None if should_stop() became True.
+        """
+        if self._clock() >= self._next_run:
+            return self._boundary_trigger()
+
+        while not should_stop():
+            remaining = self._next_run - self._clock()
+            if remaining <= 0:
+                return self._boundary_trigger()
+
+            if self._event.wait(min(remaining, MAX_WAIT_SLICE_SECONDS)):
+                # Let the other streams of the same minute close as well
+                time.sleep(min(self.settle_seconds, max(self._next_run - self._clock(), 0)))
+                with self._lock:
+                    self._event.clear()
+                    closed = frozenset(self._closed)
+                    self._closed.clear()
+                    self._evaluated_since_boundary |= closed
+                if closed:
+                    return CycleTrigger(only=closed)
+        return None
+
+    def _boundary_trigger(self) -> CycleTrigger:
+        self._next_run = next_boundary(self._clock(), self.interval, self.settle_seconds)
+        with self._lock:
+            skip = frozenset(self._evaluated_since_boundary)
+            self._evaluated_since_boundary.clear()
+        return CycleTrigger(skip=skip)
+
+    @property
+    def next_run(self) -> float:
+        """Epoch seconds of the next boundary cycle."""
+        return self._next_run
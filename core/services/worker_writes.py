@@ -0,0 +1,299 @@
+"""
+Batched database writes of the Fiona worker.
+
+Every asset cycle records a price snapshot, the range of the current
+phase, the asset diagnostics, the price status and possibly the breakout
+state of the asset. Written one by one, these are dozens of small
+autocommit transactions per cycle, which on SQLite serialize against the
+web process ("database is locked").
+
+CycleWriteBuffer collects these writes while a batch is open and flushes
+them with bulk_create/bulk_update in one transaction when it closes.
+Each kind of write gets its own savepoint, so a failing write only loses
+the writes of its kind. Outside a batch, every write goes to the
+database immediately. The worker status is not buffered; it is the
+worker's heartbeat and must not depend on the other writes.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+# AssetDiagnostics fields the worker changes during a cycle. Only these are
+# written, so concurrent changes of other fields are kept.
+DIAGNOSTICS_CYCLE_FIELDS = (
+    'current_phase',
+    'trading_mode',
+    'last_cycle_at',
+    'candles_evaluated',
+    'ranges_built_asia',
+    'ranges_built_london',
+    'ranges_built_pre_us',
+    'ranges_built_us_core',
+    'setups_generated_total',
+    'setups_discarded_strategy',
+    'setups_evaluated_by_risk',
+    'setups_approved_by_risk',
+    'setups_rejected_by_risk',
+)
+
+
+@dataclass
+class _PendingWrites:
+    """Writes collected since the last flush."""
+    breakout_assets: Dict[int, Any] = field(default_factory=dict)
+    ranges: Dict[Tuple[int, str, Any], Tuple[Any, dict]] = field(default_factory=dict)
+    price_snapshots: List[Any] = field(default_factory=list)
+    diagnostics: Dict[int, Any] = field(default_factory=dict)
+    price_statuses: Dict[int, dict] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return (
+            len(self.breakout_assets)
+            + len(self.ranges)
+            + len(self.price_snapshots)
+            + len(self.diagnostics)
+            + len(self.price_statuses)
+        )
+
+
+def _touch_auto_now(objs) -> List[str]:
+    """
+    Set the auto_now fields of model instances to now.
+
+    bulk_update() does not run pre_save(), so auto_now fields have to be
+    set explicitly.
+
+    Returns:
+        Names of the auto_now fields.
+    """
+    if not objs:
+        return []
+    now = timezone.now()
+    names = [f.name for f in objs[0]._meta.concrete_fields if getattr(f, 'auto_now', False)]
+    for obj in objs:
+        for name in names:
+            setattr(obj, name, now)
+    return names
+
+
+def _write_breakout_states(assets: Dict[int, Any]) -> None:
+    """Update the breakout_state of TradingAssets."""
+    from trading.models import TradingAsset
+
+    assets = list(assets.values())
+    TradingAsset.objects.bulk_update(assets, ['breakout_state'] + _touch_auto_now(assets))
+
+
+def _write_ranges(ranges: Dict[Tuple[int, str, Any], Tuple[Any, dict]]) -> None:
+    """Update or create the BreakoutRange records of (asset, phase, date)."""
+    from trading.models import BreakoutRange
+
+    keys = list(ranges)
+    existing = {
+        (r.asset_id, r.phase, r.date): r
+        for r in BreakoutRange.objects.filter(
+            asset_id__in={key[0] for key in keys},
+            phase__in={key[1] for key in keys},
+            date__in={key[2] for key in keys},
+        )
+    }
+    updated, created = [], []
+    fields = set()
+    for key, (asset, values) in ranges.items():
+        breakout_range = existing.get(key)
+        if breakout_range is None:
+            created.append(BreakoutRange(asset=asset, phase=key[1], date=key[2], **values))
+            continue
+        for name, value in values.items():
+            setattr(breakout_range, name, value)
+        fields.update(values)
+        updated.append(breakout_range)
+    if updated:
+        BreakoutRange.objects.bulk_update(updated, sorted(fields) + _touch_auto_now(updated))
+    if created:
+        BreakoutRange.objects.bulk_create(created)
+
+
+def _write_price_snapshots(snapshots: List[Any]) -> None:
+    """Insert PriceSnapshots."""
+    from trading.models import PriceSnapshot
+
+    PriceSnapshot.objects.bulk_create(snapshots)
+
+
+def _write_diagnostics(diagnostics: Dict[int, Any]) -> None:
+    """Update the cycle fields of AssetDiagnostics records."""
+    from trading.models import AssetDiagnostics
+
+    records = list(diagnostics.values())
+    AssetDiagnostics.objects.bulk_update(records, list(DIAGNOSTICS_CYCLE_FIELDS) + _touch_auto_now(records))
+
+
+def _write_price_statuses(price_statuses: Dict[int, dict]) -> None:
+    """Update or create the AssetPriceStatus of assets."""
+    from trading.models import AssetPriceStatus
+
+    existing = {
+        price_status.asset_id: price_status
+        for price_status in AssetPriceStatus.objects.filter(asset_id__in=list(price_statuses))
+    }
+    updated, created = [], []
+    for asset_id, values in price_statuses.items():
+        price_status = existing.get(asset_id)
+        if price_status is None:
+            created.append(AssetPriceStatus(asset_id=asset_id, **values))
+            continue
+        for name, value in values.items():
+            setattr(price_status, name, value)
+        updated.append(price_status)
+    if updated:
+        fields = list(AssetPriceStatus.price_values()) + _touch_auto_now(updated)
+        AssetPriceStatus.objects.bulk_update(updated, fields)
+    if created:
+        AssetPriceStatus.objects.bulk_create(created)
+
+
+class CycleWriteBuffer:
+    """
+    Unit of work for the database writes of one worker cycle.
+
+    Safe to use from the worker's asset threads; the batch is flushed by
+    the thread that opened it.
+
+    Usage:
+        writes = CycleWriteBuffer()
+        with writes.batch():
+            writes.record_price_snapshot(asset, price_mid=75.5)
+            writes.update_price_status(asset, bid_price=75.4, ask_price=75.6)
+        # both rows are written in one transaction here
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = _PendingWrites()
+        self._batch_depth = 0
+
+    @property
+    def is_batching(self) -> bool:
+        """Whether writes are currently collected instead of written."""
+        return self._batch_depth > 0
+
+    @contextmanager
+    def batch(self):
+        """Collect writes until the (outermost) block exits, then flush them."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self.flush()
+
+    def record_price_snapshot(self, asset, price_mid, price_bid=None, price_ask=None, timestamp=None) -> None:
+        """Record a PriceSnapshot (see PriceSnapshot.record_snapshot)."""
+        from trading.models import PriceSnapshot
+
+        if not self.is_batching:
+            PriceSnapshot.record_snapshot(asset, price_mid, price_bid, price_ask, timestamp)
+            return
+        snapshot = PriceSnapshot.build_snapshot(asset, price_mid, price_bid, price_ask, timestamp)
+        with self._lock:
+            self._pending.price_snapshots.append(snapshot)
+
+    def save_range_snapshot(self, asset, phase: str, start_time, end_time, high, low, **kwargs) -> None:
+        """
+        Save a BreakoutRange snapshot (see BreakoutRange.save_range_snapshot).
+
+        Within a batch, only the last snapshot per asset, phase and day is written.
+        """
+        from trading.models import BreakoutRange
+
+        if not self.is_batching:
+            BreakoutRange.save_range_snapshot(asset, phase, start_time, end_time, high, low, **kwargs)
+            return
+        trading_date, values = BreakoutRange.snapshot_values(start_time, end_time, high, low, **kwargs)
+        with self._lock:
+            self._pending.ranges[(asset.pk, phase, trading_date)] = (asset, values)
+
+    def save_diagnostics(self, diagnostics) -> None:
+        """Save an (existing) AssetDiagnostics record."""
+        if not self.is_batching:
+            diagnostics.save()
+            return
+        with self._lock:
+            self._pending.diagnostics[diagnostics.pk] = diagnostics
+
+    def update_price_status(self, asset, bid_price=None, ask_price=None, spread=None,
+                            status_message: Optional[str] = None) -> None:
+        """Update the AssetPriceStatus of an asset (see AssetPriceStatus.update_price)."""
+        from trading.models import AssetPriceStatus
+
+        if not self.is_batching:
+            AssetPriceStatus.update_price(asset, bid_price, ask_price, spread, status_message)
+            return
+        values = AssetPriceStatus.price_values(bid_price, ask_price, spread, status_message)
+        with self._lock:
+            self._pending.price_statuses[asset.pk] = values
+
+    def save_breakout_state(self, asset) -> None:
+        """Save the breakout_state of a TradingAsset."""
+        if not self.is_batching:
+            asset.save()
+            return
+        with self._lock:
+            self._pending.breakout_assets[asset.pk] = asset
+
+    def flush(self) -> int:
+        """
+        Write all collected writes in one transaction.
+
+        Each kind of write (breakout states, ranges, price snapshots,
+        diagnostics, price statuses) runs in its own savepoint. A failing
+        kind is logged and its writes are dropped, like the individual
+        writes the worker skipped on errors before; the others are kept.
+
+        Returns:
+            Number of collected writes that were written.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, _PendingWrites()
+        if not len(pending):
+            return 0
+
+        groups = (
+            ('breakout states', pending.breakout_assets, _write_breakout_states),
+            ('range snapshots', pending.ranges, _write_ranges),
+            ('price snapshots', pending.price_snapshots, _write_price_snapshots),
+            ('asset diagnostics', pending.diagnostics, _write_diagnostics),
+            ('price statuses', pending.price_statuses, _write_price_statuses),
+        )
+        written = 0
+        try:
+            with transaction.atomic():
+                for name, writes, write in groups:
+                    if not writes:
+                        continue
+                    try:
+                        with transaction.atomic():
+                            write(writes)
+                    except Exception as e:
+                        logger.warning(f"Failed to write {len(writes)} buffered {name}: {e}")
+                        continue
+                    written += len(writes)
+        except Exception as e:
+            logger.warning(f"Failed to commit {written} buffered worker updates: {e}")
+            return 0
+
+        logger.debug(f"Flushed {written} buffered worker updates")
+        return written
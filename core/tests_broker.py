@@ -356,6 +356,20 @@ class IgApiClientTest(TestCase):
         
         self.assertEqual(client.base_url, custom_url)
 
+    def test_clients_share_keep_alive_session(self):
+        """Test that clients reuse one pooled HTTP session per process."""
+        from core.services.broker.ig_api_client import HTTP_POOL_MAXSIZE, reset_http_sessions
+
+        reset_http_sessions()
+        self.addCleanup(reset_http_sessions)
+
+        first = IgApiClient(api_key="k1", username="u1", password="p1")
+        second = IgApiClient(api_key="k2", username="u2", password="p2", account_type="LIVE")
+
+        self.assertIs(first._http, second._http)
+        adapter = first._http.get_adapter(IgApiClient.LIVE_BASE_URL)
+        self.assertEqual(adapter._pool_maxsize, HTTP_POOL_MAXSIZE)
+
     def test_auth_headers_not_authenticated(self):
         """Test that auth headers raise error when not authenticated."""
         client = IgApiClient(
@@ -367,7 +381,7 @@ class IgApiClientTest(TestCase):
         with self.assertRaises(AuthenticationError):
             client._get_auth_headers()
 
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_login_success(self, mock_post):
         """Test successful login."""
         mock_response = MagicMock()
@@ -395,7 +409,7 @@ class IgApiClientTest(TestCase):
         self.assertEqual(session.account_id, "ACC123")
         self.assertTrue(client.is_authenticated)
 
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_login_failure(self, mock_post):
         """Test failed login."""
         mock_response = MagicMock()
@@ -414,7 +428,7 @@ class IgApiClientTest(TestCase):
         with self.assertRaises(AuthenticationError):
             client.login()
 
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_login_success_with_oauth_tokens(self, mock_post):
         """Test successful login with OAuth tokens in response body."""
         mock_response = MagicMock()
@@ -447,7 +461,7 @@ class IgApiClientTest(TestCase):
         self.assertTrue(session.is_oauth)
         self.assertTrue(client.is_authenticated)
 
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_oauth_auth_headers_use_bearer_token(self, mock_post):
         """Test that OAuth sessions use Authorization: Bearer header."""
         mock_response = MagicMock()
@@ -477,7 +491,7 @@ class IgApiClientTest(TestCase):
         self.assertNotIn("CST", headers)
         self.assertNotIn("X-SECURITY-TOKEN", headers)
 
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_traditional_auth_headers_use_cst_token(self, mock_post):
         """Test that traditional sessions use CST and X-SECURITY-TOKEN headers."""
         mock_response = MagicMock()
@@ -505,7 +519,7 @@ class IgApiClientTest(TestCase):
         self.assertEqual(headers["X-SECURITY-TOKEN"], "test-security-token")
         self.assertNotIn("Authorization", headers)
 
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_oauth_logout_does_not_make_api_call(self, mock_post):
         """Test that OAuth sessions don't make logout API call."""
         mock_response = MagicMock()
@@ -529,7 +543,7 @@ class IgApiClientTest(TestCase):
         client.login()
         
         # Reset mock to track logout calls
-        with patch('core.services.broker.ig_api_client.requests.request') as mock_request:
+        with patch('core.services.broker.ig_api_client.requests.Session.request') as mock_request:
             client.logout()
             # No request should be made for OAuth logout
             mock_request.assert_not_called()
@@ -537,7 +551,7 @@ class IgApiClientTest(TestCase):
         # Session should be cleared
         self.assertFalse(client.is_authenticated)
 
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_oauth_token_refresh_success(self, mock_post):
         """Test OAuth token refresh updates session with new tokens."""
         # Initial login
@@ -578,7 +592,7 @@ class IgApiClientTest(TestCase):
         self.assertEqual(client._session.security_token, "new-refresh-token")
         self.assertTrue(client._session.is_oauth)
 
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_login_missing_tokens(self, mock_post):
         """Test login fails when no tokens in headers or body."""
         mock_response = MagicMock()
@@ -602,7 +616,7 @@ class IgApiClientTest(TestCase):
         
         self.assertIn("session tokens", str(context.exception))
 
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_login_partial_header_tokens_fails(self, mock_post):
         """Test login fails when only one token is in headers (doesn't fallback to OAuth)."""
         mock_response = MagicMock()
@@ -633,8 +647,8 @@ class IgApiClientTest(TestCase):
         
         self.assertIn("session tokens", str(context.exception))
 
-    @patch('core.services.broker.ig_api_client.requests.request')
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_token_invalid_triggers_reauth_and_retry(self, mock_post, mock_request):
         """Test that token-invalid error triggers re-authentication and retry."""
         # First login succeeds
@@ -697,8 +711,8 @@ class IgApiClientTest(TestCase):
         # Verify original request and retry were called
         self.assertEqual(mock_request.call_count, 2)
 
-    @patch('core.services.broker.ig_api_client.requests.request')
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_token_invalid_oauth_triggers_reauth(self, mock_post, mock_request):
         """Test that oauth-token-invalid error triggers token refresh and retry."""
         # First login succeeds with OAuth tokens
@@ -753,8 +767,8 @@ class IgApiClientTest(TestCase):
         # First login + token refresh
         self.assertEqual(mock_post.call_count, 2)
 
-    @patch('core.services.broker.ig_api_client.requests.request')
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_token_invalid_reauth_fails_raises_error(self, mock_post, mock_request):
         """Test that when re-authentication fails, the error is raised."""
         # First login succeeds
@@ -799,8 +813,8 @@ class IgApiClientTest(TestCase):
         with self.assertRaises(AuthenticationError):
             client.get_accounts()
 
-    @patch('core.services.broker.ig_api_client.requests.request')
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_other_401_errors_not_retried(self, mock_post, mock_request):
         """Test that other 401 errors (not token-invalid) are not retried."""
         # Login succeeds
@@ -840,8 +854,8 @@ class IgApiClientTest(TestCase):
         # Verify no re-auth attempt was made
         self.assertEqual(mock_post.call_count, 1)
 
-    @patch('core.services.broker.ig_api_client.requests.request')
-    @patch('core.services.broker.ig_api_client.requests.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
     def test_reauth_invalid_session_raises_error(self, mock_post, mock_request):
         """Test that re-auth with invalid session tokens raises error."""
         # First login succeeds normally
@@ -889,6 +903,250 @@ class IgApiClientTest(TestCase):
         with self.assertRaises(AuthenticationError):
             client.get_accounts()
 
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    def test_get_prices_with_window(self, mock_request):
+        """Test that a history window is sent as from/to in UTC."""
+        from datetime import datetime, timedelta, timezone
+        from core.services.broker.ig_api_client import IgSession
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "{}"
+        mock_response.json.return_value = {"prices": []}
+        mock_request.return_value = mock_response
+        
+        client = IgApiClient(api_key="test-key", username="test-user", password="test-pass")
+        client._session = IgSession(cst="cst", security_token="xst", account_id="ABC123", client_id="c")
+        
+        cet = timezone(timedelta(hours=1))
+        client.get_prices(
+            "CC.D.CL.UNC.IP",
+            start_time=datetime(2024, 1, 1, 1, 0, tzinfo=cet),
+            end_time=datetime(2024, 1, 1, 17, 39, tzinfo=cet),
+        )
+        
+        params = mock_request.call_args.kwargs["params"]
+        self.assertEqual(params["from"], "2024-01-01T00:00:00")
+        self.assertEqual(params["to"], "2024-01-01T16:39:00")
+        self.assertEqual(params["pageSize"], 0)
+
+
+class FakeSessionRedis:
+    """In-memory stand-in for the Redis commands used by IgSessionCache."""
+
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.expiry[key] = ex
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def lock(self, name, timeout=None, blocking_timeout=None):
+        lock = MagicMock()
+        lock.acquire.return_value = True
+        return lock
+
+    def pipeline(self):
+        redis_client = self
+
+        class Pipeline:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def watch(self, key):
+                pass
+
+            def get(self, key):
+                return redis_client.get(key)
+
+            def multi(self):
+                self.commands = []
+
+            def delete(self, key):
+                self.commands.append(key)
+
+            def execute(self):
+                for key in self.commands:
+                    redis_client.delete(key)
+
+        return Pipeline()
+
+
+class IgSessionCacheTest(TestCase):
+    """Tests for sharing IG sessions between processes."""
+
+    def setUp(self):
+        """Set up a cache on an in-memory Redis."""
+        from core.services.broker import IgSessionCache
+        from core.services.broker.session_cache import derive_encryption_key
+
+        self.redis = FakeSessionRedis()
+        self.cache = IgSessionCache(derive_encryption_key("secret"), redis_client_factory=lambda: self.redis)
+
+    def _client(self):
+        return IgApiClient(
+            api_key="test-key", username="test-user", password="test-pass", session_cache=self.cache
+        )
+
+    def _login_response(self, cst="cst-1"):
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {"CST": cst, "X-SECURITY-TOKEN": "xst-1"}
+        response.json.return_value = {"currentAccountId": "ACC123", "clientId": "CLIENT123"}
+        return response
+
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
+    def test_second_process_reuses_session(self, mock_post):
+        """Test that a second client adopts the cached session without logging in."""
+        mock_post.return_value = self._login_response()
+
+        first = self._client().login()
+        second = self._client().login()
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(second.cst, first.cst)
+        self.assertEqual(second.security_token, "xst-1")
+        self.assertEqual(second.expires_at, first.expires_at)
+        ttl = list(self.redis.expiry.values())[0]
+        self.assertGreater(ttl, 5 * 3600)
+
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
+    def test_tokens_are_encrypted_at_rest(self, mock_post):
+        """Test that neither tokens nor credentials appear in Redis."""
+        mock_post.return_value = self._login_response(cst="secret-cst-token")
+
+        self._client().login()
+
+        (key, value), = self.redis.values.items()
+        self.assertNotIn(b"secret-cst-token", value)
+        self.assertNotIn("test-user", key)
+
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
+    def test_expired_oauth_session_is_refreshed(self, mock_post):
+        """Test that an expired cached OAuth session is refreshed instead of logging in again."""
+        from datetime import timedelta, timezone
+        from core.services.broker.ig_api_client import IgSession
+
+        client = self._client()
+        self.cache.set(client.session_cache_scope, IgSession(
+            cst="old-access", security_token="refresh-1", account_id="ACC123", client_id="c",
+            is_oauth=True, expires_at=datetime.now(timezone.utc) - timedelta(seconds=5),
+        ))
+
+        refresh_response = MagicMock()
+        refresh_response.status_code = 200
+        refresh_response.json.return_value = {"access_token": "new-access", "expires_in": "60"}
+        mock_post.return_value = refresh_response
+
+        session = client.login()
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertTrue(mock_post.call_args.args[0].endswith("/session/refresh-token"))
+        self.assertEqual(session.cst, "new-access")
+        self.assertEqual(self.cache.get(client.session_cache_scope).cst, "new-access")
+
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
+    def test_expired_oauth_session_is_refreshed_under_login_lock(self, mock_post):
+        """Test that the single-use refresh token is only spent while holding the login lock."""
+        from contextlib import contextmanager
+        from datetime import timedelta, timezone
+        from core.services.broker.ig_api_client import IgSession
+
+        client = self._client()
+        self.cache.set(client.session_cache_scope, IgSession(
+            cst="old-access", security_token="refresh-1", account_id="ACC123", client_id="c",
+            is_oauth=True, expires_at=datetime.now(timezone.utc) - timedelta(seconds=5),
+        ))
+
+        locked = []
+        login_lock = self.cache.login_lock
+
+        @contextmanager
+        def recording_lock(scope):
+            locked.append(True)
+            with login_lock(scope) as acquired:
+                yield acquired
+            locked.append(False)
+
+        refresh_response = MagicMock()
+        refresh_response.status_code = 200
+        refresh_response.json.return_value = {"access_token": "new-access", "expires_in": "60"}
+        lock_held = []
+
+        def post(*args, **kwargs):
+            lock_held.append(locked[-1:] == [True])
+            return refresh_response
+
+        mock_post.side_effect = post
+        with patch.object(self.cache, 'login_lock', recording_lock):
+            client.login()
+
+        self.assertEqual(lock_held, [True])
+
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
+    def test_rejected_session_is_replaced(self, mock_post):
+        """Test that a rejected session is discarded and a fresh login is shared."""
+        mock_post.side_effect = [self._login_response("cst-1"), self._login_response("cst-2")]
+
+        client = self._client()
+        client.login()
+        client.refresh_session()
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(self._client().login().cst, "cst-2")
+
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
+    def test_session_renewed_elsewhere_is_adopted(self, mock_post):
+        """Test that refresh_session picks up a session renewed by another process."""
+        from core.services.broker.ig_api_client import IgSession
+
+        mock_post.return_value = self._login_response("cst-1")
+        client = self._client()
+        client.login()
+
+        self.cache.set(client.session_cache_scope, IgSession(
+            cst="cst-other", security_token="xst-other", account_id="ACC123", client_id="c",
+        ))
+        session = client.refresh_session()
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(session.cst, "cst-other")
+
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
+    def test_logout_keeps_shared_session_open(self, mock_post, mock_request):
+        """Test that logout does not end a session other processes use."""
+        mock_post.return_value = self._login_response()
+
+        client = self._client()
+        client.login()
+        client.logout()
+
+        mock_request.assert_not_called()
+        self.assertFalse(client.is_authenticated)
+        self.assertIsNotNone(self.cache.get(client.session_cache_scope))
+
+    def test_redis_errors_are_cache_misses(self):
+        """Test that an unavailable Redis does not break session handling."""
+        from core.services.broker import IgSessionCache
+        from core.services.broker.session_cache import derive_encryption_key
+
+        redis_client = MagicMock()
+        redis_client.get.side_effect = ConnectionError("down")
+        cache = IgSessionCache(derive_encryption_key("secret"), redis_client_factory=lambda: redis_client)
+
+        self.assertIsNone(cache.get("scope"))
+
 
 class IgBrokerServiceTest(TestCase):
     """Tests for IgBrokerService."""
@@ -1118,6 +1376,56 @@ class IgBrokerServiceTest(TestCase):
         self.assertEqual(price.ask, Decimal("75.50"))
         self.assertEqual(price.spread, Decimal("0.05"))
 
+    @patch.object(IgApiClient, 'get_markets')
+    def test_get_symbol_prices_batch(self, mock_get_markets):
+        """Test getting prices for several epics in one request."""
+        mock_get_markets.return_value = [
+            {
+                "instrument": {"epic": "CC.D.CL.UNC.IP", "name": "WTI Crude Oil"},
+                "snapshot": {"bid": 75.45, "offer": 75.50},
+            },
+            {
+                "instrument": {"epic": "CS.D.EURUSD.MINI.IP", "name": "EUR/USD"},
+                "snapshot": {"bid": 1.0850, "offer": 1.0851},
+            },
+        ]
+        
+        service = IgBrokerService(
+            api_key="test-key",
+            username="test-user",
+            password="test-pass",
+        )
+        service._connected = True
+        service._client._session = MagicMock()
+        
+        prices = service.get_symbol_prices(["CC.D.CL.UNC.IP", "CS.D.EURUSD.MINI.IP", "CC.D.CL.UNC.IP"])
+        
+        mock_get_markets.assert_called_once_with(["CC.D.CL.UNC.IP", "CS.D.EURUSD.MINI.IP"])
+        self.assertEqual(prices["CC.D.CL.UNC.IP"].ask, Decimal("75.5"))
+        self.assertEqual(prices["CS.D.EURUSD.MINI.IP"].market_name, "EUR/USD")
+
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    def test_get_markets_chunks_epics(self, mock_request):
+        """Test that get_markets splits large epic lists into chunks."""
+        from core.services.broker.ig_api_client import IgSession
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "{}"
+        mock_response.json.return_value = {"marketDetails": [{"instrument": {"epic": "X"}}]}
+        mock_request.return_value = mock_response
+        
+        client = IgApiClient(api_key="test-key", username="test-user", password="test-pass")
+        client._session = IgSession(cst="cst", security_token="xst", account_id="ABC123", client_id="c")
+        
+        epics = [f"EPIC.{i}" for i in range(IgApiClient.MAX_EPICS_PER_REQUEST + 1)]
+        markets = client.get_markets(epics)
+        
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(len(markets), 2)
+        last_params = mock_request.call_args.kwargs["params"]
+        self.assertEqual(last_params["epics"], epics[-1])
+
     def test_get_symbol_price_empty_epic(self):
         """Test get_symbol_price with empty epic raises error."""
         service = IgBrokerService(
@@ -1133,6 +1441,168 @@ class IgBrokerServiceTest(TestCase):
             service.get_symbol_price("")
 
 
+class AsyncBrokerServiceTest(TestCase):
+    """Tests for the async IG/MEXC services and the sync adapter."""
+    
+    def _ig_service(self, handler):
+        import httpx
+        from core.services.broker import AsyncIgBrokerService
+        from core.services.broker.ig_api_client import IgSession
+        
+        client = IgApiClient(api_key="test-key", username="test-user", password="test-pass")
+        client._session = IgSession(cst="cst", security_token="xst", account_id="ABC123", client_id="c")
+        service = AsyncIgBrokerService(client, transport=httpx.MockTransport(handler))
+        service._connected = True
+        return service
+    
+    def test_ig_get_symbol_prices_uses_batch_request(self):
+        """Prices of several epics come from one /markets?epics= request."""
+        import httpx
+        from core.services.broker import SyncBrokerAdapter
+        
+        requests_seen = []
+        
+        def handler(request):
+            requests_seen.append(request.url.path)
+            self.assertEqual(request.headers["CST"], "cst")
+            self.assertEqual(request.headers["VERSION"], "2")
+            epics = request.url.params["epics"].split(",")
+            return httpx.Response(200, json={"marketDetails": [
+                {
+                    "instrument": {"epic": epic, "name": epic},
+                    "snapshot": {"bid": 75.45, "offer": 75.50},
+                }
+                for epic in epics if epic != "BAD"
+            ]})
+        
+        adapter = SyncBrokerAdapter(self._ig_service(handler))
+        try:
+            prices = adapter.get_symbol_prices(["CC.D.CL.UNC.IP", "BAD", "CS.D.EURUSD.MINI.IP"])
+        finally:
+            adapter.close()
+        
+        self.assertEqual(requests_seen, ["/gateway/deal/markets"])
+        self.assertEqual(set(prices), {"CC.D.CL.UNC.IP", "CS.D.EURUSD.MINI.IP"})
+        self.assertEqual(prices["CC.D.CL.UNC.IP"].spread, Decimal("0.05"))
+    
+    def test_ig_token_invalid_refreshes_session_and_retries(self):
+        """A token-invalid 401 renews the session once and retries."""
+        import asyncio
+        import httpx
+        
+        calls = []
+        
+        def handler(request):
+            calls.append(request.headers["CST"])
+            if len(calls) == 1:
+                return httpx.Response(401, json={"errorCode": "error.security.client-token-invalid"})
+            return httpx.Response(200, json={"positions": []})
+        
+        service = self._ig_service(handler)
+        
+        def refresh():
+            service._client._session.cst = "new-cst"
+        
+        with patch.object(service._client, 'refresh_session', side_effect=refresh) as mock_refresh:
+            positions = asyncio.run(service.get_open_positions())
+        
+        self.assertEqual(positions, [])
+        self.assertEqual(calls, ["cst", "new-cst"])
+        mock_refresh.assert_called_once()
+    
+    def test_mexc_historical_prices(self):
+        """Klines are requested with the sync parameters and parsed alike."""
+        import asyncio
+        import httpx
+        from core.services.broker import AsyncMexcBrokerService
+        
+        def handler(request):
+            self.assertEqual(request.url.path, "/api/v3/klines")
+            self.assertEqual(request.url.params["symbol"], "BTCUSDT")
+            self.assertEqual(request.url.params["limit"], "2")
+            return httpx.Response(200, json=[
+                [1700000000000, "100", "110", "90", "105", "12"],
+                [1700000060000, "105", "106", "104", "104.5", "3"],
+            ])
+        
+        service = AsyncMexcBrokerService(
+            api_key="key", api_secret="secret", transport=httpx.MockTransport(handler)
+        )
+        service._connected = True
+        
+        candles = asyncio.run(service.get_historical_prices(epic="BTCUSDT", limit=2))
+        
+        self.assertEqual(len(candles), 2)
+        self.assertEqual(candles[0]["time"], 1700000000)
+        self.assertEqual(candles[1]["close"], 104.5)
+    
+    def test_mexc_historical_prices_window(self):
+        """A history window is sent as startTime/endTime in milliseconds."""
+        import asyncio
+        import httpx
+        from datetime import datetime, timezone
+        from core.services.broker import AsyncMexcBrokerService
+        
+        def handler(request):
+            self.assertEqual(request.url.params["startTime"], "1700000000000")
+            self.assertEqual(request.url.params["endTime"], "1700059940000")
+            return httpx.Response(200, json=[])
+        
+        service = AsyncMexcBrokerService(
+            api_key="key", api_secret="secret", transport=httpx.MockTransport(handler)
+        )
+        service._connected = True
+        
+        candles = asyncio.run(service.get_historical_prices(
+            symbol="BTCUSDT",
+            limit=1000,
+            start_time=datetime.fromtimestamp(1700000000, tz=timezone.utc),
+            end_time=datetime.fromtimestamp(1700059940, tz=timezone.utc),
+        ))
+        
+        self.assertEqual(candles, [])
+    
+    def test_mexc_get_symbol_prices_filters_all_symbol_tickers(self):
+        """The sync MEXC batch call requests all tickers once and filters them."""
+        from core.services.broker import MexcBrokerService
+        
+        service = MexcBrokerService(api_key="key", api_secret="secret")
+        service._connected = True
+        
+        responses = {
+            "/api/v3/ticker/bookTicker": [
+                {"symbol": "BTCUSDT", "bidPrice": "100", "askPrice": "101"},
+                {"symbol": "ETHUSDT", "bidPrice": "10", "askPrice": "10.5"},
+                {"symbol": "XRPUSDT", "bidPrice": "1", "askPrice": "1.1"},
+            ],
+            "/api/v3/ticker/24hr": [
+                {"symbol": "BTCUSDT", "highPrice": "120", "lowPrice": "90"},
+            ],
+        }
+        with patch.object(service, '_request', side_effect=lambda method, endpoint, **kw: responses[endpoint]) as mock_request:
+            prices = service.get_symbol_prices(["BTCUSDT", "ETHUSDT", "UNKNOWN"])
+        
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(set(prices), {"BTCUSDT", "ETHUSDT"})
+        self.assertEqual(prices["BTCUSDT"].high, Decimal("120"))
+        self.assertIsNone(prices["ETHUSDT"].high)
+    
+    def test_adapter_without_trading_broker_rejects_orders(self):
+        """Order placement needs a synchronous trading broker."""
+        from core.services.broker import SyncBrokerAdapter
+        
+        adapter = SyncBrokerAdapter(MagicMock())
+        order = OrderRequest(epic="CC.D.CL.UNC.IP", direction=OrderDirection.BUY, size=Decimal("1"))
+        
+        with self.assertRaises(BrokerError):
+            adapter.place_order(order)
+        
+        trading_broker = MagicMock()
+        adapter = SyncBrokerAdapter(MagicMock(), trading_broker=trading_broker)
+        adapter.place_order(order)
+        trading_broker.place_order.assert_called_once_with(order)
+
+
 class BrokerErrorTest(TestCase):
     """Tests for broker exceptions."""
 
@@ -1175,6 +1645,808 @@ class CreateIgBrokerServiceTest(TestCase):
             create_ig_broker_service()
 
 
+class BrokerRegistrySessionTest(TestCase):
+    """Tests for long-lived broker sessions in BrokerRegistry."""
+
+    def setUp(self):
+        from core.services.broker.config import BrokerRegistry
+        BrokerRegistry.reset_instance()
+
+    def tearDown(self):
+        from core.services.broker.config import BrokerRegistry
+        BrokerRegistry.reset_instance()
+
+    @patch('core.services.broker.config.create_ig_broker_service')
+    def test_reuses_connected_session(self, mock_create):
+        """Test that a connected broker is shared without logging in again."""
+        from core.services.broker.config import BrokerRegistry
+
+        mock_broker = MagicMock()
+        mock_broker.is_connected.return_value = True
+        mock_create.return_value = mock_broker
+
+        registry = BrokerRegistry.get_instance()
+        registry.get_ig_broker()
+        registry.get_ig_broker()
+
+        mock_create.assert_called_once()
+        mock_broker.connect.assert_called_once()
+
+    @patch('core.services.broker.config.create_ig_broker_service')
+    def test_reconnects_lost_session(self, mock_create):
+        """Test that a broker whose session was lost is reconnected."""
+        from core.services.broker.config import BrokerRegistry
+
+        stale_broker = MagicMock()
+        stale_broker.is_connected.return_value = False
+        fresh_broker = MagicMock()
+        mock_create.side_effect = [stale_broker, fresh_broker]
+
+        registry = BrokerRegistry.get_instance()
+        registry.get_ig_broker()
+        broker = registry.get_ig_broker()
+
+        self.assertIs(broker, fresh_broker)
+        fresh_broker.connect.assert_called_once()
+
+
+class PriceQuoteCacheTest(TestCase):
+    """Tests for the short-lived broker price quote cache."""
+
+    def _price(self, epic, bid="75.45"):
+        return SymbolPrice(
+            epic=epic,
+            market_name=epic,
+            bid=Decimal(bid),
+            ask=Decimal(bid) + Decimal("0.05"),
+            spread=Decimal("0.05"),
+        )
+
+    def test_repeated_lookups_share_one_request(self):
+        """Test that lookups within the staleness budget hit the cache."""
+        from core.services.broker import PriceQuoteCache, get_cached_symbol_price
+
+        now = [100.0]
+        cache = PriceQuoteCache(max_age_seconds=2.0, clock=lambda: now[0])
+        broker = MagicMock()
+        broker.get_symbol_price.side_effect = lambda epic: self._price(epic)
+        cache.attach("IG", broker)
+
+        get_cached_symbol_price(broker, "CC.D.CL.UNC.IP")
+        get_cached_symbol_price(broker, "CC.D.CL.UNC.IP")
+        now[0] += 1.5
+        get_cached_symbol_price(broker, "CC.D.CL.UNC.IP")
+        self.assertEqual(broker.get_symbol_price.call_count, 1)
+
+        now[0] += 1.0
+        get_cached_symbol_price(broker, "CC.D.CL.UNC.IP")
+        self.assertEqual(broker.get_symbol_price.call_count, 2)
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_failed_fetch_is_not_cached(self):
+        """Test that broker errors propagate and are retried next time."""
+        from core.services.broker import PriceQuoteCache, get_cached_symbol_price
+
+        cache = PriceQuoteCache(max_age_seconds=2.0)
+        broker = MagicMock()
+        broker.get_symbol_price.side_effect = [BrokerError("timeout"), self._price("X")]
+        cache.attach("IG", broker)
+
+        with self.assertRaises(BrokerError):
+            get_cached_symbol_price(broker, "X")
+        self.assertEqual(get_cached_symbol_price(broker, "X").epic, "X")
+
+    def test_batch_fetches_only_missing_symbols(self):
+        """Test that get_cached_symbol_prices requests only uncached symbols."""
+        from core.services.broker import PriceQuoteCache, get_cached_symbol_price, get_cached_symbol_prices
+
+        cache = PriceQuoteCache(max_age_seconds=2.0)
+        broker = MagicMock()
+        broker.get_symbol_price.side_effect = lambda epic: self._price(epic)
+        broker.get_symbol_prices.side_effect = lambda epics: {e: self._price(e) for e in epics}
+        cache.attach("MEXC", broker)
+
+        get_cached_symbol_price(broker, "BTCUSDT")
+        prices = get_cached_symbol_prices(broker, ["BTCUSDT", "ETHUSDT"])
+
+        broker.get_symbol_prices.assert_called_once_with(["ETHUSDT"])
+        self.assertEqual(set(prices), {"BTCUSDT", "ETHUSDT"})
+
+    def test_direct_lookups_stay_uncached(self):
+        """Test that attaching leaves get_symbol_price fetching fresh quotes (order entry)."""
+        from core.services.broker import PriceQuoteCache, get_cached_symbol_price
+
+        cache = PriceQuoteCache(max_age_seconds=2.0)
+        broker = MagicMock()
+        broker.get_symbol_price.side_effect = lambda epic: self._price(epic)
+        fetch = broker.get_symbol_price
+        cache.attach("IG", broker)
+
+        get_cached_symbol_price(broker, "CC.D.CL.UNC.IP")
+        broker.get_symbol_price("CC.D.CL.UNC.IP")
+
+        self.assertIs(broker.get_symbol_price, fetch)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_disabled_cache_is_not_attached(self):
+        """Test that a max age of 0 disables caching."""
+        from core.services.broker import PriceQuoteCache, get_cached_symbol_price
+
+        broker = MagicMock()
+        broker.get_symbol_price.side_effect = lambda epic: self._price(epic)
+        PriceQuoteCache(max_age_seconds=0).attach("IG", broker)
+
+        get_cached_symbol_price(broker, "X")
+        get_cached_symbol_price(broker, "X")
+        self.assertEqual(broker.get_symbol_price.call_count, 2)
+
+    @patch('core.services.broker.config.create_ig_broker_service')
+    def test_registry_prefetch_serves_asset_lookups(self, mock_create):
+        """Test that a registry prefetch answers later per-asset lookups."""
+        from core.services.broker import get_cached_symbol_price
+        from core.services.broker.config import BrokerRegistry
+        from trading.models import TradingAsset
+
+        mock_broker = MagicMock()
+        mock_broker.is_connected.return_value = True
+        mock_broker.get_symbol_prices.side_effect = lambda epics: {e: self._price(e) for e in epics}
+        fetch = mock_broker.get_symbol_price
+        mock_create.return_value = mock_broker
+
+        asset = MagicMock(broker=TradingAsset.BrokerKind.IG, effective_broker_symbol="CC.D.CL.UNC.IP")
+        registry = BrokerRegistry()
+        registry.prefetch_prices([asset])
+        price = get_cached_symbol_price(registry.get_broker_for_asset(asset), "CC.D.CL.UNC.IP")
+
+        self.assertEqual(price.epic, "CC.D.CL.UNC.IP")
+        fetch.assert_not_called()
+        self.assertEqual(registry.price_cache.hits, 1)
+
+
+class BrokerRateLimiterTest(TestCase):
+    """Tests for the per-account broker rate limiter."""
+
+    def _limiter(self, trading_per_minute=60, history_per_minute=60):
+        from core.services.broker import BrokerRateLimiter
+
+        self.now = [0.0]
+        self.slept = []
+
+        def sleep(seconds):
+            self.slept.append(seconds)
+            self.now[0] += seconds
+
+        return BrokerRateLimiter(
+            name="IG:test",
+            trading_per_minute=trading_per_minute,
+            history_per_minute=history_per_minute,
+            clock=lambda: self.now[0],
+            sleep=sleep,
+        )
+
+    def test_price_lane_leaves_reserve_for_orders(self):
+        """Test that price requests stop at the reserve while orders continue."""
+        from core.services.broker import RequestPriority
+
+        limiter = self._limiter(trading_per_minute=10)
+
+        for _ in range(8):
+            limiter.acquire(RequestPriority.PRICE)
+        self.assertEqual(self.slept, [])
+
+        # 2 tokens left: reserved for orders
+        limiter.acquire(RequestPriority.ORDER)
+        self.assertEqual(self.slept, [])
+
+        limiter.acquire(RequestPriority.PRICE)
+        self.assertEqual(len(self.slept), 1)
+        self.assertEqual(limiter.get_stats()["throttled"], 1)
+
+    def test_history_budget_is_separate(self):
+        """Test that history requests do not use the trading budget."""
+        from core.services.broker import RequestPriority
+
+        limiter = self._limiter(trading_per_minute=10, history_per_minute=10)
+
+        for _ in range(6):
+            limiter.acquire(RequestPriority.HISTORY)
+
+        stats = limiter.get_stats()["budgets"]
+        self.assertEqual(stats["trading"]["remaining"], 10)
+        self.assertEqual(stats["history"]["remaining"], 4)
+
+    def test_history_lane_uses_whole_history_budget(self):
+        """Test that history requests can burst through their entire bucket."""
+        from core.services.broker import RequestPriority
+
+        limiter = self._limiter(trading_per_minute=10, history_per_minute=10)
+
+        for _ in range(10):
+            limiter.acquire(RequestPriority.HISTORY)
+        self.assertEqual(self.slept, [])
+
+        limiter.acquire(RequestPriority.HISTORY)
+        self.assertEqual(len(self.slept), 1)
+
+    def test_rejects_when_wait_exceeds_lane_limit(self):
+        """Test that a request fails instead of waiting too long."""
+        from core.services.broker import RequestPriority, RateLimitExceeded
+
+        limiter = self._limiter(trading_per_minute=1)
+        limiter.report_exceeded(RequestPriority.PRICE)
+
+        with self.assertRaises(RateLimitExceeded) as ctx:
+            limiter.acquire(RequestPriority.PRICE)
+        self.assertEqual(ctx.exception.code, "RATE_LIMITED")
+        self.assertEqual(limiter.get_stats()["rejected"], 1)
+
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    def test_ig_client_uses_limiter_lanes(self, mock_request):
+        """Test that IgApiClient classifies requests into limiter lanes."""
+        from core.services.broker import RequestPriority
+        from core.services.broker.ig_api_client import IgSession
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "{}"
+        mock_response.json.return_value = {}
+        mock_request.return_value = mock_response
+
+        limiter = MagicMock()
+        client = IgApiClient(
+            api_key="test-key", username="test-user", password="test-pass", rate_limiter=limiter
+        )
+        client._session = IgSession(cst="cst", security_token="xst", account_id="ABC123", client_id="c")
+
+        client.get_prices("CC.D.CL.UNC.IP")
+        client.get_market("CC.D.CL.UNC.IP")
+        client.confirm_deal("REF")
+
+        self.assertEqual(
+            [c.args[0] for c in limiter.acquire.call_args_list],
+            [RequestPriority.HISTORY, RequestPriority.PRICE, RequestPriority.ORDER],
+        )
+
+    def test_only_mutating_dealing_requests_use_order_lane(self):
+        """Test that reading positions is a PRICE request while dealing is ORDER."""
+        from core.services.broker import RequestPriority
+        from core.services.broker.ig_api_client import get_request_priority
+
+        self.assertEqual(get_request_priority("POST", "/positions/otc"), RequestPriority.ORDER)
+        self.assertEqual(get_request_priority("PUT", "/positions/otc/DEAL1"), RequestPriority.ORDER)
+        self.assertEqual(get_request_priority("DELETE", "/workingorders/otc/DEAL2"), RequestPriority.ORDER)
+        self.assertEqual(get_request_priority("GET", "/confirms/REF"), RequestPriority.ORDER)
+        self.assertEqual(get_request_priority("GET", "/positions"), RequestPriority.PRICE)
+        self.assertEqual(get_request_priority("GET", "/workingorders"), RequestPriority.PRICE)
+
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    def test_ig_allowance_error_drains_budget(self, mock_request):
+        """Test that an IG allowance error makes the limiter back off."""
+        from core.services.broker.ig_api_client import IgSession
+
+        mock_response = MagicMock()
+        mock_response.status_code = 403
+        mock_response.json.return_value = {"errorCode": "error.public-api.exceeded-account-allowance"}
+        mock_request.return_value = mock_response
+
+        limiter = self._limiter(trading_per_minute=30)
+        client = IgApiClient(
+            api_key="test-key", username="test-user", password="test-pass", rate_limiter=limiter
+        )
+        client._session = IgSession(cst="cst", security_token="xst", account_id="ABC123", client_id="c")
+
+        with self.assertRaises(BrokerError):
+            client.get_market("CC.D.CL.UNC.IP")
+
+        self.assertEqual(limiter.get_stats()["budgets"]["trading"]["remaining"], 0)
+
+
+class BrokerMetricsTest(TestCase):
+    """Tests for broker latency and error instrumentation."""
+
+    def setUp(self):
+        from core.services.broker import BrokerMetrics, get_broker_metrics
+
+        self.metrics = BrokerMetrics()
+        get_broker_metrics().reset()
+
+    def tearDown(self):
+        from core.services.broker import get_broker_metrics
+        get_broker_metrics().reset()
+
+    def test_histogram_per_normalized_endpoint(self):
+        """Test that identifiers are collapsed and latencies fall into buckets."""
+        self.metrics.observe("IG", "/prices/CC.D.CL.UNC.IP", 0.04)
+        self.metrics.observe("IG", "/prices/IX.D.DAX.IFD.IP", 0.3)
+        self.metrics.observe("IG", "/confirms/ABC123", 0.02, error_code="error.confirms.deal-not-found")
+
+        snapshot = self.metrics.snapshot()["IG"]
+
+        prices = snapshot["endpoints"]["/prices/{id}"]
+        self.assertEqual(prices["count"], 2)
+        self.assertEqual(prices["buckets"]["le_50"], 1)
+        self.assertEqual(prices["buckets"]["le_500"], 1)
+        self.assertEqual(prices["p50_ms"], 50.0)
+        self.assertEqual(prices["p95_ms"], 500.0)
+        self.assertEqual(snapshot["endpoints"]["/confirms/{id}"]["errors"], 1)
+        self.assertEqual(snapshot["errors"], {"error.confirms.deal-not-found": 1})
+
+    def test_timed_counts_broker_error_codes(self):
+        """Test that timed() records failures by broker error code."""
+        with self.assertRaises(BrokerError):
+            with self.metrics.timed("MEXC", "/api/v3/order"):
+                raise BrokerError("Insufficient balance", code="30004")
+
+        snapshot = self.metrics.snapshot()["MEXC"]
+        self.assertEqual(snapshot["errors"], {"30004": 1})
+        self.assertEqual(snapshot["endpoints"]["/api/v3/order"]["count"], 1)
+
+    @patch('core.services.broker.ig_api_client.requests.Session.post')
+    @patch('core.services.broker.ig_api_client.requests.Session.request')
+    def test_ig_client_records_errors_retries_and_refreshes(self, mock_request, mock_post):
+        """Test that IgApiClient reports latency, error codes, retries and token refreshes."""
+        from core.services.broker import get_broker_metrics
+        from core.services.broker.ig_api_client import IgSession
+
+        rejected = MagicMock()
+        rejected.status_code = 401
+        rejected.json.return_value = {"errorCode": "error.security.client-token-invalid"}
+        ok = MagicMock()
+        ok.status_code = 200
+        ok.text = "{}"
+        ok.json.return_value = {}
+        mock_request.side_effect = [rejected, ok]
+
+        login = MagicMock()
+        login.status_code = 200
+        login.headers = {"CST": "cst-2", "X-SECURITY-TOKEN": "xst-2"}
+        login.json.return_value = {"currentAccountId": "ACC123", "clientId": "c"}
+        mock_post.return_value = login
+
+        client = IgApiClient(api_key="test-key", username="test-user", password="test-pass")
+        client._session = IgSession(cst="cst-1", security_token="xst-1", account_id="ACC123", client_id="c")
+        client.get_market("CC.D.CL.UNC.IP")
+
+        snapshot = get_broker_metrics().snapshot()["IG"]
+        self.assertEqual(snapshot["endpoints"]["/markets/{id}"]["count"], 2)
+        self.assertEqual(snapshot["endpoints"]["/markets/{id}"]["errors"], 1)
+        self.assertEqual(snapshot["endpoints"]["/session"]["count"], 1)
+        self.assertEqual(snapshot["errors"], {"error.security.client-token-invalid": 1})
+        self.assertEqual(snapshot["retries"], 1)
+        self.assertEqual(snapshot["token_refreshes"], 1)
+
+    def test_mexc_request_records_mexc_error_code(self):
+        """Test that MEXC API errors are counted by their 'code'."""
+        from core.services.broker import MexcBrokerService, get_broker_metrics
+
+        response = MagicMock()
+        response.status_code = 400
+        response.json.return_value = {"code": 700003, "msg": "Timestamp for this request is outside of the recvWindow."}
+
+        service = MexcBrokerService(api_key="key", api_secret="secret")
+        with patch.object(service._session, 'get', return_value=response):
+            with self.assertRaises(BrokerError) as ctx:
+                service._request("GET", "/api/v3/account", signed=True)
+
+        self.assertEqual(ctx.exception.code, "700003")
+        snapshot = get_broker_metrics().snapshot()["MEXC"]
+        self.assertEqual(snapshot["errors"], {"700003": 1})
+        self.assertEqual(snapshot["endpoints"]["/api/v3/account"]["errors"], 1)
+
+
+class FakeWebSocketServer:
+    """
+    Minimal local WebSocket server (RFC 6455 text frames) for streaming tests.
+
+    Every text message received is passed to on_message(server, text);
+    replies are sent with server.send(). drop() closes the current
+    connection to simulate a lost stream.
+    """
+
+    GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+    def __init__(self, on_message=None):
+        import socket
+        import threading
+
+        self.on_message = on_message
+        self.received = []
+        self.connections = 0
+        self.request_paths = []
+        self._conn = None
+        self._lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(5)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self):
+        return self._sock.getsockname()[1]
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}"
+
+    def _serve(self):
+        while not self._stopped.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            try:
+                self._handshake(conn)
+            except OSError:
+                conn.close()
+                continue
+            with self._lock:
+                self._conn = conn
+                self.connections += 1
+            self._read(conn)
+
+    def _handshake(self, conn):
+        import base64
+        import hashlib
+
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = conn.recv(4096)
+            if not chunk:
+                raise OSError("client closed during handshake")
+            request += chunk
+
+        lines = request.decode().split("\r\n")
+        self.request_paths.append(lines[0].split(" ")[1])
+        headers = {
+            name.strip().lower(): value.strip()
+            for name, _, value in (line.partition(":") for line in lines[1:] if line)
+        }
+        accept = base64.b64encode(
+            hashlib.sha1((headers["sec-websocket-key"] + self.GUID).encode()).digest()
+        ).decode()
+        response = (
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n"
+        )
+        if "sec-websocket-protocol" in headers:
+            protocol = headers["sec-websocket-protocol"].split(",")[0].strip()
+            response += f"Sec-WebSocket-Protocol: {protocol}\r\n"
+        conn.sendall((response + "\r\n").encode())
+
+    def _recv_exact(self, conn, size):
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise OSError("connection closed")
+            data += chunk
+        return data
+
+    def _read(self, conn):
+        import struct
+
+        try:
+            while True:
+                first, second = self._recv_exact(conn, 2)
+                opcode = first & 0x0F
+                length = second & 0x7F
+                if length == 126:
+                    length = struct.unpack(">H", self._recv_exact(conn, 2))[0]
+                elif length == 127:
+                    length = struct.unpack(">Q", self._recv_exact(conn, 8))[0]
+                mask = self._recv_exact(conn, 4) if second & 0x80 else b"\x00" * 4
+                payload = bytes(
+                    b ^ mask[i % 4] for i, b in enumerate(self._recv_exact(conn, length))
+                )
+                if opcode == 0x8:
+                    break
+                if opcode == 0x1:
+                    text = payload.decode()
+                    self.received.append(text)
+                    if self.on_message:
+                        self.on_message(self, text)
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                if self._conn is conn:
+                    self._conn = None
+            conn.close()
+
+    def send(self, text):
+        """Send a text frame to the connected client."""
+        import struct
+
+        payload = text.encode()
+        if len(payload) < 126:
+            header = bytes([0x81, len(payload)])
+        elif len(payload) < 65536:
+            header = bytes([0x81, 126]) + struct.pack(">H", len(payload))
+        else:
+            header = bytes([0x81, 127]) + struct.pack(">Q", len(payload))
+        with self._lock:
+            if self._conn is not None:
+                self._conn.sendall(header + payload)
+
+    def drop(self):
+        """Close the current connection without a close frame."""
+        import socket
+
+        with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.shutdown(socket.SHUT_RDWR)
+            conn.close()
+
+    def stop(self):
+        self._stopped.set()
+        self.drop()
+        self._sock.close()
+
+
+def wait_until(condition, timeout=5.0):
+    """Poll a condition until it holds or the timeout expires."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class LightstreamerClientTest(TestCase):
+    """Tests for the Lightstreamer subscription client against a local fake server."""
+
+    def setUp(self):
+        self.server = FakeWebSocketServer(on_message=self._handle_request)
+        self.sessions = 0
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _handle_request(self, server, text):
+        """Answer TLCP requests like a Lightstreamer server."""
+        from urllib.parse import parse_qs
+
+        request, _, body = text.partition("\r\n")
+        params = {key: values[0] for key, values in parse_qs(body).items()}
+        if request == "create_session":
+            self.sessions += 1
+            server.send(f"CONOK,S{self.sessions},50000,5000,*\r\n")
+        elif request == "control" and params.get("LS_op") == "add":
+            server.send(f"REQOK,{params['LS_reqId']}\r\nSUBOK,{params['LS_subId']},1,3\r\n")
+
+    def _client(self):
+        from core.services.broker import LightstreamerClient
+
+        return LightstreamerClient(
+            endpoint=self.server.url.replace("ws://", "http://"),
+            credentials=lambda: ("ABC123", "CST-cst|XST-xst"),
+        )
+
+    def _subscriptions(self):
+        return [text for text in self.server.received if "LS_op=add" in text]
+
+    def test_creates_session_and_decodes_updates(self):
+        """Test login parameters, subscription request and TLCP value decoding."""
+        updates = []
+        client = self._client()
+        client.subscribe("CHART:CS.D.EURUSD.MINI.IP:TICK", ["BID", "OFR", "UTM"],
+                         lambda item, values: updates.append((item, values)), mode="DISTINCT")
+        client.connect()
+        try:
+            self.assertTrue(wait_until(lambda: self._subscriptions()))
+            self.assertEqual(self.server.request_paths, ["/lightstreamer"])
+            self.assertIn("LS_user=ABC123", self.server.received[0])
+            self.assertIn("LS_password=CST-cst%7CXST-xst", self.server.received[0])
+            self.assertIn("LS_group=CHART%3ACS.D.EURUSD.MINI.IP%3ATICK", self._subscriptions()[0])
+            self.assertIn("LS_mode=DISTINCT", self._subscriptions()[0])
+            self.assertTrue(client.is_connected())
+
+            self.server.send("U,1,1,1.1|1.2|1700000000000\r\n")
+            self.server.send("U,1,1,1.15||1700000001000\r\nPROBE\r\n")
+            self.server.send("U,1,1,#|$|1700000002000\r\n")
+            self.assertTrue(wait_until(lambda: len(updates) == 3))
+        finally:
+            client.disconnect()
+
+        item, first = updates[0]
+        self.assertEqual(item, "CHART:CS.D.EURUSD.MINI.IP:TICK")
+        self.assertEqual(first, {"BID": "1.1", "OFR": "1.2", "UTM": "1700000000000"})
+        # Empty field means unchanged
+        self.assertEqual(updates[1][1]["OFR"], "1.2")
+        # '#' is null, '$' is the empty string
+        self.assertIsNone(updates[2][1]["BID"])
+        self.assertEqual(updates[2][1]["OFR"], "")
+        self.assertFalse(client.is_connected())
+
+    def test_reconnects_and_resubscribes_after_connection_loss(self):
+        """Test that a dropped connection is re-established with all subscriptions."""
+        from core.services.broker import streaming_client
+
+        updates = []
+        client = self._client()
+        client.subscribe("CHART:IX.D.DAX.IFMM.IP:TICK", ["BID", "OFR", "UTM"],
+                         lambda item, values: updates.append(values))
+
+        with patch.object(streaming_client, "RECONNECT_INITIAL_DELAY_SECONDS", 0.01):
+            client.connect()
+            try:
+                self.assertTrue(wait_until(lambda: len(self._subscriptions()) == 1))
+                self.server.drop()
+                self.assertTrue(wait_until(lambda: len(self._subscriptions()) == 2))
+                self.assertTrue(wait_until(lambda: client.session_id == "S2"))
+
+                self.server.send("U,1,1,15000|15001|1700000000000\r\n")
+                self.assertTrue(wait_until(lambda: len(updates) == 1))
+            finally:
+                client.disconnect()
+
+        self.assertEqual(self.server.connections, 2)
+        self.assertEqual(updates[0]["BID"], "15000")
+
+    def test_server_end_triggers_reconnect(self):
+        """Test that an END notification closes the session and reconnects."""
+        from core.services.broker import streaming_client
+
+        client = self._client()
+        with patch.object(streaming_client, "RECONNECT_INITIAL_DELAY_SECONDS", 0.01):
+            client.connect()
+            try:
+                self.assertTrue(wait_until(lambda: client.session_id == "S1"))
+                self.server.send("END,31,Session closed by server\r\n")
+                self.assertTrue(wait_until(lambda: client.session_id == "S2"))
+            finally:
+                client.disconnect()
+
+    def test_ig_streaming_credentials(self):
+        """Test Lightstreamer login derived from an IG session."""
+        from core.services.broker.ig_api_client import IgSession
+
+        client = IgApiClient(api_key="test-key", username="test-user", password="test-pass")
+        client._session = IgSession(
+            cst="cst", security_token="xst", account_id="ABC123", client_id="c",
+            lightstreamer_endpoint="https://demo-apd.marketdatasystems.com",
+        )
+
+        self.assertEqual(
+            client.get_streaming_credentials(),
+            ("https://demo-apd.marketdatasystems.com", "ABC123", "CST-cst|XST-xst"),
+        )
+
+    def test_ig_streaming_credentials_fetch_tokens_for_oauth_session(self):
+        """Test that OAuth sessions fetch CST/X-SECURITY-TOKEN for streaming."""
+        from core.services.broker.ig_api_client import IgSession
+
+        http = MagicMock()
+        http.get.return_value = MagicMock(status_code=200, headers={"CST": "c2", "X-SECURITY-TOKEN": "x2"})
+        client = IgApiClient(api_key="test-key", username="test-user", password="test-pass", http_session=http)
+        client._session = IgSession(
+            cst="access", security_token="refresh", account_id="ABC123", client_id="c",
+            is_oauth=True, lightstreamer_endpoint="https://demo-apd.marketdatasystems.com",
+        )
+
+        _, _, password = client.get_streaming_credentials()
+
+        self.assertEqual(password, "CST-c2|XST-x2")
+        self.assertEqual(http.get.call_args.kwargs["params"], {"fetchSessionTokens": "true"})
+
+
+class MexcWebSocketClientTest(TestCase):
+    """Tests for the MEXC WebSocket client against a local stand-in server."""
+
+    CHANNEL = "spot@public.kline.v3.api@BTCUSDT@Min1"
+
+    def setUp(self):
+        self.server = FakeWebSocketServer(on_message=self._handle_request)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _handle_request(self, server, text):
+        """Acknowledge requests like the MEXC server."""
+        import json
+
+        request = json.loads(text)
+        if request["method"] == "PING":
+            server.send(json.dumps({"id": 0, "code": 0, "msg": "PONG"}))
+        else:
+            server.send(json.dumps({"id": 0, "code": 0, "msg": ",".join(request["params"])}))
+
+    def _push_kline(self, open_time, close):
+        import json
+
+        self.server.send(json.dumps({
+            "c": self.CHANNEL,
+            "d": {"k": {"t": open_time, "o": "100", "h": "101", "l": "99", "c": str(close),
+                        "v": "5", "i": "Min1"}, "e": "spot@public.kline.v3.api"},
+            "s": "BTCUSDT",
+            "t": open_time * 1000,
+        }))
+
+    def _requests(self, method):
+        import json
+
+        return [json.loads(text) for text in self.server.received if json.loads(text)["method"] == method]
+
+    def test_subscribes_and_delivers_channel_payloads(self):
+        """Test the subscription request and delivery of pushed kline messages."""
+        from core.services.broker import MexcWebSocketClient
+
+        updates = []
+        client = MexcWebSocketClient(url=self.server.url)
+        client.subscribe(self.CHANNEL, [], lambda item, data: updates.append((item, data)))
+        client.connect()
+        try:
+            self.assertTrue(wait_until(lambda: self._requests("SUBSCRIPTION")))
+            self.assertEqual(self._requests("SUBSCRIPTION")[0]["params"], [self.CHANNEL])
+
+            self._push_kline(1700000040, 100.5)
+            self.assertTrue(wait_until(lambda: len(updates) == 1))
+        finally:
+            client.disconnect()
+
+        item, data = updates[0]
+        self.assertEqual(item, self.CHANNEL)
+        self.assertEqual(data["k"]["c"], "100.5")
+
+    def test_pings_idle_connection(self):
+        """Test that an idle connection is kept alive with PING requests."""
+        from core.services.broker import MexcWebSocketClient
+
+        client = MexcWebSocketClient(url=self.server.url)
+        client.keepalive_interval = 0.05
+        client.connect()
+        try:
+            self.assertTrue(wait_until(lambda: self._requests("PING")))
+        finally:
+            client.disconnect()
+
+    def test_reconnects_and_resubscribes_after_connection_loss(self):
+        """Test that a dropped connection is re-established with all subscriptions."""
+        from core.services.broker import MexcWebSocketClient, streaming_client
+
+        updates = []
+        client = MexcWebSocketClient(url=self.server.url)
+        client.subscribe(self.CHANNEL, [], lambda item, data: updates.append(data))
+
+        with patch.object(streaming_client, "RECONNECT_INITIAL_DELAY_SECONDS", 0.01):
+            client.connect()
+            try:
+                self.assertTrue(wait_until(lambda: len(self._requests("SUBSCRIPTION")) == 1))
+                self.server.drop()
+                self.assertTrue(wait_until(lambda: len(self._requests("SUBSCRIPTION")) == 2))
+
+                self._push_kline(1700000100, 101.0)
+                self.assertTrue(wait_until(lambda: len(updates) == 1))
+            finally:
+                client.disconnect()
+
+        self.assertEqual(self.server.connections, 2)
+
+    def test_subscription_limit(self):
+        """Test that MEXC's per-connection subscription limit is enforced."""
+        from core.services.broker import MexcWebSocketClient
+        from core.services.broker.mexc_websocket_client import MAX_SUBSCRIPTIONS_PER_CONNECTION, kline_channel
+
+        client = MexcWebSocketClient(url=self.server.url)
+        for i in range(MAX_SUBSCRIPTIONS_PER_CONNECTION):
+            client.subscribe(kline_channel(f"SYM{i}USDT"), [], lambda item, data: None)
+
+        with self.assertRaises(BrokerError):
+            client.subscribe(kline_channel("BTCUSDT"), [], lambda item, data: None)
+
+
 class DirectionEnumTest(TestCase):
     """Tests for Direction and PositionDirection enums."""
 
@@ -1445,6 +2717,23 @@ class IGMarketStateProviderTest(TestCase):
         provider.clear_current_asset()
         self.assertIsNone(provider._current_asset)
 
+    def test_for_asset_returns_bound_provider(self):
+        """Test that for_asset() binds a view without mutating the shared provider."""
+        from core.services.broker import IGMarketStateProvider, SessionTimesConfig
+        
+        provider = IGMarketStateProvider(broker_service=self.mock_broker)
+        session_times = SessionTimesConfig.from_time_strings(asia_start='01:00', asia_end='07:00')
+        
+        bound = provider.for_asset(self.asset, session_times=session_times)
+        
+        self.assertEqual(bound._current_asset, self.asset)
+        self.assertIs(bound._session_times, session_times)
+        self.assertIsNone(provider._current_asset)
+        self.assertIsNot(provider._session_times, session_times)
+        # Caches keyed by EPIC are shared between views
+        bound._asia_range_cache[self.asset.epic] = (75.5, 74.5)
+        self.assertEqual(provider._asia_range_cache[self.asset.epic], (75.5, 74.5))
+
     def test_set_asia_range_persists_to_database(self):
         """Test that set_asia_range persists range to database when asset is set."""
         from core.services.broker import IGMarketStateProvider
@@ -1775,6 +3064,40 @@ class IGMarketStateProviderTest(TestCase):
         # Verify result
         self.assertEqual(result, (76.00, 74.50))
 
+    def test_streamed_epic_skips_rest_polling(self):
+        """Test that streamed IG epics use stream candles instead of REST price polling."""
+        from core.services.broker import IGMarketStateProvider
+        from core.services.market_data import Candle as StreamCandle
+
+        mock_registry = MagicMock()
+        mock_registry.get_broker_for_asset.return_value = self.mock_broker
+        ingestor = MagicMock()
+        ingestor.is_streaming.return_value = True
+
+        provider = IGMarketStateProvider(
+            broker_service=self.mock_broker,
+            broker_registry=mock_registry,
+            stream_ingestor=ingestor,
+        )
+        provider.set_current_asset(self.asset)
+
+        provider.update_candle_from_price()
+        self.mock_broker.get_symbol_price.assert_not_called()
+
+        stream_candles = [
+            StreamCandle(timestamp=1700000000, open=75.0, high=75.5, low=74.5, close=75.2),
+            StreamCandle(timestamp=1700000060, open=75.2, high=75.4, low=75.1, close=75.3, complete=False),
+        ]
+        with patch('core.services.market_data.get_stream_manager') as mock_manager:
+            mock_manager.return_value.get_cached_candles.return_value = stream_candles
+            candles = provider.get_recent_candles("CC.D.CL.UNC.IP", "1m", 10)
+            closed = provider.get_recent_candles("CC.D.CL.UNC.IP", "1m", 10, closed_only=True)
+
+        ingestor.is_streaming.assert_called_with("CC.D.CL.UNC.IP")
+        self.mock_broker.get_historical_prices.assert_not_called()
+        self.assertEqual([c.close for c in candles], [75.2, 75.3])
+        self.assertEqual([c.close for c in closed], [75.2])
+
 
 class KrakenBrokerConfigTest(TestCase):
     """Tests for Kraken Broker configuration and integration."""
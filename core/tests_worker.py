@@ -1366,6 +1366,538 @@ class WorkerAssetDiagnosticsTest(TestCase):
         self.assertEqual(aggregated['counters']['candles_evaluated'], 2)
 
 
+class WorkerConcurrentAssetCycleTest(TestCase):
+    """Tests for concurrent per-asset cycles in multi-asset mode."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        from trading.models import TradingAsset
+        from core.management.commands.run_fiona_worker import Command
+        
+        self.oil = TradingAsset.objects.create(
+            name="Test Oil",
+            symbol="OIL",
+            epic="CC.D.CL.UNC.IP",
+            category="commodity",
+            tick_size="0.01",
+            is_active=True,
+        )
+        self.btc = TradingAsset.objects.create(
+            name="Bitcoin",
+            symbol="BTCUSDT",
+            epic="BTCUSDT",
+            category="crypto",
+            tick_size="0.01",
+            broker=TradingAsset.BrokerKind.MEXC,
+            is_active=True,
+        )
+        
+        self.cmd = Command()
+        self.cmd.stdout = StringIO()
+        self.cmd.broker_registry = MagicMock()
+        self.cmd.market_state_provider = IGMarketStateProvider(broker_service=MagicMock())
+    
+    @patch('trading.models.TradingAsset.get_strategy_config', return_value=StrategyConfig())
+    def test_assets_run_in_parallel_with_own_provider(self, mock_config):
+        """Test that assets are evaluated in parallel, each with a provider bound to it."""
+        import threading
+        from trading.models import WorkerStatus
+        from core.management.commands.run_fiona_worker import AssetCycleResult
+        
+        # Both cycles must be in flight at the same time to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        bound_assets = {}
+        
+        def run_asset_cycle(asset, strategy_engine, shadow_only, dry_run, now, market_state, asset_context):
+            barrier.wait()
+            bound_assets[asset.epic] = market_state._current_asset
+            return AssetCycleResult(setups_found=1, bid_price=Decimal("75.50"))
+        
+        with patch.object(self.cmd, '_run_asset_cycle', side_effect=run_asset_cycle):
+            self.cmd._run_multi_asset_cycle(shadow_only=True, dry_run=True, concurrency=4)
+        
+        self.assertEqual(bound_assets, {self.oil.epic: self.oil, self.btc.epic: self.btc})
+        self.assertIsNone(self.cmd.market_state_provider._current_asset)
+        status = WorkerStatus.get_current()
+        self.assertEqual(status.setup_count, 2)
+        self.assertEqual(status.bid_price, Decimal("75.50"))
+    
+    @patch('trading.models.TradingAsset.get_strategy_config', return_value=StrategyConfig())
+    def test_trigger_limits_cycle_to_closed_assets(self, mock_config):
+        """Test that a candle close trigger evaluates only the assets whose candle closed."""
+        from core.management.commands.run_fiona_worker import AssetCycleResult
+        from core.services.worker_scheduler import CycleTrigger
+        
+        evaluated = []
+        
+        def run_asset_cycle(asset, strategy_engine, shadow_only, dry_run, now, market_state, asset_context):
+            evaluated.append(asset.symbol)
+            return AssetCycleResult()
+        
+        with patch.object(self.cmd, '_run_asset_cycle', side_effect=run_asset_cycle):
+            self.cmd._run_multi_asset_cycle(True, True, trigger=CycleTrigger(only=frozenset({"BTCUSDT"})))
+            self.cmd._run_multi_asset_cycle(True, True, trigger=CycleTrigger(skip=frozenset({"BTCUSDT"})))
+            self.cmd._run_multi_asset_cycle(True, True, trigger=CycleTrigger(skip=frozenset({"BTCUSDT", "OIL"})))
+        
+        self.assertEqual(evaluated, ["BTCUSDT", "OIL"])
+    
+    @patch('trading.models.TradingAsset.get_strategy_config', return_value=StrategyConfig())
+    def test_failed_asset_does_not_stop_others(self, mock_config):
+        """Test that an error in one asset is isolated from the other assets."""
+        from trading.models import WorkerStatus
+        from core.management.commands.run_fiona_worker import AssetCycleResult
+        
+        def run_asset_cycle(asset, strategy_engine, shadow_only, dry_run, now, market_state, asset_context):
+            if asset.epic == self.oil.epic:
+                raise RuntimeError("IG timeout")
+            return AssetCycleResult(setups_found=1)
+        
+        with patch.object(self.cmd, '_run_asset_cycle', side_effect=run_asset_cycle):
+            self.cmd._run_multi_asset_cycle(shadow_only=True, dry_run=True, concurrency=2)
+        
+        status = WorkerStatus.get_current()
+        self.assertEqual(status.setup_count, 1)
+        self.assertIn(self.btc.epic, status.diagnostic_message)
+        self.assertNotIn(self.oil.epic, status.diagnostic_message)
+
+
+class AssetContextCacheTest(TestCase):
+    """Tests for the cached per-asset configuration of the worker."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        from trading.models import TradingAsset, AssetSessionPhaseConfig
+        
+        self.asset = TradingAsset.objects.create(
+            name="Test Oil",
+            symbol="OIL",
+            epic="CC.D.CL.UNC.IP",
+            category="commodity",
+            tick_size="0.01",
+            is_active=True,
+        )
+        self.phase_config = AssetSessionPhaseConfig.objects.create(
+            asset=self.asset,
+            phase='US_CORE_TRADING',
+            start_time_utc='15:00',
+            end_time_utc='22:00',
+            is_range_build_phase=False,
+            is_trading_phase=True,
+            enabled=True,
+        )
+    
+    def _reload_asset(self):
+        from trading.models import TradingAsset
+        return TradingAsset.objects.get(pk=self.asset.pk)
+    
+    def test_unchanged_asset_uses_cache_without_queries(self):
+        """Test that a steady-state lookup performs no configuration queries."""
+        from core.services.worker_context import AssetContextCache
+        
+        cache = AssetContextCache()
+        context = cache.get(self._reload_asset())
+        self.assertEqual(context.session_times.us_core_trading_start, 15)
+        self.assertEqual(set(context.phase_configs), {'US_CORE_TRADING'})
+        
+        asset = self._reload_asset()
+        with self.assertNumQueries(0):
+            self.assertIs(cache.get(asset), context)
+    
+    def test_config_change_invalidates_context(self):
+        """Test that saving or deleting a phase config makes the asset reload its context."""
+        from core.services.worker_context import AssetContextCache
+        
+        cache = AssetContextCache()
+        context = cache.get(self._reload_asset())
+        
+        self.phase_config.start_time_utc = '14:00'
+        self.phase_config.save()
+        changed = cache.get(self._reload_asset())
+        self.assertIsNot(changed, context)
+        self.assertEqual(changed.session_times.us_core_trading_start, 14)
+        
+        self.phase_config.delete()
+        self.assertEqual(cache.get(self._reload_asset()).phase_configs, {})
+    
+    def test_provider_uses_preloaded_phase_configs(self):
+        """Test that a provider bound with phase configs does not query them."""
+        from core.services.worker_context import AssetContextCache
+        
+        context = AssetContextCache().get(self.asset)
+        provider = IGMarketStateProvider(broker_service=MagicMock()).for_asset(
+            self.asset, phase_configs=context.phase_configs
+        )
+        
+        with self.assertNumQueries(0):
+            self.assertTrue(provider.is_phase_tradeable(SessionPhase.US_CORE_TRADING))
+    
+    @patch('trading.models.TradingAsset.get_strategy_config', return_value=StrategyConfig())
+    def test_worker_builds_context_once_per_asset(self, mock_config):
+        """Test that consecutive worker cycles reuse the asset context."""
+        from core.management.commands.run_fiona_worker import AssetCycleResult, Command
+        
+        cmd = Command()
+        cmd.stdout = StringIO()
+        cmd.broker_registry = MagicMock()
+        cmd.market_state_provider = IGMarketStateProvider(broker_service=MagicMock())
+        contexts = []
+        
+        def run_asset_cycle(asset, strategy_engine, shadow_only, dry_run, now, market_state, asset_context):
+            contexts.append(asset_context)
+            return AssetCycleResult()
+        
+        with patch.object(cmd, '_run_asset_cycle', side_effect=run_asset_cycle):
+            cmd._run_multi_asset_cycle(shadow_only=True, dry_run=True)
+            cmd._run_multi_asset_cycle(shadow_only=True, dry_run=True)
+        
+        self.assertEqual(mock_config.call_count, 1)
+        self.assertIs(contexts[0], contexts[1])
+
+
+class CycleSchedulerTest(TestCase):
+    """Tests for aligning worker cycles to boundaries and candle closes."""
+
+    def setUp(self):
+        self.now = [125.0]
+
+    def _scheduler(self):
+        from core.services.worker_scheduler import CycleScheduler
+
+        return CycleScheduler(60, settle_seconds=0, clock=lambda: self.now[0])
+
+    def test_next_boundary(self):
+        """Test that cycles start at the next interval boundary plus the settle delay."""
+        from core.services.worker_scheduler import next_boundary
+
+        self.assertEqual(next_boundary(125.0, 60, 2.0), 182.0)
+        self.assertEqual(next_boundary(121.0, 60, 2.0), 122.0)
+        self.assertEqual(next_boundary(122.0, 60, 2.0), 182.0)
+        self.assertEqual(next_boundary(125.0, 0), 125.0)
+
+    def test_candle_close_triggers_before_boundary(self):
+        """Test that a closed candle starts a cycle for its asset and the boundary skips it."""
+        scheduler = self._scheduler()
+        stream = MagicMock(asset_id="WTI")
+        scheduler.watch_stream(stream)
+        scheduler.watch_stream(stream)
+        self.assertEqual(stream.add_listener.call_count, 1)
+        listener = stream.add_listener.call_args.args[0]
+
+        listener([MagicMock(complete=False)])
+        listener([MagicMock(complete=True)])
+        trigger = scheduler.wait()
+
+        self.assertEqual(trigger.only, frozenset({"WTI"}))
+        self.assertTrue(trigger.includes("WTI"))
+        self.assertFalse(trigger.includes("BTC"))
+
+        self.now[0] = 180.0
+        trigger = scheduler.wait()
+
+        self.assertIsNone(trigger.only)
+        self.assertFalse(trigger.includes("WTI"))
+        self.assertTrue(trigger.includes("BTC"))
+        self.assertEqual(scheduler.next_run, 240.0)
+
+    def test_wait_aborts_on_shutdown(self):
+        """Test that waiting stops when shutdown is requested."""
+        scheduler = self._scheduler()
+
+        self.assertIsNone(scheduler.wait(lambda: True))
+
+
+class CycleWriteBufferTest(TestCase):
+    """Tests for the batched database writes of a worker cycle."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        from trading.models import TradingAsset
+        from core.services.worker_writes import CycleWriteBuffer
+        
+        self.asset = TradingAsset.objects.create(
+            name="Test Oil",
+            symbol="OIL",
+            epic="CC.D.CL.UNC.IP",
+            category="commodity",
+            tick_size="0.01",
+            is_active=True,
+        )
+        self.writes = CycleWriteBuffer()
+        self.start = datetime(2025, 1, 15, 0, 0, tzinfo=timezone.utc)
+    
+    def test_batch_defers_writes_until_flush(self):
+        """Test that writes inside a batch reach the database only when it closes."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from trading.models import AssetPriceStatus, BreakoutRange, PriceSnapshot, TradingAsset
+        
+        with CaptureQueriesContext(connection) as queries:
+            with self.writes.batch():
+                self.writes.record_price_snapshot(self.asset, price_mid=75.5, price_bid=75.4, price_ask=75.6)
+                self.writes.update_price_status(self.asset, bid_price=75.4, ask_price=75.6, status_message="first")
+                self.writes.update_price_status(self.asset, bid_price=75.5, ask_price=75.7, status_message="last")
+                self.writes.save_range_snapshot(
+                    self.asset, 'ASIA_RANGE', self.start, self.start + timedelta(hours=8), 75.8, 74.8,
+                )
+                self.asset.breakout_state = 'BROKEN_LONG'
+                self.writes.save_breakout_state(self.asset)
+                self.assertEqual(len(queries), 0)
+        
+        self.assertEqual(PriceSnapshot.objects.filter(asset=self.asset).count(), 1)
+        price_status = AssetPriceStatus.get_for_asset(self.asset)
+        self.assertEqual(price_status.bid_price, Decimal("75.5"))
+        self.assertEqual(price_status.last_strategy_status, "last")
+        breakout_range = BreakoutRange.objects.get(asset=self.asset, phase='ASIA_RANGE')
+        self.assertEqual(breakout_range.height_ticks, 100)
+        self.assertEqual(TradingAsset.objects.get(pk=self.asset.pk).breakout_state, 'BROKEN_LONG')
+    
+    def test_batch_updates_existing_records(self):
+        """Test that flushed writes update the existing range, diagnostics and price status."""
+        from trading.models import AssetDiagnostics, AssetPriceStatus, BreakoutRange
+        
+        BreakoutRange.save_range_snapshot(
+            self.asset, 'ASIA_RANGE', self.start, self.start + timedelta(hours=1), 75.5, 74.5,
+        )
+        AssetPriceStatus.update_price(self.asset, bid_price=70, ask_price=71)
+        diagnostics = AssetDiagnostics.get_or_create_for_window(
+            self.asset, self.start, self.start + timedelta(hours=1),
+        )
+        
+        with self.writes.batch():
+            self.writes.save_range_snapshot(
+                self.asset, 'ASIA_RANGE', self.start, self.start + timedelta(hours=2), 76.0, 74.5,
+            )
+            self.writes.update_price_status(self.asset, bid_price=75.4, ask_price=75.6)
+            diagnostics.candles_evaluated += 1
+            self.writes.save_diagnostics(diagnostics)
+            diagnostics.setups_generated_total += 2
+            self.writes.save_diagnostics(diagnostics)
+            # Changed concurrently by another process; not a worker cycle field
+            AssetDiagnostics.objects.filter(pk=diagnostics.pk).update(reason_counts_risk={'RISK_SPREAD_TOO_WIDE': 3})
+        
+        breakout_range = BreakoutRange.objects.get(asset=self.asset, phase='ASIA_RANGE')
+        self.assertEqual(breakout_range.high, Decimal("76.0"))
+        self.assertEqual(breakout_range.end_time, self.start + timedelta(hours=2))
+        self.assertEqual(AssetPriceStatus.objects.filter(asset=self.asset).count(), 1)
+        self.assertEqual(AssetPriceStatus.get_for_asset(self.asset).bid_price, Decimal("75.4"))
+        diagnostics.refresh_from_db()
+        self.assertEqual(diagnostics.candles_evaluated, 1)
+        self.assertEqual(diagnostics.setups_generated_total, 2)
+        self.assertEqual(diagnostics.reason_counts_risk, {'RISK_SPREAD_TOO_WIDE': 3})
+    
+    def test_writes_outside_batch_are_immediate(self):
+        """Test that the buffer writes through when no batch is open."""
+        from trading.models import PriceSnapshot
+        
+        self.writes.record_price_snapshot(self.asset, price_mid=75.5)
+        
+        self.assertEqual(PriceSnapshot.objects.filter(asset=self.asset).count(), 1)
+    
+    def test_failed_write_only_drops_its_kind(self):
+        """Test that a failing kind of write is logged without losing the other writes."""
+        from trading.models import AssetPriceStatus, PriceSnapshot, TradingAsset
+        
+        with patch.object(PriceSnapshot.objects, 'bulk_create', side_effect=RuntimeError("database is locked")):
+            with self.assertLogs('core.services.worker_writes', level='WARNING') as cm:
+                with self.writes.batch():
+                    self.writes.update_price_status(self.asset, bid_price=75.4, ask_price=75.6)
+                    self.writes.record_price_snapshot(self.asset, price_mid=75.5)
+                    self.asset.breakout_state = 'BROKEN_SHORT'
+                    self.writes.save_breakout_state(self.asset)
+        
+        self.assertEqual(len(cm.output), 1)
+        self.assertIn("price snapshots: database is locked", cm.output[0])
+        self.assertFalse(PriceSnapshot.objects.filter(asset=self.asset).exists())
+        self.assertEqual(AssetPriceStatus.get_for_asset(self.asset).bid_price, Decimal("75.4"))
+        self.assertEqual(TradingAsset.objects.get(pk=self.asset.pk).breakout_state, 'BROKEN_SHORT')
+    
+    @patch('trading.models.TradingAsset.get_strategy_config', return_value=StrategyConfig())
+    def test_worker_cycle_writes_are_batched(self, mock_config):
+        """Test that the asset writes of a batched worker cycle are flushed at its end."""
+        from trading.models import AssetPriceStatus, WorkerStatus
+        from core.management.commands.run_fiona_worker import Command
+        
+        cmd = Command()
+        cmd.stdout = StringIO()
+        cmd.broker_registry = MagicMock()
+        cmd.broker_registry.get_broker_for_asset.return_value.get_symbol_price.return_value = SymbolPrice(
+            epic="CC.D.CL.UNC.IP", market_name="Oil", bid=Decimal("75.40"), ask=Decimal("75.60"),
+            spread=Decimal("0.20"),
+        )
+        cmd.market_state_provider = IGMarketStateProvider(
+            broker_service=MagicMock(), write_buffer=cmd.cycle_writes,
+        )
+        
+        with cmd.cycle_writes.batch():
+            cmd._run_multi_asset_cycle(shadow_only=True, dry_run=True)
+            self.assertIsNone(AssetPriceStatus.get_for_asset(self.asset))
+            # The heartbeat is written right away
+            self.assertEqual(WorkerStatus.get_current().setup_count, 0)
+        
+        self.assertEqual(AssetPriceStatus.get_for_asset(self.asset).bid_price, Decimal("75.40"))
+
+
+class FakeLeaseRedis:
+    """In-memory stand-in for the Redis commands used by WorkerCoordinator."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode("utf-8") if isinstance(value, str) else value
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in self.values if key.startswith(match.rstrip("*"))]
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self):
+        redis_client = self
+
+        class Pipeline:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def watch(self, key):
+                pass
+
+            def get(self, key):
+                return redis_client.get(key)
+
+            def multi(self):
+                self.commands = []
+
+            def set(self, key, value, ex=None):
+                self.commands.append(("set", key, value))
+
+            def delete(self, key):
+                self.commands.append(("delete", key, None))
+
+            def execute(self):
+                for command, key, value in self.commands:
+                    if command == "set":
+                        redis_client.set(key, value)
+                    else:
+                        redis_client.delete(key)
+
+        return Pipeline()
+
+
+class WorkerShardingTest(TestCase):
+    """Tests for --broker/--shard asset assignment and the leader lease."""
+
+    def setUp(self):
+        """Set up assets and coordinators on an in-memory Redis."""
+        from trading.models import TradingAsset
+
+        self.assets = [
+            TradingAsset.objects.create(
+                name=f"Asset {i}",
+                symbol=f"SYM{i}",
+                epic=f"EPIC.{i}",
+                category="crypto",
+                tick_size="0.01",
+                broker=TradingAsset.BrokerKind.MEXC if i % 2 else TradingAsset.BrokerKind.IG,
+                is_active=True,
+            )
+            for i in range(4)
+        ]
+        self.redis = FakeLeaseRedis()
+
+    def _coordinator(self, spec, broker=None):
+        from core.services.worker_coordination import WorkerShard, WorkerCoordinator
+
+        coordinator = WorkerCoordinator(
+            WorkerShard.parse(spec, broker=broker),
+            lease_seconds=60,
+            redis_client_factory=lambda: self.redis,
+        )
+        coordinator.worker_id = f"test:{spec}:{broker}"
+        return coordinator
+
+    def test_shards_partition_assets(self):
+        """Test that shards split the assets without overlap, optionally per broker."""
+        from trading.models import TradingAsset
+        from core.services.worker_coordination import WorkerShard
+
+        queryset = TradingAsset.objects.filter(is_active=True)
+        shard_ids = [
+            set(WorkerShard.parse(f"{i}/3").filter_assets(queryset).values_list('id', flat=True))
+            for i in range(3)
+        ]
+
+        self.assertEqual(set().union(*shard_ids), {asset.id for asset in self.assets})
+        self.assertEqual(sum(len(ids) for ids in shard_ids), len(self.assets))
+        mexc = WorkerShard.parse(None, broker="MEXC").filter_assets(queryset)
+        self.assertEqual({asset.broker for asset in mexc}, {"MEXC"})
+
+    def test_parse_rejects_invalid_shard(self):
+        """Test that malformed or out-of-range shards are rejected."""
+        from core.services.worker_coordination import WorkerShard
+
+        for spec in ("2/2", "x/4", "1", "0/0"):
+            with self.assertRaises(ValueError):
+                WorkerShard.parse(spec)
+
+    def test_single_leader_and_takeover_after_release(self):
+        """Test that only one worker holds the lease until it is released."""
+        first = self._coordinator("0/2")
+        second = self._coordinator("1/2")
+
+        self.assertTrue(first.renew_lease())
+        self.assertFalse(second.renew_lease())
+        self.assertTrue(first.renew_lease())
+
+        first.release()
+
+        self.assertFalse(first.is_leader)
+        self.assertTrue(second.renew_lease())
+
+    def test_only_leader_writes_worker_status_with_all_shards(self):
+        """Test that followers publish summaries and the leader merges them into WorkerStatus."""
+        from trading.models import WorkerStatus
+        from core.management.commands.run_fiona_worker import Command
+
+        leader, follower = Command(), Command()
+        for cmd, spec in ((leader, "0/2"), (follower, "1/2")):
+            cmd.worker_coordinator = self._coordinator(spec)
+            cmd.worker_shard = cmd.worker_coordinator.shard
+            cmd.worker_coordinator.renew_lease()
+        now = datetime(2024, 1, 15, 16, 30, 0, tzinfo=timezone.utc)
+
+        follower._update_worker_status(
+            now, SessionPhase.US_CORE_TRADING, "2 assets", 3, None, None, None, "Processed 2 assets"
+        )
+        self.assertIsNone(WorkerStatus.get_current())
+
+        leader._update_worker_status(
+            now, SessionPhase.US_CORE_TRADING, "2 assets", 1, None, None, None, "Processed 2 assets"
+        )
+        status = WorkerStatus.get_current()
+        self.assertEqual(status.setup_count, 4)
+        self.assertEqual(
+            [criterion['name'] for criterion in status.diagnostic_criteria],
+            ["Worker shard ALL:0/2", "Worker shard ALL:1/2"],
+        )
+
+    def test_shard_requires_multi_asset(self):
+        """Test that --shard without --multi-asset is rejected."""
+        from django.core.management.base import CommandError
+
+        with self.assertRaises(CommandError):
+            call_command('run_fiona_worker', '--once', '--shard', '0/2', stdout=StringIO())
+
+
 class WorkerProcessSetupTest(TestCase):
     """Tests for the _process_setup method to ensure signals are created instead of automatic trade execution."""
     
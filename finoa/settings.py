@@ -286,6 +286,31 @@ WEAVIATE_URL = os.environ.get('WEAVIATE_URL', '')
 WEAVIATE_API_KEY = os.environ.get('WEAVIATE_API_KEY', '')
 WEAVIATE_GRPC_PORT = int(os.environ.get('WEAVIATE_GRPC_PORT', '50051'))
 
+# Broker price quote cache
+# Seconds a broker price quote may be reused by later lookups (0 disables)
+BROKER_PRICE_CACHE_MAX_AGE_SECONDS = float(os.environ.get('BROKER_PRICE_CACHE_MAX_AGE_SECONDS', '2'))
+
+# Client-side request budgets per broker account (requests per minute).
+# Trading covers orders, prices and account calls; history covers candle downloads.
+BROKER_RATE_LIMITS = {
+    'IG': {
+        'TRADING_PER_MINUTE': int(os.environ.get('IG_TRADING_REQUESTS_PER_MINUTE', '30')),
+        'HISTORY_PER_MINUTE': int(os.environ.get('IG_HISTORY_REQUESTS_PER_MINUTE', '10')),
+    },
+    'MEXC': {
+        'TRADING_PER_MINUTE': int(os.environ.get('MEXC_TRADING_REQUESTS_PER_MINUTE', '600')),
+        'HISTORY_PER_MINUTE': int(os.environ.get('MEXC_HISTORY_REQUESTS_PER_MINUTE', '120')),
+    },
+}
+
+# MEXC Spot WebSocket endpoint for streamed klines (empty uses the client default)
+MEXC_WS_URL = os.environ.get('MEXC_WS_URL', '')
+
+# Shared IG session cache: processes reuse one login via Redis (tokens encrypted at rest).
+# BROKER_SESSION_CACHE_KEY is a Fernet key; empty derives one from SECRET_KEY.
+BROKER_SESSION_CACHE_ENABLED = os.environ.get('BROKER_SESSION_CACHE_ENABLED', 'false').lower() == 'true'
+BROKER_SESSION_CACHE_KEY = os.environ.get('BROKER_SESSION_CACHE_KEY', '')
+
 # =============================================================================
 # Logging Configuration
 # =============================================================================
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trading', '0024_add_date_field_and_unique_constraint_to_breakout_range'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workerstatus',
+            name='broker_metrics',
+            field=models.JSONField(blank=True, default=dict, help_text='Broker latency histograms and error counters of the worker (JSON)'),
+        ),
+    ]
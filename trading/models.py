@@ -1080,6 +1080,14 @@ class WorkerStatus(models.Model):
         help_text='Expected interval between worker loops in seconds'
     )
     
+    # Broker call latency/error metrics of the worker process (JSON)
+    # Format: {"IG": {"endpoints": {...}, "errors": {...}, "retries": 0, "token_refreshes": 0}}
+    broker_metrics = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Broker latency histograms and error counters of the worker (JSON)'
+    )
+    
     class Meta:
         verbose_name = 'Worker Status'
         verbose_name_plural = 'Worker Status'
@@ -1104,7 +1112,8 @@ class WorkerStatus(models.Model):
         spread=None,
         diagnostic_message='',
         diagnostic_criteria=None,
-        worker_interval=60
+        worker_interval=60,
+        broker_metrics=None,
     ):
         """
         Update or create the worker status record.
@@ -1114,6 +1123,7 @@ class WorkerStatus(models.Model):
         Args:
             diagnostic_criteria: List of dicts with keys 'name', 'passed', 'detail'.
                 Example: [{"name": "Asia Range valid", "passed": True, "detail": "75.5 - 74.5"}]
+            broker_metrics: Snapshot of BrokerMetrics of the worker process.
         """
         # Delete all existing records and create a new one
         # This ensures we only have one record (singleton)
@@ -1130,6 +1140,7 @@ class WorkerStatus(models.Model):
             diagnostic_message=diagnostic_message,
             diagnostic_criteria=diagnostic_criteria or [],
             worker_interval=worker_interval,
+            broker_metrics=broker_metrics or {},
         )
 
 
@@ -1220,15 +1231,25 @@ class AssetPriceStatus(models.Model):
         
         price_status, created = cls.objects.update_or_create(
             asset_id=asset_id,
-            defaults={
-                'bid_price': Decimal(str(bid_price)) if bid_price is not None else None,
-                'ask_price': Decimal(str(ask_price)) if ask_price is not None else None,
-                'spread': Decimal(str(spread)) if spread is not None else None,
-                'last_strategy_status': status_message or '',
-            }
+            defaults=cls.price_values(bid_price, ask_price, spread, status_message),
         )
         return price_status
     
+    @classmethod
+    def price_values(cls, bid_price=None, ask_price=None, spread=None, status_message: str | None = None) -> dict:
+        """
+        Get the field values of a price status update.
+        
+        Returns:
+            Dictionary of field name to value (as stored by update_price)
+        """
+        return {
+            'bid_price': Decimal(str(bid_price)) if bid_price is not None else None,
+            'ask_price': Decimal(str(ask_price)) if ask_price is not None else None,
+            'spread': Decimal(str(spread)) if spread is not None else None,
+            'last_strategy_status': status_message or '',
+        }
+    
     @classmethod
     def get_for_asset(cls, asset):
         """
@@ -1491,6 +1512,51 @@ class BreakoutRange(models.Model):
         Returns:
             BreakoutRange instance
         """
+        trading_date, values = cls.snapshot_values(
+            start_time=start_time,
+            end_time=end_time,
+            high=high,
+            low=low,
+            tick_size=tick_size,
+            candle_count=candle_count,
+            atr=atr,
+            valid_flags=valid_flags,
+            is_valid=is_valid,
+            reference_range=reference_range,
+        )
+        
+        # Use update_or_create to ensure only one record per asset/phase/date
+        breakout_range, created = cls.objects.update_or_create(
+            asset=asset,
+            phase=phase,
+            date=trading_date,
+            defaults=values,
+        )
+        
+        return breakout_range
+    
+    @classmethod
+    def snapshot_values(
+        cls,
+        start_time,
+        end_time,
+        high,
+        low,
+        tick_size=0.01,
+        candle_count=0,
+        atr=None,
+        valid_flags=None,
+        is_valid=True,
+        reference_range=None,
+    ):
+        """
+        Get the trading date and field values of a range snapshot.
+        
+        Arguments are the same as for save_range_snapshot().
+        
+        Returns:
+            Tuple of (trading date, dictionary of field name to value)
+        """
         from decimal import Decimal, ROUND_HALF_UP
         
         height_points = Decimal(str(high)) - Decimal(str(low))
@@ -1505,27 +1571,19 @@ class BreakoutRange(models.Model):
             start_time_utc = start_time.astimezone(dt_timezone.utc)
         trading_date = start_time_utc.date()
         
-        # Use update_or_create to ensure only one record per asset/phase/date
-        breakout_range, created = cls.objects.update_or_create(
-            asset=asset,
-            phase=phase,
-            date=trading_date,
-            defaults={
-                'start_time': start_time,
-                'end_time': end_time,
-                'high': Decimal(str(high)),
-                'low': Decimal(str(low)),
-                'height_ticks': height_ticks,
-                'height_points': height_points,
-                'candle_count': candle_count,
-                'atr': Decimal(str(atr)) if atr is not None else None,
-                'valid_flags': valid_flags or {},
-                'is_valid': is_valid,
-                'reference_range': reference_range,
-            }
-        )
-        
-        return breakout_range
+        return trading_date, {
+            'start_time': start_time,
+            'end_time': end_time,
+            'high': Decimal(str(high)),
+            'low': Decimal(str(low)),
+            'height_ticks': height_ticks,
+            'height_points': height_points,
+            'candle_count': candle_count,
+            'atr': Decimal(str(atr)) if atr is not None else None,
+            'valid_flags': valid_flags or {},
+            'is_valid': is_valid,
+            'reference_range': reference_range,
+        }
     
     def to_dict(self):
         """Convert to dictionary for API responses."""
@@ -2426,10 +2484,24 @@ class PriceSnapshot(models.Model):
         Returns:
             PriceSnapshot instance
         """
+        snapshot = cls.build_snapshot(asset, price_mid, price_bid, price_ask, timestamp)
+        snapshot.save()
+        return snapshot
+    
+    @classmethod
+    def build_snapshot(cls, asset, price_mid, price_bid=None, price_ask=None, timestamp=None):
+        """
+        Build an unsaved price snapshot (e.g. for bulk_create).
+        
+        Arguments are the same as for record_snapshot().
+        
+        Returns:
+            Unsaved PriceSnapshot instance
+        """
         if timestamp is None:
             timestamp = timezone.now()
         
-        return cls.objects.create(
+        return cls(
             asset=asset,
             timestamp=timestamp,
             price_mid=Decimal(str(price_mid)),
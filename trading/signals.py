@@ -0,0 +1,31 @@
+"""
+Signal handlers of the trading app.
+
+The Fiona worker caches the configuration of each asset and reloads it
+when the asset's updated_at changes. Changes of the configuration models
+of an asset therefore touch updated_at of the asset as well.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import (
+    AssetBreakoutConfig,
+    AssetEventConfig,
+    AssetSessionPhaseConfig,
+    TradingAsset,
+)
+
+
+def touch_asset(asset_id) -> None:
+    """Set updated_at of a TradingAsset to now (without other side effects)."""
+    TradingAsset.objects.filter(pk=asset_id).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=AssetBreakoutConfig)
+@receiver([post_save, post_delete], sender=AssetEventConfig)
+@receiver([post_save, post_delete], sender=AssetSessionPhaseConfig)
+def asset_config_changed(sender, instance, **kwargs):
+    """Mark the asset of a saved or deleted configuration as changed."""
+    if instance.asset_id is not None:
+        touch_asset(instance.asset_id)
@@ -616,6 +616,57 @@ class APISignalsSinceTest(TestCase):
         self.assertEqual(data['data']['price_info']['spread'], '0.0500')
 
 
+class BrokerMetricsAPITest(TestCase):
+    """Tests for the broker metrics endpoint."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+
+    def tearDown(self):
+        from core.services.broker import get_broker_metrics
+        get_broker_metrics().reset()
+
+    def test_returns_worker_and_web_metrics(self):
+        """Test that worker metrics come from WorkerStatus and web metrics from this process."""
+        from core.services.broker import get_broker_metrics
+
+        worker_metrics = {
+            'IG': {
+                'endpoints': {'/prices/{id}': {'count': 3, 'errors': 1, 'p95_ms': 250.0}},
+                'errors': {'error.public-api.exceeded-api-key-allowance': 1},
+                'retries': 1,
+                'token_refreshes': 2,
+            },
+        }
+        WorkerStatus.update_status(
+            last_run_at=timezone.now(),
+            phase='LONDON_CORE',
+            epic='CC.D.CL.UNC.IP',
+            broker_metrics=worker_metrics,
+        )
+        get_broker_metrics().observe('MEXC', '/api/v3/klines', 0.04)
+
+        response = self.client.get('/fiona/api/broker/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['worker']['brokers'], worker_metrics)
+        self.assertEqual(data['web']['brokers']['MEXC']['endpoints']['/api/v3/klines']['count'], 1)
+
+        status = self.client.get('/fiona/api/worker/status/').json()
+        self.assertEqual(
+            status['data']['broker_metrics'],
+            ['IG: 3 calls, p95 250ms, 1 errors, 1 retries, 2 token refreshes'],
+        )
+
+    def test_requires_login(self):
+        """Test that the metrics endpoint requires login."""
+        self.client.logout()
+        response = self.client.get('/fiona/api/broker/metrics/')
+        self.assertEqual(response.status_code, 302)
+
+
 class SignalDashboardWorkerStatusTest(TestCase):
     """Tests for Worker Status in Signal Dashboard."""
     
@@ -4459,9 +4510,452 @@ class RedisCandleStoreTest(TestCase):
         self.assertEqual(self.store.get_candle_count(self.asset_id, self.timeframe), 1)
         
         self.store.clear(self.asset_id, self.timeframe)
-        
+
         self.assertEqual(self.store.get_candle_count(self.asset_id, self.timeframe), 0)
 
+    def test_fallback_replaces_equal_timestamps(self):
+        """Test that re-appending a timestamp replaces the stored candle."""
+        from core.services.market_data import Candle
+
+        candles = [
+            Candle(timestamp=1700000000 + i * 60, open=75.0, high=75.5, low=74.5, close=75.0)
+            for i in range(5)
+        ]
+        self.store.append_candles(self.asset_id, self.timeframe, candles)
+        self.store.append_candle(
+            self.asset_id, self.timeframe,
+            Candle(timestamp=1700000000 + 4 * 60, open=75.0, high=76.0, low=74.5, close=75.9),
+        )
+        self.store.append_candle(
+            self.asset_id, self.timeframe,
+            Candle(timestamp=1700000000 + 60, open=75.0, high=75.5, low=74.0, close=74.1),
+        )
+
+        loaded = self.store.load_candles(self.asset_id, self.timeframe)
+
+        self.assertEqual([c.timestamp for c in loaded], [c.timestamp for c in candles])
+        self.assertEqual(loaded[-1].close, 75.9)
+        self.assertEqual(loaded[1].close, 74.1)
+
+    def test_fallback_evicts_oldest_candles(self):
+        """Test that the fallback keeps the newest max_candles_per_stream candles."""
+        from core.services.market_data import Candle, RedisCandleStore, RedisConfig
+
+        store = RedisCandleStore(config=RedisConfig(max_candles_per_stream=3))
+        with patch.object(store, '_get_redis_client', return_value=None):
+            store.append_candles(self.asset_id, self.timeframe, [
+                Candle(timestamp=1700000000 + i * 60, open=75.0, high=75.5, low=74.5, close=75.0)
+                for i in reversed(range(5))
+            ])
+
+            loaded = store.load_candles(self.asset_id, self.timeframe)
+            latest = store.load_candles(self.asset_id, self.timeframe, count=2)
+
+        self.assertEqual([c.timestamp for c in loaded], [1700000000 + i * 60 for i in (2, 3, 4)])
+        self.assertEqual([c.timestamp for c in latest], [1700000000 + i * 60 for i in (3, 4)])
+
+
+class RedisCandleStoreEncodingTest(TestCase):
+    """Tests for binary/JSON sorted-set member encoding."""
+
+    def setUp(self):
+        """Set up test data."""
+        from core.services.market_data import Candle, RedisCandleStore, RedisConfig
+
+        self.store = RedisCandleStore(config=RedisConfig())
+        self.candles = [
+            Candle(timestamp=1700000000, open=75.0, high=75.5, low=74.5, close=75.25,
+                   volume=1000.0, trade_count=12),
+            Candle(timestamp=1700000060, open=75.25, high=75.75, low=75.0, close=75.5),
+            Candle(timestamp=1700000120, open=75.5, high=75.6, low=75.1, close=75.2, complete=False),
+        ]
+
+    def test_binary_member_round_trip(self):
+        """Test that binary members decode to the original candles."""
+        from core.services.market_data.redis_candle_store import BINARY_V1_STRUCT
+
+        for candle in self.candles:
+            member = self.store._candle_to_member_key(candle)
+            self.assertIsInstance(member, bytes)
+            self.assertEqual(len(member), BINARY_V1_STRUCT.size)
+
+            decoded = self.store._member_key_to_candle(member)
+            self.assertEqual(decoded.timestamp, candle.timestamp)
+            self.assertEqual(decoded.close, candle.close)
+            self.assertEqual(decoded.volume, candle.volume)
+            self.assertEqual(decoded.trade_count, candle.trade_count)
+            self.assertEqual(decoded.complete, candle.complete)
+
+    def test_binary_members_are_smaller_than_json(self):
+        """Test that the binary encoding is more compact than JSON."""
+        candle = self.candles[0]
+        binary = self.store._candle_to_member_key(candle, 'binary')
+        legacy = self.store._candle_to_member_key(candle, 'json')
+
+        self.assertLess(len(binary), len(legacy.encode('utf-8')))
+
+    def test_mixed_members_decode_in_timestamp_order(self):
+        """Test that legacy JSON members are readable alongside binary ones."""
+        members = [
+            self.store._candle_to_member_key(self.candles[0], 'json').encode('utf-8'),
+            self.store._candle_to_member_key(self.candles[1], 'binary'),
+            self.store._candle_to_member_key(self.candles[2], 'json'),
+        ]
+
+        decoded = self.store._members_to_candles(members)
+
+        self.assertEqual([c.timestamp for c in decoded], [c.timestamp for c in self.candles])
+        self.assertEqual(decoded[0].trade_count, 12)
+        self.assertIsNone(decoded[1].volume)
+        self.assertFalse(decoded[2].complete)
+
+    def test_load_candles_decodes_binary_members(self):
+        """Test that load_candles reads binary members from Redis."""
+        redis_client = MagicMock()
+        redis_client.zrange.return_value = [
+            self.store._candle_to_member_key(c) for c in self.candles
+        ]
+
+        with patch.object(self.store, '_get_redis_client', return_value=redis_client):
+            loaded = self.store.load_candles('TEST_OIL', '1m')
+
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded[1].close, 75.5)
+
+    def test_migrate_member_encoding(self):
+        """Test that only legacy JSON members are rewritten."""
+        legacy = self.store._candle_to_member_key(self.candles[0], 'json').encode('utf-8')
+        binary = self.store._candle_to_member_key(self.candles[1], 'binary')
+
+        redis_client = MagicMock()
+        pipe = redis_client.pipeline.return_value.__enter__.return_value
+        pipe.zrange.return_value = [(legacy, 1700000000.0), (binary, 1700000060.0)]
+
+        with patch.object(self.store, '_get_redis_client', return_value=redis_client):
+            converted = self.store.migrate_member_encoding('market:candles:TEST_OIL:1m')
+
+        self.assertEqual(converted, 1)
+        pipe.watch.assert_called_once_with('market:candles:TEST_OIL:1m')
+        pipe.zrem.assert_called_once_with('market:candles:TEST_OIL:1m', legacy)
+        pipe.zadd.assert_called_once_with(
+            'market:candles:TEST_OIL:1m',
+            {self.store._candle_to_member_key(self.candles[0], 'binary'): 1700000000.0},
+        )
+        pipe.execute.assert_called_once()
+
+    def test_migrate_member_encoding_retries_on_concurrent_write(self):
+        """Test that the migration re-reads the key after a concurrent append."""
+        import redis
+
+        legacy = self.store._candle_to_member_key(self.candles[0], 'json').encode('utf-8')
+        appended = self.store._candle_to_member_key(self.candles[1], 'json').encode('utf-8')
+
+        redis_client = MagicMock()
+        pipe = redis_client.pipeline.return_value.__enter__.return_value
+        pipe.zrange.side_effect = [
+            [(legacy, 1700000000.0)],
+            [(legacy, 1700000000.0), (appended, 1700000060.0)],
+        ]
+        pipe.execute.side_effect = [redis.WatchError(), None]
+
+        with patch.object(self.store, '_get_redis_client', return_value=redis_client):
+            converted = self.store.migrate_member_encoding('market:candles:TEST_OIL:1m')
+
+        self.assertEqual(converted, 2)
+        self.assertEqual(pipe.execute.call_count, 2)
+        pipe.zrem.assert_called_with('market:candles:TEST_OIL:1m', appended)
+
+    def test_migrate_command_requires_redis(self):
+        """Test that the migration command stops when Redis is unavailable."""
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        self.store._get_redis_client = lambda: None
+        with patch('core.management.commands.migrate_candle_encoding.get_candle_store', return_value=self.store):
+            with self.assertRaises(CommandError):
+                call_command('migrate_candle_encoding')
+
+
+class RedisCandleStoreAppendTest(TestCase):
+    """Tests for the single round-trip Redis append path."""
+
+    def setUp(self):
+        """Set up test data."""
+        from core.services.market_data import RedisCandleStore, RedisConfig
+
+        self.store = RedisCandleStore(config=RedisConfig(ttl_hours=2, max_candles_per_stream=100))
+        self.redis_client = MagicMock()
+        self.script = self.redis_client.register_script.return_value
+        self.script.registered_client = self.redis_client
+        self.script.return_value = 3
+
+    def test_append_candles_uses_one_script_call(self):
+        """Test that a batch append is a single EVALSHA regardless of size."""
+        from core.services.market_data import Candle
+        from core.services.market_data.redis_candle_store import APPEND_CANDLES_LUA
+
+        candles = [
+            Candle(timestamp=1700000000 + i * 60, open=75.0, high=75.5, low=74.5, close=75.2)
+            for i in range(3)
+        ]
+
+        with patch.object(self.store, '_get_redis_client', return_value=self.redis_client):
+            written = self.store.append_candles('TEST_OIL', '1m', candles)
+
+        self.assertEqual(written, 3)
+        self.redis_client.register_script.assert_called_once_with(APPEND_CANDLES_LUA)
+        self.script.assert_called_once()
+
+        kwargs = self.script.call_args.kwargs
+        self.assertEqual(kwargs['keys'], ['market:candles:TEST_OIL:1m'])
+        args = kwargs['args']
+        self.assertEqual(args[:2], [7200, 100])
+        self.assertEqual(args[2::2], [c.timestamp for c in candles])
+        self.assertEqual(args[3::2], [self.store._candle_to_member_key(c) for c in candles])
+
+        # No per-command round trips outside the script
+        self.redis_client.zremrangebyscore.assert_not_called()
+        self.redis_client.zadd.assert_not_called()
+        self.redis_client.ttl.assert_not_called()
+
+    def test_append_candle_reuses_registered_script(self):
+        """Test that the script is registered once per client."""
+        from core.services.market_data import Candle
+
+        candle = Candle(timestamp=1700000000, open=75.0, high=75.5, low=74.5, close=75.2)
+
+        with patch.object(self.store, '_get_redis_client', return_value=self.redis_client):
+            self.assertTrue(self.store.append_candle('TEST_OIL', '1m', candle))
+            self.assertTrue(self.store.append_candle('TEST_OIL', '1m', candle))
+
+        self.redis_client.register_script.assert_called_once()
+        self.assertEqual(self.script.call_count, 2)
+
+    def test_append_falls_back_when_script_fails(self):
+        """Test that a failing Redis write falls back to memory."""
+        from core.services.market_data import Candle
+
+        self.script.side_effect = Exception('NOSCRIPT')
+        candle = Candle(timestamp=1700000000, open=75.0, high=75.5, low=74.5, close=75.2)
+
+        with patch.object(self.store, '_get_redis_client', return_value=self.redis_client):
+            self.assertTrue(self.store.append_candle('TEST_OIL', '1m', candle))
+
+        self.assertEqual(len(self.store._fallback_store['market:candles:TEST_OIL:1m']), 1)
+
+    def test_append_history_is_not_trimmed_or_expired(self):
+        """Test that history is written in batches to its own key without TTL or trimming."""
+        from core.services.market_data import Candle
+        from core.services.market_data import redis_candle_store
+
+        candles = [
+            Candle(timestamp=1700000000 + i * 60, open=75.0, high=75.5, low=74.5, close=75.2)
+            for i in range(5)
+        ]
+
+        with patch.object(redis_candle_store, 'HISTORY_WRITE_BATCH_SIZE', 2), \
+                patch.object(self.store, '_get_redis_client', return_value=self.redis_client):
+            self.script.side_effect = lambda keys, args: (len(args) - 2) // 2
+            written = self.store.append_history('TEST_OIL', '1m', candles)
+
+        self.assertEqual(written, 5)
+        self.assertEqual(self.script.call_count, 3)
+        for call in self.script.call_args_list:
+            self.assertEqual(call.kwargs['keys'], ['market:candles:history:TEST_OIL:1m'])
+            self.assertEqual(call.kwargs['args'][:2], [0, 0])
+        self.redis_client.publish.assert_not_called()
+
+    def test_history_fallback_keeps_all_candles(self):
+        """Test that the in-memory history fallback is unbounded and deduplicated."""
+        from datetime import datetime, timezone
+        from core.services.market_data import Candle
+
+        candles = [
+            Candle(timestamp=1700000000 + i * 60, open=75.0, high=75.5, low=74.5, close=75.2)
+            for i in range(150)
+        ]
+        candles.append(Candle(timestamp=1700000000, open=1.0, high=1.0, low=1.0, close=1.0))
+
+        with patch.object(self.store, '_get_redis_client', return_value=None):
+            self.store.append_history('TEST_OIL', '1m', candles)
+            self.assertEqual(self.store.get_history_count('TEST_OIL', '1m'), 150)
+            loaded = self.store.get_history_range(
+                'TEST_OIL', '1m',
+                datetime.fromtimestamp(1700000000, tz=timezone.utc),
+                datetime.fromtimestamp(1700000120, tz=timezone.utc),
+            )
+
+        self.assertEqual([c.timestamp for c in loaded], [1700000000, 1700000060, 1700000120])
+        self.assertEqual(loaded[0].close, 1.0)
+
+
+class RedisCandleStoreHealthTest(TestCase):
+    """Tests for connection pooling, health caching and reconnect backoff."""
+
+    def setUp(self):
+        """Set up test data."""
+        from core.services.market_data import RedisCandleStore, RedisConfig
+        from core.services.market_data.redis_candle_store import reset_connection_pools
+
+        reset_connection_pools()
+        self.store = RedisCandleStore(config=RedisConfig(health_check_interval=30, reconnect_backoff_max=8))
+        self.clock = [1000.0]
+
+        monotonic_patcher = patch(
+            'core.services.market_data.redis_candle_store.time.monotonic',
+            side_effect=lambda: self.clock[0],
+        )
+        monotonic_patcher.start()
+        self.addCleanup(monotonic_patcher.stop)
+
+    def tearDown(self):
+        """Clean up."""
+        from core.services.market_data.redis_candle_store import reset_connection_pools
+        reset_connection_pools()
+
+    def test_clients_share_connection_pool(self):
+        """Test that stores with the same config share one pool."""
+        from core.services.market_data import RedisConfig
+        from core.services.market_data.redis_candle_store import get_connection_pool
+
+        pool = get_connection_pool(RedisConfig())
+        self.assertIs(pool, get_connection_pool(RedisConfig()))
+        self.assertFalse(pool.connection_kwargs.get('decode_responses', False))
+
+    @patch('redis.Redis')
+    def test_failed_connect_backs_off_exponentially(self, MockRedis):
+        """Test that connect attempts are skipped until the backoff expires."""
+        MockRedis.return_value.ping.side_effect = ConnectionError('refused')
+
+        self.assertIsNone(self.store._get_redis_client())
+        self.assertIsNone(self.store._get_redis_client())
+        self.assertEqual(MockRedis.call_count, 1)
+
+        # After 1s the next attempt is made, then the delay doubles
+        self.clock[0] += 1.0
+        self.assertIsNone(self.store._get_redis_client())
+        self.assertEqual(MockRedis.call_count, 2)
+        self.assertEqual(self.store._reconnect_backoff, 2.0)
+
+        # Backoff is capped at reconnect_backoff_max
+        for _ in range(5):
+            self.clock[0] += self.store._reconnect_backoff
+            self.store._get_redis_client()
+        self.assertEqual(self.store._reconnect_backoff, 8.0)
+
+    @patch('redis.Redis')
+    def test_is_connected_caches_ping(self, MockRedis):
+        """Test that is_connected pings at most once per health interval."""
+        client = MockRedis.return_value
+
+        for _ in range(10):
+            self.assertTrue(self.store.is_connected)
+        self.assertEqual(client.ping.call_count, 1)
+
+        self.clock[0] += 31
+        self.assertTrue(self.store.is_connected)
+        self.assertEqual(client.ping.call_count, 2)
+
+    @patch('redis.Redis')
+    def test_connection_error_during_operation_starts_backoff(self, MockRedis):
+        """Test that a dropped connection switches to the fallback store."""
+        from redis.exceptions import ConnectionError as RedisConnectionError
+        from core.services.market_data import Candle
+
+        client = MockRedis.return_value
+        client.zcard.side_effect = RedisConnectionError('connection lost')
+
+        self.assertEqual(self.store.get_candle_count('TEST_OIL', '1m'), 0)
+        self.assertIsNone(self.store._redis_client)
+
+        # Subsequent calls use the fallback without reconnecting
+        candle = Candle(timestamp=1700000000, open=75.0, high=75.5, low=74.5, close=75.2)
+        self.assertTrue(self.store.append_candle('TEST_OIL', '1m', candle))
+        self.assertEqual(MockRedis.call_count, 1)
+        self.assertEqual(self.store.get_candle_count('TEST_OIL', '1m'), 1)
+
+
+class CandlePubSubTest(TestCase):
+    """Tests for cross-process fan-out of completed candles."""
+
+    def _candle(self, timestamp, complete=True):
+        from core.services.market_data import Candle
+        return Candle(timestamp=timestamp, open=75.0, high=75.5, low=74.5, close=75.2, complete=complete)
+
+    def test_update_round_trip(self):
+        """Test that updates encode and decode losslessly."""
+        from core.services.market_data import encode_candle_update, decode_candle_update
+
+        candles = [self._candle(1700000000), self._candle(1700000060)]
+        payload = encode_candle_update('TEST_OIL', '1m', candles, origin='host:1')
+
+        origin, asset_id, timeframe, decoded = decode_candle_update(payload)
+
+        self.assertEqual((origin, asset_id, timeframe), ('host:1', 'TEST_OIL', '1m'))
+        self.assertEqual(decoded, candles)
+
+    def test_append_publishes_only_completed_candles(self):
+        """Test that writes publish completed candles on the updates channel."""
+        from core.services.market_data import RedisCandleStore, RedisConfig, decode_candle_update
+
+        store = RedisCandleStore(config=RedisConfig())
+        redis_client = MagicMock()
+        redis_client.register_script.return_value.registered_client = redis_client
+        redis_client.register_script.return_value.return_value = 2
+
+        candles = [self._candle(1700000000), self._candle(1700000060, complete=False)]
+        with patch.object(store, '_get_redis_client', return_value=redis_client):
+            store.append_candles('TEST_OIL', '1m', candles)
+
+        redis_client.publish.assert_called_once()
+        channel, payload = redis_client.publish.call_args[0]
+        self.assertEqual(channel, 'market:candles:updates')
+        self.assertEqual(decode_candle_update(payload)[3], candles[:1])
+
+    def test_append_does_not_publish_when_disabled(self):
+        """Test that publishing can be switched off."""
+        from core.services.market_data import RedisCandleStore, RedisConfig
+
+        store = RedisCandleStore(config=RedisConfig(pubsub_enabled=False))
+        redis_client = MagicMock()
+        redis_client.register_script.return_value.registered_client = redis_client
+
+        with patch.object(store, '_get_redis_client', return_value=redis_client):
+            store.append_candle('TEST_OIL', '1m', self._candle(1700000000))
+
+        redis_client.publish.assert_not_called()
+
+    def test_subscriber_skips_own_updates(self):
+        """Test that a process ignores updates it published itself."""
+        from core.services.market_data import CandleUpdateSubscriber, RedisConfig, encode_candle_update
+
+        handler = MagicMock()
+        subscriber = CandleUpdateSubscriber(handler, RedisConfig())
+        candles = [self._candle(1700000000)]
+
+        self.assertFalse(subscriber.dispatch(encode_candle_update('TEST_OIL', '1m', candles)))
+        self.assertTrue(subscriber.dispatch(
+            encode_candle_update('TEST_OIL', '1m', candles, origin='other-host:1')
+        ))
+
+        handler.assert_called_once_with('TEST_OIL', '1m', candles)
+
+    def test_manager_applies_published_candles_without_persisting(self):
+        """Test that published candles are appended to existing local streams."""
+        from core.services.market_data import MarketDataStreamManager
+
+        manager = MarketDataStreamManager()
+        stream = manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+
+        with patch.object(manager._store, 'append_candles') as mock_persist:
+            manager._apply_published_candles('TEST_OIL', '1m', [self._candle(1700000000)])
+            manager._apply_published_candles('OTHER', '1m', [self._candle(1700000000)])
+
+        mock_persist.assert_not_called()
+        self.assertEqual(stream.get_count(), 1)
+        self.assertEqual(stream.status, 'LIVE')
+        self.assertIsNone(manager.get_stream('OTHER', '1m'))
+
 
 class CandleStreamTest(TestCase):
     """Tests for the CandleStream class."""
@@ -4535,6 +5029,315 @@ class CandleStreamTest(TestCase):
         self.assertEqual(status.candle_count, 0)
 
 
+class ColumnarCandleBufferTest(TestCase):
+    """Tests for the NumPy-backed columnar candle buffer."""
+
+    def _candle(self, ts, close=75.0, **kwargs):
+        from core.services.market_data import Candle
+        return Candle(timestamp=ts, open=75.0, high=76.0, low=74.0, close=close, **kwargs)
+
+    def test_ring_wraparound_keeps_latest_in_order(self):
+        """Test that the buffer evicts the oldest candles and stays sorted."""
+        from core.services.market_data import ColumnarCandleBuffer
+
+        buffer = ColumnarCandleBuffer(capacity=5)
+        for i in range(12):
+            buffer.append(self._candle(1700000000 + i * 60, close=float(i)))
+
+        self.assertEqual(len(buffer), 5)
+        arrays = buffer.get_recent_arrays()
+        self.assertEqual(arrays.close.tolist(), [7.0, 8.0, 9.0, 10.0, 11.0])
+        self.assertEqual(
+            arrays.timestamp.tolist(),
+            [1700000000 + i * 60 for i in range(7, 12)],
+        )
+
+    def test_same_timestamp_replaces_last(self):
+        """Test that a candle with the last timestamp replaces it."""
+        from core.services.market_data import ColumnarCandleBuffer
+
+        buffer = ColumnarCandleBuffer(capacity=10)
+        buffer.append(self._candle(1700000000, close=1.0, complete=False))
+        buffer.append(self._candle(1700000000, close=2.0))
+
+        candles = buffer.get_recent()
+        self.assertEqual(len(candles), 1)
+        self.assertEqual(candles[0].close, 2.0)
+        self.assertTrue(candles[0].complete)
+
+    def test_out_of_order_candles_are_merged(self):
+        """Test that overlapping backfills replace or insert by timestamp."""
+        from core.services.market_data import ColumnarCandleBuffer
+
+        buffer = ColumnarCandleBuffer(capacity=10)
+        for i in (0, 1, 3, 4):
+            buffer.append(self._candle(1700000000 + i * 60, close=float(i)))
+
+        # Replace an existing older candle and fill the gap at minute 2
+        buffer.extend([
+            self._candle(1700000000 + 1 * 60, close=10.0),
+            self._candle(1700000000 + 2 * 60, close=20.0),
+        ])
+
+        arrays = buffer.get_recent_arrays()
+        self.assertEqual(
+            arrays.timestamp.tolist(),
+            [1700000000 + i * 60 for i in range(5)],
+        )
+        self.assertEqual(arrays.close.tolist(), [0.0, 10.0, 20.0, 3.0, 4.0])
+
+        # Appending after an insert continues at the head
+        buffer.append(self._candle(1700000000 + 5 * 60, close=5.0))
+        self.assertEqual(buffer.get_recent(count=1)[0].close, 5.0)
+
+    def test_recent_by_timestamp_and_count(self):
+        """Test binary-searched time windows combined with count limits."""
+        from core.services.market_data import ColumnarCandleBuffer
+
+        buffer = ColumnarCandleBuffer(capacity=100)
+        buffer.extend([self._candle(1700000000 + i * 60) for i in range(30)])
+
+        arrays = buffer.get_recent_arrays(min_timestamp=1700000000 + 20 * 60)
+        self.assertEqual(len(arrays), 10)
+        self.assertEqual(arrays.timestamp[0], 1700000000 + 20 * 60)
+
+        arrays = buffer.get_recent_arrays(min_timestamp=1700000000 + 20 * 60, count=3)
+        self.assertEqual(arrays.timestamp.tolist(), [1700000000 + i * 60 for i in range(27, 30)])
+
+    def test_recent_arrays_are_views(self):
+        """Test that recent arrays share memory with the buffer."""
+        import numpy as np
+        from core.services.market_data import ColumnarCandleBuffer
+
+        buffer = ColumnarCandleBuffer(capacity=10)
+        buffer.extend([self._candle(1700000000 + i * 60) for i in range(10)])
+
+        arrays = buffer.get_recent_arrays(count=5)
+        self.assertTrue(np.shares_memory(arrays.close, buffer._close))
+
+    def test_optional_fields_round_trip(self):
+        """Test that missing volume/trade_count survive the columnar encoding."""
+        from core.services.market_data import ColumnarCandleBuffer
+
+        buffer = ColumnarCandleBuffer(capacity=10)
+        buffer.append(self._candle(1700000000))
+        buffer.append(self._candle(1700000060, volume=12.5, trade_count=3, complete=False))
+
+        first, second = buffer.get_recent()
+        self.assertIsNone(first.volume)
+        self.assertIsNone(first.trade_count)
+        self.assertEqual(second.volume, 12.5)
+        self.assertEqual(second.trade_count, 3)
+
+        # Latest complete candle skips the forming one
+        self.assertEqual(buffer.get_latest_complete().timestamp, 1700000000)
+
+    def test_stream_columnar_mode(self):
+        """Test CandleStream using the columnar buffer."""
+        from datetime import datetime, timezone as dt_timezone
+        from core.services.market_data import CandleStream, BUFFER_MODE_COLUMNAR, reset_candle_store
+
+        reset_candle_store()
+        stream = CandleStream('TEST_OIL', '1m', broker='IG', max_candles=100,
+                              buffer_mode=BUFFER_MODE_COLUMNAR)
+
+        now = int(datetime.now(dt_timezone.utc).timestamp())
+        # Offset by 30s so the 1h boundary never falls on a candle
+        stream.append_many([self._candle(now - (120 - i) * 60 + 30) for i in range(120)], persist=False)
+
+        self.assertEqual(stream.get_count(), 100)
+        self.assertEqual(len(stream.get_recent(hours=1)), 60)
+        self.assertEqual(len(stream.get_recent_arrays(hours=1)), 60)
+        self.assertEqual(stream.get_latest().timestamp, now - 30)
+        reset_candle_store()
+
+    def test_stream_arrays_are_detached_from_buffer(self):
+        """Test that stream arrays do not change with later appends."""
+        from core.services.market_data import CandleStream, BUFFER_MODE_COLUMNAR, reset_candle_store
+
+        reset_candle_store()
+        stream = CandleStream('TEST_OIL', '1m', broker='IG', max_candles=3,
+                              buffer_mode=BUFFER_MODE_COLUMNAR)
+        stream.append_many([self._candle(1700000000 + i * 60) for i in range(3)], persist=False)
+
+        arrays = stream.get_recent_arrays()
+        stream.append_many([self._candle(1700000000 + i * 60) for i in range(3, 6)], persist=False)
+
+        self.assertEqual(arrays.timestamp.tolist(), [1700000000 + i * 60 for i in range(3)])
+        arrays.close[0] = 0.0
+        self.assertNotEqual(stream.get_recent()[0].close, 0.0)
+        reset_candle_store()
+
+
+class TimeframeAggregationTest(TestCase):
+    """Tests for deriving higher timeframes from the 1m stream."""
+
+    # 2023-11-14 22:00:00 UTC, aligned to 1h
+    BASE_TS = 1700000000 - 1700000000 % 3600
+
+    def setUp(self):
+        """Set up test data."""
+        from core.services.market_data import MarketDataStreamManager, RedisCandleStore
+
+        MarketDataStreamManager.reset_instance()
+        store = RedisCandleStore()
+        store._get_redis_client = lambda: None
+        self.manager = MarketDataStreamManager(store=store)
+
+    def tearDown(self):
+        """Clean up."""
+        from core.services.market_data import MarketDataStreamManager
+        MarketDataStreamManager.reset_instance()
+
+    def _minute(self, i, price=None, complete=True):
+        from core.services.market_data import Candle
+        price = 100.0 + i if price is None else price
+        return Candle(
+            timestamp=self.BASE_TS + i * 60,
+            open=price,
+            high=price + 0.5,
+            low=price - 0.5,
+            close=price + 0.25,
+            volume=10.0,
+            complete=complete,
+        )
+
+    def test_aggregate_candles_folds_ohlcv(self):
+        """Test bulk aggregation of 1m candles into 5m buckets."""
+        from core.services.market_data import aggregate_candles
+
+        candles = aggregate_candles([self._minute(i) for i in range(12)], '5m')
+
+        self.assertEqual(len(candles), 3)
+        first = candles[0]
+        self.assertEqual(first.timestamp, self.BASE_TS)
+        self.assertEqual(first.open, 100.0)
+        self.assertEqual(first.high, 104.5)
+        self.assertEqual(first.low, 99.5)
+        self.assertEqual(first.close, 104.25)
+        self.assertEqual(first.volume, 50.0)
+        self.assertTrue(first.complete)
+        # Last bucket has only 2 of 5 minutes
+        self.assertFalse(candles[-1].complete)
+
+    def test_derived_stream_follows_base_stream(self):
+        """Test that appending 1m candles updates the derived 5m stream."""
+        base = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        base.append_many([self._minute(i) for i in range(3)], persist=False)
+
+        derived = self.manager.get_or_create_stream('TEST_OIL', '5m', 'IG')
+        self.assertFalse(derived.persistent)
+        self.assertEqual(derived.get_count(), 1)
+        self.assertFalse(derived.get_recent()[-1].complete)
+
+        # Finish the bucket and start the next one
+        base.append(self._minute(3), persist=False)
+        base.append(self._minute(4), persist=False)
+        self.assertTrue(derived.get_recent()[-1].complete)
+
+        base.append(self._minute(5, complete=False), persist=False)
+        candles = derived.get_recent()
+        self.assertEqual(len(candles), 2)
+        self.assertEqual(candles[0].close, 104.25)
+        self.assertFalse(candles[1].complete)
+
+        # Replacing a 1m candle re-folds its bucket
+        base.append(self._minute(5, price=200.0), persist=False)
+        self.assertEqual(derived.get_recent()[-1].high, 200.5)
+
+    def test_derived_stream_handles_late_base_candles(self):
+        """Test that an out-of-order 1m candle updates its (older) bucket."""
+        base = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        derived = self.manager.get_or_create_stream('TEST_OIL', '5m', 'IG')
+
+        base.append_many([self._minute(i) for i in (0, 1, 3, 4, 5, 6)], persist=False)
+        self.assertEqual(derived.get_recent()[0].high, 104.5)
+
+        base.append(self._minute(2, price=300.0), persist=False)
+        self.assertEqual(derived.get_recent()[0].high, 300.5)
+        self.assertEqual(derived.get_count(), 2)
+
+    def test_get_candles_derived_timeframe_fetches_base_only(self):
+        """Test that a 5m chart refreshes the 1m stream, not a 5m fetch."""
+        asset = MagicMock(symbol='TEST_OIL', broker='IG', category='commodity')
+
+        with patch.object(self.manager, '_refresh_stream') as mock_refresh:
+            response = self.manager.get_candles(asset, timeframe='5m', window_hours=6)
+
+        self.assertEqual(response.timeframe, '5m')
+        mock_refresh.assert_called_once()
+        self.assertEqual(mock_refresh.call_args[0][2], '1m')
+
+    def test_get_cached_candles_hourly(self):
+        """Test real hourly bars from the 1m stream without broker calls."""
+        base = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        base.append_many([self._minute(i, price=100.0) for i in range(180)], persist=False)
+
+        candles = self.manager.get_cached_candles('TEST_OIL', '1h')
+
+        self.assertEqual(len(candles), 3)
+        self.assertTrue(all(c.complete for c in candles))
+        self.assertEqual(candles[1].timestamp, self.BASE_TS + 3600)
+
+    def test_partial_leading_bucket_is_incomplete(self):
+        """Test that a bucket cut short by the start of the 1m data is not complete."""
+        from core.services.market_data import aggregate_candles
+
+        minutes = [self._minute(i) for i in range(2, 10)]
+        candles = aggregate_candles(minutes, '5m')
+        self.assertFalse(candles[0].complete)
+        self.assertTrue(candles[1].complete)
+
+        base = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        derived = self.manager.get_or_create_stream('TEST_OIL', '5m', 'IG')
+        base.append_many(minutes, persist=False)
+        self.assertFalse(derived.get_recent()[0].complete)
+        self.assertTrue(derived.get_recent()[1].complete)
+
+    def test_reseed_keeps_older_derived_bars(self):
+        """Test that reseeding merges into the derived stream instead of clearing it."""
+        from core.services.market_data import Candle
+
+        base = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        derived = self.manager.get_or_create_stream('TEST_OIL', '5m', 'IG')
+        older = Candle(timestamp=self.BASE_TS - 300, open=90.0, high=91.0, low=89.0, close=90.5)
+        native = Candle(timestamp=self.BASE_TS, open=99.0, high=110.0, low=98.0, close=104.0)
+        derived.append_many([older, native], persist=False)
+
+        base.append_many([self._minute(i) for i in range(2, 10)], persist=False)
+        self.manager._reseed_derived_streams('TEST_OIL')
+
+        candles = derived.get_recent()
+        self.assertEqual([c.timestamp for c in candles], [self.BASE_TS - 300, self.BASE_TS, self.BASE_TS + 300])
+        # The complete native bar is not replaced by the partial bucket
+        self.assertEqual(candles[1].high, 110.0)
+        self.assertTrue(candles[1].complete)
+
+    def test_4h_uses_native_stream(self):
+        """Test that 4h bars come from their own stream, enough for ATR(14)."""
+        from core.services.broker.ig_market_state_provider import IGMarketStateProvider
+        from core.services.market_data import Candle
+
+        self.assertFalse(self.manager.is_derived_timeframe('4h'))
+
+        base = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        base.append_many([self._minute(i) for i in range(1440)], persist=False)
+        native = self.manager.get_or_create_stream('TEST_OIL', '4h', 'IG')
+        native.append_many([
+            Candle(timestamp=self.BASE_TS - (20 - i) * 14400, open=100.0, high=102.0, low=98.0, close=100.0)
+            for i in range(20)
+        ], persist=False)
+
+        candles = self.manager.get_cached_candles('TEST_OIL', '4h')
+        self.assertEqual(len(candles), 20)
+
+        provider = IGMarketStateProvider(broker_service=MagicMock())
+        provider._current_asset = MagicMock(symbol='TEST_OIL')
+        with patch('core.services.market_data.get_stream_manager', return_value=self.manager):
+            atr = provider.get_atr('CC.D.CL.UNC.IP', '4h', 14)
+        self.assertAlmostEqual(atr, 4.0)
+
+
 class MarketDataStreamManagerTest(TestCase):
     """Tests for MarketDataStreamManager."""
     
@@ -4601,10 +5404,11 @@ class MarketDataStreamManagerTest(TestCase):
 
         with patch('core.services.broker.BrokerRegistry') as MockRegistry, \
                 patch.object(self.manager, '_fetch_historical_prices', side_effect=error):
-            MockRegistry.return_value.get_broker_for_asset.return_value = MagicMock()
+            MockRegistry.get_instance.return_value.get_broker_for_asset.return_value = MagicMock()
 
             self.manager._fetch_candles_from_broker(self.asset, stream, '1m', 1)
 
+        MockRegistry.get_instance.return_value.disconnect_all.assert_not_called()
         self.assertEqual(stream.status, 'CACHED')
         self.assertEqual(
             stream.error,
@@ -4634,6 +5438,542 @@ class MarketDataStreamManagerTest(TestCase):
         self.assertEqual(call_kwargs['resolution'], 'MINUTE')
         self.assertEqual(call_kwargs['epic'], 'CC.D.CL.UNC.IP')
 
+    def _fill_stream(self, stream, count, newest_age_seconds):
+        """Fill a stream with 1m candles ending newest_age_seconds ago."""
+        from datetime import datetime, timezone as dt_timezone
+        from core.services.market_data.candle_models import Candle
+
+        now = int(datetime.now(dt_timezone.utc).timestamp())
+        newest = (now - newest_age_seconds) // 60 * 60
+        stream.append_many([
+            Candle(timestamp=newest - i * 60, open=1.0, high=1.0, low=1.0, close=1.0)
+            for i in reversed(range(count))
+        ], persist=False)
+
+    def test_fetch_points_full_reload_for_empty_stream(self):
+        """An empty stream requests the whole window."""
+        stream = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+
+        self.assertEqual(self.manager._get_fetch_points(stream, '1m', 1), 60)
+
+    def test_fetch_points_only_fetches_gap(self):
+        """A filled stream only requests candles since the newest one."""
+        stream = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        self._fill_stream(stream, 60, newest_age_seconds=180)
+
+        points = self.manager._get_fetch_points(stream, '1m', 1)
+
+        self.assertGreaterEqual(points, 4)
+        self.assertLessEqual(points, 5)
+
+    def test_fetch_points_full_reload_for_large_gap(self):
+        """A gap as large as the window triggers a full reload."""
+        stream = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        self._fill_stream(stream, 60, newest_age_seconds=2 * 3600)
+
+        self.assertEqual(self.manager._get_fetch_points(stream, '1m', 1), 60)
+
+    def test_fetch_points_full_reload_for_sparse_stream(self):
+        """A stream covering too little of the window triggers a full reload."""
+        stream = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        self._fill_stream(stream, 10, newest_age_seconds=0)
+
+        self.assertEqual(self.manager._get_fetch_points(stream, '1m', 1), 60)
+
+    def test_concurrent_refresh_shares_single_fetch(self):
+        """Concurrent callers wait for the in-flight fetch instead of fetching again."""
+        import threading
+        from core.services.market_data.candle_models import Candle
+
+        stream = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetch(asset, target, timeframe, window_hours):
+            started.set()
+            release.wait(5)
+            target.append(Candle(timestamp=60, open=1.0, high=1.0, low=1.0, close=1.0), persist=False)
+
+        results = []
+
+        def request():
+            self.manager._refresh_stream(self.asset, stream, '1m', 1)
+            results.append(stream.get_count())
+
+        with patch.object(self.manager, '_should_fetch_from_broker',
+                          side_effect=lambda s, tf, w: s.get_count() == 0), \
+                patch.object(self.manager, '_fetch_candles_from_broker',
+                             side_effect=slow_fetch) as mock_fetch:
+            leader = threading.Thread(target=request)
+            leader.start()
+            started.wait(5)
+            followers = [threading.Thread(target=request) for _ in range(3)]
+            for follower in followers:
+                follower.start()
+            release.set()
+            for thread in [leader] + followers:
+                thread.join(5)
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(results, [1, 1, 1, 1])
+        self.assertEqual(self.manager._in_flight, {})
+
+    def test_refresh_wait_times_out(self):
+        """Callers fall back to cached data when the in-flight fetch takes too long."""
+        from core.services.market_data import market_data_stream_manager as module
+
+        stream = self.manager.get_or_create_stream('TEST_OIL', '1m', 'IG')
+        self.manager._in_flight[('TEST_OIL', '1m')] = module._InFlightFetch(window_hours=1)
+
+        with patch.object(module, 'FETCH_WAIT_TIMEOUT_SECONDS', 0.01), \
+                patch.object(self.manager, '_fetch_candles_from_broker') as mock_fetch:
+            self.manager._refresh_stream(self.asset, stream, '1m', 1, force_refresh=True)
+
+        mock_fetch.assert_not_called()
+
+
+class TickCandleAggregatorTest(TestCase):
+    """Tests for folding streamed ticks into 1m candles."""
+
+    BASE_TS = 1700000000 - 1700000000 % 60
+
+    def setUp(self):
+        """Set up test data."""
+        from core.services.market_data import CandleStream, TickCandleAggregator
+
+        self.store = MagicMock()
+        self.store.get_candles.return_value = []
+        self.stream = CandleStream(asset_id='TEST_OIL', timeframe='1m', broker='IG', store=self.store)
+        self.closed = []
+        self.aggregator = TickCandleAggregator(self.stream, on_candle_closed=self.closed.append)
+
+    def test_ticks_fold_into_forming_candle(self):
+        """Test OHLC of the forming candle and that it is not persisted."""
+        for offset, price in [(1, 75.0), (15, 75.4), (30, 74.8), (59.9, 75.1)]:
+            self.aggregator.add_tick(self.BASE_TS + offset, price)
+
+        partial = self.stream.get_partial()
+        self.assertEqual(partial.timestamp, self.BASE_TS)
+        self.assertEqual((partial.open, partial.high, partial.low, partial.close), (75.0, 75.4, 74.8, 75.1))
+        self.assertEqual(partial.trade_count, 4)
+        self.assertFalse(partial.complete)
+        self.assertEqual(len(self.stream), 1)
+        self.store.append_candle.assert_not_called()
+
+    def test_next_minute_closes_candle(self):
+        """Test that the first tick of a new minute closes and persists the previous candle."""
+        self.aggregator.add_tick(self.BASE_TS + 5, 75.0, volume=2.0)
+        self.aggregator.add_tick(self.BASE_TS + 40, 75.5, volume=1.0)
+        self.aggregator.add_tick(self.BASE_TS + 61, 75.2)
+
+        self.assertEqual(len(self.closed), 1)
+        closed = self.closed[0]
+        self.assertTrue(closed.complete)
+        self.assertEqual((closed.open, closed.high, closed.low, closed.close), (75.0, 75.5, 75.0, 75.5))
+        self.assertEqual(closed.volume, 3.0)
+        self.store.append_candle.assert_called_once_with('TEST_OIL', '1m', closed)
+
+        candles = self.stream.get_recent(count=10)
+        self.assertEqual([c.timestamp for c in candles], [self.BASE_TS, self.BASE_TS + 60])
+        self.assertTrue(candles[0].complete)
+        self.assertFalse(candles[1].complete)
+
+    def test_flush_closes_candle_after_minute_ends(self):
+        """Test that quiet markets still close their candle on flush."""
+        self.aggregator.add_tick(self.BASE_TS + 5, 75.0)
+
+        self.assertIsNone(self.aggregator.flush(self.BASE_TS + 59))
+        closed = self.aggregator.flush(self.BASE_TS + 60)
+
+        self.assertTrue(closed.complete)
+        self.assertIsNone(self.aggregator.current_candle)
+        self.assertIsNone(self.aggregator.flush(self.BASE_TS + 120))
+        self.assertEqual(self.closed, [closed])
+
+    def test_late_tick_of_closed_minute_is_ignored(self):
+        """Test that ticks older than the forming candle do not reopen it."""
+        self.aggregator.add_tick(self.BASE_TS + 61, 75.2)
+        self.aggregator.add_tick(self.BASE_TS + 30, 99.0)
+
+        self.assertEqual(self.aggregator.current_candle.high, 75.2)
+        self.assertEqual(self.aggregator.tick_count, 1)
+
+    def test_late_tick_after_flush_is_ignored(self):
+        """Test that a tick of a flushed minute does not replace the closed candle."""
+        for offset, price in [(1, 1.0), (20, 5.0), (40, 0.5)]:
+            self.aggregator.add_tick(self.BASE_TS + offset, price)
+        self.aggregator.flush(self.BASE_TS + 61)
+
+        # Server time lags the local flush clock
+        self.aggregator.add_tick(self.BASE_TS + 59.9, 2.0)
+        self.aggregator.add_tick(self.BASE_TS + 65, 3.0)
+
+        self.assertEqual(len(self.closed), 1)
+        candle = self.stream.get_recent(count=10)[0]
+        self.assertEqual(candle.timestamp, self.BASE_TS)
+        self.assertTrue(candle.complete)
+        self.assertEqual((candle.open, candle.high, candle.low, candle.close), (1.0, 5.0, 0.5, 0.5))
+
+    def test_forming_candle_is_appended_under_lock(self):
+        """Test that a concurrent flush cannot be overwritten by a stale forming candle."""
+        locked = []
+        append = self.stream.append
+
+        def record_append(candle, persist=True):
+            if not candle.complete:
+                locked.append(self.aggregator._lock.locked())
+            append(candle, persist=persist)
+
+        self.stream.append = record_append
+        self.aggregator.add_tick(self.BASE_TS + 5, 75.0)
+        self.aggregator.add_tick(self.BASE_TS + 61, 75.2)
+
+        self.assertEqual(locked, [True, True])
+
+
+class FakeSubscriptionClient:
+    """In-memory SubscriptionClient that delivers updates on push()."""
+
+    def __init__(self):
+        self.connected = False
+        self.subscriptions = {}
+
+    def connect(self):
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+    def is_connected(self):
+        return self.connected
+
+    def subscribe(self, item, fields, listener, mode="MERGE"):
+        sub_id = len(self.subscriptions) + 1
+        self.subscriptions[sub_id] = (item, fields, listener)
+        return sub_id
+
+    def unsubscribe(self, sub_id):
+        self.subscriptions.pop(sub_id, None)
+
+    def push(self, item, values):
+        for subscribed_item, fields, listener in list(self.subscriptions.values()):
+            if subscribed_item == item:
+                listener(item, {field: values.get(field) for field in fields})
+
+
+class IgStreamIngestorTest(TestCase):
+    """Tests for streaming IG ticks into the market data layer."""
+
+    BASE_TS = 1700000000 - 1700000000 % 60
+
+    def setUp(self):
+        """Set up test data."""
+        from core.services.market_data import IgStreamIngestor, MarketDataStreamManager, RedisCandleStore
+
+        MarketDataStreamManager.reset_instance()
+        store = RedisCandleStore()
+        store._get_redis_client = lambda: None
+        self.manager = MarketDataStreamManager(store=store)
+        self.client = FakeSubscriptionClient()
+        self.now = [float(self.BASE_TS)]
+        self.ingestor = IgStreamIngestor(self.client, manager=self.manager, clock=lambda: self.now[0])
+
+    def tearDown(self):
+        """Clean up."""
+        from core.services.market_data import MarketDataStreamManager
+        self.ingestor.stop()
+        MarketDataStreamManager.reset_instance()
+
+    def _tick(self, offset, bid, offer):
+        self.now[0] = self.BASE_TS + offset
+        self.client.push('CHART:CC.D.CL.UNC.IP:TICK', {
+            'BID': str(bid),
+            'OFR': str(offer),
+            'UTM': str(int((self.BASE_TS + offset) * 1000)),
+        })
+
+    def test_ticks_build_mid_price_candles(self):
+        """Test that streamed ticks become 1m mid-price candles on the asset stream."""
+        self.ingestor.add_market('TEST_OIL', 'CC.D.CL.UNC.IP')
+        self.ingestor.add_market('TEST_OIL', 'CC.D.CL.UNC.IP')
+        self.assertEqual(len(self.client.subscriptions), 1)
+        item, fields, _ = self.client.subscriptions[1]
+        self.assertEqual(item, 'CHART:CC.D.CL.UNC.IP:TICK')
+        self.assertIn('UTM', fields)
+
+        self._tick(1, 75.00, 75.02)
+        self._tick(20, 75.40, 75.42)
+        self._tick(45, 74.90, 74.92)
+        self._tick(62, 75.10, 75.12)
+
+        stream = self.manager.get_stream('TEST_OIL', '1m')
+        candles = stream.get_recent(count=10)
+        self.assertEqual(len(candles), 2)
+        first = candles[0]
+        self.assertTrue(first.complete)
+        self.assertAlmostEqual(first.open, 75.01)
+        self.assertAlmostEqual(first.high, 75.41)
+        self.assertAlmostEqual(first.low, 74.91)
+        self.assertAlmostEqual(first.close, 74.91)
+        self.assertFalse(candles[1].complete)
+        self.assertEqual(stream.status, 'LIVE')
+
+        # Derived timeframes are built from the streamed candles
+        five_minute = self.manager.get_cached_candles('TEST_OIL', '5m', count=5)
+        self.assertAlmostEqual(five_minute[-1].high, 75.41)
+
+    def test_is_streaming_requires_connection_and_recent_ticks(self):
+        """Test the streaming state used to skip REST polling."""
+        from core.services.market_data.ig_stream_ingestor import STREAM_STALE_SECONDS
+
+        self.ingestor.add_market('TEST_OIL', 'CC.D.CL.UNC.IP')
+        self.assertFalse(self.ingestor.is_streaming('CC.D.CL.UNC.IP'))
+
+        self.client.connect()
+        self._tick(1, 75.00, 75.02)
+        self.assertTrue(self.ingestor.is_streaming('CC.D.CL.UNC.IP'))
+        self.assertFalse(self.ingestor.is_streaming('IX.D.DAX.IFMM.IP'))
+
+        self.now[0] += STREAM_STALE_SECONDS + 1
+        self.assertFalse(self.ingestor.is_streaming('CC.D.CL.UNC.IP'))
+
+        self.client.disconnect()
+        self._tick(200, 75.00, 75.02)
+        self.assertFalse(self.ingestor.is_streaming('CC.D.CL.UNC.IP'))
+
+    def test_flush_and_remove_market(self):
+        """Test closing quiet minutes and unsubscribing."""
+        self.ingestor.add_market('TEST_OIL', 'CC.D.CL.UNC.IP')
+        self._tick(1, 75.00, 75.02)
+
+        self.now[0] = self.BASE_TS + 60
+        self.ingestor.flush()
+        self.assertTrue(self.manager.get_stream('TEST_OIL', '1m').get_latest().complete)
+
+        self.ingestor.remove_market('CC.D.CL.UNC.IP')
+        self.assertEqual(self.client.subscriptions, {})
+        self.assertEqual(self.ingestor.get_stats()['markets'], {})
+
+
+class MexcKlineIngestorTest(TestCase):
+    """Tests for streaming MEXC klines into the market data layer."""
+
+    BASE_TS = 1700000000 - 1700000000 % 60
+    CHANNEL = 'spot@public.kline.v3.api@BTCUSDT@Min1'
+
+    def setUp(self):
+        """Set up test data."""
+        from core.services.market_data import MexcKlineIngestor, MarketDataStreamManager, RedisCandleStore
+
+        MarketDataStreamManager.reset_instance()
+        store = RedisCandleStore()
+        store._get_redis_client = lambda: None
+        self.manager = MarketDataStreamManager(store=store)
+        self.client = FakeSubscriptionClient()
+        self.now = [float(self.BASE_TS)]
+        self.ingestor = MexcKlineIngestor(self.client, manager=self.manager, clock=lambda: self.now[0])
+        self.ingestor.add_symbol('BTC', 'BTCUSDT')
+        self.client.connect()
+
+    def tearDown(self):
+        """Clean up."""
+        from core.services.market_data import MarketDataStreamManager
+        MarketDataStreamManager.reset_instance()
+
+    def _kline(self, minute, close, high=None):
+        self.now[0] = self.BASE_TS + minute * 60 + 30
+        self.client.subscriptions[1][2](self.CHANNEL, {
+            'k': {
+                't': self.BASE_TS + minute * 60,
+                'o': '100.0',
+                'h': str(high or max(close, 100.0)),
+                'l': '99.0',
+                'c': str(close),
+                'v': '3.5',
+                'i': 'Min1',
+            },
+        })
+
+    def test_tracks_current_and_last_closed_kline(self):
+        """Test that the next minute's first update closes the previous kline."""
+        self.assertEqual(self.client.subscriptions[1][0], self.CHANNEL)
+
+        self._kline(0, 100.5)
+        self._kline(0, 101.0, high=101.2)
+        self.assertEqual(len(self.manager.get_stream('BTC', '1m')), 0)
+
+        self._kline(1, 101.3)
+
+        last_closed, current = self.ingestor.get_klines('BTCUSDT')
+        self.assertTrue(last_closed.complete)
+        self.assertEqual(last_closed.timestamp, self.BASE_TS)
+        self.assertEqual((last_closed.high, last_closed.close), (101.2, 101.0))
+        self.assertFalse(current.complete)
+        self.assertEqual(current.close, 101.3)
+
+        stream = self.manager.get_stream('BTC', '1m')
+        self.assertEqual([c.timestamp for c in stream.get_recent(count=10)], [self.BASE_TS])
+        self.assertEqual(stream.status, 'LIVE')
+
+    def test_ignores_stale_and_malformed_updates(self):
+        """Test that late updates of closed minutes and incomplete payloads are dropped."""
+        self._kline(1, 101.0)
+        self._kline(0, 50.0)
+        self.client.subscriptions[1][2](self.CHANNEL, {'k': {'t': self.BASE_TS + 60}})
+
+        self.assertEqual(self.ingestor.get_klines('BTCUSDT')[-1].close, 101.0)
+        self.assertEqual(self.ingestor.get_stats()['symbols']['BTCUSDT']['updates'], 1)
+
+    def test_fetcher_serves_streamed_klines_instead_of_polling(self):
+        """Test that MexcMarketDataFetcher only polls REST when the stream is not live."""
+        from core.services.broker import MexcMarketDataFetcher
+        from core.services.market_data.mexc_kline_ingestor import STREAM_STALE_SECONDS
+
+        session = MagicMock()
+        session.get.return_value.json.return_value = [
+            [self.BASE_TS * 1000, '1', '2', '0.5', '1.5', '10'],
+        ]
+        fetcher = MexcMarketDataFetcher(session=session, kline_stream=self.ingestor)
+
+        self._kline(0, 100.5)
+        self._kline(1, 101.3)
+        candles = fetcher.get_klines('BTCUSDT', interval='1m', limit=2)
+
+        session.get.assert_not_called()
+        self.assertEqual([c.close for c in candles], [100.5, 101.3])
+        self.assertEqual(candles[-1].timestamp.timestamp(), self.BASE_TS + 60)
+
+        # Only the current kline when a single candle is requested
+        self.assertEqual([c.close for c in fetcher.get_klines('BTCUSDT', limit=1)], [101.3])
+
+        # Stale stream falls back to REST
+        self.now[0] += STREAM_STALE_SECONDS + 1
+        candles = fetcher.get_klines('BTCUSDT', interval='1m', limit=2)
+        session.get.assert_called_once()
+        self.assertEqual(candles[0].close, 1.5)
+
+
+class HistoryBackfillTest(TestCase):
+    """Tests for paged, concurrent historical backfill."""
+
+    def setUp(self):
+        """Set up a MEXC broker serving klines for any requested window."""
+        from core.services.broker import MexcBrokerService
+        from core.services.market_data import RedisCandleStore, RedisConfig
+
+        self.store = RedisCandleStore(config=RedisConfig())
+        self.store._get_redis_client = lambda: None
+        self.broker = MagicMock(spec=MexcBrokerService)
+        self.broker.get_historical_prices.side_effect = self._klines
+
+    def _klines(self, symbol, interval, limit, start_time, end_time):
+        # Overlap the previous window by one candle to exercise deduplication
+        start_ts = int(start_time.timestamp()) - 60
+        end_ts = int(end_time.timestamp())
+        return [
+            {'time': ts, 'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 3.0}
+            for ts in range(start_ts, end_ts + 1, 60)
+        ][:limit]
+
+    def test_split_windows(self):
+        """Test that windows cover the range without overlap."""
+        from datetime import datetime, timedelta, timezone
+        from core.services.market_data import split_windows
+
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        windows = split_windows(start, start + timedelta(minutes=2499), '1m', 1000)
+
+        self.assertEqual(len(windows), 3)
+        self.assertEqual(windows[0], (start, start + timedelta(minutes=999)))
+        self.assertEqual(windows[1][0], start + timedelta(minutes=1000))
+        self.assertEqual(windows[2], (start + timedelta(minutes=2000), start + timedelta(minutes=2499)))
+
+    def test_backfill_month_of_1m_candles(self):
+        """Test that a month of 1m candles is paged, deduplicated and stored."""
+        from datetime import datetime, timedelta, timezone
+        from core.services.market_data import HistoryBackfill
+
+        end = datetime(2024, 1, 31, tzinfo=timezone.utc)
+        start = end - timedelta(days=30)
+
+        result = HistoryBackfill(self.broker, store=self.store, max_workers=4).run(
+            'BTC', 'BTCUSDT', '1m', start, end
+        )
+
+        expected = 30 * 24 * 60 + 1
+        self.assertTrue(result.success)
+        self.assertEqual(result.windows, 44)
+        self.assertEqual(self.broker.get_historical_prices.call_count, 44)
+        self.assertGreater(result.fetched, expected)
+        self.assertEqual(result.written, expected)
+        self.assertEqual(self.store.get_history_count('BTC', '1m'), expected)
+
+        kwargs = self.broker.get_historical_prices.call_args.kwargs
+        self.assertEqual(kwargs['interval'], '1m')
+        self.assertEqual(kwargs['limit'], 1000)
+
+        candles = self.store.get_history_range('BTC', '1m', start, end)
+        self.assertEqual(candles[0].timestamp, int(start.timestamp()))
+        self.assertEqual(candles[-1].timestamp, int(end.timestamp()))
+
+    def test_failed_window_is_reported(self):
+        """Test that a failing window does not discard the other windows."""
+        from datetime import datetime, timedelta, timezone
+        from core.services.broker import BrokerError
+        from core.services.market_data import HistoryBackfill
+
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        end = start + timedelta(minutes=1999)
+
+        def klines(**kwargs):
+            if kwargs['start_time'] == start:
+                raise BrokerError("Rate limit wait too long", code="RATE_LIMITED")
+            return self._klines(**kwargs)
+
+        self.broker.get_historical_prices.side_effect = klines
+
+        result = HistoryBackfill(self.broker, store=self.store).run('BTC', 'BTCUSDT', '1m', start, end)
+
+        self.assertFalse(result.success)
+        self.assertEqual(len(result.failed_windows), 1)
+        self.assertEqual(result.failed_windows[0][0], start)
+        # 1000 klines of the second window, starting one candle inside the first
+        self.assertEqual(result.written, 1000)
+
+    def test_unexpected_window_error_is_reported(self):
+        """Test that any exception of a window is recorded instead of aborting the backfill."""
+        from datetime import datetime, timedelta, timezone
+        from core.services.market_data import HistoryBackfill
+
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        end = start + timedelta(minutes=1999)
+
+        def klines(**kwargs):
+            if kwargs['start_time'] == start:
+                return [{'time': int(start.timestamp()), 'open': 'n/a'}]  # Malformed payload
+            return self._klines(**kwargs)
+
+        self.broker.get_historical_prices.side_effect = klines
+
+        result = HistoryBackfill(self.broker, store=self.store).run('BTC', 'BTCUSDT', '1m', start, end)
+
+        self.assertEqual(len(result.failed_windows), 1)
+        self.assertEqual(result.failed_windows[0][0], start)
+        self.assertEqual(result.written, 1000)
+
+    def test_unsupported_timeframe_raises(self):
+        """Test that timeframes without a native broker interval are rejected."""
+        from datetime import datetime, timedelta, timezone
+        from core.services.market_data import HistoryBackfill
+
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        with self.assertRaises(ValueError):
+            HistoryBackfill(self.broker, store=self.store).run(
+                'BTC', 'BTCUSDT', '2m', start, start + timedelta(hours=1)
+            )
+        self.broker.get_historical_prices.assert_not_called()
+
 
 class BreakoutDistanceCandlesAPITest(TestCase):
     """Tests for the new breakout distance candles API endpoint."""
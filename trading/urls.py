@@ -72,6 +72,7 @@ urlpatterns = [
     path('api/account-state/', views.api_account_state, name='api_account_state'),
     path('api/all-brokers-account-state/', views.api_all_brokers_account_state, name='api_all_brokers_account_state'),
     path('api/worker/status/', views.api_worker_status, name='api_worker_status'),
+    path('api/broker/metrics/', views.api_broker_metrics, name='api_broker_metrics'),
     path('api/assets/', views.api_active_assets, name='api_active_assets'),
     path('api/debug/breakout-range/', views.api_breakout_range_diagnostics, name='api_breakout_range_diagnostics'),
     
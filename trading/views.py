@@ -27,6 +27,8 @@ from core.services.broker import (
     OrderRequest,
     OrderType,
     OrderDirection,
+    get_broker_metrics,
+    summarize_broker_metrics,
 )
 from core.services.market_data.redis_candle_store import get_candle_store
 
@@ -754,6 +756,7 @@ def api_worker_status(request):
             'worker_interval': status.worker_interval,
             'seconds_since_last_run': int(time_since_last_run),
             'seconds_until_next_run': seconds_until_next_run,
+            'broker_metrics': summarize_broker_metrics(status.broker_metrics or {}),
         }
         
         return JsonResponse({
@@ -773,6 +776,30 @@ def api_worker_status(request):
         }, status=500)
 
 
+@login_required
+def api_broker_metrics(request):
+    """
+    GET /fiona/api/broker/metrics/ - Return broker call metrics.
+    
+    Returns JSON with per-broker latency histograms per endpoint, error
+    counts by broker error code, retry and token refresh counts for:
+    - worker: the worker process (as of its last status update)
+    - web: this web process
+    """
+    status = WorkerStatus.get_current()
+    
+    return JsonResponse({
+        'success': True,
+        'worker': {
+            'updated_at': status.last_run_at.isoformat() if status else None,
+            'brokers': status.broker_metrics if status else {},
+        },
+        'web': {
+            'brokers': get_broker_metrics().snapshot(),
+        },
+    })
+
+
 # ============================================================================
 # Asset Management Views
 # ============================================================================